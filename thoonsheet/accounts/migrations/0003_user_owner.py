@@ -0,0 +1,20 @@
+# Generated by Django 5.2.4 on 2026-10-19 15:24
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0002_alter_user_options_alter_user_managers_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user',
+            name='owner',
+            field=models.ForeignKey(blank=True, limit_choices_to={'user_type': 'owner'}, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='auditors', to=settings.AUTH_USER_MODEL, verbose_name='ပိုင်ရှင်'),
+        ),
+    ]
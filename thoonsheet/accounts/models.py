@@ -42,6 +42,11 @@ class User(AbstractUser): # သင့် User model အမည်ကို သေ
     ]
     user_type = models.CharField(max_length=20, choices=USER_TYPE_CHOICES, default='auditor', verbose_name="အသုံးပြုသူအမျိုးအစား")
     phone_number = models.CharField(max_length=20, blank=True, null=True, verbose_name="ဖုန်းနံပါတ်")
+    # Auditor ကို ဖန်တီးပေးသော owner (tenant) — owner/superuser များအတွက် null
+    owner = models.ForeignKey(
+        'self', on_delete=models.CASCADE, null=True, blank=True, related_name='auditors',
+        limit_choices_to={'user_type': 'owner'}, verbose_name="ပိုင်ရှင်",
+    )
 
     # အခြား fields များ...
 
@@ -60,5 +65,12 @@ class User(AbstractUser): # သင့် User model အမည်ကို သေ
     def is_auditor(self):
         return self.user_type == 'auditor'
 
+    @property
+    def tenant_id(self):
+        """ဤ user ၏ data ပိုင်ရှင် (owner) id — owner ဆိုလျှင် ကိုယ်တိုင်၊ auditor ဆိုလျှင် ဖန်တီးပေးသော owner"""
+        if self.user_type == 'owner':
+            return self.pk
+        return self.owner_id
+
 # အကယ်၍ သင်သည် User model ကို ပြောင်းလဲခဲ့ပါက settings.py တွင် AUTH_USER_MODEL = 'accounts.User' (သင့် model အမည်) ဟု သတ်မှတ်ထားရပါမည်။
 
@@ -1,3 +1,51 @@
 from django.test import TestCase
+from rest_framework.test import APIRequestFactory, force_authenticate
 
-# Create your tests here.
+from .models import User
+from .views import UserViewSet
+
+
+class TenantTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.owner = User.objects.create_user('owner', 'owner@example.com', 'x', user_type='owner')
+        cls.auditor = User.objects.create_user('auditor', 'auditor@example.com', 'x', user_type='auditor', owner=cls.owner)
+        cls.other_owner = User.objects.create_user('owner2', 'owner2@example.com', 'x', user_type='owner')
+        cls.other_auditor = User.objects.create_user(
+            'auditor2', 'auditor2@example.com', 'x', user_type='auditor', owner=cls.other_owner,
+        )
+
+    def call(self, user, method='get', data=None):
+        actions = {'get': 'list', 'post': 'create'}
+        factory = APIRequestFactory()
+        request = getattr(factory, method)('/users/', data, format='json')
+        force_authenticate(request, user=user)
+        return UserViewSet.as_view({method: actions[method]})(request)
+
+    def test_tenant_id(self):
+        self.assertEqual(self.owner.tenant_id, self.owner.pk)
+        self.assertEqual(self.auditor.tenant_id, self.owner.pk)
+        admin = User.objects.create_superuser('admin', 'admin@example.com', 'x')
+        self.assertIsNone(admin.tenant_id)
+
+    def test_owner_lists_own_auditors_only(self):
+        response = self.call(self.owner)
+        usernames = {row['username'] for row in response.data['results']}
+        self.assertEqual(usernames, {'owner', 'auditor'})
+
+    def test_auditor_lists_self_only(self):
+        response = self.call(self.auditor)
+        self.assertEqual([row['username'] for row in response.data['results']], ['auditor'])
+
+    def test_owner_created_auditor_belongs_to_owner(self):
+        response = self.call(self.owner, 'post', {
+            'username': 'auditor3', 'email': 'a3@example.com', 'password': 'x', 'user_type': 'auditor',
+        })
+        self.assertEqual(response.status_code, 201)
+        created = User.objects.get(username='auditor3')
+        self.assertEqual(created.owner, self.owner)
+        self.assertEqual(created.tenant_id, self.owner.pk)
+
+        response = self.call(self.owner, 'post', {'username': 'owner3', 'password': 'x', 'user_type': 'owner'})
+        self.assertEqual(response.status_code, 403)
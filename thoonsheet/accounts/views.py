@@ -4,6 +4,7 @@ from rest_framework.response import Response
 from rest_framework_simplejwt.views import TokenObtainPairView
 from rest_framework.permissions import IsAuthenticated
 
+from django.db.models import Q
 from .models import User
 from .serializers import UserSerializer
 from .permissions import IsSuperUser, IsSuperUserOrSelf, IsOwner, IsAuditor
@@ -32,7 +33,8 @@ class UserViewSet(viewsets.ModelViewSet):
         if self.request.user.is_superuser:
             return User.objects.all() # Superuser can see all users
         elif self.request.user.user_type == 'owner':
-            return User.objects.all() # Owner can see all users (for management context)
+            # Owner can see themselves and the auditors they manage
+            return User.objects.filter(Q(pk=self.request.user.pk) | Q(owner=self.request.user))
         elif self.request.user.user_type == 'auditor':
             return User.objects.filter(id=self.request.user.id) # Auditor can only see their own profile
         return User.objects.none() # For unauthenticated or other unexpected roles
@@ -80,7 +82,7 @@ class UserViewSet(viewsets.ModelViewSet):
             # Owner can only create 'auditor' type accounts.
             # They cannot create other owners, staff, or superusers.
             if user_type == 'auditor' and not is_staff and not is_superuser:
-                user = serializer.save(user_type='auditor')
+                user = serializer.save(user_type='auditor', owner=current_user)
             else:
                 return Response(
                     {"detail": "Owners can only create auditor accounts."},
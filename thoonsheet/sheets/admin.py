@@ -1,11 +1,22 @@
 # sheets/admin.py
 
+from django.conf import settings
 from django.contrib import admin
-from django.utils.html import format_html, mark_safe
+from django.core.exceptions import PermissionDenied, SuspiciousFileOperation
+from django.core.paginator import Paginator
+from django.db import connections
+from django.db.models import Q
+from django.db.models.expressions import RawSQL
+from django.http import FileResponse, Http404, HttpResponse, JsonResponse
+from django.urls import path, reverse
+from django.utils.functional import cached_property
+from django.utils.html import format_html, format_html_join, mark_safe
 from django import forms
 from django.contrib.auth import get_user_model
+from PIL import UnidentifiedImageError
 
-from sheets.models import AuditEntry, Group, PaymentAccount, Transaction
+from sheets import profiling, search, thumbnails
+from sheets.models import ArchivedTransaction, AuditEntry, Group, PaymentAccount, RequestProfile, Transaction
 
 User = get_user_model()
 
@@ -92,20 +103,69 @@ class AuditEntryAdmin(admin.ModelAdmin):
         super().save_model(request, obj, form, change)
 
 
+class EstimatedCountPaginator(Paginator):
+    """
+    Changelist paginator — row သန်းချီ table တွင် COUNT(*) အပြည့် မလုပ်ရန်
+    - filter မပါလျှင် database statistics (PostgreSQL reltuples / SQLite sqlite_stat1 သို့ max(id)) မှ ခန့်မှန်း
+    - filter ပါလျှင် SHEETS_ADMIN_COUNT_LIMIT အထိသာ ရေတွက် (ထို့ထက်များလျှင် page များကို ထိုအထိသာ ပြ)
+    """
+
+    @cached_property
+    def count(self):
+        queryset = self.object_list
+        limit = admin_count_limit()
+        if not queryset.query.where:
+            estimate = estimated_rows(queryset.model, queryset.db)
+            if estimate is not None and estimate > limit:
+                return estimate
+        return queryset.order_by()[:limit + 1].count()
+
+
+def admin_count_limit():
+    return getattr(settings, 'SHEETS_ADMIN_COUNT_LIMIT', 10000)
+
+
+def estimated_rows(model, using):
+    """Table row အရေအတွက် ခန့်မှန်း (မရလျှင် None)"""
+    connection = connections[using]
+    table = model._meta.db_table
+    with connection.cursor() as cursor:
+        if connection.vendor == 'postgresql':
+            cursor.execute("SELECT reltuples::bigint FROM pg_class WHERE oid = to_regclass(%s)", [table])
+            row = cursor.fetchone()
+            # ANALYZE မလုပ်ရသေးလျှင် -1
+            return row[0] if row and row[0] >= 0 else None
+        if connection.vendor == 'sqlite':
+            cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'sqlite_stat1'")
+            if cursor.fetchone():
+                cursor.execute("SELECT stat FROM sqlite_stat1 WHERE tbl = %s LIMIT 1", [table])
+                row = cursor.fetchone()
+                if row:
+                    return int(row[0].split()[0])
+            # ANALYZE မလုပ်ရသေးလျှင် — pk index ၏ နောက်ဆုံး row (ဖျက်ထားသော / archive လုပ်ထားသော row များကြောင့် ပိုနိုင်)
+            cursor.execute(f"SELECT MAX({connection.ops.quote_name(model._meta.pk.column)}) FROM {connection.ops.quote_name(table)}")
+            row = cursor.fetchone()
+            return row[0] if row else None
+    return None
+
+
 @admin.register(Transaction)
 class TransactionAdmin(admin.ModelAdmin):
     list_display = (
         'id', 'amount', 'transaction_type', 'status', 'submitted_by',
-        'group', 'payment_account', 'transaction_date', 'image_tag',
+        'group', 'payment_account', 'transaction_date', 'thumbnail',
         'transfer_id_last_6_digits',
         'submitted_at',
     )
+    list_select_related = ('submitted_by', 'group', 'payment_account')
+    # FK id ဖြင့် filter (index ရှိ) — choice များကို Transaction table ကို DISTINCT scan မလုပ်ဘဲ related table မှ ယူ
     list_filter = (
         'status',
         'transaction_type',
-        'group__name',
-        'payment_account__payment_account_name',
-        'submitted_by__username',
+        ('transaction_date', admin.DateFieldListFilter),
+        'group',
+        'payment_account',
+        'submitted_by',
     )
     search_fields = (
         'transfer_id_last_6_digits',
@@ -114,15 +174,177 @@ class TransactionAdmin(admin.ModelAdmin):
         'payment_account__payment_account_name',
         'owner_notes',
     )
-    date_hierarchy = 'transaction_date'
+    # Meta ordering (-submitted_at) အစား primary key — index မလိုဘဲ အသစ်ဆုံး page ကို ချက်ချင်းရ
+    ordering = ('-id',)
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    autocomplete_fields = ('submitted_by', 'group', 'payment_account')
     readonly_fields = (
         'submitted_at',
         'approved_by_owner_at',
         'image_tag',
     )
 
+    def get_urls(self):
+        urls = [
+            path(
+                'thumbnail/<path:name>',
+                self.admin_site.admin_view(self.thumbnail_view),
+                name='sheets_transaction_thumbnail',
+            ),
+        ]
+        return urls + super().get_urls()
+
+    def thumbnail_view(self, request, name):
+        """Changelist ၏ thumbnail (sheets/thumbnails.py) — ပထမဆုံး တောင်းသောအခါ ဖန်တီးပြီး disk ပေါ် cache"""
+        if not self.has_view_or_change_permission(request):
+            raise PermissionDenied
+        try:
+            thumbnail = thumbnails.get_or_create(name)
+        except (FileNotFoundError, SuspiciousFileOperation, UnidentifiedImageError):
+            raise Http404
+        response = FileResponse(open(thumbnail, 'rb'), content_type='image/jpeg')
+        response['Cache-Control'] = 'private, max-age=31536000, immutable'
+        return response
+
+    def get_search_results(self, request, queryset, search_term):
+        # owner notes ကို LIKE '%...%' scan အစား full-text index (sheets.search) ဖြင့်
+        # - ဂဏန်းသက်သက် — transfer ID ၏ အလယ်/နောက်ဆုံး ဂဏန်းများ (FTS က prefix သာ) ကိုပါ __contains ဖြင့်
+        # - user / group / payment account အမည် — Transaction table ကို scan မလုပ်ဘဲ related table (row နည်း) မှ id ယူပြီး FK index ဖြင့်
+        # FTS မရှိသော database တွင်သာ search_fields
+        term = search_term.strip()
+        if not term or not search.is_supported(queryset.db):
+            return super().get_search_results(request, queryset, search_term)
+        condition = (
+            Q(submitted_by__in=User.objects.filter(username__icontains=term).values('pk'))
+            | Q(group__in=Group.objects.filter(name__icontains=term).values('pk'))
+            | Q(payment_account__in=PaymentAccount.objects.filter(payment_account_name__icontains=term).values('pk'))
+        )
+        if term.isdigit():
+            condition |= Q(transfer_id_last_6_digits__contains=term)
+        sql, params, match = search.matching_ids(term, 'transaction', using=queryset.db)
+        if match:
+            condition |= Q(pk__in=RawSQL(sql, params))
+        return queryset.filter(condition), False
+
+    def thumbnail(self, obj):
+        if not obj.image:
+            return "No Image"
+        return format_html(
+            '<a href="{}" target="_blank"><img src="{}" width="48" loading="lazy" alt="" /></a>',
+            obj.image.url,
+            reverse('admin:sheets_transaction_thumbnail', args=[obj.image.name]),
+        )
+    thumbnail.short_description = 'ပုံ'
+
     def image_tag(self, obj):
         if obj.image and hasattr(obj.image, 'url'):
             return mark_safe(f'<img src="{obj.image.url}" width="50" height="auto" />')
         return "No Image"
     image_tag.short_description = 'ပုံ'
+
+
+@admin.register(ArchivedTransaction)
+class ArchivedTransactionAdmin(admin.ModelAdmin):
+    """Archive (sheets/archive.py) — ကြည့်ရန်သာ"""
+    list_display = (
+        'id', 'amount', 'transaction_type', 'group', 'payment_account',
+        'transaction_date', 'transfer_id_last_6_digits', 'archived_at',
+    )
+    list_select_related = ('group', 'payment_account')
+    list_filter = (('transaction_date', admin.DateFieldListFilter),)
+    search_fields = ('transfer_id_last_6_digits',)
+    ordering = ('-id',)
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(RequestProfile)
+class RequestProfileAdmin(admin.ModelAdmin):
+    """Request profile (sheets/profiling.py) — ကြည့်ရန် / download ရန်သာ"""
+    list_display = (
+        'request_id', 'method', 'path', 'status_code', 'duration_ms', 'sql_count', 'sql_ms',
+        'mode', 'sampled', 'user', 'created_at', 'downloads',
+    )
+    list_select_related = ('user',)
+    list_filter = ('mode', 'sampled', 'method')
+    search_fields = ('=request_id', 'path', 'view_name')
+    exclude = ('data', 'pstats')
+    readonly_fields = ('downloads', 'top_functions', 'slowest_sql')
+    raw_id_fields = ('user',)
+
+    def get_urls(self):
+        urls = [
+            path(
+                '<path:object_id>/download/<str:fmt>/',
+                self.admin_site.admin_view(self.download_view),
+                name='sheets_requestprofile_download',
+            ),
+        ]
+        return urls + super().get_urls()
+
+    def download_view(self, request, object_id, fmt):
+        profile = self.get_object(request, object_id)
+        if profile is None or not self.has_view_or_change_permission(request, profile):
+            raise Http404
+        filename = f"profile-{profile.request_id}"
+        stacks = profile.data.get('stacks', {})
+        if fmt == 'json':
+            response = JsonResponse(dict(
+                profile.data,
+                request_id=profile.request_id, method=profile.method, path=profile.path, mode=profile.mode,
+                duration_ms=profile.duration_ms, sql_count=profile.sql_count, sql_ms=profile.sql_ms,
+                call_tree=profiling.call_tree(stacks) if stacks else None,
+            ), json_dumps_params={'ensure_ascii': False})
+            filename += '.json'
+        elif fmt == 'collapsed' and stacks:
+            response = HttpResponse(profiling.collapsed(stacks), content_type='text/plain; charset=utf-8')
+            filename += '.txt'
+        elif fmt == 'prof' and profile.pstats:
+            response = HttpResponse(bytes(profile.pstats), content_type='application/octet-stream')
+            filename += '.prof'
+        else:
+            raise Http404
+        response['Content-Disposition'] = f'attachment; filename="{filename}"'
+        return response
+
+    def downloads(self, obj):
+        formats = ['json', 'collapsed' if obj.mode == 'sample' else 'prof']
+        return format_html_join(
+            ' | ', '<a href="{}">{}</a>',
+            ((reverse('admin:sheets_requestprofile_download', args=[obj.pk, fmt]), fmt) for fmt in formats),
+        )
+    downloads.short_description = 'Download'
+
+    def top_functions(self, obj):
+        rows = obj.data.get('functions', [])[:20]
+        if obj.mode == 'sample':
+            return format_html_join(
+                mark_safe('<br>'), '{} — self {} / total {}',
+                ((row['function'], row['self_samples'], row['total_samples']) for row in rows),
+            )
+        return format_html_join(
+            mark_safe('<br>'), '{} — {} calls, self {} ms / total {} ms',
+            ((row['function'], row['calls'], row['self_ms'], row['total_ms']) for row in rows),
+        )
+    top_functions.short_description = 'Function များ'
+
+    def slowest_sql(self, obj):
+        rows = sorted(obj.data.get('sql', []), key=lambda row: row['duration_ms'], reverse=True)[:10]
+        return format_html_join(
+            mark_safe('<br>'), '<code>{} ms @{} ms [{}]</code> {}',
+            ((row['duration_ms'], row['start_ms'], row['alias'], row['sql'][:300]) for row in rows),
+        )
+    slowest_sql.short_description = 'အနှေးဆုံး SQL'
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
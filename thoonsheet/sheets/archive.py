@@ -0,0 +1,194 @@
+# sheets/archive.py
+"""
+Hot / cold partitioning — လချုပ်ပိတ်ပြီး ကြာပြီဖြစ်သော approved Transaction များကို ArchivedTransaction (cold) သို့ ရွှေ့ခြင်း
+
+- ရွှေ့ခြင်း: `manage.py archive_transactions` (shard / owner အားလုံး) / 'archive_transactions' job (job တင်သူ owner)
+  SHEETS_ARCHIVE_AFTER_DAYS ထက် ကြာပြီးသော ClosedPeriod များကို archived_at အရင် မှတ်ပြီးမှ
+  row SHEETS_ARCHIVE_BATCH_SIZE ခုစီ transaction တစ်ခုစီဖြင့် (INSERT ... SELECT + DELETE) ရွှေ့သည်။
+  Lock ကို batch တစ်ခုစာသာ ကိုင်ပြီး ရပ်သွားလျှင် ပြန် run ရုံဖြင့် ကျန်သည်များကို ဆက်ရွှေ့သည် (batch တစ်ခုချင်း atomic)။
+- ဖတ်ခြင်း: querysets() — Transaction (hot) နှင့် တောင်းသော start ရက်စွဲက archive လုပ်ပြီးသောလ အထိ
+  ရောက်မှသာ ArchivedTransaction ပါ။ Field အမည်များ တူသောကြောင့် caller က filter / aggregate ကို
+  queryset တစ်ခုချင်းအပေါ် run ပြီး ရလဒ်များကို ပေါင်းသည် (pivots, statements, reconciliation, forecasting, periods)။
+- List: merged_page() — GET /transactions/ (?search= ပါ) ၏ ရက်စွဲ lower bound မပါ / archive ထဲ ရောက်လျှင်
+  hot / archive နှစ်ခုစလုံးမှ page တစ်ခုစာစီ (ordering, id) keyset ဖြင့် ဖတ်ပြီး merge (cursor — encode_cursor())
+- Archive ထဲရှိ row များသည် ပိတ်ပြီးသောလ ဖြစ်သောကြောင့် ပြင်၍မရ။ ReceiptFingerprint / search index မှ ဖယ်သည်။
+"""
+
+import heapq
+from datetime import timedelta
+
+from django.conf import settings
+from django.core import signing
+from django.core.exceptions import ValidationError
+from django.db import connections, router, transaction as db_transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from . import periods, search
+from .models import ArchivedTransaction, ClosedPeriod, ReceiptFingerprint, Transaction
+
+# Transaction -> ArchivedTransaction (column အမည် တူ)
+COLUMNS = (
+    'id', 'submitted_by_id', 'transaction_date', 'group_id', 'payment_account_id', 'transfer_id_last_6_digits',
+    'amount', 'transaction_type', 'image', 'submitted_at', 'status', 'approved_by_owner_at', 'owner_notes', 'owner_id',
+)
+
+
+def archive_after_days():
+    return getattr(settings, 'SHEETS_ARCHIVE_AFTER_DAYS', 365)
+
+
+def batch_size():
+    return getattr(settings, 'SHEETS_ARCHIVE_BATCH_SIZE', 500)
+
+
+# ---- Read ----
+
+def archived_through(owner_id=None, using=None):
+    """Archive လုပ်ပြီး (သို့ လုပ်နေဆဲ) နောက်ဆုံးလ၏ နောက်ဆုံးနေ့ (owner_id မပေးလျှင် database ထဲရှိ owner အားလုံး)"""
+    qs = ClosedPeriod.objects.using(using or router.db_for_read(ClosedPeriod)).exclude(archived_at=None)
+    if owner_id is not None:
+        qs = qs.for_owner(owner_id)
+    period = qs.order_by('-period').values_list('period', flat=True).first()
+    return periods.month_end(period) if period is not None else None
+
+
+def reaches_archive(start=None, owner_id=None, using=None):
+    """start (မပေးလျှင် history အားလုံး) မှ စသော range သည် archive လုပ်ပြီးသောလ ထဲ ရောက်သလား"""
+    until = archived_through(owner_id, using=using)
+    return until is not None and (start is None or start <= until)
+
+
+def querysets(start=None, owner_id=None, using=None):
+    """[Transaction queryset] သို့ [Transaction, ArchivedTransaction] — owner_id ပေးလျှင် owner အလိုက် scope"""
+    sources = [Transaction.objects.using(using)]
+    if reaches_archive(start, owner_id, using=using):
+        sources.append(ArchivedTransaction.objects.using(using))
+    if owner_id is not None:
+        sources = [qs.for_owner(owner_id) for qs in sources]
+    return sources
+
+
+def querysets_for_user(user, start=None, using=None):
+    """querysets() ၏ request.user (for_user) scope"""
+    owner_id = None if user.is_superuser else getattr(user, 'tenant_id', None)
+    sources = [Transaction.objects.using(using)]
+    if reaches_archive(start, owner_id, using=using):
+        sources.append(ArchivedTransaction.objects.using(using))
+    return [qs.for_user(user) for qs in sources]
+
+
+# ---- Hot + archive list ----
+
+# archive ထဲတွင်လည်း ရှိသော ordering column များ (risk_score မရှိ — archive သည် approved များသာ)
+LIST_ORDERING = ('submitted_at', 'transaction_date', 'amount')
+CURSOR_SALT = 'sheets.archive.list'
+
+
+def list_ordering(ordering):
+    """OrderingFilter ၏ ordering (ပထမ field) -> (field, descending); archive နှင့် merge မရလျှင် None"""
+    field = ordering[0] if ordering else '-submitted_at'
+    descending = field.startswith('-')
+    field = field.lstrip('-')
+    return (field, descending) if field in LIST_ORDERING else None
+
+
+def encode_cursor(obj, field, descending):
+    """merged_page() ၏ object (list_key ပါ) -> ထို row နောက်မှ စသော cursor"""
+    return signing.dumps({'f': field, 'd': descending, 'v': str(obj.list_key), 'i': obj.pk}, salt=CURSOR_SALT)
+
+
+def decode_cursor(value, field, descending):
+    """-> (field တန်ဖိုး, id); မမှန် / ordering မတူလျှင် None"""
+    try:
+        data = signing.loads(value, salt=CURSOR_SALT)
+        if data['f'] != field or data['d'] != descending:
+            return None
+        return Transaction._meta.get_field(field).to_python(data['v']), int(data['i'])
+    except (signing.BadSignature, KeyError, TypeError, ValueError, ValidationError):
+        return None
+
+
+def merged_page(sources, field, descending, size, cursor=None, offset=0):
+    """
+    Queryset တစ်ခုစီမှ (field, id) အစဉ် offset + size + 1 row စီ -> merge -> (objects, နောက် page ရှိ/မရှိ)
+    cursor (decode_cursor()) ပေးလျှင် ထို row နောက်မှ (offset 0)
+    """
+    lookup = 'lt' if descending else 'gt'
+    order = [f'-{field}', '-id'] if descending else [field, 'id']
+    pages = []
+    for qs in sources:
+        if cursor is not None:
+            value, pk = cursor
+            qs = qs.filter(Q(**{f'{field}__{lookup}': value}) | Q(**{field: value, f'id__{lookup}': pk}))
+        # ?fields= (.only()) ဖြင့် ordering column ကို defer ထားလည်း row တစ်ခုချင်း ပြန်မဖတ်စေရန် annotate
+        pages.append(list(qs.annotate(list_key=F(field)).order_by(*order)[:offset + size + 1]))
+    merged = list(heapq.merge(*pages, key=lambda obj: (obj.list_key, obj.pk), reverse=descending))
+    return merged[offset:offset + size], len(merged) > offset + size
+
+
+# ---- Move ----
+
+def _move(ids, using):
+    """Transaction id များကို archive သို့ — caller ၏ atomic block အတွင်း ခေါ်ရမည်"""
+    connection = connections[using]
+    quote = connection.ops.quote_name
+    columns = ', '.join(quote(c) for c in COLUMNS)
+    marks = ', '.join(['%s'] * len(ids))
+    with connection.cursor() as cursor:
+        # ယခင် run က ရေးပြီးသား row ရှိနေလည်း ကျော်
+        cursor.execute(
+            f"INSERT INTO {quote(ArchivedTransaction._meta.db_table)} ({columns}, {quote('archived_at')}) "
+            f"SELECT {columns}, %s FROM {quote(Transaction._meta.db_table)} WHERE {quote('id')} IN ({marks}) "
+            f"ON CONFLICT DO NOTHING",
+            [timezone.now(), *ids],
+        )
+        ReceiptFingerprint.objects.using(using).filter(transaction_id__in=ids).delete()
+        # Transaction signals (image ref count, forecast, search) မလိုသောကြောင့် SQL ဖြင့် တိုက်ရိုက်ဖျက်
+        # — ပုံကို archive row က ဆက်ရည်ညွှန်းနေ၍ blob ref count မပြောင်း
+        cursor.execute(f"DELETE FROM {quote(Transaction._meta.db_table)} WHERE {quote('id')} IN ({marks})", ids)
+    search.remove_ids('transaction', ids, using=using)
+
+
+def archive_owner(owner_id, today=None, using=None, size=None):
+    """
+    Owner တစ်ဦး၏ archive လုပ်နိုင်သောလ (SHEETS_ARCHIVE_AFTER_DAYS ထက် ကြာပြီး ပိတ်ပြီးသောလ) များ
+    -> ရွှေ့ခဲ့သော row အရေအတွက်
+    """
+    today = today or timezone.localdate()
+    using = using or router.db_for_write(Transaction)
+    size = size or batch_size()
+    cutoff = periods.month_start(today - timedelta(days=archive_after_days()))
+    eligible = ClosedPeriod.objects.using(using).for_owner(owner_id).filter(period__lt=cutoff)
+    last = eligible.order_by('-period').values_list('period', flat=True).first()
+    if last is None:
+        return 0
+    # Reader များ archive ကို ပေါင်းဖတ်စေရန် row မရွှေ့မီ မှတ် (ရွှေ့နေစဉ် hot / archive နှစ်ဘက်တွင် ကွဲနေနိုင်)
+    eligible.filter(archived_at=None).update(archived_at=timezone.now())
+
+    pending = (Transaction.objects.using(using).for_owner(owner_id)
+               .filter(status='approved', transaction_date__lte=periods.month_end(last))
+               .order_by('id').values_list('id', flat=True))
+    moved, after = 0, 0
+    while True:
+        with db_transaction.atomic(using=using):
+            ids = list(pending.filter(id__gt=after)[:size])
+            if not ids:
+                return moved
+            _move(ids, using)
+        moved += len(ids)
+        after = ids[-1]
+
+
+def archive_all(today=None, using=None, size=None):
+    """Database (shard) တစ်ခုရှိ owner အားလုံး -> {'owners': n, 'moved': n}"""
+    today = today or timezone.localdate()
+    using = using or router.db_for_write(Transaction)
+    cutoff = periods.month_start(today - timedelta(days=archive_after_days()))
+    owners = (ClosedPeriod.objects.using(using).filter(period__lt=cutoff)
+              .order_by().values_list('owner_id', flat=True).distinct())
+    result = {'owners': 0, 'moved': 0}
+    for owner_id in list(owners):
+        result['owners'] += 1
+        result['moved'] += archive_owner(owner_id, today=today, using=using, size=size)
+    return result
@@ -0,0 +1,137 @@
+# sheets/audit_summaries.py
+"""
+AuditEntry စုစုပေါင်း (group + ကာလ အလိုက်) — GET /api/sheets/audit-entries/summary/
+
+- ?period=day|week|month|year (daily/weekly/monthly/yearly လည်း ရ) ?start= ?end= (YYYY-MM-DD) ?group=1,2
+- ရရန် (receivable) / ပေးရန် (payable) / net ကို (ကာလ, group) အလိုက် GROUP BY query တစ်ခုတည်းဖြင့် DB ထဲတွင် ပေါင်းပြီး
+  ကာလ တစ်ခုချင်း၏ စုစုပေါင်းကို ထို row များမှ တွက်သည် (entry များကို page အလိုက် မဖတ်ရတော့)
+- latest — group တစ်ခုလျှင် window အတွင်း နောက်ဆုံး entry (ROW_NUMBER() OVER (PARTITION BY group ...),
+  reconciliation.latest_entries) — (group, created_at) index ဖြင့်
+"""
+
+from decimal import Decimal
+
+from django.db.models import Count, DecimalField, Sum
+from django.db.models.functions import Coalesce, Trunc
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+
+from .reconciliation import _day_bounds, latest_entries
+
+MONEY = DecimalField(max_digits=18, decimal_places=2)
+ZERO = Decimal('0.00')
+
+# ?period= -> Trunc kind
+PERIODS = {
+    'day': 'day', 'daily': 'day',
+    'week': 'week', 'weekly': 'week',
+    'month': 'month', 'monthly': 'month',
+    'year': 'year', 'yearly': 'year',
+}
+
+
+class SummaryError(Exception):
+    def __init__(self, detail):
+        super().__init__(detail)
+        self.detail = detail
+
+
+def parse_params(params):
+    """period / start / end / group -> kwargs (summarize()); မမှန်လျှင် SummaryError"""
+    kwargs = {}
+    period = str(params.get('period') or 'day').lower()
+    if period not in PERIODS:
+        raise SummaryError("period သည် day, week, month, year ထဲမှ တစ်ခု ဖြစ်ရမည်။")
+    kwargs['period'] = PERIODS[period]
+    for name in ('start', 'end'):
+        if params.get(name):
+            day = parse_date(params[name])
+            if day is None:
+                raise SummaryError(f"{name} သည် YYYY-MM-DD ဖြစ်ရမည်။")
+            kwargs[name] = day
+    if kwargs.get('start') and kwargs.get('end') and kwargs['start'] > kwargs['end']:
+        raise SummaryError("start သည် end ထက် နောက်ကျ၍ မရပါ။")
+    if params.get('group'):
+        try:
+            kwargs['group_ids'] = [int(part) for part in params['group'].split(',') if part.strip()]
+        except ValueError:
+            raise SummaryError("group သည် id များ (ဥပမာ 1,2) ဖြစ်ရမည်။")
+    return kwargs
+
+
+def _money(value):
+    return Decimal(value).quantize(Decimal('0.01'))
+
+
+def summarize(entries, period='day', start=None, end=None, group_ids=None):
+    """
+    entries — user အလိုက် scope လုပ်ပြီးသော AuditEntry queryset
+    -> report dict — results ကို ကာလ အသစ်ဆုံးမှ စီ၊ ကာလ တစ်ခုချင်းတွင် group အလိုက် row များ
+    """
+    end = end or timezone.localdate()
+    if group_ids is not None:
+        entries = entries.filter(group_id__in=group_ids)
+    lower, upper = _day_bounds(start, end)
+    window = entries.filter(created_at__lt=upper)
+    if lower:
+        window = window.filter(created_at__gte=lower)
+
+    rows = (window.order_by()
+            .annotate(period_start=Trunc('created_at', period, tzinfo=timezone.get_current_timezone()))
+            .values('period_start', 'group_id', 'group__name')
+            .annotate(
+                total_count=Count('id'),
+                total_receive=Coalesce(Sum('receivable_amount'), ZERO, output_field=MONEY),
+                total_pay=Coalesce(Sum('payable_amount'), ZERO, output_field=MONEY),
+            )
+            .order_by('-period_start', 'group_id'))
+
+    results = []
+    names = {}
+    for row in rows:
+        names[row['group_id']] = row['group__name']
+        start_date = timezone.localtime(row['period_start']).date()
+        if not results or results[-1]['period_start'] != start_date:
+            results.append({'period_start': start_date, 'total_count': 0,
+                            'total_receive': ZERO, 'total_pay': ZERO, 'groups': []})
+        bucket = results[-1]
+        bucket['total_count'] += row['total_count']
+        bucket['total_receive'] += row['total_receive']
+        bucket['total_pay'] += row['total_pay']
+        bucket['groups'].append({
+            'group': row['group_id'],
+            'group_name': row['group__name'],
+            'total_count': row['total_count'],
+            'total_receive': _money(row['total_receive']),
+            'total_pay': _money(row['total_pay']),
+            'net': _money(row['total_receive'] - row['total_pay']),
+        })
+    for bucket in results:
+        bucket['total_receive'] = _money(bucket['total_receive'])
+        bucket['total_pay'] = _money(bucket['total_pay'])
+        bucket['net'] = _money(bucket['total_receive'] - bucket['total_pay'])
+        # Flutter audit_entries_summary_widget ၏ 'Total'
+        bucket['total_amount'] = bucket['net']
+
+    latest = [
+        {
+            'group': group_id,
+            'group_name': names.get(group_id),
+            'audit_entry': entry['id'],
+            'auditor': entry['auditor_id'],
+            'auditor_username': entry['auditor__username'],
+            'receivable_amount': _money(entry['receivable_amount']),
+            'payable_amount': _money(entry['payable_amount']),
+            'net': _money(entry['receivable_amount'] - entry['payable_amount']),
+            'created_at': entry['created_at'],
+        }
+        for group_id, entry in sorted(latest_entries(entries, start, end).items())
+    ]
+
+    return {
+        'period': period,
+        'start': start,
+        'end': end,
+        'results': results,
+        'latest': latest,
+    }
@@ -0,0 +1,313 @@
+# sheets/events.py
+"""
+Transaction event များကို owner အလိုက် real-time push (Server-Sent Events, /api/sheets/events/)
+
+    created      auditor က transaction အသစ်တင်
+    resubmitted  rejected ကို auditor က ပြန်တင် (pending)
+    approved / rejected   owner ဆုံးဖြတ်
+    duplicate    receipt ပုံ hash (sheets.fingerprints) တွက်ပြီး ပုံတူ transaction များ တွေ့ (+ duplicates: [id, ...])
+
+Event တစ်ခုသည် {id, type, transaction, status, group, amount, submitted_by, at} သာ ပါသော compact JSON ဖြစ်ပြီး
+client က ပြောင်းသွားသော transaction ကိုသာ `/transactions/{id}/` ဖြင့် ပြန်ယူရန် ဖြစ်သည် (list ကို poll မလုပ်တော့)။
+
+Broker ကို settings.SHEETS_EVENT_BACKEND ဖြင့် ပြောင်းနိုင်သည် —
+
+    InProcessBroker  (default) process တစ်ခုအတွင်းသာ — runserver / ASGI process တစ်ခုတည်း
+    CacheBroker      Django cache (settings.SHEETS_EVENT_CACHE) ကို shared store အဖြစ်သုံး — gunicorn (WSGI) worker,
+                     job worker (run_jobs) စသည် process အများအပြားမှ publish ပြီး ASGI process မှ stream
+
+အခြား shared pub/sub (Redis စသည်) သုံးလိုလျှင် ထို interface ကို implement လုပ်ပါ:
+
+    class MyBroker:
+        def publish(self, owner_id, event): ...          # any thread မှ ခေါ်နိုင်ရမည်
+        def subscribe(self, owner_id, last_event_id=None) -> Subscription   # async iterator, .close()
+"""
+
+import asyncio
+import itertools
+import json
+from collections import defaultdict, deque
+from threading import Lock
+
+from django.conf import settings
+from django.core import signing
+from django.core.cache import caches
+from django.db import transaction as db_transaction
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+EVENT_TYPES = ('created', 'resubmitted', 'approved', 'rejected', 'duplicate')
+
+_broker = None
+_broker_lock = Lock()
+
+
+class Subscription:
+    """Subscriber တစ်ဦး၏ queue — event loop ထဲတွင် async for ဖြင့် ဖတ်"""
+
+    # client နှေးလွန်း၍ queue ပြည့်လျှင် event များ ဆက်မထည့်ဘဲ 'resync' တစ်ခုသာ ပို့ (client က list ပြန်ယူ)
+    max_pending = 256
+
+    def __init__(self, broker, owner_id):
+        self.broker = broker
+        self.owner_id = owner_id
+        self.loop = asyncio.get_running_loop()
+        self.queue = asyncio.Queue(maxsize=self.max_pending)
+        self.overflowed = False
+
+    def push(self, event):
+        # publisher thread မှ ခေါ်
+        self.loop.call_soon_threadsafe(self._put, event)
+
+    def _put(self, event):
+        if self.overflowed:
+            return
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self.overflowed = True
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        if self.overflowed and self.queue.empty():
+            self.overflowed = False
+            return {'type': 'resync'}
+        return await self.queue.get()
+
+    async def get(self, timeout):
+        try:
+            return await asyncio.wait_for(self.__anext__(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    def close(self):
+        self.broker.unsubscribe(self)
+
+
+class InProcessBroker:
+    """Process အတွင်း owner_id -> subscriber များ fan-out; reconnect အတွက် owner တစ်ဦးလျှင် event နောက်ဆုံး N ခု သိမ်း"""
+
+    history_size = 100
+
+    def __init__(self):
+        self._lock = Lock()
+        self._subscribers = defaultdict(set)
+        self._history = defaultdict(lambda: deque(maxlen=self.history_size))
+        self._ids = itertools.count(1)
+
+    def publish(self, owner_id, event):
+        with self._lock:
+            event = {'id': next(self._ids), **event}
+            self._history[owner_id].append(event)
+            subscribers = list(self._subscribers.get(owner_id, ()))
+        for sub in subscribers:
+            sub.push(event)
+        return event
+
+    def subscribe(self, owner_id, last_event_id=None):
+        sub = Subscription(self, owner_id)
+        with self._lock:
+            self._subscribers[owner_id].add(sub)
+            if last_event_id is not None:
+                history = self._history.get(owner_id, ())
+                missed = [e for e in history if e['id'] > last_event_id]
+                if history and history[0]['id'] > last_event_id + 1:
+                    # history ထက်ဟောင်းသော id — ကြားက event များ ပျောက်နိုင်
+                    missed = [{'type': 'resync'}]
+                for event in missed:
+                    sub._put(event)
+        return sub
+
+    def unsubscribe(self, sub):
+        with self._lock:
+            subscribers = self._subscribers.get(sub.owner_id)
+            if subscribers is not None:
+                subscribers.discard(sub)
+                if not subscribers:
+                    del self._subscribers[sub.owner_id]
+
+    def subscriber_count(self):
+        with self._lock:
+            return sum(len(subs) for subs in self._subscribers.values())
+
+
+class CacheSubscription:
+    """CacheBroker ၏ subscriber — owner ၏ sequence ကို poll ပြီး cursor နောက်က event များကို ဖတ်"""
+
+    def __init__(self, broker, owner_id, last_event_id=None):
+        self.broker = broker
+        self.owner_id = owner_id
+        self.cursor = last_event_id  # None — ပထမ poll တွင် လက်ရှိ sequence မှ စ
+        self.pending = deque()
+        self.missing = None
+
+    async def _poll(self):
+        broker = self.broker
+        latest = await broker.cache.aget(broker.sequence_key(self.owner_id), 0)
+        if self.cursor is None:
+            self.cursor = latest
+            return
+        if latest < self.cursor or latest - self.cursor > broker.history_size:
+            # cache ရှင်းသွား / history ထက် နောက်ကျ — ကြားက event များ ပျောက်နိုင်
+            self.cursor, self.missing = latest, None
+            self.pending.append({'type': 'resync'})
+            return
+        ids = range(self.cursor + 1, latest + 1)
+        found = await broker.cache.aget_many([broker.event_key(self.owner_id, i) for i in ids])
+        for event_id in ids:
+            event = found.get(broker.event_key(self.owner_id, event_id))
+            if event is None:
+                if self.missing == event_id:
+                    # poll နှစ်ကြိမ်ကြာသည်အထိ မရောက် (expire / evict) — resync
+                    self.cursor, self.missing = latest, None
+                    self.pending.append({'type': 'resync'})
+                else:
+                    # id ယူပြီး မသိမ်းရသေးသော publisher ရှိနိုင် — နောက် poll တွင် ပြန်စစ်
+                    self.missing = event_id
+                return
+            self.cursor, self.missing = event_id, None
+            self.pending.append(event)
+
+    async def get(self, timeout):
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        while True:
+            if not self.pending:
+                await self._poll()
+            if self.pending:
+                return self.pending.popleft()
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                return None
+            await asyncio.sleep(min(self.broker.poll_seconds, remaining))
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        while True:
+            event = await self.get(timeout=self.broker.poll_seconds)
+            if event is not None:
+                return event
+
+    def close(self):
+        pass
+
+
+class CacheBroker:
+    """
+    Process အများအပြားအကြား — owner တစ်ဦးလျှင် sequence (seq) တစ်ခုနှင့် event တစ်ခုချင်းကို cache key ဖြင့် သိမ်း
+    Subscriber များက SHEETS_EVENT_POLL_SECONDS တိုင်း poll (push မဟုတ်)။ Cache backend သည် process အားလုံး
+    မျှဝေသော backend (DatabaseCache / Redis / Memcached) ဖြစ်ရမည် — LocMemCache သည် process တစ်ခုအတွင်းသာ။
+    """
+
+    history_size = 100
+
+    def __init__(self):
+        self.cache = caches[getattr(settings, 'SHEETS_EVENT_CACHE', 'default')]
+        self.poll_seconds = float(getattr(settings, 'SHEETS_EVENT_POLL_SECONDS', 1))
+        self.ttl = int(getattr(settings, 'SHEETS_EVENT_TTL_SECONDS', 600))
+
+    def sequence_key(self, owner_id):
+        return f'sheets:events:{owner_id}:seq'
+
+    def event_key(self, owner_id, event_id):
+        return f'sheets:events:{owner_id}:{event_id}'
+
+    def _next_id(self, owner_id):
+        key = self.sequence_key(owner_id)
+        self.cache.add(key, 0, timeout=None)
+        try:
+            return self.cache.incr(key)
+        except ValueError:
+            # add နှင့် incr ကြား evict ဖြစ်သွား
+            self.cache.add(key, 0, timeout=None)
+            return self.cache.incr(key)
+
+    def publish(self, owner_id, event):
+        # atomic incr မရှိသော backend (DatabaseCache) တွင် id တူနိုင်သောကြောင့် add (ရှိပြီးလျှင် False) ဖြင့် နေရာယူ
+        while True:
+            stored = {'id': self._next_id(owner_id), **event}
+            if self.cache.add(self.event_key(owner_id, stored['id']), stored, timeout=self.ttl):
+                return stored
+
+    def subscribe(self, owner_id, last_event_id=None):
+        return CacheSubscription(self, owner_id, last_event_id)
+
+
+def get_broker():
+    global _broker
+    with _broker_lock:
+        if _broker is None:
+            _broker = import_string(getattr(settings, 'SHEETS_EVENT_BACKEND', 'sheets.events.InProcessBroker'))()
+        return _broker
+
+
+# EventSource (browser) သည် header မထည့်နိုင်သောကြောင့် URL တွင် token အစား သက်တမ်းတို signed ticket ကို ထည့်
+TICKET_SALT = 'sheets.events.ticket'
+
+
+def ticket_max_age():
+    return int(getattr(settings, 'SHEETS_EVENT_TICKET_SECONDS', 60))
+
+
+def make_ticket(user):
+    return signing.dumps(user.pk, salt=TICKET_SALT)
+
+
+def read_ticket(ticket):
+    """ticket မှ user pk — သက်တမ်းကုန် / ပြင်ထားလျှင် None"""
+    try:
+        return signing.loads(ticket, salt=TICKET_SALT, max_age=ticket_max_age())
+    except signing.BadSignature:
+        return None
+
+
+def transaction_event(event_type, tx):
+    return {
+        'type': event_type,
+        'transaction': tx.pk,
+        'status': tx.status,
+        'group': tx.group_id,
+        'amount': str(tx.amount),
+        'submitted_by': tx.submitted_by_id,
+        'at': timezone.now().isoformat(),
+    }
+
+
+def publish_on_commit(event_type, tx, using=None):
+    """DB commit ပြီးမှ publish (rollback ဖြစ်သွားသော ပြောင်းလဲမှုကို မပို့မိစေရန်)"""
+    if tx.owner_id is None:
+        return
+    owner_id, event = tx.owner_id, transaction_event(event_type, tx)
+    db_transaction.on_commit(lambda: get_broker().publish(owner_id, event), using=using)
+
+
+def publish_duplicates(tx, duplicate_ids):
+    """Fingerprint background thread မှ — commit ပြီးသား row ဖြစ်၍ ချက်ချင်း publish"""
+    if tx.owner_id is None or not duplicate_ids:
+        return
+    get_broker().publish(tx.owner_id, dict(transaction_event('duplicate', tx), duplicates=list(duplicate_ids)))
+
+
+def format_sse(event):
+    lines = []
+    if 'id' in event:
+        lines.append(f"id: {event['id']}")
+    lines.append(f"event: {event['type']}")
+    lines.append(f"data: {json.dumps(event, separators=(',', ':'))}")
+    return '\n'.join(lines) + '\n\n'
+
+
+def event_type_for(old_status, new_status, created):
+    if created:
+        return 'created'
+    if old_status == new_status:
+        return None
+    if new_status == 'pending' and old_status == 'rejected':
+        return 'resubmitted'
+    if new_status in ('approved', 'rejected'):
+        return new_status
+    return None
@@ -0,0 +1,120 @@
+# sheets/fieldsets.py
+"""
+Sparse fieldsets — GET /api/sheets/transactions/?fields=id,amount,status  သို့မဟုတ်  ?omit=image,owner_notes
+
+- SparseFieldsetsMixin (serializer) — response ထဲမှ မတောင်းသော field များကို ဖယ်
+- SparseFieldsetsViewMixin (viewset) — ကျန်သော field များ လိုအပ်သည့် column များကိုသာ `.only()` ဖြင့် SELECT လုပ်ပြီး
+  group.name ကဲ့သို့ relation field တောင်းမှသာ join (`select_related`) လုပ်သည်။
+  Parameter မပါလျှင်လည်း serializer field များမှ join များကို တွက်ပေးသောကြောင့် list တွင် N+1 query မဖြစ်ပါ။
+
+Write (POST/PUT/PATCH) request များတွင် field များကို မဖယ်ပါ (validation မပျက်စေရန်)။
+"""
+
+from django.core.exceptions import FieldDoesNotExist
+from rest_framework.permissions import SAFE_METHODS
+
+
+def _param(request, name):
+    raw = request.query_params.get(name) if request is not None else None
+    if not raw:
+        return None
+    return {part.strip() for part in raw.split(',') if part.strip()}
+
+
+class SparseFieldsetsMixin:
+    """
+    ModelSerializer mixin
+    sparse_sources — SerializerMethodField ကဲ့သို့ source မှ မသိနိုင်သော field များ လိုအပ်သည့် model path များ
+    """
+    sparse_sources = {}
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        request = self.context.get('request')
+        if request is None or request.method not in SAFE_METHODS:
+            return
+        keep = self.sparse_field_names(request, self.fields)
+        if keep is not None:
+            for name in list(self.fields):
+                if name not in keep:
+                    self.fields.pop(name)
+
+    @staticmethod
+    def sparse_field_names(request, fields):
+        only, omit = _param(request, 'fields'), _param(request, 'omit')
+        if only is None and omit is None:
+            return None
+        names = [name for name in fields if only is None or name in only]
+        return {name for name in names if name not in (omit or ())}
+
+    @classmethod
+    def sparse_queryset(cls, queryset, request):
+        """Response ထဲ ပါမည့် field များအတွက် လိုသော column / join များသာ"""
+        fields = {name: field for name, field in cls().fields.items() if not field.write_only}
+        names = cls.sparse_field_names(request, fields) if request.method in SAFE_METHODS else None
+        prune = names is not None
+
+        columns, joins = {queryset.model._meta.pk.name}, set()
+        for name in (names if prune else fields):
+            for path in cls.sparse_sources.get(name) or [fields[name].source]:
+                resolved = _resolve(queryset.model, path)
+                if resolved is None:
+                    # property / method — မည်သည့် column လိုမည်မသိ၍ column မဖြတ်
+                    prune = False
+                    continue
+                column, relations, fk_columns = resolved
+                columns.add(column)
+                joins.update(relations)
+                # select_related လုပ်မည့် relation ၏ FK column ကိုလည်း SELECT ရမည်
+                columns.update(fk_columns)
+
+        queryset = queryset.select_related(None)
+        if joins:
+            queryset = queryset.select_related(*sorted(joins))
+        if prune:
+            queryset = queryset.only(*sorted(columns))
+        return queryset
+
+
+def _resolve(model, source):
+    """
+    Serializer source ('group.name', 'get_status_display', 'amount')
+    -> (only() path, select_related path များ, join အတွက် လိုသော FK column များ); model field မဟုတ်လျှင် None
+    """
+    if source == '*':
+        return None
+    parts = source.split('.')
+    if parts[-1].startswith('get_') and parts[-1].endswith('_display'):
+        parts[-1] = parts[-1][len('get_'):-len('_display')]
+
+    relations, fk_columns, current = [], [], model
+    for index, part in enumerate(parts):
+        try:
+            field = current._meta.get_field(part)
+        except FieldDoesNotExist:
+            return None
+        path = '__'.join(parts[:index + 1])
+        if field.is_relation and (field.many_to_many or field.one_to_many):
+            return None
+        if index == len(parts) - 1:
+            if field.is_relation and not field.concrete:
+                return None
+            break
+        if not field.is_relation:
+            return None
+        relations.append(path)
+        if field.concrete:
+            fk_columns.append(path)  # reverse one-to-one မှာ column မရှိ
+        current = field.related_model
+    return '__'.join(parts), relations, fk_columns
+
+
+class SparseFieldsetsViewMixin:
+    """GenericAPIView mixin — get_queryset() ကို serializer ၏ sparse_queryset() ဖြင့် ချုံ့"""
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        serializer_class = self.get_serializer_class()
+        if hasattr(serializer_class, 'sparse_queryset'):
+            queryset = serializer_class.sparse_queryset(queryset, self.request)
+        return queryset
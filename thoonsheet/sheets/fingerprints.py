@@ -0,0 +1,185 @@
+# sheets/fingerprints.py
+"""
+Receipt ပုံများအတွက် perceptual hash (dHash, 64-bit) နှင့် duplicate ရှာဖွေမှု
+
+Crop လုပ်ထားသော / ပြန် screenshot ရိုက်ထားသော receipt တူများကို Hamming distance ဖြင့် ရှာသည်။
+Multi-index hashing: hash ကို 16-bit band ၄ ခု ခွဲပြီး band တစ်ခုစီကို index လုပ်ထားသည်။
+distance <= d ဖြစ်လျှင် band တစ်ခုခုမှာ bit အပြောင်းအလဲ d // 4 ခုထက် မပိုနိုင် (pigeonhole) —
+ထို့ကြောင့် band value + bit flip အနည်းငယ်ကိုသာ IN (...) ဖြင့် index lookup လုပ်ပြီး
+ထွက်လာသော candidate အနည်းငယ်ကိုသာ Python မှာ အတိအကျ စစ်သည်။ Table အရွယ်အစား မည်မျှကြီးကြီး
+scan မလုပ်ရပါ။
+"""
+
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from itertools import combinations
+from threading import Lock
+
+from django.conf import settings
+from django.db import close_old_connections, transaction as db_transaction
+
+from .sharding import use_alias
+
+logger = logging.getLogger('sheets.fingerprints')
+
+HASH_BITS = 64
+BANDS = 4
+BAND_BITS = HASH_BITS // BANDS
+BAND_MASK = (1 << BAND_BITS) - 1
+
+_executor = None
+_executor_lock = Lock()
+
+
+def max_distance():
+    return getattr(settings, 'RECEIPT_DUPLICATE_MAX_DISTANCE', 6)
+
+
+def dhash(fileobj, hash_size=8):
+    """Difference hash: (hash_size+1) x hash_size grayscale အတွင်း ဘေးချင်း pixel နှိုင်းယှဉ်"""
+    # Pillow ကို ပထမဆုံး fingerprint တွက်မှ load (worker boot တွင် မပါစေရန် — manage.py startup_report)
+    from PIL import Image
+
+    with Image.open(fileobj) as img:
+        # JPEG ဆိုရင် decoder ကို scale-down ခိုင်းလို့ရ (full-res decode မလိုတော့)
+        img.draft('L', (hash_size * 8, hash_size * 8))
+        small = img.convert('L').resize((hash_size + 1, hash_size), Image.Resampling.LANCZOS)
+        pixels = small.tobytes()
+    value = 0
+    row_len = hash_size + 1
+    for row in range(hash_size):
+        offset = row * row_len
+        for col in range(hash_size):
+            value = (value << 1) | (pixels[offset + col] > pixels[offset + col + 1])
+    return value
+
+
+def to_signed(value):
+    # BigIntegerField (signed 64-bit) ထဲ ထည့်နိုင်ရန်
+    return value - (1 << HASH_BITS) if value >= (1 << (HASH_BITS - 1)) else value
+
+
+def to_unsigned(value):
+    return value + (1 << HASH_BITS) if value < 0 else value
+
+
+def split_bands(value):
+    return [(value >> (BAND_BITS * i)) & BAND_MASK for i in range(BANDS)]
+
+
+def hamming(a, b):
+    return (to_unsigned(a) ^ to_unsigned(b)).bit_count()
+
+
+def band_probes(band_value, radius):
+    """band_value နှင့် bit `radius` ခုအထိ ကွာသော value အားလုံး"""
+    probes = {band_value}
+    for r in range(1, radius + 1):
+        for bits in combinations(range(BAND_BITS), r):
+            flipped = band_value
+            for bit in bits:
+                flipped ^= 1 << bit
+            probes.add(flipped)
+    return probes
+
+
+def find_similar(value, distance=None, exclude_transaction_id=None, queryset=None):
+    """
+    value (unsigned dHash) နှင့် Hamming distance <= distance ရှိသော fingerprint များ
+    return: [(ReceiptFingerprint, distance), ...] (distance အနည်းဆုံးမှ စီ)
+    """
+    from django.db.models import Q
+    from .models import ReceiptFingerprint
+
+    value = to_unsigned(value)
+    distance = max_distance() if distance is None else distance
+    radius = distance // BANDS
+    condition = Q()
+    for i, band_value in enumerate(split_bands(value)):
+        condition |= Q(**{f'band_{i}__in': band_probes(band_value, radius)})
+
+    qs = queryset if queryset is not None else ReceiptFingerprint.objects.all()
+    qs = qs.filter(condition)
+    if exclude_transaction_id is not None:
+        qs = qs.exclude(transaction_id=exclude_transaction_id)
+
+    matches = []
+    for fp in qs.only('id', 'transaction_id', 'dhash'):
+        d = hamming(value, fp.dhash)
+        if d <= distance:
+            matches.append((fp, d))
+    matches.sort(key=lambda pair: (pair[1], pair[0].transaction_id))
+    return matches
+
+
+def compute_fingerprint(transaction_id):
+    """Transaction ၏ ပုံအတွက် fingerprint ကို တွက်/update လုပ်ပြီး duplicate များကို မှတ်သည်"""
+    from .models import ReceiptFingerprint, Transaction
+
+    from .events import publish_duplicates
+
+    tx = (Transaction.objects.filter(pk=transaction_id)
+          .only('id', 'image', 'owner', 'status', 'group', 'amount', 'submitted_by').first())
+    if tx is None:
+        return None
+    if not tx.image:
+        ReceiptFingerprint.objects.filter(transaction_id=transaction_id).delete()
+        return None
+
+    with tx.image.open('rb') as fh:
+        value = dhash(fh)
+    # owner (tenant) တစ်ဦးအတွင်းမှာသာ duplicate စစ်
+    duplicates = find_similar(
+        value, exclude_transaction_id=tx.pk,
+        queryset=ReceiptFingerprint.objects.filter(transaction__owner_id=tx.owner_id),
+    )
+    fp, _ = ReceiptFingerprint.objects.update_or_create(
+        transaction_id=tx.pk,
+        defaults={
+            'image_name': tx.image.name,
+            'dhash': to_signed(value),
+            'duplicate_ids': [match.transaction_id for match, _ in duplicates],
+            **{f'band_{i}': band for i, band in enumerate(split_bands(value))},
+        },
+    )
+    # submit response က မစောင့်သောကြောင့် owner ၏ review screen ကို SSE ဖြင့် အသိပေး
+    publish_duplicates(tx, fp.duplicate_ids)
+    return fp
+
+
+def _run(transaction_id, using=None):
+    close_old_connections()
+    try:
+        # background thread ထဲသို့ request ၏ shard (sheets.sharding) ကို သယ်လာ
+        with use_alias(using):
+            return compute_fingerprint(transaction_id)
+    except Exception:
+        logger.exception('Receipt fingerprint failed for transaction %s', transaction_id)
+        raise
+    finally:
+        close_old_connections()
+
+
+def get_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=getattr(settings, 'RECEIPT_FINGERPRINT_WORKERS', 2),
+                thread_name_prefix='receipt-fingerprint',
+            )
+        return _executor
+
+
+def schedule_fingerprint(transaction_id, using=None):
+    """
+    DB commit ဖြစ်ပြီးမှ background pool ထဲ ပို့သည်။
+    commit ပြီးသားဆိုရင် (autocommit) Future ကို ပြန်ပေးသည်၊ မဟုတ်လျှင် None
+    """
+    futures = []
+
+    def submit():
+        futures.append(get_executor().submit(_run, transaction_id, using))
+
+    db_transaction.on_commit(submit, using=using)
+    return futures[0] if futures else None
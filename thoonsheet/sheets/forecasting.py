@@ -0,0 +1,179 @@
+# sheets/forecasting.py
+"""
+Group အလိုက် နောက်လ ဝင်ငွေ / ထွက်ငွေ ခန့်မှန်းချက် — GET /api/sheets/groups/forecast/
+
+- Approved မှတ်တမ်းများ၏ နေ့စဉ်စုစုပေါင်း (group, transaction_type, transaction_date) ကို GROUP BY query
+  တစ်ခုတည်းဖြင့် ဖတ်ပြီး (row များကို မဖတ်) group အားလုံးကို (series × day) matrix တစ်ခုအဖြစ် စီသည်။
+- Model — additive exponential smoothing (level + ရက်သတ္တပတ် seasonality, Holt-Winters, trend မပါ)
+  နေ့တစ်နေ့ချင်း update ကို series အားလုံးအပေါ် vector ဖြင့် တစ်ပြိုင်နက် run ပြီး ALPHAS grid ထဲမှ
+  one-step error အနည်းဆုံး alpha ကို series တစ်ခုချင်းအတွက် ရွေးသည်။
+- Cache — group တစ်ခုချင်း၏ version (approved မှတ်တမ်း ဝင်/ပြောင်း/ဖျက် တိုင်း signals မှ တိုး) + ယနေ့ရက်စွဲ
+  ပါသော key ဖြင့်။ Cache ထဲ မရှိသော group များကိုသာ batch တစ်ခုတည်းဖြင့် ပြန်တွက်သည်။
+  Process အများအပြားဖြင့် run လျှင် CACHES ကို shared backend ထားပါ (sheets/replicas.py နှင့် တူ)။
+"""
+
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import router, transaction as db_transaction
+from django.db.models import FloatField, Sum
+from django.db.models.functions import Cast
+from django.utils import timezone
+
+from . import archive, periods
+from .models import Transaction
+
+VERSION_KEY = 'sheets:forecast:version:{}:{}'   # using, group_id
+RESULT_KEY = 'sheets:forecast:{}:{}:{}:{}'       # using, group_id, version, today
+TYPES = ('income', 'expense')
+SEASON = 7
+ALPHAS = (0.02, 0.05, 0.1, 0.2, 0.35, 0.5)
+GAMMA = 0.1
+Z = 1.96  # ~95% interval
+
+
+def history_days():
+    return getattr(settings, 'SHEETS_FORECAST_HISTORY_DAYS', 365)
+
+
+def cache_seconds():
+    return getattr(settings, 'SHEETS_FORECAST_CACHE_SECONDS', 24 * 60 * 60)
+
+
+# ---- Cache invalidation ----
+
+def _bump(using, group_id):
+    key = VERSION_KEY.format(using, group_id)
+    if not cache.add(key, 1, timeout=None):
+        try:
+            cache.incr(key)
+        except ValueError:  # add နှင့် incr ကြား expire/evict ဖြစ်သွားလျှင်
+            cache.set(key, 1, timeout=None)
+
+
+def invalidate(group_id, using=None):
+    """Approved မှတ်တမ်း ပြောင်းလဲမှု commit ပြီးမှ group ၏ cache version ကို တိုး"""
+    using = using or router.db_for_write(Transaction)
+    db_transaction.on_commit(lambda: _bump(using, group_id), using=using)
+
+
+# ---- Model ----
+
+def daily_matrix(group_ids, start, end, using=None):
+    """
+    -> (series × day) float matrix — row = (group index) * 2 + (0 income / 1 expense)
+    နေ့စဉ် စုစုပေါင်းကိုသာ DB မှ ယူ
+    """
+    import numpy as np
+
+    index = {group_id: i for i, group_id in enumerate(group_ids)}
+    days = (end - start).days + 1
+    matrix = np.zeros((len(group_ids) * len(TYPES), days))
+    rows = []
+    # history က archive လုပ်ပြီးသောလ ထဲ ရောက်လျှင် ArchivedTransaction ပါ (sheets/archive.py) — key တူ row များကို np.add.at က ပေါင်း
+    for queryset in archive.querysets(start, using=using):
+        rows.extend(
+            queryset
+            .filter(status='approved', group_id__in=group_ids, transaction_date__gte=start, transaction_date__lte=end)
+            # (group, status, transaction_date, transaction_type, amount) covering index အစဉ်အတိုင်း GROUP BY — sort မလို
+            .order_by().values('group_id', 'transaction_date', 'transaction_type')
+            .annotate(total=Cast(Sum('amount'), FloatField()))
+            .values_list('group_id', 'transaction_type', 'transaction_date', 'total')
+        )
+    if rows:
+        series = np.fromiter((index[g] * 2 + (t == 'expense') for g, t, _, _ in rows), np.int64, len(rows))
+        offset = np.fromiter(((d - start).days for _, _, d, _ in rows), np.int64, len(rows))
+        totals = np.fromiter((v or 0.0 for _, _, _, v in rows), np.float64, len(rows))
+        np.add.at(matrix, (series, offset), totals)
+    return matrix
+
+
+def fit(matrix, start_weekday):
+    """
+    Additive Holt-Winters (weekly) — ALPHAS အားလုံးကို (alpha, series) array ဖြင့် တစ်ပြိုင်နက်
+    -> (level, season[series, weekday], residual std, ရွေးထားသော alpha) — series တစ်ခုချင်း
+    """
+    import numpy as np
+
+    n_series, days = matrix.shape
+    alphas = np.array(ALPHAS)
+    k = len(alphas)
+    alpha = alphas[:, None]
+    level = np.zeros((k, n_series))
+    season = np.zeros((k, n_series, SEASON))
+    sse = np.zeros((k, n_series))
+    for t in range(days):
+        y = matrix[:, t]
+        slot = (start_weekday + t) % SEASON
+        error = y - (level + season[:, :, slot])
+        sse += error * error
+        level = level + alpha * error
+        season[:, :, slot] += GAMMA * (1 - alpha) * error
+    best = np.argmin(sse, axis=0)
+    pick = np.arange(n_series)
+    sigma = np.sqrt(sse[best, pick] / max(days, 1))
+    return level[best, pick], season[best, pick], sigma, alphas[best]
+
+
+def project(level, season, sigma, first_weekday, days):
+    """ရက် `days` ရက် (first_weekday မှ စ) စုစုပေါင်း -> (forecast, low, high) — 0 အောက် မကျ"""
+    import numpy as np
+
+    slots = (first_weekday + np.arange(days)) % SEASON
+    forecast = np.maximum(level * days + season[:, slots].sum(axis=1), 0.0)
+    spread = Z * sigma * np.sqrt(days)
+    return forecast, np.maximum(forecast - spread, 0.0), forecast + spread
+
+
+def compute(group_ids, today, using=None):
+    """Group များ အားလုံးကို batch တစ်ခုတည်းဖြင့် -> {group_id: result}"""
+    end = today - timedelta(days=1)  # ပြည့်စုံသော နေ့များသာ
+    start = end - timedelta(days=history_days() - 1)
+    month = periods.month_end(today) + timedelta(days=1)
+    days = (periods.month_end(month) - month).days + 1
+
+    matrix = daily_matrix(group_ids, start, end, using=using)
+    level, season, sigma, alpha = fit(matrix, start.weekday())
+    forecast, low, high = project(level, season, sigma, month.weekday(), days)
+    history = matrix.sum(axis=1) > 0
+
+    results = {}
+    for i, group_id in enumerate(group_ids):
+        out = {}
+        for j, kind in enumerate(TYPES):
+            s = i * len(TYPES) + j
+            out[kind] = {
+                'forecast': round(float(forecast[s]), 2),
+                'low': round(float(low[s]), 2),
+                'high': round(float(high[s]), 2),
+                'alpha': float(alpha[s]),
+                'has_history': bool(history[s]),
+            }
+        out['net'] = round(out['income']['forecast'] - out['expense']['forecast'], 2)
+        results[group_id] = {'month': month.strftime('%Y-%m'), 'history_start': start.isoformat(),
+                             'history_end': end.isoformat(), **out}
+    return results
+
+
+def forecast(group_ids, today=None, using=None):
+    """
+    Cache ထဲမှ ဖတ်ပြီး မရှိသော group များကိုသာ ပြန်တွက် -> ({group_id: result}, ပြန်တွက်ခဲ့သော group အရေအတွက်)
+    """
+    today = today or timezone.localdate()
+    using = using or router.db_for_write(Transaction)
+    group_ids = list(group_ids)
+    versions = cache.get_many([VERSION_KEY.format(using, g) for g in group_ids])
+    keys = {
+        g: RESULT_KEY.format(using, g, versions.get(VERSION_KEY.format(using, g), 0), today.isoformat())
+        for g in group_ids
+    }
+    cached = cache.get_many(list(keys.values()))
+    results = {g: cached[key] for g, key in keys.items() if key in cached}
+
+    missing = [g for g in group_ids if g not in results]
+    if missing:
+        fresh = compute(missing, today, using=router.db_for_read(Transaction))
+        cache.set_many({keys[g]: fresh[g] for g in missing}, timeout=cache_seconds())
+        results.update(fresh)
+    return results, len(missing)
@@ -0,0 +1,127 @@
+# sheets/idempotency.py
+"""
+Offline-first client (Flutter ApiService) များအတွက် batched, idempotent mutation
+POST /api/sheets/transactions/batch/
+
+    {"operations": [
+        {"key": "<client uuid>", "op": "create", "data": {...}},
+        {"key": "<client uuid>", "op": "update", "id": 12, "data": {...}},
+        {"key": "<client uuid>", "op": "re_submit", "id": 9}
+    ]}
+
+multipart ဖြင့် ပို့လျှင် `operations` ကို JSON string အဖြစ်ထည့်ပြီး ပုံဖိုင်ကို
+`"files": {"image": "<multipart field name>"}` ဖြင့် ရည်ညွှန်းပါ။
+
+- Operation များကို အစဉ်လိုက် DB transaction တစ်ခုတည်းအတွင်း run သည် — တစ်ခု မအောင်မြင်လျှင် batch တစ်ခုလုံး rollback
+- key တစ်ခုချင်း၏ response ကို ထို transaction ထဲမှာပင် IdempotencyKey အဖြစ် သိမ်းသည်
+- Retry ဖြင့် ပြန်ရောက်လာသော key များကို table များကို မထိဘဲ သိမ်းထားသော response ဖြင့် ပြန်ဖြေသည်
+- key တူပြီး request ကွဲလျှင် 409
+"""
+
+import hashlib
+import json
+
+from django.conf import settings
+from rest_framework import status
+from rest_framework.utils.encoders import JSONEncoder
+
+from .models import IdempotencyKey
+
+OPERATIONS = ('create', 'update', 're_submit')
+
+
+def max_operations():
+    return getattr(settings, 'SHEETS_BATCH_MAX_OPERATIONS', 50)
+
+
+class BatchError(Exception):
+    """Batch ကို rollback လုပ်ပြီး client သို့ ပြန်ပို့ရမည့် error (index — မည်သည့် operation)"""
+
+    def __init__(self, detail, status_code=status.HTTP_400_BAD_REQUEST, index=None, key=None):
+        super().__init__(detail)
+        self.detail = detail
+        self.status_code = status_code
+        self.index = index
+        self.key = key
+
+    def as_dict(self):
+        data = {'detail': self.detail}
+        if self.index is not None:
+            data.update(index=self.index, key=self.key)
+        return data
+
+
+def parse_operations(request):
+    raw = request.data.get('operations')
+    if isinstance(raw, str):
+        try:
+            raw = json.loads(raw)
+        except ValueError:
+            raise BatchError("operations သည် JSON list ဖြစ်ရမည်။")
+    if not isinstance(raw, list) or not raw:
+        raise BatchError("operations list မပါဝင်ပါ။")
+    if len(raw) > max_operations():
+        raise BatchError(f"batch တစ်ခုလျှင် operation {max_operations()} ခုထက် မပိုရပါ။")
+
+    operations, keys = [], set()
+    for index, op in enumerate(raw):
+        if not isinstance(op, dict):
+            raise BatchError("operation တစ်ခုချင်းသည် object ဖြစ်ရမည်။", index=index)
+        key = op.get('key')
+        if not isinstance(key, str) or not 0 < len(key) <= 64:
+            raise BatchError("key (စာလုံး ၆၄ လုံးအထိ) လိုအပ်ပါသည်။", index=index, key=key)
+        if key in keys:
+            raise BatchError("batch တစ်ခုအတွင်း key ထပ်နေပါသည်။", index=index, key=key)
+        keys.add(key)
+        if op.get('op') not in OPERATIONS:
+            raise BatchError(f"op သည် {', '.join(OPERATIONS)} ထဲမှ တစ်ခု ဖြစ်ရမည်။", index=index, key=key)
+        if op['op'] != 'create' and not isinstance(op.get('id'), int):
+            raise BatchError("id (transaction) လိုအပ်ပါသည်။", index=index, key=key)
+        if not isinstance(op.get('data', {}), dict) or not isinstance(op.get('files', {}), dict):
+            raise BatchError("data / files သည် object ဖြစ်ရမည်။", index=index, key=key)
+        operations.append(op)
+    return operations
+
+
+def operation_data(request, index, op):
+    """op['data'] နှင့် op['files'] မှ ရည်ညွှန်းသော multipart ဖိုင်များကို ပေါင်း"""
+    data = dict(op.get('data') or {})
+    for field, name in (op.get('files') or {}).items():
+        upload = request.FILES.get(name)
+        if upload is None:
+            raise BatchError(f"ဖိုင် '{name}' ကို request ထဲတွင် ရှာမတွေ့ပါ။", index=index, key=op['key'])
+        data[field] = upload
+    return data
+
+
+def request_hash(request, op):
+    # replay ဖြစ်မဖြစ် (key တူ request တူ) စစ်ရန် — ဖိုင်များကို name/size ဖြင့်သာ
+    files = {
+        field: [getattr(request.FILES.get(name), 'name', None), getattr(request.FILES.get(name), 'size', None)]
+        for field, name in (op.get('files') or {}).items()
+    }
+    payload = {'op': op['op'], 'id': op.get('id'), 'data': op.get('data') or {}, 'files': files}
+    encoded = json.dumps(payload, sort_keys=True, separators=(',', ':'), default=str)
+    return hashlib.sha256(encoded.encode('utf-8')).hexdigest()
+
+
+def saved_keys(user, keys, using=None):
+    return {
+        row.key: row
+        for row in IdempotencyKey.objects.using(using).filter(user=user, key__in=list(keys))
+    }
+
+
+def stored_response(data):
+    # API response နှင့် တူစေရန် DRF encoder ဖြင့် (COERCE_DECIMAL_TO_STRING — amount ကို number အဖြစ်)
+    return json.loads(json.dumps(data, cls=JSONEncoder))
+
+
+def result_for(row, replayed):
+    return {
+        'key': row.key,
+        'op': row.operation,
+        'status': row.status_code,
+        'replayed': replayed,
+        'data': row.response,
+    }
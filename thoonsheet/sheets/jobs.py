@@ -0,0 +1,191 @@
+# sheets/jobs.py
+"""
+External broker မလိုသော DB-backed background job queue
+
+    from sheets.jobs import job, enqueue
+
+    @job('export_transactions', enqueueable=True)
+    def export_transactions(job, status=None):
+        ...
+        job.set_progress(0.5, 'writing rows')
+        return {'url': ...}          # Job.result ထဲ သိမ်းမည် (JSON)
+
+    enqueue('export_transactions', {'status': 'approved'}, user=request.user)
+
+Worker: `python manage.py run_jobs --workers 4` (sheets/management/commands/run_jobs.py)
+Job ကို `UPDATE ... WHERE status='queued'` ဖြင့် claim လုပ်သောကြောင့် worker process အများအပြား
+တစ်ပြိုင်နက် run နိုင်သည်။ ကျရှုံးလျှင် exponential backoff ဖြင့် max_attempts အထိ ပြန်ကြိုးစားသည်။
+Run နေဆဲ job များ၏ locked_at ကို worker က SHEETS_JOB_HEARTBEAT_SECONDS တိုင်း (နှင့် set_progress တိုင်း)
+ပြန်မှတ်သောကြောင့် SHEETS_JOB_STALE_SECONDS အတွင်း heartbeat မရှိသော (worker သေသွားသော) job များသာ ပြန်တန်းစီခံရသည်။
+"""
+
+import inspect
+import logging
+import traceback
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import close_old_connections
+from django.db.models import F
+from django.utils import timezone
+
+logger = logging.getLogger('sheets.jobs')
+
+_registry = {}
+
+
+class JobHandler:
+    def __init__(self, kind, func, enqueueable, max_attempts):
+        self.kind = kind
+        self.func = func
+        self.enqueueable = enqueueable
+        self.max_attempts = max_attempts
+
+
+def job(kind, enqueueable=False, max_attempts=3):
+    """
+    Job handler ကို register လုပ်သည်။
+    enqueueable=True ဆိုမှ API (/api/sheets/jobs/) မှ တန်းစီခွင့်ရှိသည်။
+    """
+    def decorator(func):
+        _registry[kind] = JobHandler(kind, func, enqueueable, max_attempts)
+        return func
+    return decorator
+
+
+def get_handler(kind):
+    return _registry.get(kind)
+
+
+def enqueueable_kinds():
+    return sorted(kind for kind, handler in _registry.items() if handler.enqueueable)
+
+
+def check_payload(kind, payload):
+    """
+    payload ၏ key များကို handler ၏ keyword argument များနှင့် စစ်ပြီး handler ကို ပြန်ပေး — မကိုက်လျှင် ValueError
+    (worker ထဲရောက်မှ TypeError ဖြင့် ကျပြီး retry များ မကုန်စေရန်)
+    """
+    handler = get_handler(kind)
+    if handler is None:
+        raise ValueError(f"Unknown job kind: {kind}")
+    if not isinstance(payload, dict):
+        raise ValueError("payload must be a JSON object")
+    try:
+        inspect.signature(handler.func).bind(None, **payload)
+    except TypeError as exc:
+        raise ValueError(f"Invalid payload for job '{kind}': {exc}")
+    return handler
+
+
+def enqueue(kind, payload=None, user=None, priority=0, run_after=None, dedupe=False):
+    """
+    Job တစ်ခုကို တန်းစီသည်။ dedupe=True ဆိုလျှင် kind/payload တူ queued job ရှိပြီးသားဆို ၎င်းကိုပဲ ပြန်ပေး။
+    kind / payload မမှန်လျှင် ValueError
+    """
+    from .models import Job
+
+    payload = payload or {}
+    handler = check_payload(kind, payload)
+    if dedupe:
+        existing = Job.objects.filter(kind=kind, status='queued', payload=payload).first()
+        if existing is not None:
+            return existing
+    return Job.objects.create(
+        kind=kind,
+        payload=payload,
+        created_by=user if getattr(user, 'is_authenticated', False) else None,
+        priority=priority,
+        max_attempts=handler.max_attempts,
+        run_after=run_after or timezone.now(),
+    )
+
+
+def retry_delay(attempts):
+    base = getattr(settings, 'SHEETS_JOB_RETRY_BASE_SECONDS', 30)
+    return timedelta(seconds=base * (2 ** max(attempts - 1, 0)))
+
+
+def claim_next(worker_id, batch=10):
+    """တန်းစီထားသော job တစ်ခုကို atomic ဖြင့် ယူ (အခြား worker ယူပြီးသားဆို နောက်တစ်ခုကို စမ်း)"""
+    from .models import Job
+
+    now = timezone.now()
+    candidates = list(
+        Job.objects.filter(status='queued', run_after__lte=now)
+        .order_by('-priority', 'run_after', 'id')
+        .values_list('id', flat=True)[:batch]
+    )
+    for job_id in candidates:
+        claimed = Job.objects.filter(pk=job_id, status='queued').update(
+            status='running', locked_by=worker_id, locked_at=now,
+            started_at=now, attempts=F('attempts') + 1,
+        )
+        if claimed:
+            return job_id
+    return None
+
+
+def heartbeat_seconds():
+    return getattr(settings, 'SHEETS_JOB_HEARTBEAT_SECONDS', 30)
+
+
+def heartbeat(job_ids, worker_id):
+    """Worker က run နေဆဲ job များ၏ locked_at ကို ပြန်မှတ် (requeue_stale က ဤ job များကို မယူစေရန်)"""
+    from .models import Job
+
+    if not job_ids:
+        return 0
+    return Job.objects.filter(pk__in=list(job_ids), status='running', locked_by=worker_id).update(
+        locked_at=timezone.now(),
+    )
+
+
+def requeue_stale(timeout_seconds=None):
+    """Worker crash ဖြစ်ပြီး running အတိုင်းကျန်နေသော (heartbeat ရပ်နေသော) job များကို ပြန်တန်းစီ"""
+    from .models import Job
+
+    timeout_seconds = timeout_seconds or getattr(settings, 'SHEETS_JOB_STALE_SECONDS', 60 * 60)
+    cutoff = timezone.now() - timedelta(seconds=timeout_seconds)
+    return Job.objects.filter(status='running', locked_at__lt=cutoff).update(
+        status='queued', locked_by='', locked_at=None, run_after=timezone.now(),
+    )
+
+
+def execute(job_id):
+    """
+    Claim လုပ်ပြီးသား job ကို run သည် (thread သို့မဟုတ် child process ထဲမှ ခေါ်)
+    return: နောက်ဆုံး status
+    """
+    from .models import Job
+
+    close_old_connections()
+    try:
+        job_obj = Job.objects.get(pk=job_id)
+        handler = get_handler(job_obj.kind)
+        # handler မရှိ / payload မကိုက် — ပြန်ကြိုးစားလည်း မအောင်မြင်နိုင်
+        retryable = False
+        try:
+            if handler is None:
+                raise LookupError(f"No handler registered for job kind '{job_obj.kind}'")
+            check_payload(job_obj.kind, job_obj.payload)
+            retryable = True
+            result = handler.func(job_obj, **job_obj.payload)
+        except Exception:
+            error = traceback.format_exc()
+            logger.warning('Job %s (%s) failed on attempt %s', job_obj.pk, job_obj.kind, job_obj.attempts)
+            if retryable and job_obj.attempts < job_obj.max_attempts:
+                Job.objects.filter(pk=job_id).update(
+                    status='queued', error=error, locked_by='', locked_at=None,
+                    run_after=timezone.now() + retry_delay(job_obj.attempts),
+                )
+                return 'queued'
+            Job.objects.filter(pk=job_id).update(status='failed', error=error, finished_at=timezone.now())
+            return 'failed'
+
+        Job.objects.filter(pk=job_id).update(
+            status='succeeded', result=result, progress=1.0, error='', finished_at=timezone.now(),
+        )
+        return 'succeeded'
+    finally:
+        close_old_connections()
@@ -0,0 +1,31 @@
+# sheets/management/commands/archive_transactions.py
+
+import time
+
+from django.core.management.base import BaseCommand
+
+from sheets import archive
+from sheets.sharding import all_aliases
+
+
+class Command(BaseCommand):
+    help = (
+        "SHEETS_ARCHIVE_AFTER_DAYS ထက် ကြာပြီး လချုပ်ပိတ်ပြီးသော approved Transaction များကို "
+        "ArchivedTransaction သို့ batch အလိုက် ရွှေ့သည် (ရပ်သွားလျှင် ပြန် run ရုံဖြင့် ဆက်ရွှေ့)။"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--owner', type=int, help="owner id တစ်ခုတည်း (မပေးလျှင် owner အားလုံး)")
+        parser.add_argument('--batch-size', type=int, help="transaction တစ်ခုလျှင် row အရေအတွက် (default: SHEETS_ARCHIVE_BATCH_SIZE)")
+
+    def handle(self, *args, **options):
+        for using in all_aliases():
+            started = time.monotonic()
+            if options['owner']:
+                result = {'owners': 1, 'moved': archive.archive_owner(options['owner'], using=using, size=options['batch_size'])}
+            else:
+                result = archive.archive_all(using=using, size=options['batch_size'])
+            self.stdout.write(self.style.SUCCESS(
+                f"{using}: {result['moved']} transaction(s) archived for {result['owners']} owner(s) "
+                f"in {time.monotonic() - started:.1f}s"
+            ))
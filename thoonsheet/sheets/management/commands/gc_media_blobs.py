@@ -0,0 +1,79 @@
+# sheets/management/commands/gc_media_blobs.py
+
+from collections import Counter
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db.models import Count
+from django.utils import timezone
+
+from sheets import uploads
+from sheets.models import ArchivedTransaction, MediaBlob, Transaction, UploadSession
+from sheets.sharding import all_aliases
+from sheets.storage import receipt_storage
+
+
+class Command(BaseCommand):
+    help = (
+        "Transaction တစ်ခုမှ မရည်ညွှန်းတော့သော receipt blob များနှင့် "
+        "မပြီးဆုံးဘဲ ကျန်နေသော chunked upload များကို disk နှင့် DB မှ ဖျက်သည်။"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--grace-hours', type=int, default=24,
+            help="ref_count 0 ဖြစ်ပြီး ဤနာရီထက်ကြာမှသာ ဖျက် (upload ပြီး save မလုပ်ရသေးသည်များကို ကာကွယ်ရန်)",
+        )
+        parser.add_argument('--recount', action='store_true', help="ref_count များကို Transaction / ArchivedTransaction table မှ ပြန်တွက်")
+        parser.add_argument('--dry-run', action='store_true')
+
+    def handle(self, *args, **options):
+        if options['recount']:
+            self.recount(options['dry_run'])
+
+        cutoff = timezone.now() - timedelta(hours=options['grace_hours'])
+        self.expire_uploads(cutoff, options['dry_run'])
+
+        storage = receipt_storage()
+        orphans = MediaBlob.objects.filter(ref_count=0, updated_at__lt=cutoff)
+        freed = removed = 0
+        for blob in orphans.iterator():
+            removed += 1
+            freed += blob.size
+            if options['dry_run']:
+                self.stdout.write(f"would delete {blob.name}")
+                continue
+            storage.delete(blob.name)
+
+        verb = 'would free' if options['dry_run'] else 'freed'
+        self.stdout.write(self.style.SUCCESS(f"{removed} orphan blob(s), {verb} {freed} bytes"))
+
+    def recount(self, dry_run):
+        # blob များကို owner shard အားလုံးက မျှသုံးသောကြောင့် database တိုင်းမှ ပေါင်း
+        counts = Counter()
+        for using in all_aliases():
+            # archive (sheets/archive.py) သို့ ရွှေ့ထားသော မှတ်တမ်းများကလည်း ပုံကို ဆက်ရည်ညွှန်းသည်
+            for model in (Transaction, ArchivedTransaction):
+                counts.update(dict(
+                    model.objects.using(using).exclude(image='').exclude(image__isnull=True)
+                    .values_list('image').annotate(n=Count('id')).values_list('image', 'n')
+                ))
+        fixed = 0
+        for blob in MediaBlob.objects.only('id', 'name', 'ref_count').iterator():
+            actual = counts.get(blob.name, 0)
+            if blob.ref_count != actual:
+                fixed += 1
+                if not dry_run:
+                    MediaBlob.objects.filter(pk=blob.pk).update(ref_count=actual, updated_at=timezone.now())
+        self.stdout.write(f"recount: {fixed} blob(s) had a wrong ref_count")
+
+    def expire_uploads(self, cutoff, dry_run):
+        stale = UploadSession.objects.filter(status__in=('open', 'complete'), updated_at__lt=cutoff)
+        count = 0
+        for session in stale.iterator():
+            count += 1
+            if not dry_run:
+                # complete ဖြစ်ပြီး မချိတ်ရသေးသော blob ကို ref_count 0 ဖြင့် အောက်က GC က ရှင်းမည်
+                uploads.discard(session)
+                session.delete()
+        self.stdout.write(f"{count} stale upload session(s)")
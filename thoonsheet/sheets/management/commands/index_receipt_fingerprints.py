@@ -0,0 +1,40 @@
+# sheets/management/commands/index_receipt_fingerprints.py
+
+from django.core.management.base import BaseCommand
+
+from sheets.fingerprints import compute_fingerprint
+from sheets.models import Transaction
+from sheets.sharding import all_aliases, use_alias
+
+
+class Command(BaseCommand):
+    help = "ပုံပါသော်လည်း perceptual hash မတွက်ရသေးသော Transaction များအတွက် fingerprint တွက်သည်။"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--all', action='store_true', help="ရှိပြီးသား fingerprint များကိုပါ ပြန်တွက်")
+
+    def handle(self, *args, **options):
+        done = flagged = 0
+        for using in all_aliases():
+            with use_alias(using):
+                d, f = self.index(options['all'])
+            done += d
+            flagged += f
+        self.stdout.write(self.style.SUCCESS(f"{done} fingerprint(s) computed, {flagged} with possible duplicates"))
+
+    def index(self, recompute):
+        qs = Transaction.objects.exclude(image='').exclude(image__isnull=True)
+        if not recompute:
+            qs = qs.filter(receipt_fingerprint__isnull=True)
+        # အဟောင်းမှ အသစ်သို့ — နောက်မှတင်သော ပုံကိုသာ duplicate အဖြစ် flag လုပ်ရန်
+        done = flagged = 0
+        for pk in list(qs.order_by('submitted_at', 'id').values_list('pk', flat=True)):
+            try:
+                fp = compute_fingerprint(pk)
+            except Exception as exc:
+                self.stderr.write(f"transaction {pk}: {exc}")
+                continue
+            if fp is not None:
+                done += 1
+                flagged += bool(fp.duplicate_ids)
+        return done, flagged
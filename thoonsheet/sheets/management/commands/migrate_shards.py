@@ -0,0 +1,24 @@
+# sheets/management/commands/migrate_shards.py
+
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+
+from sheets import sharding
+
+
+class Command(BaseCommand):
+    help = "Owner shard database အားလုံး (သို့မဟုတ် --owner ပေးထားသည်များ) ကို migrate လုပ်ပြီး user များကို mirror လုပ်သည်။"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--owner', type=int, action='append', dest='owners', help="owner id (အကြိမ်ကြိမ်ပေးနိုင်)")
+
+    def handle(self, *args, **options):
+        if not sharding.is_enabled():
+            raise CommandError("SHEETS_SHARDING is disabled")
+        owner_ids = options['owners'] or sharding.owner_ids()
+        for owner_id in owner_ids:
+            alias = sharding.ensure_shard(owner_id)
+            self.stdout.write(f"== {alias}")
+            call_command('migrate', database=alias, interactive=False, verbosity=max(options['verbosity'] - 1, 0))
+            sharding.mirror_users(owner_id, using=alias)
+        self.stdout.write(self.style.SUCCESS(f"{len(owner_ids)} shard(s) migrated"))
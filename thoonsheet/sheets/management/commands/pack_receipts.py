@@ -0,0 +1,40 @@
+# sheets/management/commands/pack_receipts.py
+
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from sheets import packs
+
+
+class Command(BaseCommand):
+    help = (
+        "RECEIPT_PACK_AFTER_DAYS ထက် ကြာပြီးသော receipt ပုံများကို process pool ဖြင့် ပြန် compress လုပ်ပြီး "
+        "append-only pack ဖိုင်များထဲ ရွှေ့သည် (ရပ်သွားလျှင် ပြန် run ရုံဖြင့် ဆက်လုပ်)။"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--older-than-days', type=int, help="default: RECEIPT_PACK_AFTER_DAYS")
+        parser.add_argument('--workers', type=int, help="process အရေအတွက် (default: RECEIPT_PACK_WORKERS)")
+        parser.add_argument('--limit', type=int, help="ဤ run တွင် pack မည့် blob အများဆုံး")
+        parser.add_argument('--dry-run', action='store_true')
+
+    def handle(self, *args, **options):
+        if options['dry_run']:
+            queue = packs.candidates(older_than_days=options['older_than_days'])
+            count, size = queue.count(), sum(queue.values_list('size', flat=True))
+            self.stdout.write(f"would pack {count} blob(s), {size} bytes")
+            return
+        started = time.monotonic()
+        try:
+            result = packs.pack_blobs(
+                older_than_days=options['older_than_days'], workers=options['workers'], limit=options['limit'],
+            )
+        except RuntimeError as exc:
+            raise CommandError(str(exc))
+        if result['missing']:
+            self.stdout.write(self.style.WARNING(f"{result['missing']} blob(s) had no file on disk"))
+        self.stdout.write(self.style.SUCCESS(
+            f"{result['packed']} blob(s) packed, {result['bytes_before']} -> {result['bytes_after']} bytes "
+            f"in {time.monotonic() - started:.1f}s"
+        ))
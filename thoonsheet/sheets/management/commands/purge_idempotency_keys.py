@@ -0,0 +1,26 @@
+# sheets/management/commands/purge_idempotency_keys.py
+
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from sheets.models import IdempotencyKey
+from sheets.sharding import all_aliases
+
+
+class Command(BaseCommand):
+    help = "Client retry window ကျော်သွားသော batch mutation idempotency key များကို ဖျက်သည်။"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--days', type=int, default=getattr(settings, 'SHEETS_IDEMPOTENCY_KEY_DAYS', 7),
+            help="ဤရက်ထက် ဟောင်းသော key များကို ဖျက်",
+        )
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - timedelta(days=options['days'])
+        for alias in all_aliases():
+            deleted, _ = IdempotencyKey.objects.using(alias).filter(created_at__lt=cutoff).delete()
+            self.stdout.write(f"{alias}: deleted {deleted} key(s)")
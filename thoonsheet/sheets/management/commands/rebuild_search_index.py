@@ -0,0 +1,22 @@
+# sheets/management/commands/rebuild_search_index.py
+
+from django.core.management.base import BaseCommand, CommandError
+
+from sheets import search
+from sheets.sharding import all_aliases
+
+
+class Command(BaseCommand):
+    help = "Full-text search index (transactions, audit remarks, groups, payment accounts) ကို အစမှ ပြန်တည်သည်။"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--database', help="မပေးလျှင် default + owner shard အားလုံး")
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        aliases = [options['database']] if options['database'] else all_aliases()
+        for using in aliases:
+            if not search.is_supported(using):
+                raise CommandError(f"Full-text search is not supported on '{search.vendor(using)}' (sqlite/postgresql only)")
+            total = search.rebuild(using=using, batch_size=options['batch_size'])
+            self.stdout.write(self.style.SUCCESS(f"{using}: {total} document(s) indexed"))
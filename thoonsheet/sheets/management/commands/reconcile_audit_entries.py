@@ -0,0 +1,47 @@
+# sheets/management/commands/reconcile_audit_entries.py
+
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+from django.core.serializers.json import DjangoJSONEncoder
+
+from sheets import reconciliation
+from sheets.sharding import all_aliases
+
+
+class Command(BaseCommand):
+    help = "Group တစ်ခုချင်း၏ နောက်ဆုံး AuditEntry ရရန်/ပေးရန် ပမာဏကို approved Transaction ledger နှင့် တိုက်စစ်သည် (nightly)။"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--start', help="YYYY-MM-DD (မပေးလျှင် history အားလုံး)")
+        parser.add_argument('--end', help="YYYY-MM-DD (မပေးလျှင် ယနေ့)")
+        parser.add_argument('--threshold', help="ဤပမာဏထက် ကွာမှ flag (default: SHEETS_RECONCILIATION_THRESHOLD)")
+        parser.add_argument('--owner', type=int, help="owner id တစ်ခုတည်း")
+        parser.add_argument('--json', action='store_true', help="report အပြည့်ကို JSON ဖြင့် ထုတ်")
+
+    def handle(self, *args, **options):
+        try:
+            params = reconciliation.parse_params(
+                {name: options[name] for name in ('start', 'end', 'threshold') if options[name]}
+            )
+        except reconciliation.ReconciliationError as exc:
+            raise CommandError(exc.detail)
+
+        reports = {}
+        for using in all_aliases():
+            report = reconciliation.reconcile(owner_id=options['owner'], using=using, **params)
+            reports[using] = report
+            if options['json']:
+                continue
+            self.stdout.write(
+                f"{using}: {report['audited_groups']} audited group(s), {report['flagged']} flagged, "
+                f"{len(report['unaudited_groups'])} without audit entry"
+            )
+            for row in report['results']:
+                self.stdout.write(self.style.WARNING(
+                    f"  group {row['group']} ({row['group_name']}): "
+                    f"receivable {row['audit_receivable']} vs {row['ledger_receivable']} ({row['receivable_variance']:+}), "
+                    f"payable {row['audit_payable']} vs {row['ledger_payable']} ({row['payable_variance']:+})"
+                ))
+        if options['json']:
+            self.stdout.write(json.dumps(reports, cls=DjangoJSONEncoder, ensure_ascii=False, indent=2))
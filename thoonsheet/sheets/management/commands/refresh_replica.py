@@ -0,0 +1,62 @@
+# sheets/management/commands/refresh_replica.py
+
+import signal
+import sqlite3
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+
+from sheets.replicas import replica_alias
+
+
+class Command(BaseCommand):
+    help = (
+        "SQLite primary (default) ကို online backup API ဖြင့် read replica ဖိုင်ထဲ ကူးသည်။ "
+        "Primary ကို lock မချဘဲ page အလိုက် ကူးပြီး replica reader များကိုလည်း မပိတ်ပါ (WAL)။"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--database', help="replica alias (မပေးလျှင် settings.SHEETS_READ_REPLICA)")
+        parser.add_argument('--interval', type=float, default=0, help="စက္ကန့်တိုင်း ထပ်ကူး (0 = တစ်ကြိမ်သာ)")
+        parser.add_argument('--pages', type=int, default=1024, help="backup step တစ်ခုလျှင် page အရေအတွက်")
+
+    def handle(self, *args, **options):
+        alias = options['database'] or replica_alias()
+        if not alias:
+            raise CommandError("SHEETS_READ_REPLICA is not configured")
+        if alias not in connections.settings:
+            raise CommandError(f"DATABASES['{alias}'] is not configured")
+        source = connections['default'].settings_dict
+        target = connections.settings[alias]
+        if source['ENGINE'] != 'django.db.backends.sqlite3' or target['ENGINE'] != 'django.db.backends.sqlite3':
+            raise CommandError("refresh_replica only supports SQLite; use your database's native replication instead")
+
+        self.stopping = False
+        signal.signal(signal.SIGTERM, self._stop)
+        signal.signal(signal.SIGINT, self._stop)
+        while True:
+            started = time.monotonic()
+            pages = self.refresh(str(source['NAME']), str(target['NAME']), options['pages'])
+            self.stdout.write(f"{alias}: copied {pages} page(s) in {time.monotonic() - started:.2f}s")
+            if not options['interval'] or self.stopping:
+                break
+            time.sleep(options['interval'])
+
+    def refresh(self, source_path, target_path, step):
+        src = sqlite3.connect(source_path, timeout=20)
+        dst = sqlite3.connect(target_path, timeout=20)
+        try:
+            # step အလိုက်ကူးသောကြောင့် ကြားထဲ primary ကို writer များ ရေးနိုင်သည်။
+            # Replica သည် (primary မှ ကူးလာသော) WAL mode ဖြစ်သောကြောင့် ဖွင့်ထားဆဲ reader connection များက
+            # snapshot အဟောင်းကို ဆက်ဖတ်ပြီး နောက် transaction မှစ၍ data အသစ်ကို မြင်မည်။
+            src.backup(dst, pages=step, sleep=0.005)
+            dst.execute('PRAGMA wal_checkpoint(PASSIVE)')
+            pages = dst.execute('PRAGMA page_count').fetchone()[0]
+        finally:
+            dst.close()
+            src.close()
+        return pages
+
+    def _stop(self, signum, frame):
+        self.stopping = True
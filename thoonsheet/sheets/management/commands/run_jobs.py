@@ -0,0 +1,80 @@
+# sheets/management/commands/run_jobs.py
+
+import os
+import signal
+import socket
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from sheets import jobs
+
+
+class Command(BaseCommand):
+    help = "DB job queue (sheets.jobs) မှ job များကို thread/process pool ဖြင့် run သည်။"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=2, help="တစ်ပြိုင်နက် run မည့် job အရေအတွက်")
+        parser.add_argument('--pool', choices=('thread', 'process'), default='thread',
+                            help="CPU များသော job (ပုံ processing) များအတွက် process ကိုသုံး")
+        parser.add_argument('--poll-interval', type=float, default=2.0)
+        parser.add_argument('--burst', action='store_true', help="Queue ကုန်သွားလျှင် ထွက်")
+
+    def handle(self, *args, **options):
+        self.stopping = False
+        signal.signal(signal.SIGTERM, self._stop)
+        signal.signal(signal.SIGINT, self._stop)
+
+        workers = max(options['workers'], 1)
+        worker_id = f"{socket.gethostname()}:{os.getpid()}"
+        if options['pool'] == 'process':
+            # fork မလုပ်မီ parent ၏ DB connection များကို ပိတ် (child နှင့် မမျှဝေစေရန်)
+            connections.close_all()
+            pool = ProcessPoolExecutor(max_workers=workers)
+        else:
+            pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='sheets-job')
+
+        requeued = jobs.requeue_stale()
+        if requeued:
+            self.stdout.write(f"requeued {requeued} stale job(s)")
+        self.stdout.write(f"worker {worker_id}: {workers} {options['pool']}(s), kinds={sorted(jobs._registry)}")
+
+        running = {}
+        beat_at = time.monotonic()
+        try:
+            while not self.stopping:
+                if running and time.monotonic() - beat_at >= jobs.heartbeat_seconds():
+                    # run နေဆဲ job များကို stale မဖြစ်စေရန် (နောက် worker စတင်ချိန် requeue_stale)
+                    jobs.heartbeat(running.values(), worker_id)
+                    beat_at = time.monotonic()
+                    if options['pool'] == 'process':
+                        connections.close_all()
+
+                for future in [f for f in running if f.done()]:
+                    job_id = running.pop(future)
+                    try:
+                        self.stdout.write(f"job {job_id}: {future.result()}")
+                    except Exception as exc:  # handler errors are stored by jobs.execute
+                        self.stderr.write(f"job {job_id}: worker error {exc!r}")
+
+                claimed = None
+                if len(running) < workers:
+                    claimed = jobs.claim_next(worker_id)
+                    if claimed is not None:
+                        running[pool.submit(jobs.execute, claimed)] = claimed
+                        continue
+                    if options['pool'] == 'process':
+                        connections.close_all()
+
+                if options['burst'] and claimed is None and not running:
+                    break
+                time.sleep(options['poll_interval'] if claimed is None else 0.05)
+        finally:
+            pool.shutdown(wait=True)
+            connections.close_all()
+
+    def _stop(self, signum, frame):
+        self.stdout.write("shutting down after running jobs finish...")
+        self.stopping = True
@@ -0,0 +1,27 @@
+# sheets/management/commands/score_transactions.py
+
+import time
+
+from django.core.management.base import BaseCommand
+
+from sheets import risk
+from sheets.sharding import all_aliases
+
+
+class Command(BaseCommand):
+    help = "Transaction များ၏ risk score (owner review queue) ကို NumPy ဖြင့် batch တွက်ပြီး ပြောင်းသည်များကို သိမ်းသည်။"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--owner', type=int, help="owner id တစ်ခုတည်း (မပေးလျှင် owner အားလုံး)")
+        parser.add_argument('--pending-only', action='store_true', help="pending မှတ်တမ်းများ၏ score ကိုသာ သိမ်း")
+
+    def handle(self, *args, **options):
+        for using in all_aliases():
+            started = time.monotonic()
+            if options['owner']:
+                scored, updated = risk.score_owner(options['owner'], using=using, pending_only=options['pending_only'])
+            else:
+                scored, updated = risk.score_all(using=using, pending_only=options['pending_only'])
+            self.stdout.write(self.style.SUCCESS(
+                f"{using}: {scored} transaction(s) scored, {updated} updated in {time.monotonic() - started:.1f}s"
+            ))
@@ -0,0 +1,77 @@
+# sheets/management/commands/split_into_shards.py
+
+from django.core.management.base import BaseCommand, CommandError
+
+from sheets import search, sharding
+from sheets.models import (
+    ArchivedTransaction, AuditEntry, BalanceSnapshot, ClosedPeriod, Group, PaymentAccount, ReceiptFingerprint,
+    Transaction,
+)
+
+# FK အစဉ်အတိုင်း (parent အရင်)
+COPY_ORDER = [
+    (Group, 'owner_id'),
+    (PaymentAccount, 'owner_id'),
+    (Transaction, 'owner_id'),
+    (ArchivedTransaction, 'owner_id'),
+    (AuditEntry, 'owner_id'),
+    (ReceiptFingerprint, 'transaction__owner_id'),
+    (ClosedPeriod, 'owner_id'),
+    (BalanceSnapshot, 'owner_id'),
+]
+
+
+class Command(BaseCommand):
+    help = (
+        "default database ထဲရှိ group / payment account / transaction / audit entry များကို "
+        "owner အလိုက် shard database များထဲ ကူးသည်။ ထပ် run လျှင် ကူးပြီးသား row များကို ကျော်သည်။"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--owner', type=int, action='append', dest='owners', help="owner id (အကြိမ်ကြိမ်ပေးနိုင်)")
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument(
+            '--delete-source', action='store_true',
+            help="ကူးပြီးသော row များကို default မှ ဖျက် (receipt blob ref_count မပြောင်း)",
+        )
+
+    def handle(self, *args, **options):
+        if not sharding.is_enabled():
+            raise CommandError("SHEETS_SHARDING is disabled — settings တွင် ဖွင့်ပြီးမှ run ပါ")
+        owner_ids = options['owners'] or sharding.owner_ids()
+        for owner_id in owner_ids:
+            alias = sharding.provision_shard(owner_id)
+            for model, owner_field in COPY_ORDER:
+                copied = self.copy(model, owner_field, owner_id, alias, options['batch_size'])
+                self.stdout.write(f"{alias}: {model._meta.model_name} {copied} row(s)")
+            search.rebuild(using=alias)
+            if options['delete_source']:
+                self.delete_source(owner_id)
+
+        if options['delete_source']:
+            search.rebuild(using='default')
+        leftover = Transaction.objects.using('default').filter(owner__isnull=True).count()
+        if leftover:
+            self.stdout.write(self.style.WARNING(f"{leftover} transaction(s) without owner remain in default"))
+        self.stdout.write(self.style.SUCCESS(f"{len(owner_ids)} owner(s) split into shards"))
+
+    def copy(self, model, owner_field, owner_id, alias, batch_size):
+        source = model.objects.using('default').filter(**{owner_field: owner_id}).order_by('pk')
+        copied, last_pk = 0, 0
+        while True:
+            batch = list(source.filter(pk__gt=last_pk)[:batch_size])
+            if not batch:
+                return copied
+            # pk မပြောင်း (receipt blob, job payload, URL များက id ဖြင့် ရည်ညွှန်းထား)
+            model.objects.using(alias).bulk_create(batch, ignore_conflicts=True)
+            copied += len(batch)
+            last_pk = batch[-1].pk
+
+    def delete_source(self, owner_id):
+        # .delete() သည် post_delete signal (release_blob) ကို ခေါ်ပြီး shard ထဲရှိဆဲ blob ref များကို လျှော့ချမည် —
+        # ထို့ကြောင့် signal မပါသော raw delete ကို child table မှ စ၍ သုံးသည်
+        for model, owner_field in reversed(COPY_ORDER):
+            qs = model.objects.using('default').filter(**{owner_field: owner_id})
+            if owner_field != 'owner_id':
+                qs = model.objects.using('default').filter(pk__in=list(qs.values_list('pk', flat=True)))
+            qs._raw_delete('default')
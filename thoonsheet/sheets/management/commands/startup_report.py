@@ -0,0 +1,66 @@
+# sheets/management/commands/startup_report.py
+
+import json
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from sheets import startup
+
+PHASES = ('settings', 'setup', 'urlconf', 'middleware', 'boot', 'first_request', 'request_avg')
+
+
+class Command(BaseCommand):
+    help = (
+        "Settings module တစ်ခုစီကို process အသစ်ဖြင့် boot လုပ်ပြီး အဆင့် အလိုက် အချိန်၊ app အလိုက် import အချိန်နှင့် "
+        "request တစ်ခု၏ ပျမ်းမျှ (middleware + DRF) ကို ပြသည်။ "
+        "ဥပမာ: manage.py startup_report thoonsheet.settings thoonsheet.settings_production"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('modules', nargs='*', help="settings module များ (default: လက်ရှိ settings)")
+        parser.add_argument('--runs', type=int, default=3, help="module တစ်ခုလျှင် boot အကြိမ် (အနည်းဆုံးကို ယူ)")
+        parser.add_argument('--requests', type=int, default=50, help="boot ပြီးနောက် တိုင်းမည့် request အရေအတွက်")
+        parser.add_argument('--path', default=startup.DEFAULT_PATH)
+        parser.add_argument('--top', type=int, default=15, help="ပြမည့် import အများဆုံး app / package")
+        parser.add_argument('--json', action='store_true')
+
+    def handle(self, *args, **options):
+        modules = options['modules'] or [settings.SETTINGS_MODULE]
+        reports = []
+        for module in modules:
+            runs = []
+            for _ in range(max(options['runs'], 1)):
+                try:
+                    runs.append(startup.measure(module, path=options['path'], requests=options['requests']))
+                except RuntimeError as exc:
+                    raise CommandError(str(exc))
+            # noise လျော့ရန် — အဆင့်တစ်ခုချင်း၏ အနည်းဆုံး၊ import ခွဲခြမ်းကို boot အမြန်ဆုံး run မှ
+            report = min(runs, key=lambda run: run['phases']['boot'])
+            report['phases'] = {name: min(run['phases'][name] for run in runs) for name in report['phases']}
+            reports.append(report)
+
+        if options['json']:
+            self.stdout.write(json.dumps(reports, indent=2))
+            return
+
+        for report in reports:
+            self.stdout.write(self.style.MIGRATE_HEADING(report['settings']))
+            self.stdout.write(
+                f"  apps {len(report['apps'])}, middleware {len(report['middleware'])}, "
+                f"{report['requests']} x GET {report['path']}"
+            )
+            for name in PHASES:
+                self.stdout.write(f"  {name:<14}{report['phases'][name]:>10.1f} ms")
+            self.stdout.write("  imports (app / package, self):")
+            for name, ms in list(report['imports'].items())[:options['top']]:
+                self.stdout.write(f"    {name:<40}{ms:>10.1f} ms")
+
+        if len(reports) > 1:
+            base = reports[0]
+            self.stdout.write(self.style.MIGRATE_HEADING(f"vs {base['settings']}"))
+            for report in reports[1:]:
+                for name in ('boot', 'request_avg'):
+                    before, after = base['phases'][name], report['phases'][name]
+                    change = (after - before) / before * 100 if before else 0.0
+                    self.stdout.write(f"  {report['settings']} {name}: {before:.1f} -> {after:.1f} ms ({change:+.0f}%)")
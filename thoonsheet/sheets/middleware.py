@@ -0,0 +1,161 @@
+# sheets/middleware.py
+
+import gzip
+import logging
+import random
+from collections import defaultdict
+from threading import Lock
+
+from django.conf import settings
+from django.utils.cache import patch_vary_headers
+from django.utils.regex_helper import _lazy_re_compile
+
+from . import profiling
+
+try:
+    import brotli  # optional: pip install brotli
+except ImportError:  # pragma: no cover - depends on the deployment
+    brotli = None
+
+logger = logging.getLogger('sheets.compression')
+
+re_accepts_br = _lazy_re_compile(r'\bbr\b')
+re_accepts_gzip = _lazy_re_compile(r'\bgzip\b')
+
+COMPRESSIBLE_TYPES = ('application/json', 'text/', 'application/javascript', 'text/csv')
+# URL pattern နှင့် မကိုက်သော path များ (404 စသည်) — path အလိုက် ခွဲမှတ်လျှင် key များ အကန့်အသတ်မဲ့ တိုးမည်
+UNRESOLVED_ENDPOINT = '<unresolved>'
+
+
+class CompressionStats:
+    """
+    Endpoint (url_name) တစ်ခုချင်းစီအလိုက် ချွေတာနိုင်ခဲ့သော bytes များကို process ထဲတွင် စုထားသည်။
+    """
+
+    def __init__(self):
+        self._lock = Lock()
+        self._data = defaultdict(lambda: {'responses': 0, 'original_bytes': 0, 'compressed_bytes': 0})
+
+    def record(self, endpoint, original, compressed):
+        with self._lock:
+            row = self._data[endpoint]
+            row['responses'] += 1
+            row['original_bytes'] += original
+            row['compressed_bytes'] += compressed
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                endpoint: dict(row, saved_bytes=row['original_bytes'] - row['compressed_bytes'])
+                for endpoint, row in self._data.items()
+            }
+
+    def reset(self):
+        with self._lock:
+            self._data.clear()
+
+
+compression_stats = CompressionStats()
+
+
+class ResponseCompressionMiddleware:
+    """
+    Accept-Encoding အရ br (brotli ထည့်ထားလျှင်) သို့မဟုတ် gzip ဖြင့် API response များကို ချုံ့ပေးသည်။
+
+    - RESPONSE_COMPRESSION_MIN_SIZE ထက်ငယ်သော body များကို မချုံ့ပါ (overhead ပိုများလို့)
+    - RESPONSE_COMPRESSION_PATHS ဖြင့် စတင်သော path များကိုသာ ချုံ့သည် (static/media ကို WhiteNoise/web server က ကိုင်တွယ်)
+    - streaming response နှင့် ချုံ့ပြီးသား response များကို မထိပါ
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.min_size = getattr(settings, 'RESPONSE_COMPRESSION_MIN_SIZE', 1024)
+        self.paths = tuple(getattr(settings, 'RESPONSE_COMPRESSION_PATHS', ('/api/',)))
+        self.gzip_level = getattr(settings, 'RESPONSE_COMPRESSION_GZIP_LEVEL', 6)
+        self.brotli_quality = getattr(settings, 'RESPONSE_COMPRESSION_BROTLI_QUALITY', 5)
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        if not request.path.startswith(self.paths):
+            return response
+        return self.process_response(request, response)
+
+    def _encoding_for(self, request):
+        accept = request.META.get('HTTP_ACCEPT_ENCODING', '')
+        if brotli is not None and re_accepts_br.search(accept):
+            return 'br'
+        if re_accepts_gzip.search(accept):
+            return 'gzip'
+        return None
+
+    def process_response(self, request, response):
+        if response.streaming or response.has_header('Content-Encoding'):
+            return response
+        content_type = response.get('Content-Type', '')
+        if not content_type.startswith(COMPRESSIBLE_TYPES):
+            return response
+
+        # Encoding မည်သို့ပင်ရွေးရွေး cache များအတွက် Vary ကို အမြဲထည့်
+        patch_vary_headers(response, ('Accept-Encoding',))
+
+        original_size = len(response.content)
+        if original_size < self.min_size:
+            return response
+
+        encoding = self._encoding_for(request)
+        if encoding is None:
+            return response
+
+        if encoding == 'br':
+            compressed = brotli.compress(response.content, quality=self.brotli_quality)
+        else:
+            compressed = gzip.compress(response.content, compresslevel=self.gzip_level, mtime=0)
+        if len(compressed) >= original_size:
+            return response
+
+        response.content = compressed
+        response['Content-Length'] = str(len(compressed))
+        response['X-Uncompressed-Length'] = str(original_size)
+        response['Content-Encoding'] = encoding
+        # ETag ကို weak အဖြစ်ပြောင်း (body bytes ပြောင်းသွားလို့)
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            response['ETag'] = 'W/' + etag
+
+        match = getattr(request, 'resolver_match', None)
+        endpoint = (match.view_name if match else None) or UNRESOLVED_ENDPOINT
+        compression_stats.record(endpoint, original_size, len(compressed))
+        logger.debug(
+            '%s %s: %d -> %d bytes (%s)', request.method, endpoint, original_size, len(compressed), encoding
+        )
+        return response
+
+
+class RequestProfilingMiddleware:
+    """
+    Opt-in request profiler (sheets/profiling.py) — staff ၏ `X-Sheets-Profile` header / `?_profile=` သို့
+    SHEETS_PROFILE_SAMPLE_RATE ဖြင့် ရွေးသော request များကိုသာ profile လုပ်ပြီး RequestProfile အဖြစ် သိမ်းသည်။
+    AuthenticationMiddleware နောက်တွင် ထားပါ (session user ကို သုံးရန်)။
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.sample_rate = profiling.sample_rate()
+
+    def __call__(self, request):
+        mode = profiling.requested_mode(request)
+        sampled = False
+        if mode is not None and not profiling.is_allowed(request):
+            mode = None
+        if mode is None and self.sample_rate and random.random() < self.sample_rate:
+            mode, sampled = 'sample', True
+        if mode is None:
+            return self.get_response(request)
+
+        with profiling.Profile(request, mode, sampled=sampled) as profile:
+            response = self.get_response(request)
+        saved = profile.save(response)
+        response['X-Request-ID'] = profile.request_id
+        if saved is not None:
+            response['X-Sheets-Profile-ID'] = str(saved.pk)
+        return response
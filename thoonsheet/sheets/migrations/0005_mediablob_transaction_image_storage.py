@@ -0,0 +1,36 @@
+# Generated by Django 5.2.4 on 2026-10-19 15:14
+
+import sheets.storage
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sheets', '0004_alter_auditentry_options_alter_group_options_and_more'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='transaction',
+            name='image',
+            field=models.ImageField(blank=True, null=True, storage=sheets.storage.receipt_storage, upload_to='transaction_images/', verbose_name='ပုံ'),
+        ),
+        migrations.CreateModel(
+            name='MediaBlob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('digest', models.CharField(db_index=True, max_length=64, verbose_name='Hash (sha256)')),
+                ('name', models.CharField(max_length=255, unique=True, verbose_name='ဖိုင်အမည်')),
+                ('size', models.PositiveBigIntegerField(default=0, verbose_name='အရွယ်အစား (bytes)')),
+                ('ref_count', models.PositiveIntegerField(default=0, verbose_name='ရည်ညွှန်းမှုအရေအတွက်')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='ဖန်တီးသည့်အချိန်')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='နောက်ဆုံးပြင်ဆင်သည့်အချိန်')),
+            ],
+            options={
+                'verbose_name': 'Media blob',
+                'verbose_name_plural': 'Media blobs',
+                'indexes': [models.Index(fields=['ref_count', 'updated_at'], name='sheets_blob_gc_idx')],
+            },
+        ),
+    ]
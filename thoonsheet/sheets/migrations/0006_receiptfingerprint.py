@@ -0,0 +1,33 @@
+# Generated by Django 5.2.4 on 2026-10-19 15:15
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sheets', '0005_mediablob_transaction_image_storage'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ReceiptFingerprint',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('image_name', models.CharField(max_length=255, verbose_name='ပုံအမည်')),
+                ('dhash', models.BigIntegerField(verbose_name='dHash')),
+                ('band_0', models.IntegerField(db_index=True)),
+                ('band_1', models.IntegerField(db_index=True)),
+                ('band_2', models.IntegerField(db_index=True)),
+                ('band_3', models.IntegerField(db_index=True)),
+                ('duplicate_ids', models.JSONField(blank=True, default=list, verbose_name='တူညီနိုင်သော မှတ်တမ်းများ')),
+                ('computed_at', models.DateTimeField(auto_now=True, verbose_name='တွက်ချက်သည့်အချိန်')),
+                ('transaction', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='receipt_fingerprint', to='sheets.transaction', verbose_name='မှတ်တမ်း')),
+            ],
+            options={
+                'verbose_name': 'Receipt fingerprint',
+                'verbose_name_plural': 'Receipt fingerprints',
+            },
+        ),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 5.2.4 on 2026-10-19 15:17
+
+import django.db.models.deletion
+import uuid
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sheets', '0006_receiptfingerprint'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UploadSession',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('filename', models.CharField(max_length=100, verbose_name='ဖိုင်အမည်')),
+                ('size', models.PositiveBigIntegerField(verbose_name='အရွယ်အစား (bytes)')),
+                ('received', models.PositiveBigIntegerField(default=0, verbose_name='လက်ခံပြီး (bytes)')),
+                ('status', models.CharField(choices=[('open', 'တင်နေဆဲ'), ('complete', 'ပြီးဆုံး'), ('attached', 'မှတ်တမ်းနှင့် ချိတ်ပြီး')], default='open', max_length=10, verbose_name='အခြေအနေ')),
+                ('blob_name', models.CharField(blank=True, default='', max_length=255, verbose_name='သိမ်းဆည်းထားသောအမည်')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='ဖန်တီးသည့်အချိန်')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='နောက်ဆုံးပြင်ဆင်သည့်အချိန်')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='upload_sessions', to=settings.AUTH_USER_MODEL, verbose_name='တင်သူ')),
+            ],
+            options={
+                'verbose_name': 'Upload session',
+                'verbose_name_plural': 'Upload sessions',
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['status', 'updated_at'], name='sheets_upload_status_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,46 @@
+# Generated by Django 5.2.4 on 2026-10-19 15:18
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sheets', '0007_uploadsession'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Job',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(db_index=True, max_length=64, verbose_name='အမျိုးအစား')),
+                ('payload', models.JSONField(blank=True, default=dict, verbose_name='Payload')),
+                ('status', models.CharField(choices=[('queued', 'တန်းစီထား'), ('running', 'လုပ်ဆောင်နေဆဲ'), ('succeeded', 'အောင်မြင်'), ('failed', 'မအောင်မြင်'), ('cancelled', 'ပယ်ဖျက်')], default='queued', max_length=10, verbose_name='အခြေအနေ')),
+                ('priority', models.SmallIntegerField(default=0, verbose_name='ဦးစားပေးမှု')),
+                ('attempts', models.PositiveSmallIntegerField(default=0, verbose_name='ကြိုးစားခဲ့သည့်အကြိမ်')),
+                ('max_attempts', models.PositiveSmallIntegerField(default=3, verbose_name='အများဆုံးကြိုးစားမည့်အကြိမ်')),
+                ('progress', models.FloatField(default=0.0, verbose_name='တိုးတက်မှု (0-1)')),
+                ('progress_message', models.CharField(blank=True, default='', max_length=255, verbose_name='တိုးတက်မှုမှတ်ချက်')),
+                ('result', models.JSONField(blank=True, null=True, verbose_name='ရလဒ်')),
+                ('error', models.TextField(blank=True, default='', verbose_name='Error')),
+                ('run_after', models.DateTimeField(default=django.utils.timezone.now, verbose_name='စတင်နိုင်သည့်အချိန်')),
+                ('locked_by', models.CharField(blank=True, default='', max_length=100, verbose_name='Worker')),
+                ('locked_at', models.DateTimeField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='ဖန်တီးသည့်အချိန်')),
+                ('started_at', models.DateTimeField(blank=True, null=True, verbose_name='စတင်သည့်အချိန်')),
+                ('finished_at', models.DateTimeField(blank=True, null=True, verbose_name='ပြီးဆုံးသည့်အချိန်')),
+                ('created_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='sheets_jobs', to=settings.AUTH_USER_MODEL, verbose_name='တန်းစီသူ')),
+            ],
+            options={
+                'verbose_name': 'Background job',
+                'verbose_name_plural': 'Background jobs',
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['status', 'run_after', 'priority'], name='sheets_job_queue_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,93 @@
+# sheets/migrations/0009_search_index.py
+# Full-text search index (sheets.search) — FTS5 virtual table / Postgres tsvector table
+# sheets.search နောင်ပြောင်းလဲလည်း ဤ migration ၏ ရလဒ် မပြောင်းစေရန် DDL၊ tokenizer နှင့် ဝဏ္ဏ ခွဲပုံကို ဤနေရာတွင် freeze ထားသည်
+
+import re
+
+from django.db import migrations
+
+TABLE = 'sheets_search'
+KIND_CODES = {'transaction': 1, 'audit_entry': 2, 'group': 3, 'payment_account': 4}
+KIND_SLOTS = 8
+BATCH_SIZE = 1000
+
+FTS5_TOKENIZER = "unicode61 remove_diacritics 0 categories 'L* N* Co M*'"
+
+SQLITE_DDL = [
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {TABLE} USING fts5("
+    f"title, body, kind UNINDEXED, object_id UNINDEXED, user_id UNINDEXED, "
+    f"tokenize=\"{FTS5_TOKENIZER}\")",
+]
+POSTGRES_DDL = [
+    f"CREATE TABLE IF NOT EXISTS {TABLE} ("
+    f"rowid bigint PRIMARY KEY, kind varchar(20) NOT NULL, object_id bigint NOT NULL, user_id bigint NULL, "
+    f"title text NOT NULL DEFAULT '', body text NOT NULL DEFAULT '', "
+    f"document tsvector GENERATED ALWAYS AS ("
+    f"setweight(to_tsvector('simple', title), 'A') || setweight(to_tsvector('simple', body), 'B')) STORED)",
+    f"CREATE INDEX IF NOT EXISTS {TABLE}_document_idx ON {TABLE} USING GIN (document)",
+]
+INSERT_SQL = f"INSERT INTO {TABLE} (rowid, title, body, kind, object_id, user_id) VALUES (%s, %s, %s, %s, %s, %s)"
+
+ZWSP = '\u200b'
+re_myanmar_run = re.compile(r'[က-႟ꩠ-ꩿ]+')
+re_syllable_start = re.compile(r'(?<!္)([က-အ](?![်္])|[ဣ-ဪဿ၌-၏၀-၉၊။])')
+
+
+def segment(text):
+    if not text:
+        return ''
+    return re_myanmar_run.sub(
+        lambda m: re_syllable_start.sub(ZWSP + r'\1', m.group(0)).lstrip(ZWSP), text,
+    )
+
+
+def documents(apps, db):
+    """(rowid, title, body, kind, object_id, user_id) — ဤအချိန်က historical model များမှ"""
+    sources = [
+        ('group', 'group', lambda o: (None, f'{o.group_title} {o.name}', o.group_type or '')),
+        ('paymentaccount', 'payment_account', lambda o: (
+            None, o.payment_account_name, ' '.join(filter(None, [o.payment_account_type, o.bank_name])),
+        )),
+        ('auditentry', 'audit_entry', lambda o: (o.auditor_id, '', o.remarks or '')),
+        ('transaction', 'transaction', lambda o: (o.submitted_by_id, o.transfer_id_last_6_digits, o.owner_notes or '')),
+    ]
+    for model_name, kind, document in sources:
+        model = apps.get_model('sheets', model_name)
+        for obj in model.objects.using(db).order_by('pk').iterator(chunk_size=BATCH_SIZE):
+            user_id, title, body = document(obj)
+            yield [obj.pk * KIND_SLOTS + KIND_CODES[kind], segment(title), segment(body), kind, obj.pk, user_id]
+
+
+def create_index(apps, schema_editor):
+    connection = schema_editor.connection
+    ddl = {'sqlite': SQLITE_DDL, 'postgresql': POSTGRES_DDL}.get(connection.vendor)
+    if ddl is None:
+        return
+    for sql in ddl:
+        schema_editor.execute(sql)
+    # ရှိပြီးသား data များကို index ထဲ ထည့်
+    rows = []
+    with connection.cursor() as cursor:
+        for row in documents(apps, connection.alias):
+            rows.append(row)
+            if len(rows) >= BATCH_SIZE:
+                cursor.executemany(INSERT_SQL, rows)
+                rows = []
+        if rows:
+            cursor.executemany(INSERT_SQL, rows)
+
+
+def drop_index(apps, schema_editor):
+    if schema_editor.connection.vendor in ('sqlite', 'postgresql'):
+        schema_editor.execute(f"DROP TABLE IF EXISTS {TABLE}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sheets', '0008_job'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_index, drop_index),
+    ]
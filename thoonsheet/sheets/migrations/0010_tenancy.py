@@ -0,0 +1,154 @@
+# Generated by Django 5.2.4 on 2026-10-19 15:24
+
+import re
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+
+# Search index (owner_id column ပါ) — sheets.search ပြောင်းလဲလည်း ဤ migration ၏ ရလဒ် မပြောင်းစေရန် freeze
+SEARCH_TABLE = 'sheets_search'
+KIND_CODES = {'transaction': 1, 'audit_entry': 2, 'group': 3, 'payment_account': 4}
+KIND_SLOTS = 8
+BATCH_SIZE = 1000
+
+FTS5_TOKENIZER = "unicode61 remove_diacritics 0 categories 'L* N* Co M*'"
+
+SQLITE_DDL = [
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {SEARCH_TABLE} USING fts5("
+    f"title, body, kind UNINDEXED, object_id UNINDEXED, owner_id UNINDEXED, user_id UNINDEXED, "
+    f"tokenize=\"{FTS5_TOKENIZER}\")",
+]
+POSTGRES_DDL = [
+    f"CREATE TABLE IF NOT EXISTS {SEARCH_TABLE} ("
+    f"rowid bigint PRIMARY KEY, kind varchar(20) NOT NULL, object_id bigint NOT NULL, "
+    f"owner_id bigint NULL, user_id bigint NULL, "
+    f"title text NOT NULL DEFAULT '', body text NOT NULL DEFAULT '', "
+    f"document tsvector GENERATED ALWAYS AS ("
+    f"setweight(to_tsvector('simple', title), 'A') || setweight(to_tsvector('simple', body), 'B')) STORED)",
+    f"CREATE INDEX IF NOT EXISTS {SEARCH_TABLE}_document_idx ON {SEARCH_TABLE} USING GIN (document)",
+    f"CREATE INDEX IF NOT EXISTS {SEARCH_TABLE}_owner_idx ON {SEARCH_TABLE} (owner_id, kind)",
+]
+INSERT_SQL = (
+    f"INSERT INTO {SEARCH_TABLE} (rowid, title, body, kind, object_id, owner_id, user_id) "
+    f"VALUES (%s, %s, %s, %s, %s, %s, %s)"
+)
+
+ZWSP = '\u200b'
+re_myanmar_run = re.compile(r'[က-႟ꩠ-ꩿ]+')
+re_syllable_start = re.compile(r'(?<!္)([က-အ](?![်္])|[ဣ-ဪဿ၌-၏၀-၉၊။])')
+
+
+def segment(text):
+    if not text:
+        return ''
+    return re_myanmar_run.sub(
+        lambda m: re_syllable_start.sub(ZWSP + r'\1', m.group(0)).lstrip(ZWSP), text,
+    )
+
+
+def backfill_owner(apps, schema_editor):
+    Group = apps.get_model('sheets', 'Group')
+    Transaction = apps.get_model('sheets', 'Transaction')
+    AuditEntry = apps.get_model('sheets', 'AuditEntry')
+    User = apps.get_model(*settings.AUTH_USER_MODEL.split('.'))
+    db = schema_editor.connection.alias
+
+    group_owner = Subquery(Group.objects.using(db).filter(pk=OuterRef('group_id')).values('owner_id')[:1])
+    Transaction.objects.using(db).update(owner_id=group_owner)
+    AuditEntry.objects.using(db).update(owner_id=group_owner)
+
+    # Auditor များ၏ owner — အများဆုံး တင်ပြခဲ့သော group များ၏ owner; မှတ်တမ်းမရှိပြီး owner တစ်ဦးတည်းရှိလျှင် ၎င်း
+    owners = list(User.objects.using(db).filter(user_type='owner').values_list('pk', flat=True)[:2])
+    for auditor in User.objects.using(db).filter(user_type='auditor', owner__isnull=True):
+        top = (
+            Transaction.objects.using(db).filter(submitted_by_id=auditor.pk).values('owner_id')
+            .annotate(n=Count('id')).order_by('-n').first()
+        ) or (
+            AuditEntry.objects.using(db).filter(auditor_id=auditor.pk).values('owner_id')
+            .annotate(n=Count('id')).order_by('-n').first()
+        )
+        owner_id = top['owner_id'] if top else (owners[0] if len(owners) == 1 else None)
+        if owner_id is not None:
+            User.objects.using(db).filter(pk=auditor.pk).update(owner_id=owner_id)
+
+
+def search_documents(apps, db):
+    """(rowid, title, body, kind, object_id, owner_id, user_id) — ဤအချိန်က historical model များမှ"""
+    sources = [
+        ('group', 'group', lambda o: (None, f'{o.group_title} {o.name}', o.group_type or '')),
+        ('paymentaccount', 'payment_account', lambda o: (
+            None, o.payment_account_name, ' '.join(filter(None, [o.payment_account_type, o.bank_name])),
+        )),
+        ('auditentry', 'audit_entry', lambda o: (o.auditor_id, '', o.remarks or '')),
+        ('transaction', 'transaction', lambda o: (o.submitted_by_id, o.transfer_id_last_6_digits, o.owner_notes or '')),
+    ]
+    for model_name, kind, document in sources:
+        model = apps.get_model('sheets', model_name)
+        for obj in model.objects.using(db).order_by('pk').iterator(chunk_size=BATCH_SIZE):
+            user_id, title, body = document(obj)
+            yield [
+                obj.pk * KIND_SLOTS + KIND_CODES[kind], segment(title), segment(body), kind, obj.pk,
+                obj.owner_id, user_id,
+            ]
+
+
+def rebuild_search_index(apps, schema_editor):
+    # owner_id column ထည့်ရန် index ကို ပြန်တည်
+    connection = schema_editor.connection
+    ddl = {'sqlite': SQLITE_DDL, 'postgresql': POSTGRES_DDL}.get(connection.vendor)
+    if ddl is None:
+        return
+    schema_editor.execute(f"DROP TABLE IF EXISTS {SEARCH_TABLE}")
+    for sql in ddl:
+        schema_editor.execute(sql)
+    rows = []
+    with connection.cursor() as cursor:
+        for row in search_documents(apps, connection.alias):
+            rows.append(row)
+            if len(rows) >= BATCH_SIZE:
+                cursor.executemany(INSERT_SQL, rows)
+                rows = []
+        if rows:
+            cursor.executemany(INSERT_SQL, rows)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sheets', '0009_search_index'),
+        ('accounts', '0003_user_owner'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='auditentry',
+            name='owner',
+            field=models.ForeignKey(db_index=False, editable=False, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='sheets_owned_audit_entries', to=settings.AUTH_USER_MODEL, verbose_name='ပိုင်ရှင်'),
+        ),
+        migrations.AddField(
+            model_name='transaction',
+            name='owner',
+            field=models.ForeignKey(db_index=False, editable=False, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='sheets_owned_transactions', to=settings.AUTH_USER_MODEL, verbose_name='ပိုင်ရှင်'),
+        ),
+        migrations.RunPython(backfill_owner, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='auditentry',
+            index=models.Index(fields=['owner', '-created_at'], name='sheets_audit_owner_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='transaction',
+            index=models.Index(fields=['owner', '-submitted_at'], name='sheets_tx_owner_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='transaction',
+            index=models.Index(fields=['owner', 'status', '-submitted_at'], name='sheets_tx_owner_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='transaction',
+            index=models.Index(fields=['owner', 'transfer_id_last_6_digits'], name='sheets_tx_owner_tid_idx'),
+        ),
+        migrations.RunPython(rebuild_search_index, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 5.2.4 on 2026-10-19 15:36
+
+import django.core.serializers.json
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sheets', '0010_tenancy'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='IdempotencyKey',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('key', models.CharField(max_length=64, verbose_name='Idempotency key')),
+                ('operation', models.CharField(max_length=20, verbose_name='Operation')),
+                ('request_hash', models.CharField(max_length=64, verbose_name='Request hash')),
+                ('status_code', models.PositiveSmallIntegerField(verbose_name='HTTP status')),
+                ('response', models.JSONField(encoder=django.core.serializers.json.DjangoJSONEncoder, verbose_name='Response')),
+                ('created_at', models.DateTimeField(auto_now_add=True, db_index=True, verbose_name='ဖန်တီးသည့်အချိန်')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='sheets_idempotency_keys', to=settings.AUTH_USER_MODEL, verbose_name='User')),
+            ],
+            options={
+                'verbose_name': 'Idempotency key',
+                'verbose_name_plural': 'Idempotency keys',
+                'constraints': [models.UniqueConstraint(fields=('user', 'key'), name='sheets_idempotency_user_key_uniq')],
+            },
+        ),
+    ]
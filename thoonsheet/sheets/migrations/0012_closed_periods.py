@@ -0,0 +1,57 @@
+# Generated by Django 5.2.4 on 2026-10-19 15:42
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sheets', '0011_idempotencykey'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ClosedPeriod',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('period', models.DateField(verbose_name='လ')),
+                ('closed_at', models.DateTimeField(auto_now_add=True, verbose_name='ပိတ်သည့်အချိန်')),
+                ('closed_by', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL, verbose_name='ပိတ်သူ')),
+                ('owner', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='sheets_closed_periods', to=settings.AUTH_USER_MODEL, verbose_name='ပိုင်ရှင်')),
+            ],
+            options={
+                'verbose_name': 'ပိတ်ပြီးသောလ',
+                'verbose_name_plural': 'ပိတ်ပြီးသောလများ',
+                'ordering': ['-period'],
+            },
+        ),
+        migrations.CreateModel(
+            name='BalanceSnapshot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('income', models.DecimalField(decimal_places=2, default=0, max_digits=18, verbose_name='ဝင်ငွေ (အတည်ပြုပြီး)')),
+                ('expense', models.DecimalField(decimal_places=2, default=0, max_digits=18, verbose_name='ထွက်ငွေ (အတည်ပြုပြီး)')),
+                ('rejected_income', models.DecimalField(decimal_places=2, default=0, max_digits=18, verbose_name='ဝင်ငွေ (ပယ်ချပြီး)')),
+                ('rejected_expense', models.DecimalField(decimal_places=2, default=0, max_digits=18, verbose_name='ထွက်ငွေ (ပယ်ချပြီး)')),
+                ('group', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='sheets.group', verbose_name='အဖွဲ့')),
+                ('owner', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL, verbose_name='ပိုင်ရှင်')),
+                ('payment_account', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='sheets.paymentaccount', verbose_name='ငွေပေးချေမှုအကောင့်')),
+                ('period', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='snapshots', to='sheets.closedperiod', verbose_name='လ')),
+            ],
+            options={
+                'verbose_name': 'Balance snapshot',
+                'verbose_name_plural': 'Balance snapshots',
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='closedperiod',
+            constraint=models.UniqueConstraint(fields=('owner', 'period'), name='sheets_closed_period_owner_uniq'),
+        ),
+        migrations.AddConstraint(
+            model_name='balancesnapshot',
+            constraint=models.UniqueConstraint(fields=('period', 'group', 'payment_account'), name='sheets_snapshot_period_uniq'),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.4 on 2026-10-19 15:43
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sheets', '0012_closed_periods'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='transaction',
+            index=models.Index(fields=['payment_account', 'status', 'transaction_date', 'id'], name='sheets_tx_account_stmt_idx'),
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.2.4 on 2026-10-19 15:47
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sheets', '0013_transaction_statement_index'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='transaction',
+            name='risk_flags',
+            field=models.PositiveSmallIntegerField(default=0, editable=False, verbose_name='Risk flags'),
+        ),
+        migrations.AddField(
+            model_name='transaction',
+            name='risk_score',
+            field=models.FloatField(blank=True, editable=False, null=True, verbose_name='Risk score'),
+        ),
+        migrations.AddIndex(
+            model_name='transaction',
+            index=models.Index(fields=['owner', 'status', '-risk_score'], name='sheets_tx_owner_risk_idx'),
+        ),
+    ]
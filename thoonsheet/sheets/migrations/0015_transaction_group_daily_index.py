@@ -0,0 +1,19 @@
+# Generated by Django 5.2.4 on 2026-10-19 15:59
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sheets', '0014_transaction_risk_score'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='transaction',
+            index=models.Index(fields=['group', 'status', 'transaction_date', 'transaction_type', 'amount'], name='sheets_tx_group_daily_idx'),
+        ),
+    ]
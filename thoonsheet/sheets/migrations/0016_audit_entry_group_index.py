@@ -0,0 +1,25 @@
+# Generated by Django 5.2.4 on 2026-10-19 16:03
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sheets', '0015_transaction_group_daily_index'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='auditentry',
+            index=models.Index(fields=['group', '-created_at'], name='sheets_audit_group_idx'),
+        ),
+        migrations.AlterField(
+            model_name='auditentry',
+            name='group',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, to='sheets.group', verbose_name='အဖွဲ့'),
+        ),
+    ]
@@ -0,0 +1,48 @@
+# Generated by Django 5.2.4 on 2026-10-19 16:09
+
+import django.db.models.deletion
+import sheets.storage
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sheets', '0016_audit_entry_group_index'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='closedperiod',
+            name='archived_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True, verbose_name='Archive လုပ်သည့်အချိန်'),
+        ),
+        migrations.CreateModel(
+            name='ArchivedTransaction',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False, verbose_name='ID')),
+                ('transaction_date', models.DateField(verbose_name='ငွေပေးချေမှုနေ့စွဲ')),
+                ('transfer_id_last_6_digits', models.CharField(max_length=6, verbose_name='Transaction ID (နောက်ဆုံး ၆ လုံး)')),
+                ('amount', models.DecimalField(decimal_places=2, max_digits=15, verbose_name='ပမာဏ')),
+                ('transaction_type', models.CharField(choices=[('income', 'ဝင်ငွေ'), ('expense', 'ထွက်ငွေ')], max_length=10, verbose_name='မှတ်တမ်းအမျိုးအစား')),
+                ('image', models.ImageField(blank=True, null=True, storage=sheets.storage.receipt_storage, upload_to='transaction_images/', verbose_name='ပုံ')),
+                ('submitted_at', models.DateTimeField(verbose_name='တင်ပြသည့်အချိန်')),
+                ('status', models.CharField(choices=[('pending', 'စောင့်ဆိုင်းဆဲ'), ('approved', 'အတည်ပြုပြီး'), ('rejected', 'ပယ်ချပြီး')], default='approved', max_length=10, verbose_name='အခြေအနေ')),
+                ('approved_by_owner_at', models.DateTimeField(blank=True, null=True, verbose_name='ပိုင်ရှင်မှအတည်ပြုသည့်အချိန်')),
+                ('owner_notes', models.TextField(blank=True, null=True, verbose_name='ပိုင်ရှင်မှတ်ချက်')),
+                ('archived_at', models.DateTimeField(auto_now_add=True, verbose_name='Archive လုပ်သည့်အချိန်')),
+                ('group', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='sheets.group', verbose_name='အဖွဲ့')),
+                ('owner', models.ForeignKey(db_index=False, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL, verbose_name='ပိုင်ရှင်')),
+                ('payment_account', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='sheets.paymentaccount', verbose_name='ငွေပေးချေမှုအကောင့်')),
+                ('submitted_by', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL, verbose_name='တင်ပြသူ')),
+            ],
+            options={
+                'verbose_name': 'Archive ငွေပေးချေမှုမှတ်တမ်း',
+                'verbose_name_plural': 'Archive ငွေပေးချေမှုမှတ်တမ်းများ',
+                'ordering': ['-transaction_date', '-id'],
+                'indexes': [models.Index(fields=['owner', 'transaction_date'], name='sheets_arch_owner_date_idx'), models.Index(fields=['owner', 'transfer_id_last_6_digits'], name='sheets_arch_owner_tid_idx'), models.Index(fields=['payment_account', 'transaction_date', 'id'], name='sheets_arch_account_idx'), models.Index(fields=['group', 'transaction_date', 'transaction_type', 'amount'], name='sheets_arch_group_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 5.2.4 on 2026-10-19 16:13
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sheets', '0017_archived_transaction'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='mediablob',
+            name='pack',
+            field=models.CharField(blank=True, default='', max_length=64, verbose_name='Pack ဖိုင်'),
+        ),
+        migrations.AddField(
+            model_name='mediablob',
+            name='pack_codec',
+            field=models.CharField(blank=True, default='', max_length=8, verbose_name='Pack codec'),
+        ),
+        migrations.AddField(
+            model_name='mediablob',
+            name='pack_length',
+            field=models.PositiveBigIntegerField(blank=True, null=True, verbose_name='Pack ထဲရှိ အရွယ်အစား (bytes)'),
+        ),
+        migrations.AddField(
+            model_name='mediablob',
+            name='pack_offset',
+            field=models.PositiveBigIntegerField(blank=True, null=True, verbose_name='Pack offset'),
+        ),
+        migrations.AddIndex(
+            model_name='mediablob',
+            index=models.Index(fields=['pack', 'created_at'], name='sheets_blob_pack_idx'),
+        ),
+    ]
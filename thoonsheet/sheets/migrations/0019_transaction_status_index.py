@@ -0,0 +1,19 @@
+# Generated by Django 5.2.4 on 2026-10-19 16:17
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sheets', '0018_media_blob_pack'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='transaction',
+            index=models.Index(fields=['status', '-id'], name='sheets_tx_status_idx'),
+        ),
+    ]
@@ -0,0 +1,41 @@
+# Generated by Django 5.2.4 on 2026-10-19 16:20
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sheets', '0019_transaction_status_index'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RequestProfile',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('request_id', models.CharField(max_length=64, unique=True, verbose_name='Request ID')),
+                ('method', models.CharField(max_length=10, verbose_name='Method')),
+                ('path', models.CharField(max_length=500, verbose_name='Path')),
+                ('view_name', models.CharField(blank=True, default='', max_length=200, verbose_name='View')),
+                ('status_code', models.PositiveSmallIntegerField(blank=True, null=True, verbose_name='HTTP status')),
+                ('mode', models.CharField(choices=[('sample', 'Sampling'), ('cprofile', 'Deterministic (cProfile)')], default='sample', max_length=10, verbose_name='Profiler')),
+                ('sampled', models.BooleanField(default=False, verbose_name='Sample rate ဖြင့် ရွေးခဲ့')),
+                ('duration_ms', models.FloatField(default=0, verbose_name='ကြာချိန် (ms)')),
+                ('sql_count', models.PositiveIntegerField(default=0, verbose_name='SQL အရေအတွက်')),
+                ('sql_ms', models.FloatField(default=0, verbose_name='SQL ကြာချိန် (ms)')),
+                ('data', models.JSONField(blank=True, default=dict, verbose_name='Profile')),
+                ('pstats', models.BinaryField(blank=True, null=True, verbose_name='cProfile stats')),
+                ('created_at', models.DateTimeField(auto_now_add=True, db_index=True, verbose_name='ဖန်တီးသည့်အချိန်')),
+                ('user', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL, verbose_name='User')),
+            ],
+            options={
+                'verbose_name': 'Request profile',
+                'verbose_name_plural': 'Request profiles',
+                'ordering': ['-created_at'],
+            },
+        ),
+    ]
@@ -1,10 +1,39 @@
 # sheets/models.py
 
+import uuid
+
+from django.core.serializers.json import DjangoJSONEncoder
 from django.db import models
+from django.utils import timezone
 from django.contrib.auth import get_user_model
 
+from .storage import receipt_storage
+
 User = get_user_model()
 
+
+class TenantQuerySet(models.QuerySet):
+    """
+    Owner (tenant) အလိုက် scope — `owner` column (index ရှိ) တစ်ခုတည်းဖြင့် filter လုပ်သောကြောင့်
+    group.owner သို့ join မလိုဘဲ owner တစ်ဦး၏ data range ကိုသာ ဖတ်သည်။
+    """
+
+    def for_owner(self, owner_id):
+        return self.filter(owner_id=owner_id)
+
+    def for_user(self, user):
+        if user is None or not user.is_authenticated:
+            return self.none()
+        if user.is_superuser:
+            return self
+        tenant_id = getattr(user, 'tenant_id', None)
+        if tenant_id is None:
+            return self.none()
+        return self.for_owner(tenant_id)
+
+
+TenantManager = models.Manager.from_queryset(TenantQuerySet)
+
 class Group(models.Model):
     owner = models.ForeignKey(User, on_delete=models.CASCADE, limit_choices_to={'user_type': 'owner'}, verbose_name="ပိုင်ရှင်")
     group_title = models.CharField(max_length=255, verbose_name="အဖွဲ့ခေါင်းစဉ်")
@@ -13,31 +42,60 @@ class Group(models.Model):
     created_at = models.DateTimeField(auto_now_add=True, verbose_name="ဖန်တီးသည့်အချိန်")
     updated_at = models.DateTimeField(auto_now=True, verbose_name="နောက်ဆုံးပြင်ဆင်သည့်အချိန်")
 
+    objects = TenantManager()
+
     class Meta:
         verbose_name = "အဖွဲ့"
         verbose_name_plural = "အဖွဲ့များ"
         ordering = ['name']
 
     def __str__(self):
-        owner_username = self.owner.username if self.owner else "N/A"
         return f"{self.group_title} ({self.group_type}) - Name: {self.name}"
 
+    def save(self, *args, **kwargs):
+        # _original_owner_id — DB မှ load လုပ်ချိန်က owner (sheets/signals.py; အသစ်ဆိုလျှင် child row မရှိ)
+        owner_changed = not self._state.adding and getattr(self, '_original_owner_id', None) != self.owner_id
+        super().save(*args, **kwargs)
+        if owner_changed:
+            # owner ပြောင်းသွားလျှင် denormalized owner ကို လိုက်ပြင်
+            Transaction.objects.filter(group=self).exclude(owner_id=self.owner_id).update(owner_id=self.owner_id)
+            AuditEntry.objects.filter(group=self).exclude(owner_id=self.owner_id).update(owner_id=self.owner_id)
+        self._original_owner_id = self.owner_id
+
 class AuditEntry(models.Model):
-    group = models.ForeignKey(Group, on_delete=models.CASCADE, verbose_name="အဖွဲ့")
+    # index ကို Meta.indexes (group, created_at) က ပေးသည်
+    group = models.ForeignKey(Group, on_delete=models.CASCADE, db_index=False, verbose_name="အဖွဲ့")
     auditor = models.ForeignKey(User, on_delete=models.CASCADE, limit_choices_to={'user_type': 'auditor'}, verbose_name="စစ်ဆေးသူ")
     receivable_amount = models.DecimalField(max_digits=10, decimal_places=2, default=0.00, verbose_name="ရရန်ပမာဏ")
     payable_amount = models.DecimalField(max_digits=10, decimal_places=2, default=0.00, verbose_name="ပေးရန်ပမာဏ")
     remarks = models.TextField(blank=True, null=True, verbose_name="မှတ်ချက်")
     created_at = models.DateTimeField(auto_now_add=True, verbose_name="ဖန်တီးသည့်အချိန်")
     last_updated = models.DateTimeField(auto_now=True, verbose_name="နောက်ဆုံးပြင်ဆင်သည့်အချိန်")
+    # group.owner (denormalized) — save() တွင် သတ်မှတ်; index ကို Meta.indexes (owner, created_at) က ပေးသည်
+    owner = models.ForeignKey(
+        User, on_delete=models.CASCADE, null=True, editable=False, db_index=False,
+        related_name='sheets_owned_audit_entries', verbose_name="ပိုင်ရှင်",
+    )
+
+    objects = TenantManager()
 
     def __str__(self):
         return f"Audit by {self.auditor.username} for {self.group.name} on {self.created_at.date()}"
+
+    def save(self, *args, **kwargs):
+        if self.group_id is not None:
+            self.owner_id = self.group.owner_id
+        super().save(*args, **kwargs)
     
     class Meta:
         ordering = ['-created_at']
         verbose_name = "စာရင်းစစ်မှတ်တမ်း"
         verbose_name_plural = "စာရင်းစစ်မှတ်တမ်းများ"
+        indexes = [
+            models.Index(fields=['owner', '-created_at'], name='sheets_audit_owner_idx'),
+            # group အလိုက် ကာလ summary / နောက်ဆုံး entry (audit_summaries, reconciliation)
+            models.Index(fields=['group', '-created_at'], name='sheets_audit_group_idx'),
+        ]
 
 class PaymentAccount(models.Model):
     owner = models.ForeignKey(User, on_delete=models.CASCADE, limit_choices_to={'user_type': 'owner'}, verbose_name="ပိုင်ရှင်")
@@ -49,13 +107,14 @@ class PaymentAccount(models.Model):
     created_at = models.DateTimeField(auto_now_add=True, verbose_name="ဖန်တီးသည့်အချိန်")
     updated_at = models.DateTimeField(auto_now=True, verbose_name="နောက်ဆုံးပြင်ဆင်သည့်အချိန်")
 
+    objects = TenantManager()
+
     class Meta:
         verbose_name = "ငွေပေးချေမှုအကောင့်"
         verbose_name_plural = "ငွေပေးချေမှုအကောင့်များ"
         ordering = ['payment_account_name']
 
     def __str__(self):
-        owner_username = self.owner.username if self.owner else "N/A"
         return f"{self.payment_account_name} ({self.payment_account_type})"
 
 
@@ -80,7 +139,7 @@ class Transaction(models.Model):
     transaction_type = models.CharField(
         max_length=10, choices=TRANSACTION_TYPE_CHOICES, default='income', verbose_name="မှတ်တမ်းအမျိုးအစား"
     )
-    image = models.ImageField(upload_to='transaction_images/', null=True, blank=True, verbose_name="ပုံ") # Make sure this is 'transaction_images/'
+    image = models.ImageField(upload_to='transaction_images/', storage=receipt_storage, null=True, blank=True, verbose_name="ပုံ") # Make sure this is 'transaction_images/'
     submitted_at = models.DateTimeField(auto_now_add=True, verbose_name="တင်ပြသည့်အချိန်")
 
     status = models.CharField(
@@ -88,12 +147,52 @@ class Transaction(models.Model):
     )
     approved_by_owner_at = models.DateTimeField(null=True, blank=True, verbose_name="ပိုင်ရှင်မှအတည်ပြုသည့်အချိန်")
     owner_notes = models.TextField(null=True, blank=True, verbose_name="ပိုင်ရှင်မှတ်ချက်")
+    # group.owner (denormalized) — save() တွင် သတ်မှတ်; index များကို Meta.indexes က ပေးသည်
+    owner = models.ForeignKey(
+        User, on_delete=models.CASCADE, null=True, editable=False, db_index=False,
+        related_name='sheets_owned_transactions', verbose_name="ပိုင်ရှင်",
+    )
+    # owner review queue (sheets/risk.py) — 0–100၊ risk_flags = sheets.risk.FLAG_* bitmask
+    risk_score = models.FloatField(null=True, blank=True, editable=False, verbose_name="Risk score")
+    risk_flags = models.PositiveSmallIntegerField(default=0, editable=False, verbose_name="Risk flags")
+
+    objects = TenantManager()
 
     class Meta:
         unique_together = ('transfer_id_last_6_digits', 'payment_account')
         ordering = ['-submitted_at']
         verbose_name = "Sheets ငွေပေးချေမှုမှတ်တမ်း"
         verbose_name_plural = "Sheets ငွေပေးချေမှုမှတ်တမ်းများ"
+        indexes = [
+            models.Index(fields=['owner', '-submitted_at'], name='sheets_tx_owner_idx'),
+            models.Index(fields=['owner', 'status', '-submitted_at'], name='sheets_tx_owner_status_idx'),
+            models.Index(fields=['owner', 'transfer_id_last_6_digits'], name='sheets_tx_owner_tid_idx'),
+            # payment account statement (sheets/statements.py) — keyset range
+            models.Index(fields=['payment_account', 'status', 'transaction_date', 'id'], name='sheets_tx_account_stmt_idx'),
+            # pending review queue — risk score မြင့်ရာမှ
+            models.Index(fields=['owner', 'status', '-risk_score'], name='sheets_tx_owner_risk_idx'),
+            # group forecast (sheets/forecasting.py) — နေ့စဉ်စုစုပေါင်း (covering)
+            models.Index(fields=['group', 'status', 'transaction_date', 'transaction_type', 'amount'], name='sheets_tx_group_daily_idx'),
+            # admin changelist (sheets/admin.py) — status filter + id အသစ်ဆုံးမှ
+            models.Index(fields=['status', '-id'], name='sheets_tx_status_idx'),
+        ]
+
+    def save(self, *args, **kwargs):
+        if self.group_id is not None:
+            self.owner_id = self.group.owner_id
+        super().save(*args, **kwargs)
+
+    def clean(self):
+        # admin form — လချုပ်ပိတ်ပြီးသော ရက်စွဲ (sheets/periods.py)
+        from django.core.exceptions import ValidationError
+        from .periods import locked_through
+        if self.group_id is None:
+            return
+        until = locked_through(self.group.owner_id)
+        original = Transaction.objects.filter(pk=self.pk).values_list('transaction_date', flat=True).first() if self.pk else None
+        dates = [d for d in (self.transaction_date, original) if d is not None]
+        if until is not None and dates and min(dates) <= until:
+            raise ValidationError({'transaction_date': f"{until:%Y-%m} အထိ လချုပ်ပိတ်ပြီး ဖြစ်သောကြောင့် ဤမှတ်တမ်းကို ပြင်ဆင်၍ မရပါ။"})
 
     def __str__(self):
         return f"{self.payment_account.payment_account_name} - {self.transfer_id_last_6_digits} - {self.amount} ({self.get_transaction_type_display()})"
@@ -110,3 +209,298 @@ class Transaction(models.Model):
     def image_tag(self):
         return mark_safe('<img src="%s" width="520px" height="1400px" />'%(self.image.url))
     image_tag.short_description = 'Image'
+
+
+class ArchivedTransaction(models.Model):
+    """
+    လချုပ်ပိတ်ပြီး ကြာပြီဖြစ်သော approved Transaction (cold) — sheets/archive.py က batch အလိုက် ရွှေ့သည်
+    id ကို မူလ Transaction id အတိုင်း ထားသောကြောင့် hot / archive ကို id ဖြင့် ပေါင်း၍ ရသည်။ ပြင်ဆင်ခြင်း မပြုရ
+    """
+    id = models.BigIntegerField(primary_key=True, verbose_name="ID")
+    submitted_by = models.ForeignKey(User, on_delete=models.CASCADE, related_name='+', verbose_name="တင်ပြသူ")
+    transaction_date = models.DateField(verbose_name="ငွေပေးချေမှုနေ့စွဲ")
+    # group / payment_account / owner — index များကို Meta.indexes က ပေးသည်
+    group = models.ForeignKey(Group, on_delete=models.CASCADE, db_index=False, related_name='+', verbose_name="အဖွဲ့")
+    payment_account = models.ForeignKey(
+        PaymentAccount, on_delete=models.CASCADE, db_index=False, related_name='+', verbose_name="ငွေပေးချေမှုအကောင့်",
+    )
+    transfer_id_last_6_digits = models.CharField(max_length=6, verbose_name="Transaction ID (နောက်ဆုံး ၆ လုံး)")
+    amount = models.DecimalField(max_digits=15, decimal_places=2, verbose_name="ပမာဏ")
+    transaction_type = models.CharField(max_length=10, choices=Transaction.TRANSACTION_TYPE_CHOICES, verbose_name="မှတ်တမ်းအမျိုးအစား")
+    image = models.ImageField(upload_to='transaction_images/', storage=receipt_storage, null=True, blank=True, verbose_name="ပုံ")
+    submitted_at = models.DateTimeField(verbose_name="တင်ပြသည့်အချိန်")
+    status = models.CharField(max_length=10, choices=Transaction.STATUS_CHOICES, default='approved', verbose_name="အခြေအနေ")
+    approved_by_owner_at = models.DateTimeField(null=True, blank=True, verbose_name="ပိုင်ရှင်မှအတည်ပြုသည့်အချိန်")
+    owner_notes = models.TextField(null=True, blank=True, verbose_name="ပိုင်ရှင်မှတ်ချက်")
+    owner = models.ForeignKey(User, on_delete=models.CASCADE, null=True, db_index=False, related_name='+', verbose_name="ပိုင်ရှင်")
+    archived_at = models.DateTimeField(auto_now_add=True, verbose_name="Archive လုပ်သည့်အချိန်")
+
+    objects = TenantManager()
+
+    class Meta:
+        ordering = ['-transaction_date', '-id']
+        verbose_name = "Archive ငွေပေးချေမှုမှတ်တမ်း"
+        verbose_name_plural = "Archive ငွေပေးချေမှုမှတ်တမ်းများ"
+        indexes = [
+            models.Index(fields=['owner', 'transaction_date'], name='sheets_arch_owner_date_idx'),
+            models.Index(fields=['owner', 'transfer_id_last_6_digits'], name='sheets_arch_owner_tid_idx'),
+            # payment account statement (keyset)
+            models.Index(fields=['payment_account', 'transaction_date', 'id'], name='sheets_arch_account_idx'),
+            # group forecast / reconciliation
+            models.Index(fields=['group', 'transaction_date', 'transaction_type', 'amount'], name='sheets_arch_group_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.transfer_id_last_6_digits} - {self.amount} ({self.transaction_date})"
+
+
+class MediaBlob(models.Model):
+    """
+    ContentAddressedStorage မှ သိမ်းထားသော ဖိုင်တစ်ခု (content hash တစ်ခုလျှင် တစ်ခု)
+    ref_count = ဤဖိုင်ကို ရည်ညွှန်းနေသော Transaction အရေအတွက်
+    """
+    digest = models.CharField(max_length=64, db_index=True, verbose_name="Hash (sha256)")
+    name = models.CharField(max_length=255, unique=True, verbose_name="ဖိုင်အမည်")
+    size = models.PositiveBigIntegerField(default=0, verbose_name="အရွယ်အစား (bytes)")
+    ref_count = models.PositiveIntegerField(default=0, verbose_name="ရည်ညွှန်းမှုအရေအတွက်")
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name="ဖန်တီးသည့်အချိန်")
+    updated_at = models.DateTimeField(auto_now=True, verbose_name="နောက်ဆုံးပြင်ဆင်သည့်အချိန်")
+    # Cold storage (sheets/packs.py) — pack ဖိုင်ထဲရှိ byte range; pack = '' ဆိုလျှင် ဖိုင်တစ်ခုချင်း (loose)
+    pack = models.CharField(max_length=64, blank=True, default='', verbose_name="Pack ဖိုင်")
+    pack_offset = models.PositiveBigIntegerField(null=True, blank=True, verbose_name="Pack offset")
+    pack_length = models.PositiveBigIntegerField(null=True, blank=True, verbose_name="Pack ထဲရှိ အရွယ်အစား (bytes)")
+    pack_codec = models.CharField(max_length=8, blank=True, default='', verbose_name="Pack codec")
+
+    class Meta:
+        verbose_name = "Media blob"
+        verbose_name_plural = "Media blobs"
+        indexes = [
+            models.Index(fields=['ref_count', 'updated_at'], name='sheets_blob_gc_idx'),
+            # pack_receipts — မ pack ရသေးသော blob အဟောင်းများ
+            models.Index(fields=['pack', 'created_at'], name='sheets_blob_pack_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.name} ({self.ref_count})"
+
+
+class ReceiptFingerprint(models.Model):
+    """
+    Transaction ပုံ၏ perceptual hash (dHash) — duplicate receipt ရှာရန် (sheets.fingerprints)
+    band_0..band_3 = dhash ၏ 16-bit အပိုင်း ၄ ခု (multi-index hashing အတွက် index လုပ်ထား)
+    """
+    transaction = models.OneToOneField(Transaction, on_delete=models.CASCADE, related_name='receipt_fingerprint', verbose_name="မှတ်တမ်း")
+    image_name = models.CharField(max_length=255, verbose_name="ပုံအမည်")
+    dhash = models.BigIntegerField(verbose_name="dHash")
+    band_0 = models.IntegerField(db_index=True)
+    band_1 = models.IntegerField(db_index=True)
+    band_2 = models.IntegerField(db_index=True)
+    band_3 = models.IntegerField(db_index=True)
+    duplicate_ids = models.JSONField(default=list, blank=True, verbose_name="တူညီနိုင်သော မှတ်တမ်းများ")
+    computed_at = models.DateTimeField(auto_now=True, verbose_name="တွက်ချက်သည့်အချိန်")
+
+    class Meta:
+        verbose_name = "Receipt fingerprint"
+        verbose_name_plural = "Receipt fingerprints"
+
+    def __str__(self):
+        return f"{self.transaction_id}: {self.dhash:#x}"
+
+
+class UploadSession(models.Model):
+    """Chunk ဖြင့် အပိုင်းလိုက်တင်သော receipt upload (sheets.uploads)"""
+    STATUS_CHOICES = [
+        ('open', 'တင်နေဆဲ'),
+        ('complete', 'ပြီးဆုံး'),
+        ('attached', 'မှတ်တမ်းနှင့် ချိတ်ပြီး'),
+    ]
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='upload_sessions', verbose_name="တင်သူ")
+    filename = models.CharField(max_length=100, verbose_name="ဖိုင်အမည်")
+    size = models.PositiveBigIntegerField(verbose_name="အရွယ်အစား (bytes)")
+    received = models.PositiveBigIntegerField(default=0, verbose_name="လက်ခံပြီး (bytes)")
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='open', verbose_name="အခြေအနေ")
+    blob_name = models.CharField(max_length=255, blank=True, default='', verbose_name="သိမ်းဆည်းထားသောအမည်")
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name="ဖန်တီးသည့်အချိန်")
+    updated_at = models.DateTimeField(auto_now=True, verbose_name="နောက်ဆုံးပြင်ဆင်သည့်အချိန်")
+
+    class Meta:
+        ordering = ['-created_at']
+        verbose_name = "Upload session"
+        verbose_name_plural = "Upload sessions"
+        indexes = [
+            models.Index(fields=['status', 'updated_at'], name='sheets_upload_status_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.filename} ({self.received}/{self.size})"
+
+
+class Job(models.Model):
+    """DB-backed background job (sheets.jobs / manage.py run_jobs)"""
+    STATUS_CHOICES = [
+        ('queued', 'တန်းစီထား'),
+        ('running', 'လုပ်ဆောင်နေဆဲ'),
+        ('succeeded', 'အောင်မြင်'),
+        ('failed', 'မအောင်မြင်'),
+        ('cancelled', 'ပယ်ဖျက်'),
+    ]
+
+    kind = models.CharField(max_length=64, db_index=True, verbose_name="အမျိုးအစား")
+    payload = models.JSONField(default=dict, blank=True, verbose_name="Payload")
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='queued', verbose_name="အခြေအနေ")
+    priority = models.SmallIntegerField(default=0, verbose_name="ဦးစားပေးမှု")
+    attempts = models.PositiveSmallIntegerField(default=0, verbose_name="ကြိုးစားခဲ့သည့်အကြိမ်")
+    max_attempts = models.PositiveSmallIntegerField(default=3, verbose_name="အများဆုံးကြိုးစားမည့်အကြိမ်")
+    progress = models.FloatField(default=0.0, verbose_name="တိုးတက်မှု (0-1)")
+    progress_message = models.CharField(max_length=255, blank=True, default='', verbose_name="တိုးတက်မှုမှတ်ချက်")
+    result = models.JSONField(null=True, blank=True, verbose_name="ရလဒ်")
+    error = models.TextField(blank=True, default='', verbose_name="Error")
+    run_after = models.DateTimeField(default=timezone.now, verbose_name="စတင်နိုင်သည့်အချိန်")
+    locked_by = models.CharField(max_length=100, blank=True, default='', verbose_name="Worker")
+    locked_at = models.DateTimeField(null=True, blank=True)
+    created_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True, related_name='sheets_jobs', verbose_name="တန်းစီသူ")
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name="ဖန်တီးသည့်အချိန်")
+    started_at = models.DateTimeField(null=True, blank=True, verbose_name="စတင်သည့်အချိန်")
+    finished_at = models.DateTimeField(null=True, blank=True, verbose_name="ပြီးဆုံးသည့်အချိန်")
+
+    class Meta:
+        ordering = ['-created_at']
+        verbose_name = "Background job"
+        verbose_name_plural = "Background jobs"
+        indexes = [
+            models.Index(fields=['status', 'run_after', 'priority'], name='sheets_job_queue_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.kind} #{self.pk} ({self.status})"
+
+    def set_progress(self, fraction, message=''):
+        """Handler အတွင်းမှ ခေါ်ရန် — row တစ်ခုတည်းကို တိုက်ရိုက် update"""
+        self.progress = max(0.0, min(float(fraction), 1.0))
+        self.progress_message = message[:255]
+        updates = {'progress': self.progress, 'progress_message': self.progress_message}
+        if self.status == 'running':
+            # heartbeat — worker loop အပြင် ကြာရှည် run သော handler ကိုယ်တိုင်လည်း stale မဖြစ်စေရန်
+            updates['locked_at'] = timezone.now()
+        Job.objects.filter(pk=self.pk).update(**updates)
+
+
+class IdempotencyKey(models.Model):
+    """
+    Batch mutation (/transactions/batch/) ၏ operation တစ်ခုချင်း client key နှင့် ၎င်း၏ response
+    Mutation နှင့် DB transaction တစ်ခုတည်းအတွင်း သိမ်းသောကြောင့် key ရှိလျှင် ပြောင်းလဲမှုလည်း commit ဖြစ်ပြီးသား
+    """
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='sheets_idempotency_keys', verbose_name="User")
+    key = models.CharField(max_length=64, verbose_name="Idempotency key")
+    operation = models.CharField(max_length=20, verbose_name="Operation")
+    request_hash = models.CharField(max_length=64, verbose_name="Request hash")
+    status_code = models.PositiveSmallIntegerField(verbose_name="HTTP status")
+    response = models.JSONField(encoder=DjangoJSONEncoder, verbose_name="Response")
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True, verbose_name="ဖန်တီးသည့်အချိန်")
+
+    class Meta:
+        verbose_name = "Idempotency key"
+        verbose_name_plural = "Idempotency keys"
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'key'], name='sheets_idempotency_user_key_uniq'),
+        ]
+
+    def __str__(self):
+        return f"{self.user_id}:{self.key} ({self.operation})"
+
+
+class ClosedPeriod(models.Model):
+    """
+    Owner က ပိတ်လိုက်သော လ (period = လ၏ ပထမနေ့) — ထိုလ ကုန်ဆုံးသည်အထိ ရက်စွဲရှိသော transaction များကို ပြင်၍မရတော့
+    ပိတ်ချိန်၌ BalanceSnapshot (စုစုပေါင်း) များကို ရေးသည် (sheets/periods.py)
+    """
+    owner = models.ForeignKey(User, on_delete=models.CASCADE, related_name='sheets_closed_periods', verbose_name="ပိုင်ရှင်")
+    period = models.DateField(verbose_name="လ")
+    closed_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, related_name='+', verbose_name="ပိတ်သူ")
+    closed_at = models.DateTimeField(auto_now_add=True, verbose_name="ပိတ်သည့်အချိန်")
+    # approved transaction များကို ArchivedTransaction သို့ စတင်ရွှေ့သည့်အချိန် (sheets/archive.py)
+    # သတ်မှတ်ပြီးသောလ ရှိမှသာ report များက archive ကို ပေါင်းဖတ်သည်
+    archived_at = models.DateTimeField(null=True, blank=True, editable=False, verbose_name="Archive လုပ်သည့်အချိန်")
+
+    objects = TenantManager()
+
+    class Meta:
+        ordering = ['-period']
+        verbose_name = "ပိတ်ပြီးသောလ"
+        verbose_name_plural = "ပိတ်ပြီးသောလများ"
+        constraints = [
+            models.UniqueConstraint(fields=['owner', 'period'], name='sheets_closed_period_owner_uniq'),
+        ]
+
+    def __str__(self):
+        return f"{self.owner_id}: {self.period:%Y-%m}"
+
+
+class BalanceSnapshot(models.Model):
+    """
+    Period ကုန်ဆုံးသည်အထိ group + payment account တစ်ခုချင်း၏ စုစုပေါင်း (cumulative) — ပြင်/ဖျက်၍ မရ
+    Balance = နောက်ဆုံး snapshot + ပိတ်ပြီးနောက် ရက်စွဲရှိသော transaction များ
+    """
+    owner = models.ForeignKey(User, on_delete=models.CASCADE, related_name='+', verbose_name="ပိုင်ရှင်")
+    period = models.ForeignKey(ClosedPeriod, on_delete=models.CASCADE, related_name='snapshots', verbose_name="လ")
+    group = models.ForeignKey(Group, on_delete=models.CASCADE, related_name='+', verbose_name="အဖွဲ့")
+    payment_account = models.ForeignKey(PaymentAccount, on_delete=models.CASCADE, related_name='+', verbose_name="ငွေပေးချေမှုအကောင့်")
+    # approved
+    income = models.DecimalField(max_digits=18, decimal_places=2, default=0, verbose_name="ဝင်ငွေ (အတည်ပြုပြီး)")
+    expense = models.DecimalField(max_digits=18, decimal_places=2, default=0, verbose_name="ထွက်ငွေ (အတည်ပြုပြီး)")
+    # AuditSummaryView ၏ total_* (status အားလုံး) အတွက်
+    rejected_income = models.DecimalField(max_digits=18, decimal_places=2, default=0, verbose_name="ဝင်ငွေ (ပယ်ချပြီး)")
+    rejected_expense = models.DecimalField(max_digits=18, decimal_places=2, default=0, verbose_name="ထွက်ငွေ (ပယ်ချပြီး)")
+
+    objects = TenantManager()
+
+    class Meta:
+        verbose_name = "Balance snapshot"
+        verbose_name_plural = "Balance snapshots"
+        constraints = [
+            models.UniqueConstraint(fields=['period', 'group', 'payment_account'], name='sheets_snapshot_period_uniq'),
+        ]
+
+    def save(self, *args, **kwargs):
+        if self.pk is not None:
+            raise ValueError("BalanceSnapshot is immutable")
+        super().save(*args, **kwargs)
+
+    def delete(self, *args, **kwargs):
+        raise ValueError("BalanceSnapshot is immutable")
+
+
+class RequestProfile(models.Model):
+    """
+    Request တစ်ခု၏ profile (sheets.profiling / RequestProfilingMiddleware)
+    data = {'stacks': {collapsed stack: samples}, 'functions': [...], 'sql': [...]}; pstats = cProfile dump (mode=cprofile)
+    """
+    MODE_CHOICES = [
+        ('sample', 'Sampling'),
+        ('cprofile', 'Deterministic (cProfile)'),
+    ]
+
+    request_id = models.CharField(max_length=64, unique=True, verbose_name="Request ID")
+    method = models.CharField(max_length=10, verbose_name="Method")
+    path = models.CharField(max_length=500, verbose_name="Path")
+    view_name = models.CharField(max_length=200, blank=True, default='', verbose_name="View")
+    status_code = models.PositiveSmallIntegerField(null=True, blank=True, verbose_name="HTTP status")
+    user = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True, related_name='+', verbose_name="User")
+    mode = models.CharField(max_length=10, choices=MODE_CHOICES, default='sample', verbose_name="Profiler")
+    sampled = models.BooleanField(default=False, verbose_name="Sample rate ဖြင့် ရွေးခဲ့")
+    duration_ms = models.FloatField(default=0, verbose_name="ကြာချိန် (ms)")
+    sql_count = models.PositiveIntegerField(default=0, verbose_name="SQL အရေအတွက်")
+    sql_ms = models.FloatField(default=0, verbose_name="SQL ကြာချိန် (ms)")
+    data = models.JSONField(default=dict, blank=True, verbose_name="Profile")
+    pstats = models.BinaryField(null=True, blank=True, verbose_name="cProfile stats")
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True, verbose_name="ဖန်တီးသည့်အချိန်")
+
+    class Meta:
+        ordering = ['-created_at']
+        verbose_name = "Request profile"
+        verbose_name_plural = "Request profiles"
+
+    def __str__(self):
+        return f"{self.method} {self.path} ({self.request_id})"
@@ -0,0 +1,137 @@
+# sheets/multiplex.py
+"""
+Dashboard screen များအတွက် multiplexed read — POST /api/sheets/batch/
+
+    {"requests": {
+        "groups": "/api/sheets/groups/",
+        "accounts": "/api/sheets/payment-accounts/",
+        "pending": "/api/sheets/transactions/pending/"
+     },
+     "parallel": false}
+
+    -> {"responses": {"groups": {"status": 200, "body": [...]}, ...}}
+
+- Subrequest တစ်ခုချင်းကို HTTP round trip / middleware မဖြတ်ဘဲ view ကို တိုက်ရိုက်ခေါ်သည်။
+  Authenticate လုပ်ပြီးသား user ကို ပြန်သုံးသောကြောင့် token lookup ထပ်မလုပ်ပါ။
+- Permission / shard / replica routing များကို view တစ်ခုချင်းက ပုံမှန်အတိုင်း စစ်သည်။
+- GET ဖြင့်ခေါ်နိုင်သော whitelisted sheets route များ (ALLOWED_ROUTES) ၏ JSON response သာ
+  (?format=csv ကဲ့သို့ အခြား format ကို item တစ်ခုချင်းအလိုက် 400 ဖြင့် ငြင်း)
+- Default — အစဉ်လိုက်၊ request thread ၏ DB connection တစ်ခုတည်းဖြင့်။ "parallel": true ဆိုလျှင်
+  thread pool ဖြင့် (thread တစ်ခုလျှင် connection တစ်ခု) — PostgreSQL ကဲ့သို့ query ကြာသော database တွင်သာ အကျိုးရှိ
+"""
+
+import contextvars
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from copy import copy
+from urllib.parse import urlsplit
+
+from django.conf import settings
+from django.db import connections
+from django.http import Http404, QueryDict
+from django.urls import Resolver404, resolve
+from rest_framework import serializers, status
+from rest_framework.settings import api_settings
+
+logger = logging.getLogger('sheets.multiplex')
+
+PREFIX = '/api/sheets/'
+
+# GET-only, side effect မရှိသော route များ (router url name)
+ALLOWED_ROUTES = frozenset({
+    'group-list', 'group-detail', 'group-forecast',
+    'paymentaccount-list', 'paymentaccount-detail', 'paymentaccount-statement',
+    'transaction-list', 'transaction-detail', 'transaction-pending', 'transaction-duplicates',
+    'auditentry-list', 'auditentry-detail', 'auditentry-summary',
+    'job-list', 'job-detail',
+    'period-list', 'period-detail',
+    'search', 'pivot_report', 'audit_summary',
+})
+
+
+def max_requests():
+    return getattr(settings, 'SHEETS_BATCH_READ_MAX_REQUESTS', 10)
+
+
+def max_workers():
+    return getattr(settings, 'SHEETS_BATCH_READ_WORKERS', 4)
+
+
+class BatchReadSerializer(serializers.Serializer):
+    requests = serializers.DictField(child=serializers.CharField(max_length=500), allow_empty=False)
+    parallel = serializers.BooleanField(default=False)
+
+    def validate_requests(self, value):
+        if len(value) > max_requests():
+            raise serializers.ValidationError(f"request {max_requests()} ခုထက် မပိုရပါ။")
+        return value
+
+
+def _error(status_code, detail):
+    return {'status': status_code, 'body': {'detail': detail}}
+
+
+def _subrequest(request, path, query):
+    """Outer request ၏ header/user ကို ပြန်သုံးသော GET request"""
+    sub = copy(request._request)
+    sub.method = 'GET'
+    sub.path = sub.path_info = path
+    sub.GET = QueryDict(query)
+    sub.META = {**request._request.META, 'REQUEST_METHOD': 'GET', 'PATH_INFO': path, 'QUERY_STRING': query}
+    # body ကို JSON ထဲ ထည့်မည်ဖြစ်၍ outer request ၏ Accept မည်သို့ပင်ဖြစ်စေ JSON renderer ကို ရွေးစေ
+    sub.META['HTTP_ACCEPT'] = 'application/json'
+    sub.META.pop('CONTENT_LENGTH', None)
+    sub.META.pop('CONTENT_TYPE', None)
+    # DRF Request က ForcedAuthentication ကို သုံး — authenticator များ ထပ်မခေါ်
+    sub._force_auth_user = request.user
+    sub._force_auth_token = request.auth
+    return sub
+
+
+def dispatch(request, url):
+    parts = urlsplit(url)
+    if parts.scheme or parts.netloc or not parts.path.startswith(PREFIX):
+        return _error(status.HTTP_400_BAD_REQUEST, f"{PREFIX} အောက်ရှိ path သာ ခေါ်နိုင်ပါသည်။")
+    try:
+        match = resolve(parts.path)
+    except Resolver404:
+        return _error(status.HTTP_404_NOT_FOUND, "Not found.")
+    if match.url_name not in ALLOWED_ROUTES or 'format' in match.kwargs:
+        return _error(status.HTTP_400_BAD_REQUEST, "ဤ route ကို batch ဖြင့် ခေါ်ခွင့် မရှိပါ။")
+    # ?format=csv စသည် (pivot CSV ကဲ့သို့ stream ဖြစ်ပြီး data မရှိ) — JSON body သာ ပြန်ပေးနိုင်
+    if QueryDict(parts.query).get(api_settings.URL_FORMAT_OVERRIDE, 'json') != 'json':
+        return _error(status.HTTP_400_BAD_REQUEST, "Batch ထဲတွင် JSON format သာ ခေါ်နိုင်ပါသည်။")
+
+    sub = _subrequest(request, parts.path, parts.query)
+    sub.resolver_match = match
+    try:
+        response = match.func(sub, *match.args, **match.kwargs)
+    except Http404:
+        return _error(status.HTTP_404_NOT_FOUND, "Not found.")
+    except Exception:
+        logger.exception('Batch subrequest failed: %s', url)
+        return _error(status.HTTP_500_INTERNAL_SERVER_ERROR, "Server error.")
+    if getattr(response, 'streaming', False) or not hasattr(response, 'data'):
+        response.close()
+        return _error(status.HTTP_406_NOT_ACCEPTABLE, "Batch ထဲတွင် JSON response သာ ပြန်ပေးနိုင်ပါသည်။")
+    return {'status': response.status_code, 'body': response.data}
+
+
+def _dispatch_in_thread(context, request, url):
+    try:
+        return context.run(dispatch, request, url)
+    finally:
+        # worker thread ၏ connection များ — request ပြီးလျှင် ပိတ်
+        connections.close_all()
+
+
+def run(request, requests, parallel=False):
+    if not parallel or len(requests) == 1:
+        return {key: dispatch(request, url) for key, url in requests.items()}
+
+    with ThreadPoolExecutor(max_workers=min(max_workers(), len(requests))) as pool:
+        futures = {
+            key: pool.submit(_dispatch_in_thread, contextvars.copy_context(), request, url)
+            for key, url in requests.items()
+        }
+        return {key: future.result() for key, future in futures.items()}
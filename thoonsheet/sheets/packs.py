@@ -0,0 +1,251 @@
+# sheets/packs.py
+"""
+Receipt ပုံ cold storage — ကြာပြီးသော blob များကို append-only pack ဖိုင်ကြီးများထဲ စုသိမ်းခြင်း
+
+- `manage.py pack_receipts` / 'pack_receipts' job — RECEIPT_PACK_AFTER_DAYS ထက် ကြာပြီးသော loose blob များကို
+  process pool (RECEIPT_PACK_WORKERS) ဖြင့် ပြန် compress လုပ်ပြီး (မူရင်း byte များကို zlib — ပိုသေးမှသာ)
+  `RECEIPT_PACK_DIR/pack-*.pack` ၏ နောက်ဆုံးတွင် ဆက်ရေးသည်။ ပုံကို ပြန် encode မလုပ်ပါ — blob အမည်သည် content ၏
+  sha256 ဖြစ်သောကြောင့် ပြန်ဖတ်သော byte များ မူရင်းအတိုင်း ဖြစ်ရမည်။ Pack တစ်ခု RECEIPT_PACK_MAX_BYTES ပြည့်လျှင် အသစ်ဖွင့်။
+- Offset index — MediaBlob (pack, pack_offset, pack_length, pack_codec)၊ DB ပျက်လျှင် ပြန်တည်ရန် pack တစ်ခုစီ၏
+  ဘေးတွင် `.idx` (tab ခြား စာကြောင်း) ကိုလည်း ရေးသည်။
+- အစဉ် — pack ထဲ ရေး + fsync -> DB update -> loose ဖိုင် ဖျက်။ ကြားတွင် ရပ်သွားလျှင် loose ဖိုင် ကျန်နေသောကြောင့်
+  နောက် run တွင် ပြန် pack လုပ်သည် (pack ထဲတွင် သုံးမရသော byte အနည်းငယ်သာ ကျန်)။
+- ဖတ်ခြင်း — ContentAddressedStorage._open() က pack ဖိုင်ကို mmap လုပ်ပြီး byte range ကိုသာ ဖြတ်ယူသည်
+  (process တစ်ခုလျှင် pack တစ်ခု mmap တစ်ကြိမ်)။ URL မပြောင်း — MEDIA_URL အောက်ရှိ ဖိုင် disk ပေါ်တွင် မရှိလျှင်
+  sheets.views.ReceiptFileView က serve လုပ်သည် (nginx စသည်ဖြင့် media ကို serve လုပ်လျှင် try_files ဖြင့် Django သို့ fallback)။
+  ထို view ကို RECEIPT_FILE_VIEW ဖွင့်ထားမှသာ mount သောကြောင့် ပိတ်ထားလျှင် pack မလုပ်ပါ။
+- GC ဖြင့် ဖျက်သော packed blob ၏ byte များကို pack ထဲမှ မဖယ်ပါ (append-only)။
+
+Worker process များထဲတွင် Django model မလိုစေရန် model များကို function အတွင်းမှသာ ယူသည် (storage.py နှင့် တူ)။
+"""
+
+import logging
+import mmap
+import os
+import posixpath
+import uuid
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+from datetime import timedelta
+from threading import Lock
+
+from django.apps import apps
+from django.conf import settings
+from django.db import transaction as db_transaction
+from django.utils import timezone
+
+try:
+    import fcntl
+except ImportError:  # Windows — pack_receipts ကို တစ်ပြိုင်နက် တစ်ခုသာ run ပါ
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+CODEC_ZLIB = 'zlib'
+# zlib ဖြင့် ဤအချိုးထက် ပိုသေးမှသာ သုံး (JPEG ကဲ့သို့ compress ပြီးသား ပုံများအတွက် decompress ကုန်ကျစရိတ် မပေးရ)
+ZLIB_MIN_RATIO = 0.95
+
+_maps = {}
+_maps_lock = Lock()
+
+
+def pack_after_days():
+    return getattr(settings, 'RECEIPT_PACK_AFTER_DAYS', 90)
+
+
+def pack_dir():
+    return getattr(settings, 'RECEIPT_PACK_DIR', None) or os.path.join(settings.MEDIA_ROOT, 'packs')
+
+
+def pack_max_bytes():
+    return getattr(settings, 'RECEIPT_PACK_MAX_BYTES', 256 * 1024 * 1024)
+
+
+def file_view_enabled():
+    return getattr(settings, 'RECEIPT_FILE_VIEW', True)
+
+
+def pack_workers():
+    return getattr(settings, 'RECEIPT_PACK_WORKERS', 2)
+
+
+# ---- Read ----
+
+def _mapped(pack, end):
+    """pack ဖိုင်၏ mmap — end (byte) ထက် တိုနေလျှင် (ထို့နောက် ဆက်ရေးထားသော pack) ပြန် map"""
+    with _maps_lock:
+        mapped = _maps.get(pack)
+        if mapped is None or len(mapped) < end:
+            with open(os.path.join(pack_dir(), pack), 'rb') as fh:
+                mapped = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+            _maps[pack] = mapped
+        return mapped
+
+
+def read(blob):
+    """Packed MediaBlob -> bytes"""
+    end = blob.pack_offset + blob.pack_length
+    data = _mapped(blob.pack, end)[blob.pack_offset:end]
+    if blob.pack_codec == CODEC_ZLIB:
+        data = zlib.decompress(data)
+    return data
+
+
+# ---- Recompress (worker process) ----
+
+def recompress(path):
+    """Loose ဖိုင် -> (codec, pack ထဲ ရေးမည့် bytes, ဖတ်လျှင် ပြန်ရမည့် အရွယ်အစား)"""
+    with open(path, 'rb') as fh:
+        data = fh.read()
+    packed = zlib.compress(data, 9)
+    if len(packed) < len(data) * ZLIB_MIN_RATIO:
+        return CODEC_ZLIB, packed, len(data)
+    return '', data, len(data)
+
+
+# ---- Write ----
+
+class PackWriter:
+    """Pack ဖိုင်တစ်ခု၏ နောက်ဆုံးတွင် ဆက်ရေး — ပြည့်လျှင် အသစ်ဖွင့်"""
+
+    def __init__(self, directory=None, max_bytes=None):
+        self.directory = directory or pack_dir()
+        self.max_bytes = max_bytes or pack_max_bytes()
+        os.makedirs(self.directory, exist_ok=True)
+        self.name = self.data = self.index = None
+
+    def _open(self):
+        current = sorted(
+            (n for n in os.listdir(self.directory) if n.startswith('pack-') and n.endswith('.pack')),
+            key=lambda n: os.path.getmtime(os.path.join(self.directory, n)),
+        )
+        name = current[-1] if current else None
+        if name is None or os.path.getsize(os.path.join(self.directory, name)) >= self.max_bytes:
+            name = f"pack-{timezone.now():%Y%m%d%H%M%S}-{uuid.uuid4().hex[:8]}.pack"
+        self.name = name
+        self.data = open(os.path.join(self.directory, name), 'ab')
+        self.index = open(os.path.join(self.directory, name[:-len('.pack')] + '.idx'), 'a', encoding='utf-8')
+
+    def append(self, blob_name, codec, payload):
+        """-> (pack, offset, length)"""
+        if self.data is None or (self.data.tell() and self.data.tell() + len(payload) > self.max_bytes):
+            self.close()
+            self._open()
+        offset = self.data.tell()
+        self.data.write(payload)
+        self.index.write(f"{blob_name}\t{offset}\t{len(payload)}\t{codec}\n")
+        return self.name, offset, len(payload)
+
+    def sync(self):
+        for fh in (self.data, self.index):
+            if fh is not None:
+                fh.flush()
+                os.fsync(fh.fileno())
+
+    def close(self):
+        self.sync()
+        for fh in (self.data, self.index):
+            if fh is not None:
+                fh.close()
+        self.data = self.index = None
+
+
+class _Lock:
+    """pack_receipts တစ်ခုတည်းသာ pack ဖိုင်များကို ရေးစေရန် (fcntl ရှိမှ)"""
+
+    def __init__(self, directory):
+        self.path = os.path.join(directory, '.lock')
+        self.fh = None
+
+    def __enter__(self):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        self.fh = open(self.path, 'w')
+        if fcntl is not None:
+            try:
+                fcntl.flock(self.fh, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                self.fh.close()
+                raise RuntimeError("pack_receipts တစ်ခု run နေဆဲ ဖြစ်ပါသည်။")
+        return self
+
+    def __exit__(self, *exc):
+        self.fh.close()
+
+
+def _remove_loose(path, root):
+    """Loose ဖိုင်နှင့် ဗလာဖြစ်သွားသော <aa>/<bb> directory များ (root — upload_to directory — အထိ)"""
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+    directory = os.path.dirname(path)
+    while os.path.normpath(directory) != os.path.normpath(root):
+        try:
+            os.rmdir(directory)
+        except OSError:  # ဗလာ မဟုတ်
+            return
+        directory = os.path.dirname(directory)
+
+
+def candidates(older_than_days=None):
+    """Pack မလုပ်ရသေးသော၊ ရည်ညွှန်းသူရှိသော blob အဟောင်းများ"""
+    MediaBlob = apps.get_model('sheets', 'MediaBlob')
+    days = pack_after_days() if older_than_days is None else older_than_days
+    cutoff = timezone.now() - timedelta(days=days)
+    return MediaBlob.objects.filter(pack='', created_at__lt=cutoff, ref_count__gt=0).order_by('created_at', 'id')
+
+
+def pack_blobs(older_than_days=None, workers=None, batch_size=200, limit=None, progress=None):
+    """
+    -> {'packed': n, 'missing': n, 'bytes_before': n, 'bytes_after': n}
+    progress — callable(ပြီးသော အရေအတွက်, စုစုပေါင်း) (job progress)
+    """
+    from .storage import receipt_storage
+
+    if not file_view_enabled():
+        raise RuntimeError("RECEIPT_FILE_VIEW ပိတ်ထားသဖြင့် pack ထဲရှိ ပုံများကို serve မည့် view မရှိပါ။")
+    MediaBlob = apps.get_model('sheets', 'MediaBlob')
+    storage = receipt_storage()
+    queue = candidates(older_than_days=older_than_days).values_list('id', 'name', 'size')
+    if limit:
+        queue = queue[:limit]
+    queue = list(queue)
+    result = {'packed': 0, 'missing': 0, 'bytes_before': 0, 'bytes_after': 0}
+    if not queue:
+        return result
+
+    writer = PackWriter()
+    with _Lock(writer.directory), ProcessPoolExecutor(max_workers=workers or pack_workers()) as pool:
+        try:
+            for start in range(0, len(queue), batch_size):
+                batch = []
+                for blob_id, name, size in queue[start:start + batch_size]:
+                    path = storage.path(name)
+                    if os.path.exists(path):
+                        batch.append((blob_id, name, path, os.path.getsize(path)))
+                    else:
+                        result['missing'] += 1
+                        logger.warning('Receipt blob %s has no file to pack', name)
+
+                updates = []
+                for (blob_id, name, path, size), (codec, payload, served) in zip(
+                    batch, pool.map(recompress, [item[2] for item in batch]),
+                ):
+                    pack, offset, length = writer.append(name, codec, payload)
+                    updates.append(MediaBlob(
+                        id=blob_id, pack=pack, pack_offset=offset, pack_length=length, pack_codec=codec, size=served,
+                    ))
+                    result['bytes_before'] += size
+                    result['bytes_after'] += length
+                # DB ထဲ မမှတ်မီ pack ကို disk ပေါ် သေချာ ရေး
+                writer.sync()
+                with db_transaction.atomic(using='default'):
+                    MediaBlob.objects.bulk_update(updates, ['pack', 'pack_offset', 'pack_length', 'pack_codec', 'size'])
+                for _, name, path, _ in batch:
+                    _remove_loose(path, storage.path(posixpath.dirname(posixpath.dirname(posixpath.dirname(name)))))
+                result['packed'] += len(updates)
+                if progress is not None:
+                    progress(min(start + batch_size, len(queue)), len(queue))
+        finally:
+            writer.close()
+    return result
@@ -0,0 +1,150 @@
+# sheets/periods.py
+"""
+လချုပ် (period close) — POST /api/sheets/periods/ {"month": "YYYY-MM"}
+
+- Owner က လ တစ်လကို ပိတ်လိုက်လျှင် ထိုလကုန်သည်အထိ approved / rejected ပမာဏများကို group + payment account အလိုက်
+  BalanceSnapshot (cumulative) အဖြစ် ရေးသည်။ ယခင် snapshot + (ယခင်ပိတ်ရက်၊ ယခုလကုန်] အတွင်း transaction များကိုသာ
+  ပေါင်းသောကြောင့် history များလာသော်လည်း ပိတ်ရသည့် ကုန်ကျစရိတ် မတက်ပါ။
+- ပိတ်ပြီးသော ရက်စွဲအတွင်းရှိ transaction များကို ဖန်တီး / ပြင် / အတည်ပြု / ပယ်ချ / ပြန်တင် / ဖျက် မရတော့ပါ။
+- Balance (AuditSummaryView) = နောက်ဆုံး snapshot + ပိတ်ရက်နောက်ပိုင်း (open period) transaction များ
+"""
+
+from datetime import date, timedelta
+
+from django.db import router, transaction as db_transaction
+from django.db.models import Sum
+from django.utils import timezone
+from rest_framework import serializers
+
+from .models import BalanceSnapshot, ClosedPeriod, Transaction
+
+# (status, transaction_type) -> BalanceSnapshot field
+SNAPSHOT_FIELDS = {
+    ('approved', 'income'): 'income',
+    ('approved', 'expense'): 'expense',
+    ('rejected', 'income'): 'rejected_income',
+    ('rejected', 'expense'): 'rejected_expense',
+}
+
+
+class CloseError(Exception):
+    def __init__(self, detail):
+        super().__init__(detail)
+        self.detail = detail
+
+
+def month_start(day):
+    return day.replace(day=1)
+
+
+def month_end(day):
+    return (month_start(day) + timedelta(days=32)).replace(day=1) - timedelta(days=1)
+
+
+def parse_month(value):
+    """'YYYY-MM' -> လ၏ ပထမနေ့ (မမှန်လျှင် None)"""
+    try:
+        year, month = (int(part) for part in str(value).split('-'))
+        return date(year, month, 1)
+    except (TypeError, ValueError):
+        return None
+
+
+def latest_period(owner_id, before=None, using=None):
+    """နောက်ဆုံးပိတ်ထားသောလ (before ပေးလျှင် before နေ့မတိုင်မီ လုံးလုံး ကုန်ဆုံးပြီးသော လများထဲမှ)"""
+    qs = ClosedPeriod.objects.using(using).filter(owner_id=owner_id)
+    if before is not None:
+        qs = qs.filter(period__lt=month_start(before + timedelta(days=1)))
+    return qs.order_by('-period').first()
+
+
+def locked_through(owner_id, using=None):
+    period = latest_period(owner_id, using=using)
+    return month_end(period.period) if period is not None else None
+
+
+def check_open(owner_id, *days, using=None):
+    """ပိတ်ပြီးသော ရက်စွဲ ပါလျှင် ValidationError"""
+    days = [d for d in days if d is not None]
+    if owner_id is None or not days:
+        return
+    until = locked_through(owner_id, using=using)
+    if until is not None and min(days) <= until:
+        raise serializers.ValidationError(
+            {'transaction_date': [f"{until:%Y-%m} အထိ လချုပ်ပိတ်ပြီး ဖြစ်သောကြောင့် ဤမှတ်တမ်းကို ပြင်ဆင်၍ မရပါ။"]}
+        )
+
+
+def close_period(owner, month, user=None, today=None):
+    today = today or timezone.localdate()
+    month = month_start(month)
+    if month >= month_start(today):
+        raise CloseError("ယခုလ သို့မဟုတ် နောက်လများကို ပိတ်၍ မရပါ။")
+
+    using = router.db_for_write(ClosedPeriod)
+    with db_transaction.atomic(using=using):
+        previous = latest_period(owner.pk, using=using)
+        if previous is not None and month <= previous.period:
+            raise CloseError(f"{previous.period:%Y-%m} အထိ ပိတ်ပြီး ဖြစ်ပါသည်။")
+
+        txs = Transaction.objects.using(using).for_owner(owner.pk).filter(transaction_date__lte=month_end(month))
+        if previous is not None:
+            txs = txs.filter(transaction_date__gt=month_end(previous.period))
+        pending = txs.filter(status='pending').count()
+        if pending:
+            raise CloseError(f"ဤကာလအတွင်း စောင့်ဆိုင်းဆဲ မှတ်တမ်း {pending} ခု ရှိနေသေးပါသည်။")
+
+        totals = {}
+        if previous is not None:
+            for snap in previous.snapshots.all():
+                totals[(snap.group_id, snap.payment_account_id)] = {
+                    field: getattr(snap, field) for field in SNAPSHOT_FIELDS.values()
+                }
+        rows = (txs.order_by()
+                .values('group_id', 'payment_account_id', 'status', 'transaction_type')
+                .annotate(total=Sum('amount')))
+        for row in rows:
+            field = SNAPSHOT_FIELDS.get((row['status'], row['transaction_type']))
+            if field is None:
+                continue
+            bucket = totals.setdefault(
+                (row['group_id'], row['payment_account_id']), {f: 0 for f in SNAPSHOT_FIELDS.values()}
+            )
+            bucket[field] += row['total']
+
+        period = ClosedPeriod.objects.using(using).create(owner=owner, period=month, closed_by=user)
+        BalanceSnapshot.objects.using(using).bulk_create([
+            BalanceSnapshot(owner=owner, period=period, group_id=group_id, payment_account_id=account_id, **values)
+            for (group_id, account_id), values in sorted(totals.items())
+        ])
+    return period
+
+
+def totals(owner_id, end=None, using=None):
+    """
+    {(status, transaction_type): amount} — end (ပါဝင်) အထိ
+    end မတိုင်မီ ကုန်ဆုံးသော နောက်ဆုံး snapshot + ထို့နောက်ပိုင်း transaction များ (grouped query တစ်ခုတည်း)
+    Snapshot နောက်ပိုင်းက archive လုပ်ပြီးသောလ ထဲ ရောက်လျှင် (end က archive ထဲ ကျ) ArchivedTransaction ပါ ပေါင်း
+    """
+    from . import archive  # archive -> periods
+
+    result = {(s, t): 0 for s in ('approved', 'rejected', 'pending') for t in ('income', 'expense')}
+    period = latest_period(owner_id, before=end, using=using)
+    since = None
+    if period is not None:
+        base = BalanceSnapshot.objects.using(using).filter(period=period).aggregate(
+            **{field: Sum(field) for field in SNAPSHOT_FIELDS.values()}
+        )
+        for key, field in SNAPSHOT_FIELDS.items():
+            result[key] += base[field] or 0
+        since = month_end(period.period) + timedelta(days=1)
+    for txs in archive.querysets(since, owner_id, using=using):
+        if since is not None:
+            txs = txs.filter(transaction_date__gte=since)
+        if end is not None:
+            txs = txs.filter(transaction_date__lte=end)
+        for row in txs.order_by().values('status', 'transaction_type').annotate(total=Sum('amount')):
+            key = (row['status'], row['transaction_type'])
+            if key in result:
+                result[key] += row['total'] or 0
+    return result
@@ -0,0 +1,279 @@
+# sheets/pivots.py
+"""
+Pivot (crosstab) report — GET /api/sheets/reports/pivot/?rows=group&columns=month&measure=net
+
+- rows / columns — DIMENSIONS ထဲမှ တစ်ခုစီ (columns မပေးလျှင် "Total" column တစ်ခုတည်း)
+- measure — sum (ပမာဏ), net (ဝင်ငွေ − ထွက်ငွေ), count, avg
+- start / end (transaction_date), status, transaction_type, group, payment_account — filter များ
+  status ကို filter / dimension အဖြစ် မပေးလျှင် approved မှတ်တမ်းများသာ
+- ?format=csv (သို့မဟုတ် Accept: text/csv) — CSV ဖြင့် stream
+
+(row, column) အလိုက် SUM / COUNT ကို GROUP BY query တစ်ခုတည်းဖြင့် (start က archive ထဲ ရောက်လျှင်
+ArchivedTransaction အတွက် နောက်ထပ် တစ်ခု — sheets/archive.py) ယူပြီး NumPy ဖြင့် dense matrix အဖြစ်
+ပြန်စီသည်။ ပမာဏများကို cent (int64) ဖြင့် ပေါင်းသောကြောင့် row / column subtotal နှင့် grand total များ
+SQL ရလဒ်နှင့် အတိအကျ ကိုက်ညီသည်။ day / week / month column များတွင် မှတ်တမ်းမရှိသော ကာလများကိုလည်း 0 ဖြင့် ဖြည့်သည်။
+"""
+
+import csv
+from datetime import date, timedelta
+
+from django.conf import settings
+from django.db.models import Count, F, Sum
+from django.db.models.functions import TruncMonth, TruncWeek
+from django.utils.dateparse import parse_date
+from rest_framework import renderers
+
+from .models import Transaction
+from .statements import signed_amount
+
+# name -> (GROUP BY expression, label path) — label path မရှိလျှင် choices / ရက်စွဲ format ကို သုံး
+DIMENSIONS = {
+    'group': ('group_id', 'group__name'),
+    'payment_account': ('payment_account_id', 'payment_account__payment_account_name'),
+    'submitted_by': ('submitted_by_id', 'submitted_by__username'),
+    'transaction_type': ('transaction_type', None),
+    'status': ('status', None),
+    'day': ('transaction_date', None),
+    'week': (TruncWeek('transaction_date'), None),
+    'month': (TruncMonth('transaction_date'), None),
+}
+PERIODS = ('day', 'week', 'month')
+MEASURES = ('sum', 'net', 'count', 'avg')
+CHOICE_LABELS = {
+    'transaction_type': dict(Transaction.TRANSACTION_TYPE_CHOICES),
+    'status': dict(Transaction.STATUS_CHOICES),
+}
+TOTAL_LABEL = 'Total'
+
+
+def max_cells():
+    return getattr(settings, 'SHEETS_PIVOT_MAX_CELLS', 100_000)
+
+
+class PivotError(Exception):
+    def __init__(self, detail):
+        super().__init__(detail)
+        self.detail = detail
+
+
+def parse(params):
+    """Query params -> spec (dict); မမှန်လျှင် PivotError"""
+    rows = params.get('rows', 'group')
+    columns = params.get('columns') or None
+    measure = params.get('measure', 'sum')
+    for name in (rows, columns):
+        if name is not None and name not in DIMENSIONS:
+            raise PivotError(f"dimension မမှန်ကန်ပါ: {name} ({', '.join(DIMENSIONS)})")
+    if rows == columns:
+        raise PivotError("rows နှင့် columns မတူရပါ။")
+    if measure not in MEASURES:
+        raise PivotError(f"measure မမှန်ကန်ပါ: {measure} ({', '.join(MEASURES)})")
+
+    filters, applied = {}, {}
+    for param, lookup in (('start', 'transaction_date__gte'), ('end', 'transaction_date__lte')):
+        if params.get(param):
+            day = parse_date(params[param])
+            if day is None:
+                raise PivotError(f"{param} သည် YYYY-MM-DD ဖြစ်ရမည်။")
+            filters[lookup] = applied[param] = day
+    for param in ('status', 'transaction_type'):
+        if params.get(param):
+            if params[param] not in CHOICE_LABELS[param]:
+                raise PivotError(f"{param} မမှန်ကန်ပါ: {params[param]}")
+            filters[param] = applied[param] = params[param]
+    for param in ('group', 'payment_account'):
+        if params.get(param):
+            try:
+                filters[f'{param}_id'] = applied[param] = int(params[param])
+            except ValueError:
+                raise PivotError(f"{param} သည် id (ကိန်းဂဏန်း) ဖြစ်ရမည်။")
+    if 'status' not in filters and 'status' not in (rows, columns):
+        filters['status'] = applied['status'] = 'approved'
+    return {'rows': rows, 'columns': columns, 'measure': measure, 'filters': filters, 'applied': applied}
+
+
+def _period_start(dimension, day):
+    if dimension == 'month':
+        return day.replace(day=1)
+    if dimension == 'week':
+        return day - timedelta(days=day.weekday())  # TruncWeek — တနင်္လာနေ့
+    return day
+
+
+def _period_index(dimension, keys, bounds):
+    """
+    ရက်စွဲ key များ -> (ပထမကာလမှ စ၍ index array, ကာလ အရေအတွက်, ပထမကာလ) — dense axis အတွက်
+    bounds (start/end filter) ပါလျှင် axis ကို ထို range အထိ ချဲ့
+    """
+    import numpy as np
+
+    edges = [_period_start(dimension, day) for day in bounds if day is not None]
+    if dimension == 'month':
+        months = np.fromiter((k.year * 12 + k.month - 1 for k in keys), np.int64, len(keys))
+        span = [int(months.min()), int(months.max())] + [d.year * 12 + d.month - 1 for d in edges]
+        first = min(span)
+        return months - first, max(span) - first + 1, date(first // 12, first % 12 + 1, 1)
+    step = 7 if dimension == 'week' else 1
+    ordinals = np.fromiter((k.toordinal() for k in keys), np.int64, len(keys))
+    span = [int(ordinals.min()), int(ordinals.max())] + [d.toordinal() for d in edges]
+    first = min(span)
+    return (ordinals - first) // step, (max(span) - first) // step + 1, date.fromordinal(first)
+
+
+def _period_keys(dimension, first, size):
+    if dimension == 'month':
+        months = first.year * 12 + first.month - 1
+        return [date(m // 12, m % 12 + 1, 1) for m in range(months, months + size)]
+    step = 7 if dimension == 'week' else 1
+    return [first + timedelta(days=step * i) for i in range(size)]
+
+
+def _label(dimension, key, labels):
+    if dimension in PERIODS:
+        return key.strftime('%Y-%m') if dimension == 'month' else key.isoformat()
+    if dimension in CHOICE_LABELS:
+        return CHOICE_LABELS[dimension].get(key, key)
+    return labels.get(key, key)
+
+
+def _axis(dimension, keys, labels, bounds=()):
+    """GROUP BY ရလဒ်၏ key များ -> (axis key list, label list, row အလိုက် index array)"""
+    import numpy as np
+
+    if dimension is None:
+        return [None], [TOTAL_LABEL], np.zeros(len(keys), np.int64)
+    if dimension in PERIODS:
+        index, size, first = _period_index(dimension, keys, bounds)
+        axis = _period_keys(dimension, first, size)
+    else:
+        unique, index = np.unique(np.array(keys, dtype=object), return_inverse=True)
+        axis = unique.tolist()
+    out = [k.isoformat() if dimension in PERIODS else k for k in axis]
+    return out, [_label(dimension, k, labels) for k in axis], index.ravel()
+
+
+def _cells(measure, sums, counts):
+    """cent sum / count matrix (သို့ vector) -> measure တန်ဖိုး (JSON list)"""
+    import numpy as np
+
+    if measure == 'count':
+        return counts.tolist()
+    if measure == 'avg':
+        with np.errstate(invalid='ignore', divide='ignore'):
+            avg = np.round(sums / counts / 100.0, 2)
+        return np.where(counts > 0, avg, np.nan).tolist()
+    return np.round(sums / 100.0, 2).tolist()
+
+
+def _nan_to_none(values):
+    if isinstance(values, list):
+        return [_nan_to_none(v) for v in values]
+    return None if isinstance(values, float) and values != values else values
+
+
+def build(querysets, spec):
+    """querysets — archive.querysets_for_user() (hot + လိုအပ်လျှင် archive) — ရလဒ် row များကို ပေါင်း"""
+    import numpy as np
+
+    rows, columns, measure = spec['rows'], spec['columns'], spec['measure']
+    row_expr, row_label = DIMENSIONS[rows]
+    annotations = {'pivot_row': row_expr if not isinstance(row_expr, str) else F(row_expr)}
+    values = ['pivot_row']
+    if row_label:
+        annotations['pivot_row_label'] = F(row_label)
+        values.append('pivot_row_label')
+    if columns:
+        column_expr, column_label = DIMENSIONS[columns]
+        annotations['pivot_column'] = column_expr if not isinstance(column_expr, str) else F(column_expr)
+        values.append('pivot_column')
+        if column_label:
+            annotations['pivot_column_label'] = F(column_label)
+            values.append('pivot_column_label')
+
+    amount = signed_amount() if measure == 'net' else F('amount')
+    result = []
+    for queryset in querysets:
+        # key တူသော row များ ပါနိုင်သည် — အောက်ပါ np.add.at က ပေါင်းသည်
+        result.extend(
+            queryset.filter(**spec['filters']).order_by()
+            .annotate(**annotations).values(*values)
+            .annotate(pivot_total=Sum(amount), pivot_count=Count('id'))
+            .values_list(*values, 'pivot_total', 'pivot_count')
+        )
+
+    position = {name: i for i, name in enumerate(values)}
+    row_labels = {r[0]: r[position['pivot_row_label']] for r in result} if row_label else {}
+    column_keys, column_labels = [None] * len(result), {}
+    if columns:
+        column_keys = [r[position['pivot_column']] for r in result]
+        if 'pivot_column_label' in position:
+            column_labels = {r[position['pivot_column']]: r[position['pivot_column_label']] for r in result}
+
+    if result:
+        bounds = spec['filters'].get('transaction_date__gte'), spec['filters'].get('transaction_date__lte')
+        row_axis, row_names, ri = _axis(rows, [r[0] for r in result], row_labels, bounds)
+        column_axis, column_names, ci = _axis(columns, column_keys, column_labels, bounds)
+    else:
+        row_axis, row_names, ri = [], [], np.zeros(0, np.int64)
+        column_axis, column_names, ci = ([], [], np.zeros(0, np.int64)) if columns else _axis(None, [], {})
+    if len(row_axis) * len(column_axis) > max_cells():
+        raise PivotError(f"cell {max_cells()} ခုထက် များနေပါသည်။ ရက်စွဲ range ကို ကျဉ်းပါ သို့မဟုတ် ကာလ ပိုကြီးသော dimension သုံးပါ။")
+
+    # Decimal -> cent (int64) — ပေါင်းလဒ်များ အတိအကျ
+    cents = np.fromiter((int(round((r[-2] or 0) * 100)) for r in result), np.int64, len(result))
+    counts = np.fromiter((r[-1] for r in result), np.int64, len(result))
+    sums = np.zeros((len(row_axis), len(column_axis)), np.int64)
+    n = np.zeros_like(sums)
+    np.add.at(sums, (ri, ci), cents)
+    np.add.at(n, (ri, ci), counts)
+
+    return {
+        'rows': {'dimension': rows, 'keys': row_axis, 'labels': row_names},
+        'columns': {'dimension': columns, 'keys': column_axis, 'labels': column_names},
+        'measure': measure,
+        'filters': {k: (v.isoformat() if isinstance(v, date) else v) for k, v in spec['applied'].items()},
+        'values': _nan_to_none(_cells(measure, sums, n)),
+        'row_totals': _nan_to_none(_cells(measure, sums.sum(axis=1), n.sum(axis=1))),
+        'column_totals': _nan_to_none(_cells(measure, sums.sum(axis=0), n.sum(axis=0))),
+        'grand_total': _nan_to_none(_cells(measure, sums.sum(), n.sum())),
+    }
+
+
+# ---- CSV ----
+
+class _Echo:
+    def write(self, value):
+        return value
+
+
+def csv_rows(report):
+    """
+    Streaming CSV — header, row တစ်ခုချင်း (row total ပါ), နောက်ဆုံး Total row
+    columns မပေးလျှင် "Total" column တစ်ခုတည်းသည် row total ဖြစ်၍ ထပ်မထည့်
+    """
+    writer = csv.writer(_Echo())
+    with_total = report['columns']['dimension'] is not None
+
+    def line(first, cells, total):
+        return writer.writerow([first, *cells, total] if with_total else [first, *cells])
+
+    # Excel တွင် မြန်မာစာ မှန်ကန်စွာပေါ်ရန် BOM (sheets/tasks.py export နှင့် တူ)
+    yield '\ufeff'
+    yield line(report['rows']['dimension'], report['columns']['labels'], TOTAL_LABEL)
+    for label, cells, total in zip(report['rows']['labels'], report['values'], report['row_totals']):
+        yield line(label, cells, total)
+    yield line(TOTAL_LABEL, report['column_totals'], report['grand_total'])
+
+
+class CSVRenderer(renderers.BaseRenderer):
+    """?format=csv content negotiation အတွက် — report ကို view က stream လုပ်၍ error response များသာ ဤနေရာရောက်"""
+    media_type = 'text/csv'
+    format = 'csv'
+    charset = 'utf-8'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        rows = data.items() if isinstance(data, dict) else [(value,) for value in data]
+        writer = csv.writer(_Echo())
+        return ''.join(writer.writerow(list(row)) for row in rows).encode(self.charset)
@@ -0,0 +1,314 @@
+# sheets/profiling.py
+"""
+Request profiling — production တွင် နှေးနေသော endpoint ကို local မှာ ပြန်မလုပ်ရဘဲ ဘာကြောင့်နှေးသည်ကို ကြည့်ရန်
+
+- ဖွင့်ခြင်း (RequestProfilingMiddleware):
+  - `X-Sheets-Profile: 1` header သို့ `?_profile=1` — staff user (session သို့ API token) ၏ request ကိုသာ
+    (`sample` အစား `cprofile` ပေးလျှင် deterministic profiler)
+  - SHEETS_PROFILE_SAMPLE_RATE (0-1) — request အားလုံးထဲမှ ကျပန်း ရွေး (sampling profiler)
+  ဘာမှ မပါလျှင် middleware က header / query စစ်ရုံသာ (overhead မရှိသလောက်)
+- Sampling profiler — ဘေးမှ thread တစ်ခုက SHEETS_PROFILE_INTERVAL_MS တိုင်း request thread ၏ stack ကို ယူ
+  (code ကို instrument မလုပ်သောကြောင့် overhead နည်း)၊ cProfile — function call တိုင်း (ပိုတိကျ၊ ပိုနှေး)
+- SQL timeline — connection အားလုံး (shard များပါ) ၏ execute_wrapper ဖြင့် statement တစ်ခုချင်း၏ စချိန် / ကြာချိန်
+- RequestProfile ကို request ID (X-Request-ID — client ပေးလျှင် ထိုအတိုင်း) ဖြင့် သိမ်းပြီး response တွင်
+  X-Request-ID / X-Sheets-Profile-ID ပြန်ပေးသည်။ Admin (RequestProfileAdmin) မှ JSON (call tree + SQL),
+  collapsed stacks (flamegraph.pl / speedscope) သို့ .prof (snakeviz / pstats) အဖြစ် download
+- SHEETS_PROFILE_RETENTION_DAYS ထက် ကြာသော profile များကို profile အသစ်သိမ်းတိုင်း ဖျက်သည်
+"""
+
+import cProfile
+import logging
+import marshal
+import os
+import re
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from contextlib import ExitStack
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connections
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+HEADER = 'HTTP_X_SHEETS_PROFILE'
+QUERY_PARAM = '_profile'
+MODES = ('sample', 'cprofile')
+re_request_id = re.compile(r'^[A-Za-z0-9._-]{8,64}$')
+
+
+def sample_rate():
+    return getattr(settings, 'SHEETS_PROFILE_SAMPLE_RATE', 0.0)
+
+
+def interval_ms():
+    return getattr(settings, 'SHEETS_PROFILE_INTERVAL_MS', 5)
+
+
+def max_sql():
+    return getattr(settings, 'SHEETS_PROFILE_MAX_SQL', 1000)
+
+
+def retention_days():
+    return getattr(settings, 'SHEETS_PROFILE_RETENTION_DAYS', 7)
+
+
+def request_id_for(request):
+    """Client / proxy ပေးသော X-Request-ID (ပုံစံမှန်လျှင်) သို့ အသစ်"""
+    value = request.META.get('HTTP_X_REQUEST_ID', '')
+    return value if re_request_id.match(value) else uuid.uuid4().hex
+
+
+def requested_mode(request):
+    """Header / query ဖြင့် တောင်းသော mode (မတောင်းလျှင် None)"""
+    value = request.META.get(HEADER)
+    if QUERY_PARAM in request.GET:
+        # view / admin changelist / filter များက မသိသော parameter အဖြစ် မမြင်စေရန် ဖယ်
+        query = request.GET.copy()
+        value = value or query.pop(QUERY_PARAM)[-1]
+        request.GET = query
+    if not value or value.lower() in ('0', 'false', 'off'):
+        return None
+    value = value.lower()
+    return value if value in MODES else 'sample'
+
+
+def is_allowed(request):
+    """Profile တောင်းသူ staff ဟုတ်မဟုတ် — API token ဖြင့် ခေါ်လျှင် view မတိုင်မီ DRF authenticator ဖြင့် စစ်"""
+    user = getattr(request, 'user', None)
+    if user is not None and user.is_authenticated:
+        return user.is_staff
+    from rest_framework.exceptions import APIException
+    from rest_framework.request import Request
+    from rest_framework.settings import api_settings
+
+    try:
+        user = Request(request, authenticators=[auth() for auth in api_settings.DEFAULT_AUTHENTICATION_CLASSES]).user
+    except APIException:
+        return False
+    return bool(user and user.is_authenticated and user.is_staff)
+
+
+# ---- Profilers ----
+
+def _frame_label(code):
+    filename = code.co_filename
+    for prefix in (str(settings.BASE_DIR), sys.prefix):
+        if filename.startswith(prefix):
+            filename = os.path.relpath(filename, prefix)
+            break
+    return f"{code.co_name} ({filename}:{code.co_firstlineno})"
+
+
+class Sampler:
+    """Thread တစ်ခု (request thread) ၏ stack ကို interval တိုင်း ယူ — {collapsed stack: samples}"""
+
+    def __init__(self, thread_id=None, interval=None):
+        self.thread_id = thread_id or threading.get_ident()
+        self.interval = (interval or interval_ms()) / 1000.0
+        self.stacks = Counter()
+        self._labels = {}
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _label(self, code):
+        label = self._labels.get(code)
+        if label is None:
+            label = self._labels[code] = _frame_label(code)
+        return label
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                stack.append(self._label(frame.f_code))
+                frame = frame.f_back
+            if stack:
+                self.stacks[';'.join(reversed(stack))] += 1
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name='sheets-profiler', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def result(self):
+        return {'stacks': dict(self.stacks), 'functions': top_functions(self.stacks)}
+
+
+class DeterministicProfiler:
+    """cProfile — marshal လုပ်ထားသော stats (pstats.Stats / snakeviz ဖြင့် ဖွင့်နိုင်)"""
+
+    def __init__(self):
+        self.profile = cProfile.Profile()
+
+    def start(self):
+        self.profile.enable()
+
+    def stop(self):
+        self.profile.disable()
+
+    def result(self):
+        self.profile.create_stats()
+        functions = sorted(
+            (
+                {'function': f"{name} ({os.path.basename(filename)}:{line})", 'calls': nc,
+                 'self_ms': round(tt * 1000, 3), 'total_ms': round(ct * 1000, 3)}
+                for (filename, line, name), (cc, nc, tt, ct, callers) in self.profile.stats.items()
+            ),
+            key=lambda row: row['self_ms'], reverse=True,
+        )[:50]
+        return {'functions': functions}
+
+    def dump(self):
+        return marshal.dumps(self.profile.stats)
+
+
+def top_functions(stacks, limit=50):
+    """Collapsed stacks -> self / total samples အများဆုံး function များ"""
+    own, total = Counter(), Counter()
+    for stack, count in stacks.items():
+        frames = stack.split(';')
+        own[frames[-1]] += count
+        for frame in set(frames):
+            total[frame] += count
+    return [
+        {'function': frame, 'self_samples': own[frame], 'total_samples': total[frame]}
+        for frame, _ in sorted(total.items(), key=lambda item: (own[item[0]], item[1]), reverse=True)[:limit]
+    ]
+
+
+def call_tree(stacks):
+    """Collapsed stacks -> {'name', 'samples', 'children': [...]} (samples များရာမှ စီ)"""
+    root = {'name': 'all', 'samples': 0, 'children': {}}
+    for stack, count in stacks.items():
+        node = root
+        node['samples'] += count
+        for frame in stack.split(';'):
+            node = node['children'].setdefault(frame, {'name': frame, 'samples': 0, 'children': {}})
+            node['samples'] += count
+
+    def freeze(node):
+        children = sorted(node['children'].values(), key=lambda child: child['samples'], reverse=True)
+        return {'name': node['name'], 'samples': node['samples'], 'children': [freeze(child) for child in children]}
+
+    return freeze(root)
+
+
+def collapsed(stacks):
+    """flamegraph.pl / speedscope ဖတ်နိုင်သော `frame;frame;frame count` စာကြောင်းများ"""
+    return ''.join(f"{stack} {count}\n" for stack, count in sorted(stacks.items()))
+
+
+# ---- SQL timeline ----
+
+class SQLTimeline:
+    """connection.execute_wrapper — statement တစ်ခုချင်း (alias, request စချိန်မှ offset, ကြာချိန်)"""
+
+    def __init__(self, started):
+        self.started = started
+        self.queries = []
+        self.count = 0
+        self.total = 0.0
+        self.limit = max_sql()
+
+    def wrapper(self, alias):
+        def record(execute, sql, params, many, context):
+            start = time.perf_counter()
+            try:
+                return execute(sql, params, many, context)
+            finally:
+                duration = time.perf_counter() - start
+                self.count += 1
+                self.total += duration
+                if len(self.queries) < self.limit:
+                    self.queries.append({
+                        'alias': alias,
+                        'start_ms': round((start - self.started) * 1000, 3),
+                        'duration_ms': round(duration * 1000, 3),
+                        'sql': sql,
+                        'many': many,
+                    })
+        return record
+
+    def install(self, stack):
+        # ensure_shard() ဖြင့် request အတွင်း အသစ် register လုပ်သော shard များ မပါ
+        for connection in connections.all(initialized_only=False):
+            stack.enter_context(connection.execute_wrapper(self.wrapper(connection.alias)))
+
+
+# ---- Request ----
+
+class Profile:
+    """Middleware မှ — with Profile(request, mode) as profile: response = get_response(request)"""
+
+    def __init__(self, request, mode, sampled=False):
+        self.request = request
+        self.mode = mode
+        self.sampled = sampled
+        self.request_id = getattr(request, 'request_id', None) or request_id_for(request)
+        self.profiler = None
+        self.response = None
+
+    def __enter__(self):
+        self._stack = ExitStack()
+        self.started = time.perf_counter()
+        self.sql = SQLTimeline(self.started)
+        self.sql.install(self._stack)
+        if self.mode == 'cprofile':
+            self.profiler = DeterministicProfiler()
+            try:
+                self.profiler.start()
+            except ValueError:  # အခြား profiler / debugger ဖွင့်ထားလျှင်
+                self.mode = 'sample'
+        if self.mode == 'sample':
+            self.profiler = Sampler()
+            self.profiler.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.profiler.stop()
+        self.duration = time.perf_counter() - self.started
+        self._stack.close()
+        return False
+
+    def save(self, response=None):
+        """RequestProfile ကို သိမ်း — profile ကြောင့် request မပျက်စေရန် error များကို log သာ"""
+        from .models import RequestProfile
+
+        try:
+            user = getattr(self.request, 'user', None)
+            match = getattr(self.request, 'resolver_match', None)
+            data = self.profiler.result()
+            data['sql'] = self.sql.queries
+            data['sql_truncated'] = self.sql.count > len(self.sql.queries)
+            if RequestProfile.objects.filter(request_id=self.request_id).exists():
+                # client က X-Request-ID တူ ထပ်ပို့လျှင်
+                self.request_id = f"{self.request_id[:55]}-{uuid.uuid4().hex[:8]}"
+            profile = RequestProfile.objects.create(
+                request_id=self.request_id,
+                method=self.request.method,
+                path=self.request.get_full_path()[:500],
+                view_name=(match.view_name if match else '')[:200],
+                status_code=getattr(response, 'status_code', None),
+                user=user if user is not None and user.is_authenticated else None,
+                mode=self.mode,
+                sampled=self.sampled,
+                duration_ms=round(self.duration * 1000, 3),
+                sql_count=self.sql.count,
+                sql_ms=round(self.sql.total * 1000, 3),
+                data=data,
+                pstats=self.profiler.dump() if self.mode == 'cprofile' else None,
+            )
+            RequestProfile.objects.filter(created_at__lt=timezone.now() - timedelta(days=retention_days())).delete()
+            return profile
+        except Exception:
+            logger.exception('Could not save request profile %s', self.request_id)
+            return None
@@ -0,0 +1,162 @@
+# sheets/reconciliation.py
+"""
+AuditEntry နှင့် Transaction ledger ကိုက်ညီမှု စစ်ဆေးခြင်း — GET /api/sheets/audit-entries/reconciliation/
+
+Group တစ်ခုချင်းအတွက် audit window [start, end] အတွင်း
+- ledger — approved ဝင်ငွေ (receivable) / ထွက်ငွေ (payable) စုစုပေါင်း — group အလိုက် GROUP BY query တစ်ခု
+  (start က archive လုပ်ပြီးသောလ ထဲ ရောက်လျှင် ArchivedTransaction အတွက် နောက်ထပ် တစ်ခု)
+- audit  — window အတွင်း နောက်ဆုံး AuditEntry (ROW_NUMBER() OVER (PARTITION BY group ...)) — query တစ်ခု
+ကို group id ဖြင့် ချိတ်ပြီး |audit − ledger| > threshold ဖြစ်သော group များကို ပြသည်။
+
+Nightly: `manage.py reconcile_audit_entries` (owner အားလုံး၊ shard တစ်ခုလျှင် query ၂ ခု) /
+'reconcile_audit_entries' job (job တင်သူ owner)
+"""
+
+from datetime import datetime, time, timedelta
+from decimal import Decimal, InvalidOperation
+
+from django.conf import settings
+from django.db import router
+from django.db.models import Case, DecimalField, F, Sum, Value, When, Window
+from django.db.models.functions import Coalesce, RowNumber
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+
+from . import archive
+from .models import AuditEntry, Group, Transaction
+
+MONEY = DecimalField(max_digits=18, decimal_places=2)
+ZERO = Decimal('0.00')
+
+
+def default_threshold():
+    return Decimal(str(getattr(settings, 'SHEETS_RECONCILIATION_THRESHOLD', '1.00')))
+
+
+class ReconciliationError(Exception):
+    def __init__(self, detail):
+        super().__init__(detail)
+        self.detail = detail
+
+
+def parse_params(params):
+    """start / end (YYYY-MM-DD), threshold, all -> kwargs (reconcile()); မမှန်လျှင် ReconciliationError"""
+    kwargs = {}
+    for name in ('start', 'end'):
+        if params.get(name):
+            day = parse_date(params[name])
+            if day is None:
+                raise ReconciliationError(f"{name} သည် YYYY-MM-DD ဖြစ်ရမည်။")
+            kwargs[name] = day
+    if kwargs.get('start') and kwargs.get('end') and kwargs['start'] > kwargs['end']:
+        raise ReconciliationError("start သည် end ထက် နောက်ကျ၍ မရပါ။")
+    if params.get('threshold'):
+        try:
+            kwargs['threshold'] = Decimal(params['threshold'])
+        except InvalidOperation:
+            raise ReconciliationError("threshold သည် ပမာဏ (ကိန်းဂဏန်း) ဖြစ်ရမည်။")
+        if not kwargs['threshold'].is_finite() or kwargs['threshold'] < 0:
+            raise ReconciliationError("threshold သည် 0 နှင့်အထက် ဖြစ်ရမည်။")
+    kwargs['include_all'] = str(params.get('all', '')).lower() in ('1', 'true', 'yes')
+    return kwargs
+
+
+def _day_bounds(start, end):
+    tz = timezone.get_current_timezone()
+    lower = timezone.make_aware(datetime.combine(start, time.min), tz) if start else None
+    upper = timezone.make_aware(datetime.combine(end + timedelta(days=1), time.min), tz)
+    return lower, upper
+
+
+def ledger_totals(sources, start, end):
+    """
+    {group_id: (receivable, payable)} — approved မှတ်တမ်း၊ group အလိုက် GROUP BY တစ်ခု
+    sources — archive.querysets() (hot + လိုအပ်လျှင် archive) — queryset တစ်ခုလျှင် query တစ်ခု
+    """
+    totals = {}
+    for transactions in sources:
+        qs = transactions.filter(status='approved', transaction_date__lte=end)
+        if start:
+            qs = qs.filter(transaction_date__gte=start)
+        rows = (qs.order_by().values('group_id').annotate(
+            receivable=Coalesce(Sum(Case(When(transaction_type='income', then=F('amount')), default=Value(ZERO), output_field=MONEY)), ZERO, output_field=MONEY),
+            payable=Coalesce(Sum(Case(When(transaction_type='expense', then=F('amount')), default=Value(ZERO), output_field=MONEY)), ZERO, output_field=MONEY),
+        ).values_list('group_id', 'receivable', 'payable'))
+        for group_id, receivable, payable in rows:
+            before = totals.get(group_id, (ZERO, ZERO))
+            totals[group_id] = (before[0] + receivable, before[1] + payable)
+    return totals
+
+
+def latest_entries(entries, start, end):
+    """{group_id: AuditEntry row (dict)} — window အတွင်း group တစ်ခုလျှင် နောက်ဆုံး entry"""
+    lower, upper = _day_bounds(start, end)
+    qs = entries.filter(created_at__lt=upper)
+    if lower:
+        qs = qs.filter(created_at__gte=lower)
+    rows = (qs.order_by()
+            .annotate(position=Window(RowNumber(), partition_by=[F('group_id')],
+                                      order_by=[F('created_at').desc(), F('id').desc()]))
+            .filter(position=1)
+            .values('id', 'group_id', 'auditor_id', 'auditor__username', 'receivable_amount', 'payable_amount', 'created_at'))
+    return {row['group_id']: row for row in rows}
+
+
+def _round(value):
+    return Decimal(value).quantize(Decimal('0.01'))
+
+
+def reconcile(owner_id=None, start=None, end=None, threshold=None, include_all=False, using=None):
+    """
+    owner_id မပေးလျှင် database (shard) ထဲရှိ owner အားလုံး
+    -> report dict — results ကို variance အကြီးဆုံးမှ စီ
+    """
+    using = using or router.db_for_read(Transaction)
+    end = end or timezone.localdate()
+    threshold = default_threshold() if threshold is None else threshold
+
+    entries = AuditEntry.objects.using(using)
+    groups = Group.objects.using(using)
+    if owner_id is not None:
+        entries = entries.for_owner(owner_id)
+        groups = groups.for_owner(owner_id)
+
+    ledger = ledger_totals(archive.querysets(start, owner_id, using=using), start, end)
+    audits = latest_entries(entries, start, end)
+    names = dict(groups.filter(pk__in=set(ledger) | set(audits)).values_list('id', 'name'))
+
+    results = []
+    for group_id, entry in audits.items():
+        receivable, payable = ledger.get(group_id, (ZERO, ZERO))
+        receivable_variance = entry['receivable_amount'] - receivable
+        payable_variance = entry['payable_amount'] - payable
+        flagged = abs(receivable_variance) > threshold or abs(payable_variance) > threshold
+        if not (flagged or include_all):
+            continue
+        results.append({
+            'group': group_id,
+            'group_name': names.get(group_id),
+            'audit_entry': entry['id'],
+            'auditor': entry['auditor_id'],
+            'auditor_username': entry['auditor__username'],
+            'audited_at': entry['created_at'],
+            'audit_receivable': _round(entry['receivable_amount']),
+            'ledger_receivable': _round(receivable),
+            'receivable_variance': _round(receivable_variance),
+            'audit_payable': _round(entry['payable_amount']),
+            'ledger_payable': _round(payable),
+            'payable_variance': _round(payable_variance),
+            'flagged': flagged,
+        })
+    results.sort(key=lambda row: (-max(abs(row['receivable_variance']), abs(row['payable_variance'])), row['group']))
+
+    return {
+        'start': start,
+        'end': end,
+        'threshold': threshold,
+        'audited_groups': len(audits),
+        'flagged': sum(row['flagged'] for row in results),
+        # ledger လှုပ်ရှားမှု ရှိသော်လည်း window အတွင်း AuditEntry မရှိသော group များ
+        'unaudited_groups': sorted(set(ledger) - set(audits)),
+        'results': results,
+    }
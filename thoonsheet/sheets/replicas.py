@@ -0,0 +1,105 @@
+# sheets/replicas.py
+"""
+Read replica routing (optional, settings.SHEETS_READ_REPLICA = '<alias>')
+
+- GET/HEAD (list, retrieve, summary, search) နှင့် export job များ၏ sheets data read များကို replica သို့ ပို့သည်
+- Write (POST/PUT/PATCH/DELETE) နှင့် write အတွင်းရှိ read များ — primary (default)
+- User တစ်ဦး write လုပ်ပြီးနောက် SHEETS_REPLICA_STICKY_SECONDS အတွင်း ၎င်း၏ read များကိုလည်း primary မှ ဖတ်သည်
+  (replica lag ကြောင့် ကိုယ်တင်လိုက်သော မှတ်တမ်း ပျောက်မနေစေရန်)။ Process အများအပြားဖြင့် run လျှင်
+  CACHES ကို shared backend (redis/memcached/database) ထားပါ။
+- Job / UploadSession (progress polling, read-after-write) များကို primary မှသာ ဖတ်သည်
+- sharding (sheets.sharding) ဖွင့်ထားလျှင် owner shard များသည် ShardRouter က ဦးစွာ route လုပ်သည် (replica မသုံး)
+
+SQLite ဖြင့် local တွင် စမ်းရန်: DATABASES['replica'] ထည့်ပြီး `manage.py refresh_replica --interval 30`
+"""
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework.permissions import SAFE_METHODS
+
+from .sharding import is_sharded
+
+STICKY_CACHE_KEY = 'sheets:replica:sticky:{}'
+
+_reading = ContextVar('sheets_replica_reads', default=False)
+
+
+def replica_alias():
+    return getattr(settings, 'SHEETS_READ_REPLICA', None)
+
+
+def sticky_seconds():
+    return getattr(settings, 'SHEETS_REPLICA_STICKY_SECONDS', 10)
+
+
+def mark_sticky(user):
+    """ဤ user ၏ နောက် read များကို sticky window အတွင်း primary မှ ဖတ်ရန်"""
+    if replica_alias() and getattr(user, 'is_authenticated', False):
+        cache.set(STICKY_CACHE_KEY.format(user.pk), 1, sticky_seconds())
+
+
+def is_sticky(user):
+    return bool(getattr(user, 'is_authenticated', False) and cache.get(STICKY_CACHE_KEY.format(user.pk)))
+
+
+@contextmanager
+def use_replica(enabled=True):
+    token = _reading.set(bool(enabled and replica_alias()))
+    try:
+        yield
+    finally:
+        _reading.reset(token)
+
+
+class ReplicaRouter:
+    """Read-only context ထဲရှိ sheets data read များကို replica သို့၊ ကျန်အားလုံး None (= နောက် router / default)"""
+
+    def db_for_read(self, model, **hints):
+        alias = replica_alias()
+        if not alias or not _reading.get() or not is_sharded(model):
+            return None
+        instance = hints.get('instance')
+        if instance is not None and instance._state.db:
+            return instance._state.db
+        return alias
+
+    def db_for_write(self, model, **hints):
+        return None
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # replica သည် primary ၏ copy — row တူ
+        alias = replica_alias()
+        dbs = {obj1._state.db, obj2._state.db}
+        if alias and alias in dbs and dbs <= {alias, 'default'}:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # replica ကို refresh_replica (backup) ဖြင့်သာ ဖြည့်
+        if db == replica_alias():
+            return False
+        return None
+
+
+class ReplicaReadViewMixin:
+    """
+    DRF view mixin — safe method ဖြစ်ပြီး user သည် sticky window ထဲ မရှိလျှင် replica မှ ဖတ်
+    write အောင်မြင်လျှင် user ကို sticky အဖြစ် မှတ်
+    """
+
+    def perform_authentication(self, request):
+        super().perform_authentication(request)
+        read_only = request.method in SAFE_METHODS and not is_sticky(request.user)
+        self._replica_token = _reading.set(bool(read_only and replica_alias()))
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        token = getattr(self, '_replica_token', None)
+        if token is not None:
+            _reading.reset(token)
+            self._replica_token = None
+        if request.method not in SAFE_METHODS and response.status_code < 400:
+            mark_sticky(request.user)
+        return super().finalize_response(request, response, *args, **kwargs)
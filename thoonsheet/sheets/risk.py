@@ -0,0 +1,286 @@
+# sheets/risk.py
+"""
+Owner review queue အတွက် risk score (0–100) — GET /api/sheets/transactions/pending/ ကို score မြင့်ရာမှ စီသည်
+
+Feature များကို row တစ်ခုချင်း Python loop မပတ်ဘဲ NumPy array များဖြင့် တစ်ပြိုင်နက် တွက်သည်။
+Partition = (group, payment_account, transaction_type); "history" = partition ထဲရှိ approved မှတ်တမ်းများ
+- amount    — log(amount) ၏ z-score (history နှင့် နှိုင်းယှဉ်)
+- gap       — ငွေလွှဲရက်မှ တင်ပြရက်အထိ ကြာချိန် ၏ z-score (နောက်ကျမှ တင်ခြင်း) / အနာဂတ်ရက်စွဲ
+- duplicate — partition တစ်ခုတည်းတွင် ပမာဏတူ၍ ရက်စွဲ SHEETS_RISK_NEAR_DUPLICATE_DAYS ရက်အတွင်း နီးသော မှတ်တမ်း
+- new_auditor — တင်ပြသူ၏ ဤ owner ထံ ပထမဆုံးတင်ပြမှုမှ SHEETS_RISK_NEW_AUDITOR_DAYS ရက် မပြည့်သေး
+
+- Batch: `manage.py score_transactions` / 'score_transactions' job — owner တစ်ဦးချင်း data အားလုံး
+- Incremental: pending မှတ်တမ်း တင်/ပြင်/ပြန်တင် တိုင်း (signals) ထို (group, payment_account) ၏ pending များကိုသာ ပြန်တွက်
+"""
+
+import logging
+
+from django.conf import settings
+from django.db import connections, router, transaction as db_transaction
+from django.db.models import FloatField, Min
+from django.db.models.functions import Cast
+
+from .models import Transaction
+
+logger = logging.getLogger('sheets.risk')
+
+# Transaction.risk_flags bitmask
+FLAG_AMOUNT = 1
+FLAG_GAP = 2
+FLAG_DUPLICATE = 4
+FLAG_NEW_AUDITOR = 8
+FLAGS = {
+    FLAG_AMOUNT: 'amount',
+    FLAG_GAP: 'gap',
+    FLAG_DUPLICATE: 'duplicate',
+    FLAG_NEW_AUDITOR: 'new_auditor',
+}
+
+# feature တစ်ခုချင်း၏ အများဆုံး အမှတ် (စုစုပေါင်း 100)
+WEIGHTS = {FLAG_AMOUNT: 40.0, FLAG_GAP: 20.0, FLAG_DUPLICATE: 25.0, FLAG_NEW_AUDITOR: 15.0}
+
+Z_FLAG = 2.0       # |z| ဤထက် ကျော်မှ အမှတ်စပေး
+Z_FULL = 5.0       # |z| ဤအထိ ရောက်လျှင် အမှတ်အပြည့်
+MIN_HISTORY = 5    # history ဤထက် နည်းလျှင် z-score မတွက် (0)
+# history အမြဲတူ (std ≈ 0) လျှင် အနည်းငယ်ကွာရုံဖြင့် z မတက်စေရန် အနိမ့်ဆုံး std (log scale)
+MIN_AMOUNT_STD = 0.05  # ~5%
+MIN_GAP_STD = 0.5      # တစ်ရက် နှစ်ရက် နောက်ကျခြင်းကို ပုံမှန်ဟု ယူ
+EPOCH_ORDINAL = 719163  # date(1970, 1, 1).toordinal()
+
+STATUS_CODES = {'pending': 0, 'approved': 1, 'rejected': 2}
+COLUMNS = ('id', 'group_id', 'payment_account_id', 'transaction_type', 'amount_float', 'transaction_date',
+           'submitted_at', 'submitted_by_id', 'status', 'risk_score', 'risk_flags')
+WRITE_BATCH_SIZE = 5000
+
+
+def near_duplicate_days():
+    return getattr(settings, 'SHEETS_RISK_NEAR_DUPLICATE_DAYS', 3)
+
+
+def new_auditor_days():
+    return getattr(settings, 'SHEETS_RISK_NEW_AUDITOR_DAYS', 30)
+
+
+def flag_names(flags):
+    return [name for bit, name in FLAGS.items() if flags & bit]
+
+
+# ---- Vectorized scoring ----
+
+def load_frame(queryset):
+    """QuerySet -> column array များ (dict); မှတ်တမ်း မရှိလျှင် None"""
+    import numpy as np
+
+    # amount ကို DB ဘက်တွင် float ပြောင်း (row တစ်သန်းအတွက် Decimal object မဆောက်ရ)
+    queryset = queryset.order_by().annotate(amount_float=Cast('amount', FloatField()))
+    rows = list(queryset.values_list(*COLUMNS).iterator(chunk_size=WRITE_BATCH_SIZE))
+    if not rows:
+        return None
+    (ids, groups, accounts, types, amounts, dates, submitted, submitters, statuses,
+     scores, flags) = zip(*rows)
+    n = len(ids)
+    return {
+        'id': np.fromiter(ids, np.int64, n),
+        'group': np.fromiter(groups, np.int64, n),
+        'account': np.fromiter(accounts, np.int64, n),
+        'expense': np.fromiter((t == 'expense' for t in types), bool, n),
+        'amount': np.fromiter(amounts, np.float64, n),
+        'day': np.fromiter((d.toordinal() for d in dates), np.int64, n),
+        'submitted': np.fromiter((s.timestamp() for s in submitted), np.float64, n),
+        'submitter': np.fromiter(submitters, np.int64, n),
+        'status': np.fromiter((STATUS_CODES.get(s, 0) for s in statuses), np.int8, n),
+        'risk_score': np.fromiter((np.nan if s is None else s for s in scores), np.float64, n),
+        'risk_flags': np.fromiter(flags, np.int64, n),
+    }
+
+
+def _codes(*columns):
+    """Column များ၏ တွဲဖက်တန်ဖိုး -> 0..k-1 partition code"""
+    import numpy as np
+
+    code = np.zeros(len(columns[0]), np.int64)
+    for column in columns:
+        _, inverse = np.unique(column, return_inverse=True)
+        code = code * (inverse.max() + 1) + inverse.ravel()
+    return np.unique(code, return_inverse=True)[1].ravel()
+
+
+def _zscore(values, partition, history, min_std):
+    """partition တစ်ခုချင်း၏ history (mask) mean/std နှင့် နှိုင်းယှဉ်ထားသော z-score"""
+    import numpy as np
+
+    size = partition.max() + 1
+    weight = history.astype(np.float64)
+    n = np.bincount(partition, weights=weight, minlength=size)
+    total = np.bincount(partition, weights=values * weight, minlength=size)
+    squares = np.bincount(partition, weights=values * values * weight, minlength=size)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean = total / n
+        std = np.sqrt(np.maximum(squares / n - mean * mean, 0.0))
+    z = (values - mean[partition]) / np.maximum(std[partition], min_std)
+    return np.where(n[partition] >= MIN_HISTORY, z, 0.0)
+
+
+def _near_duplicates(partition, cents, day, active, window):
+    """ပမာဏတူ + ရက်စွဲ window ရက်အတွင်း — sort ပြီး ဘေးချင်းကပ် row များကိုသာ နှိုင်းယှဉ်"""
+    import numpy as np
+
+    result = np.zeros(len(partition), bool)
+    idx = np.flatnonzero(active)
+    if len(idx) < 2:
+        return result
+    order = idx[np.lexsort((day[idx], cents[idx], partition[idx]))]
+    close = ((partition[order[1:]] == partition[order[:-1]])
+             & (cents[order[1:]] == cents[order[:-1]])
+             & (day[order[1:]] - day[order[:-1]] <= window))
+    result[order[1:][close]] = True
+    result[order[:-1][close]] = True
+    return result
+
+
+def _first_seen(submitter, submitted):
+    import numpy as np
+
+    codes = _codes(submitter)
+    first = np.full(codes.max() + 1, np.inf)
+    np.minimum.at(first, codes, submitted)
+    return first[codes]
+
+
+def score(frame, first_seen=None):
+    """
+    -> (risk_score float array, risk_flags int array)
+    first_seen — တင်ပြသူ တစ်ဦးချင်း၏ ပထမဆုံးတင်ပြချိန် (row အလိုက်); မပေးလျှင် frame ထဲမှ တွက်
+    (frame တွင် owner ၏ မှတ်တမ်းအားလုံး မပါလျှင် ပေးရမည်)
+    """
+    import numpy as np
+
+    partition = _codes(frame['group'], frame['account'], frame['expense'])
+    approved = frame['status'] == STATUS_CODES['approved']
+    active = frame['status'] != STATUS_CODES['rejected']
+
+    amount_z = np.abs(_zscore(np.log1p(np.maximum(frame['amount'], 0.0)), partition, approved, MIN_AMOUNT_STD))
+
+    lag = np.floor(frame['submitted'] / 86400.0) - (frame['day'] - EPOCH_ORDINAL)
+    lag_z = _zscore(np.log1p(np.maximum(lag, 0.0)), partition, approved, MIN_GAP_STD)
+    future = lag < -1  # timezone ကြောင့် တစ်ရက်ကွာခြင်းကို ခွင့်ပြု
+
+    cents = np.rint(frame['amount'] * 100).astype(np.int64)
+    duplicate = _near_duplicates(partition, cents, frame['day'], active, near_duplicate_days())
+
+    if first_seen is None:
+        first_seen = _first_seen(frame['submitter'], frame['submitted'])
+    new_auditor = frame['submitted'] - first_seen < new_auditor_days() * 86400.0
+
+    def ramp(z):
+        return np.clip((z - Z_FLAG) / (Z_FULL - Z_FLAG), 0.0, 1.0)
+
+    gap = np.where(future, 1.0, ramp(lag_z))
+    points = (WEIGHTS[FLAG_AMOUNT] * ramp(amount_z)
+              + WEIGHTS[FLAG_GAP] * gap
+              + WEIGHTS[FLAG_DUPLICATE] * duplicate
+              + WEIGHTS[FLAG_NEW_AUDITOR] * new_auditor)
+    flags = ((amount_z >= Z_FLAG) * FLAG_AMOUNT
+             | (gap > 0) * FLAG_GAP
+             | duplicate * FLAG_DUPLICATE
+             | new_auditor * FLAG_NEW_AUDITOR)
+    return np.round(points, 1), flags.astype(np.int64)
+
+
+# ---- Persist ----
+
+def _write(frame, scores, flags, mask, using):
+    """Score ပြောင်းသော row များကိုသာ UPDATE (executemany)"""
+    import numpy as np
+
+    changed = mask & ((frame['risk_flags'] != flags) | ~np.isclose(frame['risk_score'], scores))
+    idx = np.flatnonzero(changed)
+    if not len(idx):
+        return 0
+    meta = Transaction._meta
+    connection = connections[using]
+    qn = connection.ops.quote_name
+    sql = (f"UPDATE {qn(meta.db_table)} SET {qn(meta.get_field('risk_score').column)} = %s, "
+           f"{qn(meta.get_field('risk_flags').column)} = %s WHERE {qn(meta.pk.column)} = %s")
+    rows = zip(scores[idx].tolist(), flags[idx].tolist(), frame['id'][idx].tolist())
+    with db_transaction.atomic(using=using), connection.cursor() as cursor:
+        batch = []
+        for row in rows:
+            batch.append(row)
+            if len(batch) >= WRITE_BATCH_SIZE:
+                cursor.executemany(sql, batch)
+                batch = []
+        if batch:
+            cursor.executemany(sql, batch)
+    return len(idx)
+
+
+def score_owner(owner_id, using=None, pending_only=False):
+    """Owner တစ်ဦး၏ မှတ်တမ်းအားလုံးကို တွက်ပြီး ပြောင်းလဲသော score များကို သိမ်း -> (scored, updated)"""
+    import numpy as np
+
+    using = using or router.db_for_write(Transaction)
+    frame = load_frame(Transaction.objects.using(using).for_owner(owner_id))
+    if frame is None:
+        return 0, 0
+    scores, flags = score(frame)
+    mask = frame['status'] == STATUS_CODES['pending'] if pending_only else np.ones(len(scores), bool)
+    return int(mask.sum()), _write(frame, scores, flags, mask, using)
+
+
+def score_all(using=None, pending_only=False):
+    using = using or router.db_for_write(Transaction)
+    owners = (Transaction.objects.using(using).order_by()
+              .exclude(owner_id=None).values_list('owner_id', flat=True).distinct())
+    scored = updated = 0
+    for owner_id in list(owners):
+        s, u = score_owner(owner_id, using=using, pending_only=pending_only)
+        scored += s
+        updated += u
+    return scored, updated
+
+
+def rescore_partition(owner_id, group_id, payment_account_id, using=None):
+    """
+    Incremental — (group, payment_account) တစ်ခု၏ pending မှတ်တမ်းများ
+    history ကို ထို partition မှသာ ဖတ်ပြီး new_auditor အတွက် owner အဆင့် MIN(submitted_at) ကို query တစ်ခုဖြင့် ယူ
+    -> {transaction id: (risk_score, risk_flags)} (pending များ)
+    """
+    import numpy as np
+
+    using = using or router.db_for_write(Transaction)
+    frame = load_frame(Transaction.objects.using(using).filter(group_id=group_id, payment_account_id=payment_account_id))
+    if frame is None:
+        return {}
+    pending = frame['status'] == STATUS_CODES['pending']
+    submitters = np.unique(frame['submitter'][pending]).tolist()
+    seen = dict(
+        Transaction.objects.using(using).for_owner(owner_id).filter(submitted_by_id__in=submitters)
+        .order_by().values('submitted_by_id').annotate(first=Min('submitted_at'))
+        .values_list('submitted_by_id', 'first')
+    )
+    first_seen = np.fromiter(
+        (seen[s].timestamp() if s in seen else t for s, t in zip(frame['submitter'].tolist(), frame['submitted'].tolist())),
+        np.float64, len(frame['id']),
+    )
+    scores, flags = score(frame, first_seen=first_seen)
+    _write(frame, scores, flags, pending, using)
+    idx = np.flatnonzero(pending)
+    return dict(zip(frame['id'][idx].tolist(), zip(scores[idx].tolist(), flags[idx].tolist())))
+
+
+def schedule_rescore(instance, using=None):
+    """post_save (pending) — commit ပြီးမှ partition ကို ပြန်တွက်ပြီး instance ပေါ်တွင်လည်း သတ်မှတ်"""
+    using = using or router.db_for_write(Transaction)
+    owner_id, group_id, account_id = instance.owner_id, instance.group_id, instance.payment_account_id
+
+    def run():
+        try:
+            results = rescore_partition(owner_id, group_id, account_id, using=using)
+        except Exception:
+            logger.exception('Risk scoring failed for transaction %s', instance.pk)
+            return
+        if instance.pk in results:
+            instance.risk_score, instance.risk_flags = results[instance.pk]
+
+    db_transaction.on_commit(run, using=using)
@@ -0,0 +1,331 @@
+# sheets/search.py
+"""
+Full-text search index — transactions (transfer ID, owner notes), audit remarks, group / payment account names
+
+- SQLite: FTS5 virtual table `sheets_search` (bm25 ranking)
+- PostgreSQL: `sheets_search` table + generated tsvector column + GIN index (ts_rank_cd ranking)
+  (schema ကို migration 0009_search_index က vendor အလိုက် ဖန်တီးသည်)
+
+Document တိုင်းတွင် owner_id (tenant) ပါသောကြောင့် ရလဒ်များကို owner တစ်ဦးချင်းအလိုက်သာ ပြသည်။
+Index ကို sheets.signals မှ save/delete တိုင်း sync လုပ်သည်။ အပြည့်ပြန်တည်ရန်: `manage.py rebuild_search_index`
+
+မြန်မာစာတွင် စကားလုံးကြား space မရှိသောကြောင့် index မလုပ်မီ / query မလုပ်မီ ဝဏ္ဏ (syllable) အလိုက်
+zero-width space (U+200B) ခြားပေးသည် (sylbreak rule)။ ထို့ကြောင့် "ငွေလွှဲ" ကို "ငွေ" ဖြင့် prefix ရှာလို့ရပြီး
+ဝဏ္ဏများကို phrase အဖြစ် ဆက်တိုက်ရှာသည်။ ZWSP သည် မျက်စိဖြင့်မမြင်ရသောကြောင့် snippet များလည်း မူရင်းအတိုင်း ပေါ်သည်။
+"""
+
+import re
+
+from django.db import connections
+
+TABLE = 'sheets_search'
+
+# kind -> rowid ထဲ encode လုပ်မည့် code (rowid = object_id * KIND_SLOTS + code)
+KIND_CODES = {
+    'transaction': 1,
+    'audit_entry': 2,
+    'group': 3,
+    'payment_account': 4,
+}
+KIND_SLOTS = 8
+
+FTS5_TOKENIZER = "unicode61 remove_diacritics 0 categories 'L* N* Co M*'"
+
+ZWSP = '\u200b'
+re_myanmar_run = re.compile(r'[က-႟ꩠ-ꩿ]+')
+# Myanmar syllable break: ဗျည်း (asat/virama မပါ၊ stacked မဟုတ်) သို့မဟုတ် သီးခြားသင်္ကေတ၏ ရှေ့တွင် ခြား
+re_syllable_start = re.compile(r'(?<!္)([က-အ](?![်္])|[ဣ-ဪဿ၌-၏၀-၉၊။])')
+re_separators = re.compile(r'[\s\u200b]+')
+re_query_noise = re.compile(r'["&|!():*<>\'\\]')
+
+
+def segment(text):
+    """မြန်မာစာ အပိုင်းများကို ဝဏ္ဏ အလိုက် ZWSP ခြား (အင်္ဂလိပ်/ဂဏန်း မထိ)"""
+    if not text:
+        return ''
+    return re_myanmar_run.sub(
+        lambda m: re_syllable_start.sub(ZWSP + r'\1', m.group(0)).lstrip(ZWSP), text,
+    )
+
+
+def unsegment(text):
+    return (text or '').replace(ZWSP, '')
+
+
+def vendor(using=None):
+    return connections[using or 'default'].vendor
+
+
+def is_supported(using=None):
+    return vendor(using) in ('sqlite', 'postgresql')
+
+
+# ---------------------------------------------------------------- schema (migration မှ ခေါ်)
+
+def create_schema(schema_editor):
+    conn = schema_editor.connection
+    if conn.vendor == 'sqlite':
+        schema_editor.execute(
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {TABLE} USING fts5("
+            f"title, body, kind UNINDEXED, object_id UNINDEXED, owner_id UNINDEXED, user_id UNINDEXED, "
+            f"tokenize=\"{FTS5_TOKENIZER}\")"
+        )
+    elif conn.vendor == 'postgresql':
+        schema_editor.execute(
+            f"CREATE TABLE IF NOT EXISTS {TABLE} ("
+            f"rowid bigint PRIMARY KEY, kind varchar(20) NOT NULL, object_id bigint NOT NULL, "
+            f"owner_id bigint NULL, user_id bigint NULL, "
+            f"title text NOT NULL DEFAULT '', body text NOT NULL DEFAULT '', "
+            f"document tsvector GENERATED ALWAYS AS ("
+            f"setweight(to_tsvector('simple', title), 'A') || setweight(to_tsvector('simple', body), 'B')) STORED)"
+        )
+        schema_editor.execute(f"CREATE INDEX IF NOT EXISTS {TABLE}_document_idx ON {TABLE} USING GIN (document)")
+        schema_editor.execute(f"CREATE INDEX IF NOT EXISTS {TABLE}_owner_idx ON {TABLE} (owner_id, kind)")
+
+
+def drop_schema(schema_editor):
+    if schema_editor.connection.vendor in ('sqlite', 'postgresql'):
+        schema_editor.execute(f"DROP TABLE IF EXISTS {TABLE}")
+
+
+# ---------------------------------------------------------------- documents
+
+# model_name -> kind (migration ထဲက historical model များအတွက်လည်း အလုပ်လုပ်ရန် class မဟုတ်ဘဲ အမည်ဖြင့် စစ်)
+MODEL_KINDS = {
+    'group': 'group',
+    'paymentaccount': 'payment_account',
+    'auditentry': 'audit_entry',
+    'transaction': 'transaction',
+}
+
+
+def kind_of(instance):
+    meta = instance._meta
+    if meta.app_label != 'sheets':
+        return None
+    return MODEL_KINDS.get(meta.model_name)
+
+
+def document_for(instance):
+    """
+    (kind, owner_id, user_id, title, body)
+    owner_id = tenant scope, user_id = auditor ကိုယ်ပိုင်မှတ်တမ်းသာ မြင်ရန်
+    """
+    kind = kind_of(instance)
+    # owner_id — tenancy migration မတိုင်မီ historical model တွင် မရှိနိုင်
+    owner_id = getattr(instance, 'owner_id', None)
+    if kind == 'transaction':
+        return kind, owner_id, instance.submitted_by_id, instance.transfer_id_last_6_digits, instance.owner_notes or ''
+    if kind == 'audit_entry':
+        return kind, owner_id, instance.auditor_id, '', instance.remarks or ''
+    if kind == 'group':
+        return kind, owner_id, None, f'{instance.group_title} {instance.name}', instance.group_type or ''
+    if kind == 'payment_account':
+        return kind, owner_id, None, instance.payment_account_name, ' '.join(
+            filter(None, [instance.payment_account_type, instance.bank_name])
+        )
+    return None
+
+
+def rowid_for(kind, object_id):
+    return int(object_id) * KIND_SLOTS + KIND_CODES[kind]
+
+
+INSERT_SQL = (
+    f"INSERT INTO {TABLE} (rowid, title, body, kind, object_id, owner_id, user_id) "
+    f"VALUES (%s, %s, %s, %s, %s, %s, %s)"
+)
+
+
+def _row(instance, doc):
+    kind, owner_id, user_id, title, body = doc
+    return [rowid_for(kind, instance.pk), segment(title), segment(body), kind, instance.pk, owner_id, user_id]
+
+
+def index_instance(instance, using=None):
+    doc = document_for(instance)
+    if doc is None:
+        return
+    using = using or instance._state.db or 'default'
+    if not is_supported(using):
+        return
+    with connections[using].cursor() as cursor:
+        cursor.execute(f"DELETE FROM {TABLE} WHERE rowid = %s", [rowid_for(doc[0], instance.pk)])
+        cursor.execute(INSERT_SQL, _row(instance, doc))
+
+
+def remove_instance(instance, using=None):
+    kind = kind_of(instance)
+    using = using or instance._state.db or 'default'
+    if kind is None or not is_supported(using):
+        return
+    with connections[using].cursor() as cursor:
+        cursor.execute(f"DELETE FROM {TABLE} WHERE rowid = %s", [rowid_for(kind, instance.pk)])
+
+
+def remove_ids(kind, object_ids, using=None):
+    """Signal မဖြတ်ဘဲ ဖျက်သော row များ (sheets/archive.py) ၏ document များ"""
+    using = using or 'default'
+    if not object_ids or not is_supported(using):
+        return
+    with connections[using].cursor() as cursor:
+        cursor.executemany(f"DELETE FROM {TABLE} WHERE rowid = %s", [[rowid_for(kind, i)] for i in object_ids])
+
+
+def rebuild(using='default', batch_size=1000, apps=None):
+    """Index ကို အစမှ ပြန်တည် (apps = migration ထဲမှ ခေါ်လျှင် historical app registry)"""
+    if apps is None:
+        from django.apps import apps
+    if not is_supported(using):
+        return 0
+    with connections[using].cursor() as cursor:
+        cursor.execute(f"DELETE FROM {TABLE}")
+    total = 0
+    for model_name in MODEL_KINDS:
+        model = apps.get_model('sheets', model_name)
+        rows = []
+        for obj in model.objects.using(using).order_by('pk').iterator(chunk_size=batch_size):
+            rows.append(_row(obj, document_for(obj)))
+            if len(rows) >= batch_size:
+                total += _insert_rows(using, rows)
+                rows = []
+        total += _insert_rows(using, rows)
+    if vendor(using) == 'sqlite':
+        with connections[using].cursor() as cursor:
+            cursor.execute(f"INSERT INTO {TABLE}({TABLE}) VALUES ('optimize')")
+    return total
+
+
+def _insert_rows(using, rows):
+    if rows:
+        with connections[using].cursor() as cursor:
+            cursor.executemany(INSERT_SQL, rows)
+    return len(rows)
+
+
+# ---------------------------------------------------------------- query
+
+def _terms(query):
+    """User query -> term list; term တစ်ခုစီ = ဝဏ္ဏ/token များ (phrase)"""
+    terms = []
+    for word in query.split():
+        tokens = [t for t in re_separators.split(re_query_noise.sub(' ', segment(word))) if t]
+        if tokens:
+            terms.append(tokens)
+    return terms
+
+
+def fts5_query(query):
+    terms = _terms(query)
+    if not terms:
+        return None
+    parts = ['"' + ' '.join(tokens) + '"' for tokens in terms]
+    parts[-1] += '*'  # နောက်ဆုံးစကားလုံးကို prefix (user ရိုက်နေဆဲ)
+    return ' '.join(parts)
+
+
+def tsquery(query):
+    terms = _terms(query)
+    if not terms:
+        return None
+    parts = []
+    for i, tokens in enumerate(terms):
+        cleaned = list(tokens)
+        if i == len(terms) - 1:
+            cleaned[-1] += ':*'
+        parts.append('(' + ' <-> '.join(cleaned) + ')')
+    return ' & '.join(parts)
+
+
+class SearchResults:
+    """
+    Lazy ranked result list — Django Paginator (DRF PageNumberPagination) နှင့် တိုက်ရိုက်သုံးနိုင်သည်
+    (count() နှင့် slice သာ SQL run)
+    """
+
+    def __init__(self, query, kinds=None, user=None, using='default'):
+        self.using = using
+        self.vendor = vendor(using)
+        self.match = fts5_query(query) if self.vendor == 'sqlite' else tsquery(query)
+        self.where, self.params = self._filters(kinds, user)
+        self._count = None
+
+    def _filters(self, kinds, user):
+        where, params = [], []
+        if kinds:
+            where.append('kind IN (' + ', '.join(['%s'] * len(kinds)) + ')')
+            params.extend(kinds)
+        if user is not None and not user.is_superuser:
+            # tenant (owner) ၏ data သာ
+            where.append('owner_id = %s')
+            params.append(getattr(user, 'tenant_id', None))
+            if getattr(user, 'user_type', None) != 'owner':
+                # auditor: ကိုယ်တင်ထားသော transaction / audit entry + owner ၏ group/payment account
+                where.append("(user_id = %s OR kind IN ('group', 'payment_account'))")
+                params.append(user.pk)
+        return where, params
+
+    def _sql(self, select, tail=''):
+        if self.vendor == 'sqlite':
+            clauses = [f"{TABLE} MATCH %s"] + self.where
+        else:
+            clauses = ["document @@ to_tsquery('simple', %s)"] + self.where
+        return f"SELECT {select} FROM {TABLE} WHERE {' AND '.join(clauses)} {tail}", [self.match] + self.params
+
+    def count(self):
+        if self._count is None:
+            if not self.match:
+                self._count = 0
+            else:
+                sql, params = self._sql('COUNT(*)')
+                with connections[self.using].cursor() as cursor:
+                    cursor.execute(sql, params)
+                    self._count = cursor.fetchone()[0]
+        return self._count
+
+    def __len__(self):
+        return self.count()
+
+    def __getitem__(self, key):
+        if not isinstance(key, slice):
+            return self[key:key + 1][0]
+        if not self.match:
+            return []
+        start = key.start or 0
+        limit = (key.stop - start) if key.stop is not None else -1
+        if self.vendor == 'sqlite':
+            select = (
+                f"kind, object_id, title, body, bm25({TABLE}, 10.0, 1.0) AS score, "
+                f"snippet({TABLE}, 1, '[', ']', '…', 12) AS snippet"
+            )
+            sql, params = self._sql(select, 'ORDER BY score LIMIT %s OFFSET %s')
+        else:
+            select = (
+                "kind, object_id, title, body, -ts_rank_cd(document, to_tsquery('simple', %s)) AS score, "
+                "ts_headline('simple', body, to_tsquery('simple', %s), 'StartSel=[, StopSel=], MaxWords=12') AS snippet"
+            )
+            sql, params = self._sql(select, 'ORDER BY score LIMIT %s OFFSET %s')
+            params = [self.match, self.match] + params
+            limit = None if limit < 0 else limit
+        with connections[self.using].cursor() as cursor:
+            cursor.execute(sql, params + [limit, start])
+            rows = cursor.fetchall()
+        return [
+            {
+                'kind': kind,
+                'id': object_id,
+                'title': unsegment(title),
+                'snippet': unsegment(snippet),
+                'rank': -score,
+            }
+            for kind, object_id, title, body, score, snippet in rows
+        ]
+
+
+def matching_ids(query, kind, using='default'):
+    """kind ၏ object_id များကို ပြန်ပေးသော subquery (SQL, params) — queryset.filter(pk__in=RawSQL(...)) အတွက်"""
+    if vendor(using) == 'sqlite':
+        match = fts5_query(query)
+        return f"SELECT object_id FROM {TABLE} WHERE {TABLE} MATCH %s AND kind = %s", [match, kind], match
+    match = tsquery(query)
+    return f"SELECT object_id FROM {TABLE} WHERE document @@ to_tsquery('simple', %s) AND kind = %s", [match, kind], match
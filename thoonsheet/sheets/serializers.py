@@ -1,11 +1,17 @@
 # sheets/serializers.py
 
 import re
+from django.core.exceptions import ObjectDoesNotExist
 from django.db import IntegrityError
 from rest_framework import serializers
-from .models import Group, PaymentAccount, Transaction, AuditEntry
+from django.utils.text import get_valid_filename
+import os
+from .models import Group, PaymentAccount, Transaction, AuditEntry, UploadSession, Job, ClosedPeriod, BalanceSnapshot, ArchivedTransaction
+from .jobs import check_payload, enqueueable_kinds
+from .fieldsets import SparseFieldsetsMixin
+from . import periods, risk
+from .uploads import ALLOWED_EXTENSIONS, max_upload_size
 from django.contrib.auth import get_user_model
-from rest_framework.validators import UniqueValidator
 from django.contrib.auth.password_validation import validate_password
 
 User = get_user_model()
@@ -54,14 +60,14 @@ class UserSerializer(serializers.ModelSerializer):
         return instance
 
 
-class GroupSerializer(serializers.ModelSerializer):
+class GroupSerializer(SparseFieldsetsMixin, serializers.ModelSerializer):
     owner_username = serializers.CharField(source='owner.username', read_only=True)
     class Meta:
         model = Group
         fields = '__all__'
         read_only_fields = ('created_at', 'updated_at') # 'owner' ကို ဖယ်ရှားလိုက်ပါပြီ
 
-class PaymentAccountSerializer(serializers.ModelSerializer):
+class PaymentAccountSerializer(SparseFieldsetsMixin, serializers.ModelSerializer):
     owner_username = serializers.CharField(source='owner.username', read_only=True)
     class Meta:
         model = PaymentAccount
@@ -109,19 +115,43 @@ class PaymentAccountSerializer(serializers.ModelSerializer):
 #         return super().update(instance, validated_data)
 
 
-class TransactionSerializer(serializers.ModelSerializer):
+class TenantScopedFieldsMixin:
+    """
+    FK field (group, payment_account) ရွေးချယ်စရာများကို request user ၏ owner (tenant) data သာ ဖြစ်အောင် ကန့်သတ်
+    (အခြား owner ၏ group id ကို ပို့လျှင် "Invalid pk" ဖြစ်မည်)
+    """
+    tenant_scoped_fields = ('group', 'payment_account')
+
+    def get_fields(self):
+        fields = super().get_fields()
+        request = self.context.get('request')
+        user = getattr(request, 'user', None)
+        if user is not None:
+            for name in self.tenant_scoped_fields:
+                field = fields.get(name)
+                if field is not None and getattr(field, 'queryset', None) is not None:
+                    field.queryset = field.queryset.for_user(user)
+        return fields
+
+
+class TransactionSerializer(SparseFieldsetsMixin, TenantScopedFieldsMixin, serializers.ModelSerializer):
     group_name = serializers.CharField(source='group.name', read_only=True)
     payment_account_name = serializers.CharField(source='payment_account.payment_account_name', read_only=True)
     submitted_by_username = serializers.CharField(source='submitted_by.username', read_only=True)
     transaction_type_display = serializers.CharField(source='get_transaction_type_display', read_only=True)
     status_display = serializers.CharField(source='get_status_display', read_only=True)
+    possible_duplicates = serializers.SerializerMethodField()
+    # owner review queue (sheets/risk.py) — owner များသာ မြင်ရ
+    risk_score = serializers.FloatField(read_only=True)
+    risk_reasons = serializers.SerializerMethodField()
+    # chunked upload (/uploads/) ဖြင့် တင်ပြီးသားပုံကို image အစား id ဖြင့် ချိတ်ရန်
+    upload_id = serializers.UUIDField(write_only=True, required=False)
 
-    # ⭐ Global unique on the 6 digits
-    transfer_id_last_6_digits = serializers.CharField(
-        max_length=6,
-        validators=[UniqueValidator(queryset=Transaction.objects.all(),
-                   message="ဤ လွှဲပြောင်း ID (၆ လုံး) သည် ရှိပြီးသား ဖြစ်နေပါသည်။")]
-    )
+    # ?fields= / ?omit= — possible_duplicates တောင်းမှသာ receipt_fingerprint ကို join
+    sparse_sources = {'possible_duplicates': ['receipt_fingerprint.duplicate_ids'], 'risk_reasons': ['risk_flags']}
+
+    # ⭐ Owner (tenant) တစ်ဦးအတွင်း unique on the 6 digits — validate() တွင် (owner, transfer_id) index ဖြင့် စစ်
+    transfer_id_last_6_digits = serializers.CharField(max_length=6)
 
     class Meta:
         model = Transaction
@@ -129,27 +159,96 @@ class TransactionSerializer(serializers.ModelSerializer):
             'id', 'submitted_by', 'submitted_by_username', 'transaction_date', 'group', 'group_name',
             'payment_account', 'payment_account_name', 'transfer_id_last_6_digits',
             'amount', 'transaction_type', 'transaction_type_display', 'image',
-            'submitted_at', 'status', 'status_display', 'approved_by_owner_at', 'owner_notes'
+            'submitted_at', 'status', 'status_display', 'approved_by_owner_at', 'owner_notes',
+            'possible_duplicates', 'risk_score', 'risk_reasons', 'upload_id',
         ]
         read_only_fields = [
             'id', 'submitted_by', 'submitted_by_username', 'group_name', 'payment_account_name',
             'transaction_type_display', 'status_display', 'submitted_at', 'approved_by_owner_at',
         ]
 
+    def get_possible_duplicates(self, obj):
+        # ပုံတူ (perceptual hash) receipt ရှိသော transaction id များ — fingerprint မတွက်ရသေးလျှင် []
+        try:
+            ids = obj.receipt_fingerprint.duplicate_ids
+        except ObjectDoesNotExist:
+            return []
+        user = getattr(self.context.get('request'), 'user', None)
+        if ids and user is not None and getattr(user, 'user_type', None) == 'auditor':
+            # auditor — ကိုယ်တင်ထားသော transaction များ၏ id သာ (အခြား auditor ၏ မှတ်တမ်း မပေါက်ကြားစေရန်)
+            visible = set(Transaction.objects.filter(pk__in=ids, submitted_by=user).values_list('pk', flat=True))
+            ids = [pk for pk in ids if pk in visible]
+        return ids
+
+    def get_risk_reasons(self, obj):
+        return risk.flag_names(obj.risk_flags)
+
+    def get_fields(self):
+        fields = super().get_fields()
+        # auditor က score ကို ကြည့်ပြီး စည်းမျဉ်းကို ရှောင်မတင်နိုင်စေရန်
+        user = getattr(self.context.get('request'), 'user', None)
+        if user is not None and not (user.is_superuser or getattr(user, 'user_type', None) == 'owner'):
+            fields.pop('risk_score', None)
+            fields.pop('risk_reasons', None)
+        return fields
+
     # ⭐ ၆ လုံး digit-only backend validation
     def validate_transfer_id_last_6_digits(self, v):
         if not re.fullmatch(r'\d{6}', v or ''):
             raise serializers.ValidationError("၆ လုံး ဂဏန်း အတိအကျ ဖြစ်ရမည်။")
         return v
 
+    def validate(self, attrs):
+        attrs = super().validate(attrs)
+        group = attrs.get('group') or getattr(self.instance, 'group', None)
+        payment_account = attrs.get('payment_account') or getattr(self.instance, 'payment_account', None)
+        if group is not None and payment_account is not None and group.owner_id != payment_account.owner_id:
+            raise serializers.ValidationError({"payment_account": ["ဤအကောင့်သည် အဖွဲ့၏ ပိုင်ရှင်နှင့် မကိုက်ညီပါ။"]})
+
+        transfer_id = attrs.get('transfer_id_last_6_digits')
+        if transfer_id and group is not None:
+            duplicates = Transaction.objects.for_owner(group.owner_id).filter(transfer_id_last_6_digits=transfer_id)
+            if self.instance is not None:
+                duplicates = duplicates.exclude(pk=self.instance.pk)
+            archived = ArchivedTransaction.objects.for_owner(group.owner_id).filter(transfer_id_last_6_digits=transfer_id)
+            if duplicates.exists() or archived.exists():
+                raise serializers.ValidationError(
+                    {"transfer_id_last_6_digits": ["ဤ လွှဲပြောင်း ID (၆ လုံး) သည် ရှိပြီးသား ဖြစ်နေပါသည်။"]}
+                )
+
+        # လချုပ်ပိတ်ပြီးသော ရက်စွဲ — မူလရက်စွဲ / ရက်စွဲအသစ် နှစ်ခုစလုံး
+        if group is not None:
+            periods.check_open(
+                group.owner_id, attrs.get('transaction_date'), getattr(self.instance, 'transaction_date', None),
+            )
+        return attrs
+
+    def validate_upload_id(self, value):
+        request = self.context.get('request')
+        session = UploadSession.objects.filter(pk=value, user=getattr(request, 'user', None), status='complete').first()
+        if session is None:
+            raise serializers.ValidationError("ပြီးဆုံးထားသော upload ကို ရှာမတွေ့ပါ။")
+        return session
+
+    def _mark_attached(self, session):
+        session.status = 'attached'
+        session.save(update_fields=['status', 'updated_at'])
+
     def create(self, validated_data):
         # submitted_by ကို request user ဖြင့်အလိုအလျောက် သတ်မှတ်
         validated_data['submitted_by'] = self.context['request'].user
+        session = validated_data.pop('upload_id', None)
+        if session is not None:
+            # ဖိုင်ကို storage ထဲ သိမ်းပြီးသား — name ကိုသာ ချိတ် (ထပ်မရေး)
+            validated_data['image'] = session.blob_name
         try:
-            return super().create(validated_data)
+            instance = super().create(validated_data)
         except IntegrityError:
             # DB-level unique (optional) ကလည်း ထပ်တူသွားရင် fallback error
             raise serializers.ValidationError({"transfer_id_last_6_digits": ["ဤ ၆ လုံး ID သည် ရှိပြီးသား ဖြစ်ပါသည်။"]})
+        if session is not None:
+            self._mark_attached(session)
+        return instance
 
     def update(self, instance, validated_data):
         """
@@ -172,18 +271,97 @@ class TransactionSerializer(serializers.ModelSerializer):
         if new_image is not None:
             instance.image = new_image
 
+        session = validated_data.pop('upload_id', None)
+        if session is not None:
+            instance.image.name = session.blob_name
+
         # အခြား field များကို default update ချ
         for attr, val in validated_data.items():
             setattr(instance, attr, val)
         instance.save()
+        if session is not None:
+            self._mark_attached(session)
         return instance
 
 
+class ArchivedTransactionSerializer(SparseFieldsetsMixin, serializers.ModelSerializer):
+    """Archive (sheets/archive.py) ထဲရှိ Transaction — ဖတ်ရန်သာ (risk / duplicate data မရှိ)"""
+    group_name = serializers.CharField(source='group.name', read_only=True)
+    payment_account_name = serializers.CharField(source='payment_account.payment_account_name', read_only=True)
+    submitted_by_username = serializers.CharField(source='submitted_by.username', read_only=True)
+    transaction_type_display = serializers.CharField(source='get_transaction_type_display', read_only=True)
+    status_display = serializers.CharField(source='get_status_display', read_only=True)
+    archived = serializers.BooleanField(default=True, read_only=True)
+
+    class Meta:
+        model = ArchivedTransaction
+        fields = [
+            'id', 'submitted_by', 'submitted_by_username', 'transaction_date', 'group', 'group_name',
+            'payment_account', 'payment_account_name', 'transfer_id_last_6_digits',
+            'amount', 'transaction_type', 'transaction_type_display', 'image',
+            'submitted_at', 'status', 'status_display', 'approved_by_owner_at', 'owner_notes',
+            'archived', 'archived_at',
+        ]
+        read_only_fields = fields
+
+
+class UploadSessionSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = UploadSession
+        fields = ['id', 'filename', 'size', 'received', 'status', 'blob_name', 'created_at', 'updated_at']
+        read_only_fields = ['id', 'received', 'status', 'blob_name', 'created_at', 'updated_at']
+
+    def validate_filename(self, value):
+        value = get_valid_filename(os.path.basename(value))
+        if not value.lower().endswith(ALLOWED_EXTENSIONS):
+            raise serializers.ValidationError("ပုံဖိုင် (jpg, png, webp ...) သာ တင်နိုင်ပါသည်။")
+        return value
+
+    def validate_size(self, value):
+        if value <= 0:
+            raise serializers.ValidationError("size သည် 0 ထက် ကြီးရမည်။")
+        if value > max_upload_size():
+            raise serializers.ValidationError("ဖိုင်အရွယ်အစား ကြီးလွန်းပါသည်။")
+        return value
+
+
+class JobSerializer(serializers.ModelSerializer):
+    created_by_username = serializers.CharField(source='created_by.username', read_only=True, default=None)
+
+    class Meta:
+        model = Job
+        fields = [
+            'id', 'kind', 'payload', 'status', 'attempts', 'max_attempts', 'progress', 'progress_message',
+            'result', 'error', 'created_by', 'created_by_username', 'created_at', 'started_at', 'finished_at',
+        ]
+        read_only_fields = [
+            'id', 'status', 'attempts', 'max_attempts', 'progress', 'progress_message', 'result', 'error',
+            'created_by', 'created_by_username', 'created_at', 'started_at', 'finished_at',
+        ]
+
+    def validate_kind(self, value):
+        if value not in enqueueable_kinds():
+            raise serializers.ValidationError(f"ခွင့်ပြုထားသော job များ: {', '.join(enqueueable_kinds())}")
+        return value
+
+    def validate_payload(self, value):
+        if not isinstance(value, dict):
+            raise serializers.ValidationError("payload သည် JSON object ဖြစ်ရမည်။")
+        return value
+
+    def validate(self, attrs):
+        try:
+            check_payload(attrs['kind'], attrs.get('payload') or {})
+        except ValueError as exc:
+            raise serializers.ValidationError({'payload': str(exc)})
+        return attrs
+
+
 class OwnerApproveRejectSerializer(serializers.Serializer):
     owner_notes = serializers.CharField(required=False, allow_blank=True)
 
 
-class AuditEntrySerializer(serializers.ModelSerializer):
+class AuditEntrySerializer(SparseFieldsetsMixin, TenantScopedFieldsMixin, serializers.ModelSerializer):
     group_name = serializers.CharField(source='group.name', read_only=True)
     auditor_username = serializers.CharField(source='auditor.username', read_only=True)
 
@@ -213,6 +391,39 @@ class AuditEntrySerializer(serializers.ModelSerializer):
 #         data = super().to_representation(instance)
 #         return data
 
+class BalanceSnapshotSerializer(serializers.ModelSerializer):
+    group_name = serializers.CharField(source='group.name', read_only=True)
+    payment_account_name = serializers.CharField(source='payment_account.payment_account_name', read_only=True)
+
+    class Meta:
+        model = BalanceSnapshot
+        fields = [
+            'group', 'group_name', 'payment_account', 'payment_account_name',
+            'income', 'expense', 'rejected_income', 'rejected_expense',
+        ]
+        read_only_fields = fields
+
+
+class ClosedPeriodSerializer(serializers.ModelSerializer):
+    closed_by_username = serializers.CharField(source='closed_by.username', read_only=True, default=None)
+    snapshots = BalanceSnapshotSerializer(many=True, read_only=True)
+
+    class Meta:
+        model = ClosedPeriod
+        fields = ['id', 'period', 'closed_by', 'closed_by_username', 'closed_at', 'snapshots']
+        read_only_fields = fields
+
+
+class ClosePeriodSerializer(serializers.Serializer):
+    month = serializers.CharField(help_text="YYYY-MM")
+
+    def validate_month(self, value):
+        month = periods.parse_month(value)
+        if month is None:
+            raise serializers.ValidationError("YYYY-MM ပုံစံ ဖြစ်ရမည်။")
+        return month
+
+
 class AuditSummarySerializer(serializers.Serializer):
     total_income = serializers.DecimalField(max_digits=18, decimal_places=2)
     total_expense = serializers.DecimalField(max_digits=18, decimal_places=2)
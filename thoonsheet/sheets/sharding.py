@@ -0,0 +1,205 @@
+# sheets/sharding.py
+"""
+Owner တစ်ဦးချင်း SQLite database ဖိုင်သီးသန့် (optional, settings.SHEETS_SHARDING = True)
+
+- Group / PaymentAccount / Transaction / ArchivedTransaction / AuditEntry / ReceiptFingerprint / IdempotencyKey /
+  ClosedPeriod / BalanceSnapshot (+ full-text index) များသည်
+  `SHEETS_SHARD_DIR/owner_<id>.sqlite3` ထဲတွင် နေသည်။ Owner အချင်းချင်း write lock မလုတော့ပါ။
+- User, Job, UploadSession, MediaBlob (receipt blob များကို owner များကြား မျှသုံး) စသည်တို့ `default` တွင်သာ ကျန်သည်။
+  Sharded table များ၏ user FK မှန်ကန်ရန် owner နှင့် ၎င်း၏ auditor များကို shard ထဲ mirror လုပ်ထားသည် (mirror_users)။
+- Request တစ်ခုအတွင်း မည်သည့် shard ကိုသုံးမည်ကို ShardScopedViewMixin က authenticated user မှ ဆုံးဖြတ်ပြီး
+  contextvar ထဲထားသည်။ ShardRouter က ၎င်းကိုဖတ်၍ route လုပ်သည်။ Request မဟုတ်သော code (job, command) တွင်
+  `with use_shard(owner_id):` သို့မဟုတ် `.using(alias)` ဖြင့် ရွေးပါ။
+
+Shard connection များကို runtime တွင် `connections.settings` ထဲ ထည့်သည် (ensure_shard)၊ DATABASES ထဲ ရေးစရာမလို။
+    python manage.py split_into_shards     # default ထဲက data ကို owner အလိုက် ခွဲ
+    python manage.py migrate_shards        # model ပြောင်းတိုင်း shard အားလုံးကို migrate
+"""
+
+import os
+from contextlib import contextmanager
+from contextvars import ContextVar
+from threading import Lock
+
+from django.conf import settings
+from django.db import connections
+
+SHARD_PREFIX = 'owner_'
+# IdempotencyKey — mutation နှင့် transaction တစ်ခုတည်းဖြင့် commit ရန် shard ထဲတွင်
+SHARDED_MODELS = {
+    'group', 'paymentaccount', 'transaction', 'archivedtransaction', 'auditentry', 'receiptfingerprint',
+    'idempotencykey', 'closedperiod', 'balancesnapshot',
+}
+# shard ထဲတွင် table မလိုသော sheets model များ (default တွင်သာ)
+DEFAULT_ONLY_MODELS = {'mediablob', 'uploadsession', 'job', 'requestprofile'}
+
+_current_alias = ContextVar('sheets_shard_alias', default=None)
+_lock = Lock()
+
+
+def is_enabled():
+    return getattr(settings, 'SHEETS_SHARDING', False)
+
+
+def shard_dir():
+    return getattr(settings, 'SHEETS_SHARD_DIR', None) or os.path.join(settings.BASE_DIR, 'shards')
+
+
+def alias_for(owner_id):
+    return f'{SHARD_PREFIX}{int(owner_id)}'
+
+
+def is_sharded(model):
+    return model._meta.app_label == 'sheets' and model._meta.model_name in SHARDED_MODELS
+
+
+def is_shard_alias(alias):
+    return bool(alias) and alias.startswith(SHARD_PREFIX)
+
+
+def ensure_shard(owner_id):
+    """Owner ၏ shard connection ကို register လုပ်ပြီး alias ကို ပြန်ပေး (ဖိုင်ကို migrate က ဖန်တီးသည်)"""
+    alias = alias_for(owner_id)
+    if alias not in connections.settings:
+        with _lock:
+            if alias not in connections.settings:
+                os.makedirs(shard_dir(), exist_ok=True)
+                config = dict(connections['default'].settings_dict)
+                config['NAME'] = os.path.join(shard_dir(), f'{alias}.sqlite3')
+                connections.settings[alias] = config
+    return alias
+
+
+def owner_ids():
+    from django.contrib.auth import get_user_model
+    return list(
+        get_user_model().objects.using('default').filter(user_type='owner').order_by('pk').values_list('pk', flat=True)
+    )
+
+
+def all_aliases():
+    """Sharded model များ ရှိနိုင်သော database အားလုံး (sharding ပိတ်ထားလျှင် default သာ)"""
+    if not is_enabled():
+        return ['default']
+    return ['default'] + [ensure_shard(owner_id) for owner_id in owner_ids()]
+
+
+def current_alias():
+    return _current_alias.get()
+
+
+def activate(alias):
+    return _current_alias.set(alias)
+
+
+def deactivate(token):
+    _current_alias.reset(token)
+
+
+def alias_for_user(user):
+    if not is_enabled() or user is None or not user.is_authenticated or user.is_superuser:
+        return None
+    tenant_id = getattr(user, 'tenant_id', None)
+    return ensure_shard(tenant_id) if tenant_id is not None else None
+
+
+@contextmanager
+def use_alias(alias):
+    token = activate(alias)
+    try:
+        yield alias
+    finally:
+        deactivate(token)
+
+
+def use_shard(owner_id):
+    return use_alias(ensure_shard(owner_id) if is_enabled() and owner_id is not None else None)
+
+
+# Shard ထဲရှိ user copy သည် FK / join အတွက်သာ — authentication က default မှသာ ဖတ်သောကြောင့် ဤ field များ ပြောင်းရုံဖြင့် mirror မလုပ်
+USER_MIRROR_IGNORED_FIELDS = frozenset({'last_login', 'password'})
+
+
+def user_mirror_state(user):
+    """Shard copy ကို update လိုမလို နှိုင်းယှဉ်ရန် (deferred field များကို DB မှ မဖတ်)"""
+    return tuple(
+        user.__dict__.get(field.attname)
+        for field in user._meta.concrete_fields if field.name not in USER_MIRROR_IGNORED_FIELDS
+    )
+
+
+def mirror_users(owner_id, using=None):
+    """Owner နှင့် ၎င်း၏ auditor များကို shard ထဲ copy/update (user FK constraint များအတွက်)"""
+    from django.contrib.auth import get_user_model
+    from django.db.models import Q
+
+    User = get_user_model()
+    using = using or ensure_shard(owner_id)
+    users = list(User.objects.using('default').filter(Q(pk=owner_id) | Q(owner_id=owner_id)).order_by('pk'))
+    if users:
+        User.objects.using(using).bulk_create(
+            users, update_conflicts=True, unique_fields=['id'],
+            update_fields=[f.name for f in User._meta.concrete_fields if not f.primary_key],
+        )
+    return len(users)
+
+
+def provision_shard(owner_id, verbosity=0):
+    """Shard ဖိုင်မရှိသေးလျှင် migrate လုပ်ပြီး user များကို mirror (owner အသစ်အတွက်)"""
+    from django.core.management import call_command
+
+    alias = ensure_shard(owner_id)
+    if not os.path.exists(connections.settings[alias]['NAME']):
+        call_command('migrate', database=alias, interactive=False, verbosity=verbosity)
+    mirror_users(owner_id, using=alias)
+    return alias
+
+
+class ShardRouter:
+    """
+    sharding ဖွင့်ထားပြီး shard ရွေးထားလျှင် sheets data ကို owner ၏ database သို့ route
+    မဖွင့်ထားလျှင် / shard မရွေးထားလျှင် None (= default)
+    """
+
+    def _alias(self, model, hints):
+        if not is_enabled() or not is_sharded(model):
+            return None
+        instance = hints.get('instance')
+        # hint instance သည် mirror လုပ်ထားသော user (default) ဖြစ်နိုင်သောကြောင့် sharded model ဆိုမှသာ ယုံ
+        if instance is not None and instance._state.db and is_sharded(instance):
+            return instance._state.db
+        return current_alias()
+
+    def db_for_read(self, model, **hints):
+        return self._alias(model, hints)
+
+    def db_for_write(self, model, **hints):
+        return self._alias(model, hints)
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # shard ထဲက row မှ default ရှိ user (mirror လုပ်ထား) သို့ FK
+        if is_shard_alias(obj1._state.db) or is_shard_alias(obj2._state.db):
+            labels = {obj1._meta.label_lower, obj2._meta.label_lower}
+            if settings.AUTH_USER_MODEL.lower() in labels:
+                return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        if is_shard_alias(db) and app_label == 'sheets' and model_name in DEFAULT_ONLY_MODELS:
+            return False
+        return None
+
+
+class ShardScopedViewMixin:
+    """DRF view mixin — authentication ပြီးတာနဲ့ request user ၏ shard ကို ရွေး၊ response ပြီးလျှင် ပြန်ဖြုတ်"""
+
+    def perform_authentication(self, request):
+        super().perform_authentication(request)
+        self._shard_token = activate(alias_for_user(request.user))
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        token = getattr(self, '_shard_token', None)
+        if token is not None:
+            deactivate(token)
+            self._shard_token = None
+        return super().finalize_response(request, response, *args, **kwargs)
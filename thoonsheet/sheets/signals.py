@@ -1,6 +1,10 @@
+from django.conf import settings
 from django.dispatch import receiver
-from django.db.models.signals import post_save
-from sheets.models import Transaction
+from django.db.models.signals import post_delete, post_init, post_save
+from sheets.models import ArchivedTransaction, AuditEntry, Group, PaymentAccount, Transaction
+from sheets.storage import acquire_blob, release_blob
+from sheets.fingerprints import schedule_fingerprint
+from sheets import events, forecasting, risk, search, sharding
 
 
 @receiver(post_save, sender=Transaction)
@@ -10,3 +14,140 @@ def update_audit_entry_on_transaction_save(sender, instance, created, **kwargs):
     # If an audit entry needs to be automatically created/updated based on transactions,
     # this is where the logic would go.
     pass
+
+
+# ---- Receipt image reference counting (sheets.storage.ContentAddressedStorage) ----
+
+@receiver(post_init, sender=Transaction)
+def remember_transaction_image(sender, instance, **kwargs):
+    # DB မှ load လုပ်ချိန်က image name (deferred ဖြစ်နေရင် None)
+    instance._original_image_name = instance.__dict__.get('image')
+
+
+@receiver(post_save, sender=Transaction)
+def track_transaction_image_refs(sender, instance, created, **kwargs):
+    new_name = instance.image.name or ''
+    if created:
+        old_name = ''
+    else:
+        old_name = getattr(instance, '_original_image_name', None)
+        if old_name is None:
+            # image field ကို defer လုပ်ထားပြီး save — image မပြောင်းသည်ဟု ယူဆ
+            return
+        old_name = getattr(old_name, 'name', old_name) or ''
+    if new_name != old_name:
+        acquire_blob(new_name)
+        release_blob(old_name)
+        # perceptual hash ကို background pool ထဲမှာ တွက် (duplicate receipt စစ်ရန်)
+        instance._fingerprint_future = schedule_fingerprint(instance.pk, using=kwargs.get('using'))
+    instance._original_image_name = new_name
+
+
+@receiver(post_delete, sender=Transaction)
+@receiver(post_delete, sender=ArchivedTransaction)
+def release_transaction_image(sender, instance, **kwargs):
+    # archive သို့ ရွှေ့ခြင်းသည် signal မဖြတ်သောကြောင့် ref ကို archive row က ဆက်ကိုင်ထားသည်
+    release_blob(instance.image.name)
+
+
+# ---- Owner review queue risk score (sheets.risk) ----
+
+@receiver(post_save, sender=Transaction)
+def refresh_risk_score(sender, instance, raw=False, using=None, **kwargs):
+    # တင်/ပြင်/ပြန်တင် — ထို group + payment account ၏ pending များကို commit ပြီးမှ ပြန်တွက်
+    if raw or instance.status != 'pending' or instance.group_id is None:
+        return
+    risk.schedule_rescore(instance, using=using)
+
+
+# ---- Cash-flow forecast cache (sheets.forecasting) ----
+
+@receiver(post_save, sender=Transaction)
+def invalidate_forecast_on_save(sender, instance, raw=False, using=None, **kwargs):
+    # approved ဖြစ်လာ / approved မှ ပြောင်း / approved ကို ပြင် — group ၏ forecast ကို ပြန်တွက်ရန်
+    # (_original_status ကို ဖတ်ရုံသာ — reset_transaction_status က နောက်ဆုံးမှ ပြန်သတ်မှတ်)
+    if not raw and 'approved' in (instance.status, getattr(instance, '_original_status', None)):
+        forecasting.invalidate(instance.group_id, using=using)
+
+
+@receiver(post_delete, sender=Transaction)
+def invalidate_forecast_on_delete(sender, instance, using=None, **kwargs):
+    if instance.status == 'approved':
+        forecasting.invalidate(instance.group_id, using=using)
+
+
+# ---- Full-text search index (sheets.search) ----
+
+@receiver(post_save, sender=Transaction)
+@receiver(post_save, sender=AuditEntry)
+@receiver(post_save, sender=Group)
+@receiver(post_save, sender=PaymentAccount)
+def update_search_index(sender, instance, raw=False, using=None, **kwargs):
+    if raw:
+        # loaddata — `manage.py rebuild_search_index` ဖြင့် ပြန်တည်ပါ
+        return
+    search.index_instance(instance, using=using)
+
+
+@receiver(post_delete, sender=Transaction)
+@receiver(post_delete, sender=AuditEntry)
+@receiver(post_delete, sender=Group)
+@receiver(post_delete, sender=PaymentAccount)
+def remove_from_search_index(sender, instance, using=None, **kwargs):
+    search.remove_instance(instance, using=using)
+
+
+# ---- Owner-scoped tenancy (Group.save က denormalized owner ကို လိုက်ပြင်) ----
+
+@receiver(post_init, sender=Group)
+def remember_group_owner(sender, instance, **kwargs):
+    # DB မှ load လုပ်ချိန်က owner (deferred ဖြစ်နေရင် None — save တွင် ပြောင်းသည်ဟု ယူ)
+    instance._original_owner_id = instance.__dict__.get('owner_id')
+
+
+# ---- Database-per-owner sharding (sheets.sharding) ----
+
+@receiver(post_init, sender=settings.AUTH_USER_MODEL)
+def remember_user_mirror_state(sender, instance, **kwargs):
+    instance._original_mirror_state = sharding.user_mirror_state(instance)
+
+
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+def mirror_user_into_shard(sender, instance, created, raw=False, using=None, update_fields=None, **kwargs):
+    # default ထဲမှ user ပြောင်းလဲမှုကို owner ၏ shard ထဲ ထပ်ရေး (shard မရှိသေးလျှင် ဖန်တီး)
+    # login (last_login) / password ပြောင်းခြင်းကဲ့သို့ shard copy နှင့် မဆိုင်သော save များကို ကျော်
+    if raw or using != 'default' or not sharding.is_enabled():
+        return
+    state = sharding.user_mirror_state(instance)
+    changed = created or state != getattr(instance, '_original_mirror_state', None)
+    if update_fields is not None and not set(update_fields) - sharding.USER_MIRROR_IGNORED_FIELDS:
+        changed = False
+    instance._original_mirror_state = state
+    if changed and instance.tenant_id is not None:
+        sharding.provision_shard(instance.tenant_id)
+
+
+# ---- Real-time transaction events (sheets.events, /api/sheets/events/) ----
+
+@receiver(post_init, sender=Transaction)
+def remember_transaction_status(sender, instance, **kwargs):
+    # DB မှ load လုပ်ချိန်က status (deferred ဖြစ်နေရင် None)
+    instance._original_status = instance.__dict__.get('status')
+
+
+@receiver(post_save, sender=Transaction)
+def publish_transaction_event(sender, instance, created, raw=False, using=None, **kwargs):
+    if raw:
+        return
+    event_type = events.event_type_for(getattr(instance, '_original_status', None), instance.status, created)
+    if event_type is not None:
+        events.publish_on_commit(event_type, instance, using=using)
+
+
+# ---- Status tracking (forecast cache နှင့် events နှစ်ခုလုံး သုံး) ----
+
+@receiver(post_save, sender=Transaction)
+def reset_transaction_status(sender, instance, **kwargs):
+    # _original_status ကို ဖတ်သော receiver များ အားလုံးပြီးမှ — ဤ module ၏ နောက်ဆုံး post_save ဖြစ်ရမည်
+    instance._original_status = instance.status
+
@@ -0,0 +1,128 @@
+# sheets/startup.py
+"""
+Worker startup အချိန် တိုင်းတာခြင်း — `manage.py startup_report`
+
+Settings module တစ်ခုစီအတွက် python process အသစ်တစ်ခု (`python -X importtime`) ကို run ပြီး:
+- အဆင့် အလိုက် အချိန် — settings, django.setup() (app / model import + ready()), URLconf, WSGI handler
+  (middleware chain), ပထမ request နှင့် ထို့နောက် request များ၏ ပျမ်းမျှ
+- Import အချိန် — `-X importtime` ၏ module တစ်ခုချင်း self အချိန်ကို INSTALLED_APPS (အရှည်ဆုံး module prefix)
+  အလိုက် ပေါင်း (app မဟုတ်သော package များကို package အမည်ဖြင့်)
+
+Process ပြင်ပမှ တိုင်းသောကြောင့် ယခု process ၏ cache / import များ ရလဒ်ကို မထိ။
+"""
+
+import io
+import json
+import os
+import re
+import subprocess
+import sys
+import time
+from collections import defaultdict
+
+from django.conf import settings
+
+re_importtime = re.compile(r'^import time:\s+(\d+)\s+\|\s+\d+\s+\|\s*(\S+)')
+MARKER = 'SHEETS_STARTUP_REPORT '
+# token မပါသော API request (401) — middleware + DRF authentication + renderer ကို ဖြတ်သည်
+DEFAULT_PATH = '/api/sheets/groups/'
+
+
+def probe(path=DEFAULT_PATH, requests=50):
+    """Child process ထဲတွင် — အဆင့် အလိုက် ms ကို stdout သို့ JSON (MARKER) ဖြင့် ထုတ်"""
+    started = time.perf_counter()
+    phases = {}
+
+    def mark(name, since):
+        now = time.perf_counter()
+        phases[name] = round((now - since) * 1000, 3)
+        return now
+
+    import django
+    from django.conf import settings as lazy_settings
+
+    now = time.perf_counter()
+    lazy_settings.INSTALLED_APPS  # settings module import
+    now = mark('settings', now)
+    django.setup()
+    now = mark('setup', now)
+    from django.urls import get_resolver
+    get_resolver().url_patterns
+    now = mark('urlconf', now)
+    from django.core.handlers.wsgi import WSGIHandler
+    handler = WSGIHandler()
+    now = mark('middleware', now)
+
+    host = next((h for h in lazy_settings.ALLOWED_HOSTS if h and not h.startswith(('*', '.'))), 'localhost')
+
+    def get():
+        # django.test ကို import မလုပ်ရန် (import အချိန်ထဲ မပါစေရန်) WSGI environ ကို ကိုယ်တိုင်
+        environ = {
+            'REQUEST_METHOD': 'GET', 'PATH_INFO': path, 'QUERY_STRING': '', 'SERVER_NAME': host,
+            'SERVER_PORT': '80', 'HTTP_HOST': host, 'HTTP_ACCEPT': 'application/json',
+            'wsgi.input': io.BytesIO(), 'wsgi.url_scheme': 'http',
+        }
+        response = handler(environ, lambda status, headers, exc_info=None: None)
+        response.close()
+
+    get()
+    now = mark('first_request', now)
+    for _ in range(requests):
+        get()
+    phases['request_avg'] = round((time.perf_counter() - now) * 1000 / max(requests, 1), 3)
+    phases['boot'] = round(sum(phases[name] for name in ('settings', 'setup', 'urlconf', 'middleware')), 3)
+    phases['total'] = round((time.perf_counter() - started) * 1000, 3)
+
+    sys.stdout.write(MARKER + json.dumps({
+        'phases': phases,
+        'apps': list(lazy_settings.INSTALLED_APPS),
+        'middleware': list(lazy_settings.MIDDLEWARE),
+        'requests': requests,
+        'path': path,
+    }) + '\n')
+    sys.stdout.flush()
+
+
+def parse_importtime(lines, apps):
+    """
+    -X importtime stderr -> {app / package: ms}
+    Module တစ်ခုချင်း၏ self အချိန်ကို ၎င်းပါဝင်သော INSTALLED_APPS entry (အရှည်ဆုံး prefix) သို့ package အမည်ဖြင့် ပေါင်း
+    (ဥပမာ sheets က numpy ကို import လုပ်လျှင် numpy အဖြစ် ပြ)
+    """
+    prefixes = sorted(apps, key=len, reverse=True)
+    totals = defaultdict(float)
+    for line in lines:
+        match = re_importtime.match(line)
+        if match is None:
+            continue
+        module = match.group(2)
+        owner = next(
+            (app for app in prefixes if module == app or module.startswith(app + '.')),
+            module.split('.')[0],
+        )
+        totals[owner] += int(match.group(1)) / 1000.0
+    return dict(sorted(((name, round(ms, 3)) for name, ms in totals.items()), key=lambda item: item[1], reverse=True))
+
+
+def measure(settings_module, path=DEFAULT_PATH, requests=50, env=None):
+    """Settings module တစ်ခု -> {'settings', 'phases', 'imports', 'apps', 'middleware', 'requests', 'path'}"""
+    child_env = dict(os.environ, **(env or {}))
+    child_env['DJANGO_SETTINGS_MODULE'] = settings_module
+    # settings_production — secret ကို env မှသာ ယူ (တိုင်းတာရန်သာ ဖြစ်၍ placeholder)
+    child_env.setdefault('DJANGO_SECRET_KEY', 'startup-report')
+    # django.conf ကို အရင် import — sheets.startup ၏ import အဖြစ် မရေတွက်စေရန်
+    code = f"import django.conf; from sheets.startup import probe; probe({path!r}, {int(requests)})"
+    completed = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', code],
+        cwd=str(settings.BASE_DIR), env=child_env, capture_output=True, text=True,
+    )
+    report = next(
+        (json.loads(line[len(MARKER):]) for line in completed.stdout.splitlines() if line.startswith(MARKER)),
+        None,
+    )
+    if completed.returncode != 0 or report is None:
+        errors = [line for line in completed.stderr.splitlines() if not line.startswith('import time:')]
+        raise RuntimeError(f"{settings_module}: " + ('\n'.join(errors[-20:]) or f"exit {completed.returncode}"))
+    report['settings'] = settings_module
+    report['imports'] = parse_importtime(completed.stderr.splitlines(), report['apps'])
+    return report
@@ -0,0 +1,167 @@
+# sheets/statements.py
+"""
+Payment account statement — GET /api/sheets/payment-accounts/{id}/statement/?start=YYYY-MM-DD&page_size=50
+
+Approved transaction တစ်ခုချင်းနောက် running balance ကို SQL window function (SUM() OVER) ဖြင့် တွက်သည်။
+- Opening balance — start မတိုင်မီ ကုန်ဆုံးသော နောက်ဆုံး လချုပ် snapshot (sheets/periods.py) + ထို့နောက် start အထိ ပမာဏ
+  start မပေးလျှင် နောက်ဆုံးပိတ်ထားသောလ၏ နောက်နေ့မှ စသည်
+- Keyset pagination — cursor ထဲတွင် (account, transaction_date, id, ထိုနေရာ၏ balance) ပါသောကြောင့် မည်သည့် page မဆို
+  ရှေ့ row များကို ပြန်မပေါင်းဘဲ (payment_account, status, transaction_date, id) index range ဖြင့်သာ ဖတ်သည်
+  (cursor ကို အခြား account ၏ statement တွင် သုံး၍ မရ)
+- opening_balance / page_end_balance — ဤ page ၏ ပထမ row မတိုင်မီ နှင့် နောက်ဆုံး row ပြီးနောက် balance
+  (account ၏ လက်ရှိ balance မဟုတ်ပါ — နောက်ဆုံး page ၏ page_end_balance သာ ဖြစ်သည်)
+- Page က archive လုပ်ပြီးသောလ (sheets/archive.py) ထဲ ရောက်လျှင် hot / archive နှစ်ခုစလုံးမှ page တစ်ခုစာစီ
+  ဖတ်ပြီး (transaction_date, id) အစဉ်အတိုင်း merge ကာ balance ကို Python ဖြင့် ဆက်ပေါင်းသည်
+"""
+
+import heapq
+
+from datetime import timedelta
+from decimal import Decimal
+
+from django.core import signing
+from django.db.models import Case, DecimalField, F, Q, Sum, When, Window
+from django.db.models.expressions import RowRange
+from django.db.models.functions import Coalesce
+from django.utils.dateparse import parse_date
+
+from . import archive, periods
+from .models import BalanceSnapshot, Transaction
+
+CURSOR_SALT = 'sheets.statements'
+MONEY = DecimalField(max_digits=18, decimal_places=2)
+ZERO = Decimal('0.00')
+CENT = Decimal('0.01')
+
+
+def signed_amount():
+    return Case(
+        When(transaction_type='expense', then=-F('amount')),
+        default=F('amount'),
+        output_field=MONEY,
+    )
+
+
+ROW_FIELDS = ('id', 'transaction_date', 'transaction_type', 'amount', 'group_id', 'transfer_id_last_6_digits', 'submitted_by_id')
+
+
+def approved_rows(account, using=None):
+    return Transaction.objects.using(using).filter(payment_account=account, status='approved')
+
+
+def approved_sources(account, since=None, using=None):
+    """approved_rows() + since မှ စသော range က archive ထဲ ရောက်လျှင် archive ထဲမှ row များ"""
+    return [qs.filter(payment_account=account, status='approved')
+            for qs in archive.querysets(since, account.owner_id, using=using)]
+
+
+def encode_cursor(account, row):
+    return signing.dumps({
+        'a': account.pk, 'd': row['transaction_date'].isoformat(), 'i': row['id'], 'b': str(row['balance']),
+    }, salt=CURSOR_SALT)
+
+
+def decode_cursor(value, account):
+    """မမှန်ကန်/ပြင်ထားသော သို့မဟုတ် အခြား account ၏ cursor -> None"""
+    try:
+        data = signing.loads(value, salt=CURSOR_SALT)
+        if data['a'] != account.pk:
+            return None
+        return parse_date(data['d']), int(data['i']), Decimal(data['b'])
+    except (signing.BadSignature, KeyError, TypeError, ValueError, ArithmeticError):
+        return None
+
+
+def opening_balance(account, start=None, using=None):
+    """
+    (start နေ့ မတိုင်မီ balance, ပထမ row ၏ အနည်းဆုံးရက်စွဲ)
+    Snapshot ရှိလျှင် snapshot + snapshot နောက် start အထိ (open period) ပမာဏသာ ပေါင်း
+    """
+    period = periods.latest_period(
+        account.owner_id, before=start - timedelta(days=1) if start else None, using=using,
+    )
+    balance, since = ZERO, None
+    if period is not None:
+        since = periods.month_end(period.period)
+        snap = BalanceSnapshot.objects.using(using).filter(period=period, payment_account=account).aggregate(
+            income=Coalesce(Sum('income'), ZERO, output_field=MONEY),
+            expense=Coalesce(Sum('expense'), ZERO, output_field=MONEY),
+        )
+        balance = snap['income'] - snap['expense']
+    if start is None:
+        return balance, since + timedelta(days=1) if since else None
+
+    for gap in approved_sources(account, since + timedelta(days=1) if since else None, using):
+        gap = gap.filter(transaction_date__lt=start)
+        if since is not None:
+            gap = gap.filter(transaction_date__gt=since)
+        balance += gap.aggregate(total=Coalesce(Sum(signed_amount()), ZERO, output_field=MONEY))['total']
+    return balance, start
+
+
+def page(account, start=None, cursor=None, size=50, using=None):
+    """
+    -> {'opening_balance', 'page_end_balance', 'results': [...], 'next_cursor'}
+    cursor — decode_cursor() ၏ ရလဒ် (transaction_date, id, balance)
+    """
+    if cursor is not None:
+        after_date, after_id, opening = cursor
+        sources = [rows.filter(Q(transaction_date__gt=after_date) | Q(transaction_date=after_date, id__gt=after_id))
+                   for rows in approved_sources(account, after_date, using)]
+    else:
+        opening, since = opening_balance(account, start, using)
+        sources = approved_sources(account, since, using)
+        if since is not None:
+            sources = [rows.filter(transaction_date__gte=since) for rows in sources]
+    if len(sources) > 1:
+        results, more = merged_page(sources, opening, size)
+        return _page_result(account, opening, results, more)
+    rows = sources[0]
+
+    # Page ၏ နောက်ဆုံး key ကို index ဖြင့် အရင်ရှာပြီး window ကို ထို range အတွင်းသာ run
+    # (WHERE ပြီးမှ window တွက်သောကြောင့် နောက်ပိုင်း row အားလုံးကို မပေါင်းမိစေရန်)
+    ordered = rows.order_by('transaction_date', 'id')
+    boundary = list(ordered.values_list('transaction_date', 'id')[size:size + 1])
+    if boundary:
+        last_date, last_id = boundary[0]
+        rows = rows.filter(Q(transaction_date__lt=last_date) | Q(transaction_date=last_date, id__lt=last_id))
+
+    rows = (rows
+            .annotate(running=Window(
+                Sum(signed_amount()),
+                order_by=[F('transaction_date').asc(), F('id').asc()],
+                frame=RowRange(start=None, end=0),
+                output_field=MONEY,
+            ))
+            .order_by('transaction_date', 'id')
+            .values(*ROW_FIELDS, 'running'))
+
+    results = []
+    for row in rows:
+        row['balance'] = opening + row.pop('running')
+        results.append(row)
+    return _page_result(account, opening, results, bool(boundary))
+
+
+def merged_page(sources, opening, size):
+    """Queryset တစ်ခုစီမှ size + 1 row စီ -> (transaction_date, id) အစဉ် merge -> (results, နောက် page ရှိ/မရှိ)"""
+    pages = [rows.order_by('transaction_date', 'id').values(*ROW_FIELDS)[:size + 1] for rows in sources]
+    merged = list(heapq.merge(*pages, key=lambda row: (row['transaction_date'], row['id'])))
+    balance, results = opening, []
+    for row in merged[:size]:
+        balance += -row['amount'] if row['transaction_type'] == 'expense' else row['amount']
+        row['balance'] = balance
+        results.append(row)
+    return results, len(merged) > size
+
+
+def _page_result(account, opening, results, more):
+    # SQLite ၏ SUM() OVER သည် float ဖြင့် ပေါင်းသောကြောင့် cent သို့ ပြန်ဖြတ်
+    for row in results:
+        row['balance'] = row['balance'].quantize(CENT)
+    return {
+        'opening_balance': opening,
+        'page_end_balance': results[-1]['balance'] if results else opening,
+        'results': results,
+        'next_cursor': encode_cursor(account, results[-1]) if more and results else None,
+    }
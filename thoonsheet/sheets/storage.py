@@ -0,0 +1,145 @@
+# sheets/storage.py
+
+import hashlib
+import os
+import posixpath
+import tempfile
+
+from django.apps import apps
+from django.core.files.base import ContentFile
+from django.core.files.move import file_move_safe
+from django.core.files.storage import FileSystemStorage, storages
+from django.db.models import F
+from django.utils import timezone
+
+
+def receipt_storage():
+    """Transaction.image အတွက် storage (settings.STORAGES['receipts'])"""
+    return storages['receipts']
+
+
+class ContentAddressedStorage(FileSystemStorage):
+    """
+    Upload ဖိုင်ကို disk ပေါ်ရေးနေစဉ်မှာပဲ sha256 hash တွက်ပြီး
+    `<upload_to>/<aa>/<bb>/<digest><ext>` အဖြစ် တစ်ကြိမ်သာ သိမ်းသည်။
+
+    - တူညီသော screenshot ကို ထပ်တင်လျှင် disk ပေါ် ထပ်မရေးတော့ပါ (existing name ကိုပဲ ပြန်ပေး)
+    - ဖိုင်တစ်ခုကို Transaction ဘယ်နှခုက ရည်ညွှန်းနေသည်ကို MediaBlob.ref_count ဖြင့် မှတ်ထားသည်
+      (sheets.signals မှ acquire_blob / release_blob ကို ခေါ်)
+    - delete() သည် ရည်ညွှန်းသူရှိနေသေးလျှင် ဖိုင်ကိုမဖျက်ပါ။ ref_count 0 ဖြစ်သွားသော blob များကို
+      `manage.py gc_media_blobs` က ရှင်းပေးသည်။
+    - Pack ဖိုင်ထဲ ရွှေ့ပြီးသော blob (sheets/packs.py) များကို pack မှ mmap ဖြင့် ဖတ်သည်။ Loose ဖိုင် ရှိနေလျှင်
+      DB ကို မမေးဘဲ ထိုဖိုင်ကိုသာ ဖတ်သည်။
+    """
+    hash_algorithm = 'sha256'
+
+    def _packed(self, name):
+        MediaBlob = apps.get_model('sheets', 'MediaBlob')
+        return MediaBlob.objects.exclude(pack='').filter(name=name).first()
+
+    def _open(self, name, mode='rb'):
+        try:
+            return super()._open(name, mode)
+        except FileNotFoundError:
+            blob = self._packed(name)
+            if blob is None or 'w' in mode or 'a' in mode:
+                raise
+            from .packs import read
+            return ContentFile(read(blob), name=name)
+
+    def exists(self, name):
+        return super().exists(name) or self._packed(name) is not None
+
+    def size(self, name):
+        try:
+            return super().size(name)
+        except FileNotFoundError:
+            blob = self._packed(name)
+            if blob is None:
+                raise
+            return blob.size
+
+    def get_available_name(self, name, max_length=None):
+        # Content-addressed ဖြစ်သောကြောင့် _suffix (ဥပမာ _hWrY2OX) မထည့်ပါ။ နောက်ဆုံးအမည်ကို _save() က ဆုံးဖြတ်သည်။
+        return name
+
+    def blob_name(self, directory, digest, ext):
+        return posixpath.join(directory, digest[:2], digest[2:4], digest + ext)
+
+    def _save(self, name, content):
+        directory = posixpath.dirname(name)
+        ext = os.path.splitext(name)[1].lower()
+        staging_dir = self.path(directory)
+        os.makedirs(staging_dir, exist_ok=True)
+
+        hasher = hashlib.new(self.hash_algorithm)
+        size = 0
+        if hasattr(content, 'temporary_file_path'):
+            # Django က disk ပေါ် ရေးပြီးသား upload ဆိုရင် hash သာတွက်ပြီး နောက်မှ move လုပ်မည်
+            tmp_path = content.temporary_file_path()
+            owns_tmp = False
+            for chunk in content.chunks():
+                hasher.update(chunk)
+                size += len(chunk)
+        else:
+            fd, tmp_path = tempfile.mkstemp(dir=staging_dir, prefix='.upload-')
+            owns_tmp = True
+            try:
+                with os.fdopen(fd, 'wb') as fh:
+                    for chunk in content.chunks():
+                        hasher.update(chunk)
+                        size += len(chunk)
+                        fh.write(chunk)
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
+
+        digest = hasher.hexdigest()
+        final_name = self.blob_name(directory, digest, ext)
+        full_path = self.path(final_name)
+
+        if os.path.exists(full_path) or self._packed(final_name) is not None:
+            # blob ရှိပြီးသား (loose သို့ pack ထဲ) — write ကို ကျော်
+            if owns_tmp:
+                os.unlink(tmp_path)
+        else:
+            os.makedirs(os.path.dirname(full_path), exist_ok=True)
+            if owns_tmp:
+                os.replace(tmp_path, full_path)
+            else:
+                file_move_safe(tmp_path, full_path)
+            if self.file_permissions_mode is not None:
+                os.chmod(full_path, self.file_permissions_mode)
+
+        MediaBlob = apps.get_model('sheets', 'MediaBlob')
+        MediaBlob.objects.get_or_create(
+            name=final_name, defaults={'digest': digest, 'size': size},
+        )
+        return final_name
+
+    def delete(self, name):
+        if not name:
+            raise ValueError('The name must be given to delete().')
+        MediaBlob = apps.get_model('sheets', 'MediaBlob')
+        blob = MediaBlob.objects.filter(name=name).first()
+        if blob is not None and blob.ref_count > 0:
+            return
+        super().delete(name)
+        if blob is not None:
+            blob.delete()
+        from .thumbnails import remove
+        remove(name)
+
+
+def acquire_blob(name):
+    if not name:
+        return
+    MediaBlob = apps.get_model('sheets', 'MediaBlob')
+    MediaBlob.objects.filter(name=name).update(ref_count=F('ref_count') + 1, updated_at=timezone.now())
+
+
+def release_blob(name):
+    if not name:
+        return
+    MediaBlob = apps.get_model('sheets', 'MediaBlob')
+    MediaBlob.objects.filter(name=name, ref_count__gt=0).update(ref_count=F('ref_count') - 1, updated_at=timezone.now())
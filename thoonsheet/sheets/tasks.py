@@ -0,0 +1,182 @@
+# sheets/tasks.py
+"""Background job handlers (sheets.jobs) — SheetsConfig.ready() တွင် import လုပ်၍ register ဖြစ်သည်"""
+
+import csv
+import json
+import os
+import tempfile
+import uuid
+
+from django.conf import settings
+from django.core.files.storage import FileSystemStorage
+from django.core.serializers.json import DjangoJSONEncoder
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+
+from .fingerprints import compute_fingerprint
+from .jobs import job
+from . import archive, packs, reconciliation, risk, search
+from .models import Transaction
+from .replicas import use_replica
+from .sharding import alias_for_user, all_aliases, use_alias
+
+EXPORT_BATCH_SIZE = 2000
+EXPORT_COLUMNS = [
+    ('id', 'ID'),
+    ('transaction_date', 'Date'),
+    ('group__name', 'Group'),
+    ('payment_account__payment_account_name', 'Payment account'),
+    ('transfer_id_last_6_digits', 'Transfer ID'),
+    ('transaction_type', 'Type'),
+    ('amount', 'Amount'),
+    ('status', 'Status'),
+    ('submitted_by__username', 'Submitted by'),
+    ('submitted_at', 'Submitted at'),
+    ('owner_notes', 'Owner notes'),
+]
+
+
+def export_storage():
+    return FileSystemStorage(
+        location=getattr(settings, 'SHEETS_EXPORT_DIR', None) or os.path.join(settings.BASE_DIR, 'exports'),
+    )
+
+
+def transactions_visible_to(user, start=None):
+    """
+    TransactionViewSet.get_queryset နှင့် တူညီသော စည်းမျဉ်း (owner/tenant scope) —
+    [Transaction] သို့ start က archive လုပ်ပြီးသောလ ထဲ ရောက်လျှင် [Transaction, ArchivedTransaction]
+    """
+    if user is None or not (user.is_superuser or user.user_type in ('owner', 'auditor')):
+        return [Transaction.objects.none()]
+    sources = archive.querysets_for_user(user, start=start)
+    if not user.is_superuser and user.user_type == 'auditor':
+        sources = [qs.filter(submitted_by=user) for qs in sources]
+    return sources
+
+
+@job('export_transactions', enqueueable=True)
+def export_transactions(job, status=None, transaction_type=None, start=None, end=None):
+    """Transaction များ (archive ပါ) ကို CSV ထုတ်ပြီး SHEETS_EXPORT_DIR အောက်မှာ သိမ်းသည် (GET /jobs/{id}/download/)"""
+    # owner ၏ shard၊ read replica ရှိလျှင် replica မှ ဖတ်
+    with use_alias(alias_for_user(job.created_by)), use_replica():
+        return _export_transactions(job, status, transaction_type, start, end)
+
+
+def _export_transactions(job, status, transaction_type, start, end):
+    start, end = parse_date(start) if start else None, parse_date(end) if end else None
+    sources = []
+    for qs in transactions_visible_to(job.created_by, start=start):
+        if status:
+            qs = qs.filter(status=status)
+        if transaction_type:
+            qs = qs.filter(transaction_type=transaction_type)
+        if start:
+            qs = qs.filter(transaction_date__gte=start)
+        if end:
+            qs = qs.filter(transaction_date__lte=end)
+        sources.append(qs)
+
+    total = sum(qs.count() for qs in sources)
+    fields = [field for field, _ in EXPORT_COLUMNS]
+    # ခန့်မှန်း၍ မရသော directory — SHEETS_EXPORT_DIR ကို web server က မှားယွင်း serve မိလျှင်ပင် အမည်ဖြင့် ရှာမရစေရန်
+    name = f'{uuid.uuid4().hex}/transactions-{job.pk}-{timezone.now():%Y%m%d%H%M%S}.csv'
+    path = export_storage().path(name)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    # batch တစ်ခုချင်း ဖိုင်ထဲ တိုက်ရိုက်ရေး (memory ထဲ မစု)၊ ပြီးမှ rename — download က ဖိုင်တစ်ဝက် မမြင်ရ
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+    try:
+        # Excel တွင် မြန်မာစာ မှန်ကန်စွာပေါ်ရန် BOM ပါသော UTF-8
+        with os.fdopen(fd, 'w', encoding='utf-8-sig', newline='') as out:
+            writer = csv.writer(out)
+            writer.writerow([label for _, label in EXPORT_COLUMNS])
+            # id ဖြင့် keyset batch — batch ကြားမှာ read cursor မဖွင့်ထားဘဲ progress ကို ရေးနိုင်ရန် (SQLite lock)
+            # hot ပြီးမှ archive (id များ မထပ်)
+            done = 0
+            for qs in sources:
+                last_id = 0
+                while True:
+                    batch = list(qs.filter(id__gt=last_id).order_by('id').values_list(*fields)[:EXPORT_BATCH_SIZE])
+                    if not batch:
+                        break
+                    writer.writerows(batch)
+                    done += len(batch)
+                    last_id = batch[-1][0]
+                    job.set_progress(done / total, f'{done}/{total} rows')
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+    return {'rows': total, 'file': name, 'url': reverse('job-download', kwargs={'pk': job.pk})}
+
+
+@job('index_receipt_fingerprints', enqueueable=True)
+def index_receipt_fingerprints(job, recompute=False):
+    """ပုံပါသော Transaction များ၏ perceptual hash (duplicate receipt index) ကို တွက်/ပြန်တွက်"""
+    # job တင်သူ owner ၏ shard (sharding မဖွင့်ထားလျှင် default)
+    with use_alias(alias_for_user(job.created_by)):
+        qs = Transaction.objects.exclude(image='').exclude(image__isnull=True)
+        if not recompute:
+            qs = qs.filter(receipt_fingerprint__isnull=True)
+        ids = list(qs.order_by('submitted_at', 'id').values_list('pk', flat=True))
+        flagged = 0
+        for i, pk in enumerate(ids, start=1):
+            fp = compute_fingerprint(pk)
+            flagged += bool(fp and fp.duplicate_ids)
+            if i % 50 == 0:
+                job.set_progress(i / len(ids))
+    return {'computed': len(ids), 'flagged': flagged}
+
+
+@job('rebuild_search_index')
+def rebuild_search_index(job, using=None):
+    """Full-text search index ကို ပြန်တည် (admin/command မှသာ တန်းစီ — API မှ မဖွင့်)"""
+    aliases = [using] if using else all_aliases()
+    return {'documents': sum(search.rebuild(using=alias) for alias in aliases)}
+
+
+@job('pack_receipts')
+def pack_receipts(job, older_than_days=None):
+    """ကြာပြီးသော receipt ပုံများကို pack ဖိုင်များထဲ (sheets.packs) — owner အားလုံး မျှသုံးသော blob များဖြစ်၍ admin/command မှသာ"""
+    return packs.pack_blobs(
+        older_than_days=older_than_days, progress=lambda done, total: job.set_progress(done / total),
+    )
+
+
+@job('score_transactions', enqueueable=True)
+def score_transactions(job, pending_only=False):
+    """Job တင်သူ owner ၏ မှတ်တမ်းအားလုံးကို risk score (sheets.risk) ပြန်တွက်"""
+    # owner ၏ review queue — auditor တန်းစီလျှင် ဘာမှမလုပ်
+    if job.created_by is None or job.created_by.user_type != 'owner':
+        return {'scored': 0, 'updated': 0}
+    owner_id = job.created_by.pk
+    with use_alias(alias_for_user(job.created_by)):
+        scored, updated = risk.score_owner(owner_id, pending_only=pending_only)
+    return {'scored': scored, 'updated': updated}
+
+
+@job('reconcile_audit_entries', enqueueable=True)
+def reconcile_audit_entries(job, start=None, end=None, threshold=None, include_all=False):
+    """
+    Job တင်သူ owner ၏ group အားလုံး — AuditEntry နှင့် ledger ကွာခြားချက် (sheets.reconciliation)
+    include_all — threshold အတွင်း ကိုက်ညီသော group များကိုပါ ပြ (API ၏ ?all=1)
+    """
+    if job.created_by is None or job.created_by.user_type != 'owner':
+        return {'flagged': 0, 'results': []}
+    params = reconciliation.parse_params({'start': start, 'end': end, 'threshold': threshold, 'all': include_all})
+    with use_alias(alias_for_user(job.created_by)), use_replica():
+        report = reconciliation.reconcile(owner_id=job.created_by.pk, **params)
+    # Job.result (JSONField) — Decimal / date / datetime ကို string ပြောင်း
+    return json.loads(json.dumps(report, cls=DjangoJSONEncoder))
+
+
+@job('archive_transactions', enqueueable=True)
+def archive_transactions(job):
+    """Job တင်သူ owner ၏ ကြာပြီးသော လချုပ်ပိတ်ပြီး approved မှတ်တမ်းများကို archive သို့ (sheets.archive)"""
+    if job.created_by is None or job.created_by.user_type != 'owner':
+        return {'moved': 0}
+    with use_alias(alias_for_user(job.created_by)):
+        moved = archive.archive_owner(job.created_by.pk)
+    return {'moved': moved}
@@ -1,3 +1,2066 @@
-from django.test import TestCase
+import asyncio
+import gzip
+import hashlib
+import io
+import json
+import math
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
+from unittest import mock
 
-# Create your tests here.
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.core.management import call_command
+from django.db import connection, connections
+from django.http import HttpResponse, JsonResponse
+from django.test import AsyncClient, RequestFactory, TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+import numpy as np
+from rest_framework.authtoken.models import Token
+from rest_framework.pagination import PageNumberPagination
+from rest_framework.test import APIClient
+
+from accounts.models import User
+from sheets import middleware as sheets_middleware
+from sheets import archive, audit_summaries, events, fingerprints, forecasting, jobs, packs, periods, pivots, profiling, reconciliation, replicas, risk, search, sharding, uploads
+from sheets.admin import estimated_rows as admin_estimated_rows
+from sheets.models import ArchivedTransaction, AuditEntry, BalanceSnapshot, ClosedPeriod, Group, IdempotencyKey, Job, MediaBlob, PaymentAccount, ReceiptFingerprint, RequestProfile, Transaction, UploadSession
+from sheets.storage import receipt_storage
+
+
+def receipt_image(seed=0, size=(64, 48)):
+    """ချောမွေ့သော wave ပုံ — seed ပြောင်းလျှင် dHash ပါ ပြောင်း (resize / re-encode လုပ်လည်း မပြောင်း)"""
+    from PIL import Image
+
+    width, height = size
+    img = Image.new('L', size)
+    img.putdata([
+        int(128 + 120 * math.sin((x + seed * 7) / (4 + seed)) * math.cos((y - seed * 5) / (3 + seed % 3)))
+        for y in range(height) for x in range(width)
+    ])
+    return img
+
+
+def png_bytes(seed=0, size=(64, 48)):
+    out = io.BytesIO()
+    receipt_image(seed, size).save(out, format='PNG')
+    return out.getvalue()
+
+
+def jpeg_bytes(seed=0, size=(64, 48), quality=80):
+    out = io.BytesIO()
+    receipt_image(seed, (64, 48)).convert('RGB').resize(size).save(out, format='JPEG', quality=quality)
+    return out.getvalue()
+
+
+class SheetsTestCase(TestCase):
+    """Owner / auditor / group / payment account နှင့် ယာယီ MEDIA_ROOT"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls._media_root = tempfile.mkdtemp(prefix='sheets-tests-')
+        cls._media_override = override_settings(MEDIA_ROOT=cls._media_root)
+        cls._media_override.enable()
+        super().setUpClass()
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        cls._media_override.disable()
+        shutil.rmtree(cls._media_root, ignore_errors=True)
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.owner = User.objects.create_user('owner', 'owner@example.com', 'x', user_type='owner')
+        cls.auditor = User.objects.create_user('auditor', 'auditor@example.com', 'x', user_type='auditor', owner=cls.owner)
+        cls.group = Group.objects.create(group_title='Shop', group_type='income', name='Main', owner=cls.owner)
+        cls.account = PaymentAccount.objects.create(
+            payment_account_name='KBZ', payment_account_type='bank', owner=cls.owner,
+        )
+
+    def client_for(self, user):
+        client = APIClient(HTTP_HOST='localhost')
+        client.force_authenticate(user)
+        return client
+
+    def make_transaction(self, digits, amount='1000.00', transaction_type='income', status='pending',
+                         transaction_date=None, image=None, **extra):
+        tx = Transaction(
+            submitted_by=extra.pop('submitted_by', self.auditor),
+            transaction_date=transaction_date or date.today(),
+            group=extra.pop('group', self.group),
+            payment_account=extra.pop('payment_account', self.account),
+            transfer_id_last_6_digits=digits,
+            amount=Decimal(amount),
+            transaction_type=transaction_type,
+            status=status,
+            **extra,
+        )
+        if image is not None:
+            tx.image.save(f'{digits}.png', ContentFile(image), save=False)
+        tx.save()
+        return tx
+
+
+class ResponseCompressionTests(TestCase):
+    """ResponseCompressionMiddleware — Accept-Encoding negotiation, size threshold, Vary / ETag, stats"""
+
+    body = {'rows': [{'id': n, 'name': 'ငွေလွှဲ receipt', 'amount': '1000.00'} for n in range(100)]}
+
+    def setUp(self):
+        sheets_middleware.compression_stats.reset()
+        self.addCleanup(sheets_middleware.compression_stats.reset)
+
+    def respond(self, path='/api/sheets/x/', encoding='gzip', response=None):
+        request = RequestFactory().get(path, HTTP_ACCEPT_ENCODING=encoding)
+
+        def view(request):
+            result = response if response is not None else JsonResponse(self.body)
+            result['ETag'] = '"abc"'
+            return result
+
+        return sheets_middleware.ResponseCompressionMiddleware(view)(request)
+
+    def test_gzip_when_accepted(self):
+        response = self.respond()
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertEqual(json.loads(gzip.decompress(response.content)), self.body)
+        self.assertEqual(int(response['X-Uncompressed-Length']), len(JsonResponse(self.body).content))
+        self.assertEqual(response['Content-Length'], str(len(response.content)))
+        self.assertIn('Accept-Encoding', response['Vary'])
+        self.assertEqual(response['ETag'], 'W/"abc"')
+
+    def test_brotli_preferred_when_installed(self):
+        fake = mock.Mock()
+        fake.compress.return_value = b'br-bytes'
+        with mock.patch.object(sheets_middleware, 'brotli', fake):
+            response = self.respond(encoding='gzip, deflate, br')
+            self.assertEqual((response['Content-Encoding'], response.content), ('br', b'br-bytes'))
+        with mock.patch.object(sheets_middleware, 'brotli', None):
+            self.assertEqual(self.respond(encoding='gzip, br')['Content-Encoding'], 'gzip')
+
+    def test_left_alone_without_encoding_small_body_or_outside_api(self):
+        plain = self.respond(encoding='')
+        self.assertFalse(plain.has_header('Content-Encoding'))
+        self.assertIn('Accept-Encoding', plain['Vary'])
+        self.assertEqual(plain['ETag'], '"abc"')
+
+        with override_settings(RESPONSE_COMPRESSION_MIN_SIZE=10 ** 6):
+            self.assertFalse(self.respond().has_header('Content-Encoding'))
+        self.assertFalse(self.respond(path='/media/x.json').has_header('Content-Encoding'))
+        self.assertFalse(self.respond(response=HttpResponse(b'\x89PNG' * 1000, content_type='image/png'))
+                         .has_header('Content-Encoding'))
+        self.assertEqual(sheets_middleware.compression_stats.snapshot(), {})
+
+    def test_stats_bucket_unresolved_paths(self):
+        self.respond(path='/api/sheets/nope-1/')
+        self.respond(path='/api/sheets/nope-2/')
+        stats = sheets_middleware.compression_stats.snapshot()
+        self.assertEqual(list(stats), [sheets_middleware.UNRESOLVED_ENDPOINT])
+        self.assertEqual(stats[sheets_middleware.UNRESOLVED_ENDPOINT]['responses'], 2)
+
+    def test_stats_endpoint_is_staff_only(self):
+        owner = User.objects.create_user('owner', 'owner@example.com', 'x', user_type='owner')
+        staff = User.objects.create_user('staff', 'staff@example.com', 'x', is_staff=True)
+        self.respond()
+        client = APIClient(HTTP_HOST='localhost')
+        client.force_authenticate(owner)
+        self.assertEqual(client.get('/api/sheets/stats/compression/').status_code, 403)
+
+        client.force_authenticate(staff)
+        data = client.get('/api/sheets/stats/compression/', {'reset': '1'}).json()
+        row = data['endpoints'][sheets_middleware.UNRESOLVED_ENDPOINT]
+        self.assertEqual(row['saved_bytes'], row['original_bytes'] - row['compressed_bytes'])
+        self.assertEqual(data['total_saved_bytes'], row['saved_bytes'])
+        self.assertEqual(client.get('/api/sheets/stats/compression/').json()['endpoints'], {})
+
+
+class ContentAddressedStorageTests(SheetsTestCase):
+
+    def blob(self, tx):
+        return MediaBlob.objects.get(name=tx.image.name)
+
+    def test_same_bytes_are_stored_once(self):
+        first = self.make_transaction('100001', image=png_bytes(1))
+        second = self.make_transaction('100002', image=png_bytes(1))
+        self.assertEqual(first.image.name, second.image.name)
+        self.assertEqual(MediaBlob.objects.count(), 1)
+        self.assertEqual(self.blob(first).ref_count, 2)
+        self.assertTrue(receipt_storage().exists(first.image.name))
+
+    def test_name_is_content_hash(self):
+        tx = self.make_transaction('100001', image=png_bytes(1))
+        blob = self.blob(tx)
+        self.assertTrue(tx.image.name.endswith(blob.digest + '.png'))
+        self.assertEqual(blob.size, len(png_bytes(1)))
+
+    def test_replacing_and_deleting_release_refs(self):
+        first = self.make_transaction('100001', image=png_bytes(1))
+        second = self.make_transaction('100002', image=png_bytes(1))
+        old_name = first.image.name
+
+        first.image.save('new.png', ContentFile(png_bytes(2)), save=True)
+        self.assertEqual(MediaBlob.objects.get(name=old_name).ref_count, 1)
+        self.assertEqual(self.blob(first).ref_count, 1)
+
+        second.delete()
+        self.assertEqual(MediaBlob.objects.get(name=old_name).ref_count, 0)
+
+    def test_delete_keeps_referenced_file(self):
+        tx = self.make_transaction('100001', image=png_bytes(1))
+        receipt_storage().delete(tx.image.name)
+        self.assertTrue(receipt_storage().exists(tx.image.name))
+
+    def test_gc_removes_unreferenced_blobs(self):
+        tx = self.make_transaction('100001', image=png_bytes(1))
+        name = tx.image.name
+        tx.delete()
+        call_command('gc_media_blobs', grace_hours=0, stdout=io.StringIO())
+        self.assertFalse(MediaBlob.objects.filter(name=name).exists())
+        self.assertFalse(receipt_storage().exists(name))
+
+    def test_recount_repairs_ref_count(self):
+        tx = self.make_transaction('100001', image=png_bytes(1))
+        MediaBlob.objects.filter(name=tx.image.name).update(ref_count=7)
+        call_command('gc_media_blobs', recount=True, grace_hours=0, stdout=io.StringIO())
+        self.assertEqual(self.blob(tx).ref_count, 1)
+
+
+class ReceiptFingerprintTests(SheetsTestCase):
+
+    def test_dhash_survives_resize_and_reencode(self):
+        original = fingerprints.dhash(io.BytesIO(png_bytes(1)))
+        resized = fingerprints.dhash(io.BytesIO(jpeg_bytes(1, size=(128, 96))))
+        different = fingerprints.dhash(io.BytesIO(png_bytes(2)))
+        self.assertLessEqual(fingerprints.hamming(original, resized), fingerprints.max_distance())
+        self.assertGreater(fingerprints.hamming(original, different), 16)
+
+    def test_signed_storage_round_trip(self):
+        value = (1 << 63) | 0xABCD
+        self.assertLess(fingerprints.to_signed(value), 0)
+        self.assertEqual(fingerprints.to_unsigned(fingerprints.to_signed(value)), value)
+        self.assertEqual(fingerprints.hamming(fingerprints.to_signed(value), value), 0)
+
+    def test_band_probes_cover_radius(self):
+        probes = fingerprints.band_probes(0, 1)
+        self.assertEqual(len(probes), 1 + fingerprints.BAND_BITS)
+        self.assertIn(1 << 15, probes)
+
+    def test_find_similar_uses_distance_threshold(self):
+        base = 0x0123456789ABCDEF
+        near = base ^ 0b111          # 3 bits
+        far = base ^ 0xFFFF_0000_FFFF  # 32 bits
+        for digits, value in (('100001', near), ('100002', far)):
+            tx = self.make_transaction(digits)
+            ReceiptFingerprint.objects.create(
+                transaction=tx, image_name='x', dhash=fingerprints.to_signed(value),
+                **{f'band_{i}': band for i, band in enumerate(fingerprints.split_bands(value))},
+            )
+        matches = fingerprints.find_similar(base, distance=6)
+        self.assertEqual([(fp.transaction.transfer_id_last_6_digits, d) for fp, d in matches], [('100001', 3)])
+        self.assertEqual(fingerprints.find_similar(base, distance=2), [])
+
+    def test_compute_fingerprint_flags_duplicates_within_owner(self):
+        other_owner = User.objects.create_user('owner2', 'owner2@example.com', 'x', user_type='owner')
+        other_group = Group.objects.create(group_title='B', group_type='income', name='Other', owner=other_owner)
+        other_account = PaymentAccount.objects.create(
+            payment_account_name='AYA', payment_account_type='bank', owner=other_owner,
+        )
+        first = self.make_transaction('100001', image=png_bytes(1))
+        foreign = self.make_transaction('100002', image=png_bytes(1), group=other_group, payment_account=other_account)
+        resubmitted = self.make_transaction('100003', image=jpeg_bytes(1, size=(128, 96)))
+        for tx in (first, foreign, resubmitted):
+            fingerprints.compute_fingerprint(tx.pk)
+
+        fp = ReceiptFingerprint.objects.get(transaction=resubmitted)
+        self.assertEqual(fp.duplicate_ids, [first.pk])
+
+        response = self.client_for(self.owner).get(f'/api/sheets/transactions/{resubmitted.pk}/duplicates/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([row['id'] for row in response.json()['results']], [first.pk])
+
+    def test_auditor_sees_only_own_duplicate_ids(self):
+        other_auditor = User.objects.create_user(
+            'auditor2', 'auditor2@example.com', 'x', user_type='auditor', owner=self.owner,
+        )
+        mine = self.make_transaction('100001', image=png_bytes(1))
+        theirs = self.make_transaction('100002', image=png_bytes(1), submitted_by=other_auditor)
+        resubmitted = self.make_transaction('100003', image=jpeg_bytes(1, size=(128, 96)))
+        for tx in (mine, theirs, resubmitted):
+            fingerprints.compute_fingerprint(tx.pk)
+
+        url = f'/api/sheets/transactions/{resubmitted.pk}/'
+        self.assertEqual(self.client_for(self.owner).get(url).json()['possible_duplicates'], [mine.pk, theirs.pk])
+        self.assertEqual(self.client_for(self.auditor).get(url).json()['possible_duplicates'], [mine.pk])
+
+
+class ChunkedUploadTests(SheetsTestCase):
+
+    def start(self, client, data):
+        response = client.post('/api/sheets/uploads/', {'filename': 'receipt.png', 'size': len(data)}, format='json')
+        self.assertEqual(response.status_code, 201)
+        return response.json()['id']
+
+    def put_chunk(self, client, upload_id, data, offset):
+        return client.put(
+            f'/api/sheets/uploads/{upload_id}/chunk/?offset={offset}', data, content_type='application/octet-stream',
+        )
+
+    def test_resume_and_attach_to_transaction(self):
+        client = self.client_for(self.auditor)
+        data = png_bytes(3)
+        upload_id = self.start(client, data)
+        half = len(data) // 2
+
+        self.assertEqual(self.put_chunk(client, upload_id, data[:half], 0).json()['received'], half)
+        # ချိတ်ဆက်မှု ပြတ်ပြီး ပြန်စ — received မှ ဆက်ပို့
+        self.assertEqual(client.get(f'/api/sheets/uploads/{upload_id}/').json()['received'], half)
+        self.assertEqual(self.put_chunk(client, upload_id, data[half:], half).json()['received'], len(data))
+
+        response = client.post(f'/api/sheets/uploads/{upload_id}/finalize/')
+        self.assertEqual(response.json()['status'], 'complete')
+        blob_name = response.json()['blob_name']
+        with receipt_storage().open(blob_name) as fh:
+            self.assertEqual(fh.read(), data)
+
+        response = client.post('/api/sheets/transactions/', {
+            'transaction_date': str(date.today()), 'group': self.group.pk, 'payment_account': self.account.pk,
+            'transfer_id_last_6_digits': '200001', 'amount': '500.00', 'transaction_type': 'income',
+            'upload_id': upload_id,
+        }, format='json')
+        self.assertEqual(response.status_code, 201, response.content)
+        tx = Transaction.objects.get(pk=response.json()['id'])
+        self.assertEqual(tx.image.name, blob_name)
+        self.assertEqual(MediaBlob.objects.get(name=blob_name).ref_count, 1)
+        self.assertEqual(client.get(f'/api/sheets/uploads/{upload_id}/').json()['status'], 'attached')
+
+    def test_gap_and_oversize_are_rejected(self):
+        client = self.client_for(self.auditor)
+        data = png_bytes(3)
+        upload_id = self.start(client, data)
+        response = self.put_chunk(client, upload_id, data[10:], 10)
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(response.json()['received'], 0)
+        self.assertEqual(self.put_chunk(client, upload_id, data + b'extra', 0).status_code, 400)
+        self.assertEqual(client.post(f'/api/sheets/uploads/{upload_id}/finalize/').status_code, 409)
+
+    def test_resent_chunk_never_moves_received_backwards(self):
+        client = self.client_for(self.auditor)
+        data = png_bytes(3)
+        upload_id = self.start(client, data)
+        stale = UploadSession.objects.get(pk=upload_id)
+        half = len(data) // 2
+        self.put_chunk(client, upload_id, data[:half], 0)
+        self.put_chunk(client, upload_id, data[half:], half)
+
+        # ပြိုင်နေသော request ၏ ဟောင်းနေသော session object ဖြင့် ပထမ chunk ကို ထပ်ရေး
+        session = uploads.write_chunk(stale, io.BytesIO(data[:half]), 0)
+        self.assertEqual(session.received, len(data))
+        self.assertEqual(UploadSession.objects.get(pk=upload_id).received, len(data))
+        with open(uploads.partial_path(session), 'rb') as fh:
+            self.assertEqual(fh.read(), data)
+
+    def test_finalize_rejects_non_image(self):
+        client = self.client_for(self.auditor)
+        data = b'not an image at all'
+        upload_id = self.start(client, data)
+        self.put_chunk(client, upload_id, data, 0)
+        self.assertEqual(client.post(f'/api/sheets/uploads/{upload_id}/finalize/').status_code, 400)
+
+    def test_sessions_are_private(self):
+        upload_id = self.start(self.client_for(self.auditor), png_bytes(3))
+        self.assertEqual(self.client_for(self.owner).get(f'/api/sheets/uploads/{upload_id}/').status_code, 404)
+
+
+@jobs.job('tests.echo')
+def echo_job(job, value=None):
+    job.set_progress(0.5, 'half way')
+    return {'value': value}
+
+
+@jobs.job('tests.fail', max_attempts=2)
+def failing_job(job):
+    raise RuntimeError('boom')
+
+
+class JobQueueTests(SheetsTestCase):
+
+    def test_enqueue_validates_kind_and_payload(self):
+        with self.assertRaises(ValueError):
+            jobs.enqueue('tests.missing')
+        with self.assertRaises(ValueError):
+            jobs.enqueue('tests.echo', {'unknown': 1})
+        self.assertEqual(jobs.enqueue('tests.echo', {'value': 1}).status, 'queued')
+
+    def test_dedupe_returns_queued_job(self):
+        first = jobs.enqueue('tests.echo', {'value': 1}, dedupe=True)
+        self.assertEqual(jobs.enqueue('tests.echo', {'value': 1}, dedupe=True), first)
+        self.assertNotEqual(jobs.enqueue('tests.echo', {'value': 2}, dedupe=True), first)
+
+    def test_claim_order_and_single_claim(self):
+        low = jobs.enqueue('tests.echo', {'value': 'low'})
+        high = jobs.enqueue('tests.echo', {'value': 'high'}, priority=5)
+        jobs.enqueue('tests.echo', run_after=timezone.now() + timedelta(hours=1))
+        self.assertEqual(jobs.claim_next('w1'), high.pk)
+        self.assertEqual(jobs.claim_next('w2'), low.pk)
+        self.assertIsNone(jobs.claim_next('w3'))
+        high.refresh_from_db()
+        self.assertEqual((high.status, high.locked_by, high.attempts), ('running', 'w1', 1))
+
+    def test_execute_records_result(self):
+        job_obj = jobs.enqueue('tests.echo', {'value': 42})
+        jobs.claim_next('w1')
+        self.assertEqual(jobs.execute(job_obj.pk), 'succeeded')
+        job_obj.refresh_from_db()
+        self.assertEqual((job_obj.result, job_obj.progress), ({'value': 42}, 1.0))
+
+    def test_failure_retries_with_backoff_then_fails(self):
+        job_obj = jobs.enqueue('tests.fail')
+        jobs.claim_next('w1')
+        with self.assertLogs('sheets.jobs', 'WARNING'):
+            self.assertEqual(jobs.execute(job_obj.pk), 'queued')
+        job_obj.refresh_from_db()
+        self.assertGreater(job_obj.run_after, timezone.now())
+        self.assertIn('boom', job_obj.error)
+
+        Job.objects.filter(pk=job_obj.pk).update(run_after=timezone.now())
+        jobs.claim_next('w1')
+        with self.assertLogs('sheets.jobs', 'WARNING'):
+            self.assertEqual(jobs.execute(job_obj.pk), 'failed')
+
+    def test_bad_payload_fails_without_retry(self):
+        job_obj = Job.objects.create(kind='tests.echo', payload={'unknown': 1})
+        jobs.claim_next('w1')
+        with self.assertLogs('sheets.jobs', 'WARNING'):
+            self.assertEqual(jobs.execute(job_obj.pk), 'failed')
+        job_obj.refresh_from_db()
+        self.assertEqual(job_obj.attempts, 1)
+
+    def test_requeue_stale(self):
+        job_obj = jobs.enqueue('tests.echo')
+        jobs.claim_next('w1')
+        Job.objects.filter(pk=job_obj.pk).update(locked_at=timezone.now() - timedelta(hours=2))
+        self.assertEqual(jobs.requeue_stale(timeout_seconds=60), 1)
+        job_obj.refresh_from_db()
+        self.assertEqual(job_obj.status, 'queued')
+
+    def test_heartbeat_keeps_long_running_job(self):
+        job_obj = jobs.enqueue('tests.echo')
+        jobs.claim_next('w1')
+        old = timezone.now() - timedelta(hours=2)
+        Job.objects.filter(pk=job_obj.pk).update(locked_at=old)
+        # အခြား worker ၏ heartbeat က ဤ job ကို မထိ
+        self.assertEqual(jobs.heartbeat([job_obj.pk], 'w2'), 0)
+        self.assertEqual(jobs.heartbeat([job_obj.pk], 'w1'), 1)
+        self.assertEqual(jobs.requeue_stale(timeout_seconds=60), 0)
+
+        Job.objects.filter(pk=job_obj.pk).update(locked_at=old)
+        Job.objects.get(pk=job_obj.pk).set_progress(0.3, 'still going')
+        self.assertEqual(jobs.requeue_stale(timeout_seconds=60), 0)
+        self.assertEqual(Job.objects.get(pk=job_obj.pk).status, 'running')
+
+    def test_export_download_is_private(self):
+        self.make_transaction('300001', amount='1500.00')
+        self.make_transaction('300002', amount='2500.00', status='approved')
+        client = self.client_for(self.owner)
+        self.assertEqual(client.post('/api/sheets/jobs/', {'kind': 'tests.echo'}, format='json').status_code, 400)
+        response = client.post(
+            '/api/sheets/jobs/', {'kind': 'export_transactions', 'payload': {'bogus': 1}}, format='json',
+        )
+        self.assertEqual(response.status_code, 400)
+
+        response = client.post(
+            '/api/sheets/jobs/', {'kind': 'export_transactions', 'payload': {'status': 'approved'}}, format='json',
+        )
+        self.assertEqual(response.status_code, 202)
+        job_id = response.json()['id']
+        with override_settings(SHEETS_EXPORT_DIR=self._media_root + '/exports'):
+            jobs.claim_next('w1')
+            self.assertEqual(jobs.execute(job_id), 'succeeded')
+            result = client.get(f'/api/sheets/jobs/{job_id}/').json()['result']
+            self.assertEqual(result['rows'], 1)
+
+            response = client.get(result['url'])
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response['Cache-Control'], 'private, no-store')
+            body = b''.join(response.streaming_content).decode('utf-8-sig')
+            response.close()
+            self.assertIn('300002', body)
+            self.assertNotIn('300001', body)
+
+            other = User.objects.create_user('owner2', 'owner2@example.com', 'x', user_type='owner')
+            self.assertEqual(self.client_for(other).get(result['url']).status_code, 404)
+
+
+class FullTextSearchTests(SheetsTestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.other_owner = User.objects.create_user('owner2', 'owner2@example.com', 'x', user_type='owner')
+        cls.other_auditor = User.objects.create_user(
+            'auditor2', 'auditor2@example.com', 'x', user_type='auditor', owner=cls.owner,
+        )
+        cls.other_group = Group.objects.create(group_title='B', group_type='income', name='Other', owner=cls.other_owner)
+        cls.other_account = PaymentAccount.objects.create(
+            payment_account_name='AYA', payment_account_type='bank', owner=cls.other_owner,
+        )
+
+    def search(self, user, query, **params):
+        response = self.client_for(user).get('/api/sheets/search/', {'q': query, **params})
+        self.assertEqual(response.status_code, 200, response.content)
+        return [(row['kind'], row['id']) for row in response.json()['results']]
+
+    def test_myanmar_text_is_segmented_by_syllable(self):
+        self.assertEqual(search.segment('ငွေလွှဲ abc'), 'ငွေ\u200bလွှဲ abc')
+        self.assertEqual(search.unsegment(search.segment('ငွေလွှဲ')), 'ငွေလွှဲ')
+        self.assertEqual(search.fts5_query('ငွေ'), '"ငွေ"*')
+        self.assertIsNone(search.fts5_query('"()'))
+
+    def test_prefix_search_is_tenant_scoped(self):
+        mine = self.make_transaction('400001', owner_notes='ငွေလွှဲ ပြေစာ')
+        self.make_transaction('400002', owner_notes='ငွေလွှဲ', group=self.other_group, payment_account=self.other_account)
+        self.assertEqual(self.search(self.owner, 'ငွေ', kind='transaction'), [('transaction', mine.pk)])
+        self.assertEqual(self.search(self.owner, 'Sho'), [('group', self.group.pk)])
+
+    def test_auditor_sees_own_transactions_only(self):
+        mine = self.make_transaction('400001', owner_notes='refund')
+        self.make_transaction('400002', owner_notes='refund', submitted_by=self.other_auditor)
+        self.assertEqual(self.search(self.auditor, 'refund'), [('transaction', mine.pk)])
+        self.assertEqual(len(self.search(self.owner, 'refund')), 2)
+
+    def test_index_follows_updates_and_deletes(self):
+        tx = self.make_transaction('400001', owner_notes='first note')
+        tx.owner_notes = 'second note'
+        tx.save()
+        self.assertEqual(self.search(self.owner, 'first'), [])
+        self.assertEqual(self.search(self.owner, 'second'), [('transaction', tx.pk)])
+        tx.delete()
+        self.assertEqual(self.search(self.owner, 'second'), [])
+
+    def test_unknown_kind_is_rejected(self):
+        response = self.client_for(self.owner).get('/api/sheets/search/', {'q': 'x', 'kind': 'nope'})
+        self.assertEqual(response.status_code, 400)
+
+    def test_transaction_list_search(self):
+        tx = self.make_transaction('123456', owner_notes='cash')
+        self.make_transaction('654321')
+        client = self.client_for(self.owner)
+
+        def ids(query):
+            return [row['id'] for row in client.get('/api/sheets/transactions/', {'search': query}).json()['results']]
+
+        self.assertEqual(ids('1234'), [tx.pk])   # prefix (index)
+        self.assertEqual(ids('345'), [tx.pk])    # transfer ID အလယ်မှ ဂဏန်း (contains)
+        self.assertEqual(ids('cash'), [tx.pk])
+        self.assertEqual(ids('"()'), [])
+
+    def test_rebuild_command_restores_index(self):
+        tx = self.make_transaction('400001', owner_notes='restored')
+        search.remove_instance(tx)
+        self.assertEqual(self.search(self.owner, 'restored'), [])
+        call_command('rebuild_search_index', stdout=io.StringIO())
+        self.assertEqual(self.search(self.owner, 'restored'), [('transaction', tx.pk)])
+
+
+class TenancyTests(SheetsTestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.other_owner = User.objects.create_user('owner2', 'owner2@example.com', 'x', user_type='owner')
+        cls.other_group = Group.objects.create(group_title='B', group_type='income', name='Other', owner=cls.other_owner)
+        cls.other_account = PaymentAccount.objects.create(
+            payment_account_name='AYA', payment_account_type='bank', owner=cls.other_owner,
+        )
+
+    def create_payload(self, digits, **extra):
+        return {
+            'transaction_date': str(date.today()), 'group': self.group.pk, 'payment_account': self.account.pk,
+            'transfer_id_last_6_digits': digits, 'amount': '100.00', 'transaction_type': 'income', **extra,
+        }
+
+    def test_owner_key_follows_group(self):
+        tx = self.make_transaction('500001')
+        self.assertEqual(tx.owner_id, self.owner.pk)
+        self.group.owner = self.other_owner
+        self.group.save()
+        tx.refresh_from_db()
+        self.assertEqual(tx.owner_id, self.other_owner.pk)
+
+    def test_group_save_without_owner_change_skips_propagation(self):
+        self.make_transaction('500001')
+        group = Group.objects.get(pk=self.group.pk)
+        group.name = 'Renamed'
+        with CaptureQueriesContext(connection) as queries:
+            group.save()
+        tables = ' '.join(query['sql'] for query in queries)
+        self.assertNotIn('sheets_transaction', tables)
+        self.assertNotIn('sheets_auditentry', tables)
+
+    def test_other_owner_cannot_read(self):
+        tx = self.make_transaction('500001')
+        client = self.client_for(self.other_owner)
+        self.assertEqual(client.get(f'/api/sheets/transactions/{tx.pk}/').status_code, 404)
+        self.assertEqual(client.get('/api/sheets/transactions/').json()['count'], 0)
+        self.assertEqual(client.get(f'/api/sheets/groups/{self.group.pk}/').status_code, 404)
+        self.assertEqual(self.client_for(self.owner).get(f'/api/sheets/transactions/{tx.pk}/').status_code, 200)
+
+    def test_foreign_group_or_account_is_rejected(self):
+        client = self.client_for(self.auditor)
+        response = client.post('/api/sheets/transactions/', self.create_payload('500001', group=self.other_group.pk), format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('group', response.json())
+        response = client.post(
+            '/api/sheets/transactions/', self.create_payload('500001', payment_account=self.other_account.pk), format='json',
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('payment_account', response.json())
+
+    def test_transfer_id_is_unique_per_owner(self):
+        self.make_transaction('500001', group=self.other_group, payment_account=self.other_account)
+        client = self.client_for(self.auditor)
+        self.assertEqual(
+            client.post('/api/sheets/transactions/', self.create_payload('500001'), format='json').status_code, 201,
+        )
+        # (transfer ID, payment account) unique_together မဟုတ်ဘဲ owner အတွင်း — အကောင့် အခြားတစ်ခုဖြင့်
+        second_account = PaymentAccount.objects.create(
+            payment_account_name='CB', payment_account_type='bank', owner=self.owner,
+        )
+        response = client.post(
+            '/api/sheets/transactions/', self.create_payload('500001', payment_account=second_account.pk), format='json',
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('transfer_id_last_6_digits', response.json())
+
+
+class ShardRouterTests(TestCase):
+    """
+    SHEETS_SHARDING — owner တစ်ဦးလျှင် SQLite ဖိုင် (ယာယီ directory ထဲ)
+    Shard များကို test တစ်ခုချင်း rollback ဖြစ်စေရန် (databases = '__all__') owner id ကို ကြိုသတ်မှတ်ပြီး
+    super().setUpClass() မတိုင်မီ register + migrate လုပ်ထားသည် (atomic block ထဲတွင် SQLite schema ပြောင်း၍ မရ)
+    """
+    OWNER_ID, OTHER_OWNER_ID = 9001, 9501
+    databases = '__all__'
+
+    @classmethod
+    def setUpClass(cls):
+        cls._shard_dir = tempfile.mkdtemp(prefix='sheets-shards-')
+        cls._shard_override = override_settings(SHEETS_SHARDING=True, SHEETS_SHARD_DIR=cls._shard_dir)
+        cls._shard_override.enable()
+        for owner_id in (cls.OWNER_ID, cls.OTHER_OWNER_ID):
+            call_command('migrate', database=sharding.ensure_shard(owner_id), verbosity=0)
+        super().setUpClass()
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        for alias in [alias for alias in connections.settings if sharding.is_shard_alias(alias)]:
+            connections[alias].close()
+            del connections[alias]
+            del connections.settings[alias]
+        cls._shard_override.disable()
+        shutil.rmtree(cls._shard_dir, ignore_errors=True)
+
+    @classmethod
+    def setUpTestData(cls):
+        # user save signal က owner ၏ shard ထဲ mirror လုပ်သည်
+        cls.owner = User.objects.create_user('owner', 'owner@example.com', 'x', user_type='owner', id=cls.OWNER_ID)
+        cls.auditor = User.objects.create_user('auditor', 'auditor@example.com', 'x', user_type='auditor', owner=cls.owner)
+        cls.other_owner = User.objects.create_user(
+            'owner2', 'owner2@example.com', 'x', user_type='owner', id=cls.OTHER_OWNER_ID,
+        )
+        cls.alias = sharding.alias_for(cls.owner.pk)
+        with sharding.use_shard(cls.owner.pk):
+            cls.group = Group.objects.create(group_title='Shop', group_type='income', name='Main', owner=cls.owner)
+            cls.account = PaymentAccount.objects.create(
+                payment_account_name='KBZ', payment_account_type='bank', owner=cls.owner,
+            )
+
+    def client_for(self, user):
+        client = APIClient(HTTP_HOST='localhost')
+        client.force_authenticate(user)
+        return client
+
+    def test_router_follows_active_shard(self):
+        router = sharding.ShardRouter()
+        self.assertIsNone(router.db_for_read(Transaction))
+        with sharding.use_shard(self.owner.pk):
+            self.assertEqual(router.db_for_write(Transaction), self.alias)
+            self.assertIsNone(router.db_for_read(User))
+            self.assertIsNone(router.db_for_read(Job))
+        self.assertEqual(router.db_for_read(Transaction, instance=self.group), self.alias)
+        self.assertFalse(router.allow_migrate(self.alias, 'sheets', model_name='job'))
+        self.assertIsNone(router.allow_migrate(self.alias, 'sheets', model_name='transaction'))
+        self.assertTrue(router.allow_relation(self.group, self.owner))
+
+    def test_shard_holds_owner_data_and_users(self):
+        self.assertEqual(User.objects.using(self.alias).filter(pk__in=[self.owner.pk, self.auditor.pk]).count(), 2)
+        self.assertFalse(User.objects.using(self.alias).filter(pk=self.other_owner.pk).exists())
+        self.assertFalse(Group.objects.using('default').filter(pk=self.group.pk).exists())
+
+    def test_api_writes_land_in_owner_shard(self):
+        response = self.client_for(self.auditor).post('/api/sheets/transactions/', {
+            'transaction_date': str(date.today()), 'group': self.group.pk, 'payment_account': self.account.pk,
+            'transfer_id_last_6_digits': '600001', 'amount': '100.00', 'transaction_type': 'income',
+        }, format='json')
+        self.assertEqual(response.status_code, 201, response.content)
+        tx_id = response.json()['id']
+        self.assertTrue(Transaction.objects.using(self.alias).filter(pk=tx_id).exists())
+        self.assertFalse(Transaction.objects.using('default').filter(pk=tx_id).exists())
+
+        owner_list = self.client_for(self.owner).get('/api/sheets/transactions/').json()
+        self.assertIn(tx_id, [row['id'] for row in owner_list['results']])
+        # အခြား owner ၏ shard ထဲ မရှိ
+        self.assertEqual(self.client_for(self.other_owner).get('/api/sheets/transactions/').json()['count'], 0)
+
+    def test_login_save_does_not_remirror(self):
+        User.objects.using(self.alias).filter(pk=self.auditor.pk).update(first_name='stale')
+        self.auditor.last_login = timezone.now()
+        self.auditor.save(update_fields=['last_login'])
+        self.assertEqual(User.objects.using(self.alias).get(pk=self.auditor.pk).first_name, 'stale')
+        self.auditor.first_name = 'Aye'
+        self.auditor.save()
+        self.assertEqual(User.objects.using(self.alias).get(pk=self.auditor.pk).first_name, 'Aye')
+
+
+@override_settings(SHEETS_READ_REPLICA='replica', SHEETS_REPLICA_STICKY_SECONDS=60)
+class ReplicaRouterTests(SheetsTestCase):
+    """SHEETS_READ_REPLICA — read-only context ထဲရှိ sheets read များသာ replica သို့"""
+
+    def setUp(self):
+        cache.clear()
+
+    def test_router_only_routes_sheets_reads_inside_replica_context(self):
+        router = replicas.ReplicaRouter()
+        self.assertIsNone(router.db_for_read(Transaction))
+        with replicas.use_replica():
+            self.assertEqual(router.db_for_read(Transaction), 'replica')
+            self.assertIsNone(router.db_for_read(Job))
+            self.assertIsNone(router.db_for_read(User))
+            self.assertIsNone(router.db_for_write(Transaction))
+            # primary မှ load ထားသော instance ၏ relation များ — instance ၏ db အတိုင်း
+            self.assertEqual(router.db_for_read(Transaction, instance=self.group), 'default')
+            with replicas.use_replica(enabled=False):
+                self.assertIsNone(router.db_for_read(Transaction))
+        self.assertFalse(router.allow_migrate('replica', 'sheets'))
+        self.assertIsNone(router.allow_migrate('default', 'sheets'))
+
+    @override_settings(SHEETS_READ_REPLICA=None)
+    def test_disabled_without_replica_alias(self):
+        with replicas.use_replica():
+            self.assertIsNone(replicas.ReplicaRouter().db_for_read(Transaction))
+        replicas.mark_sticky(self.auditor)
+        self.assertFalse(replicas.is_sticky(self.auditor))
+
+    @override_settings(SHEETS_READ_REPLICA='default')
+    def test_writes_make_user_reads_sticky_to_primary(self):
+        # replica alias ကို 'default' ထားပြီး router ၏ ဆုံးဖြတ်ချက်ကို မှတ်ယူ (replica DB မလို)
+        routed = []
+        original = replicas.ReplicaRouter.db_for_read
+
+        def spy(router, model, **hints):
+            alias = original(router, model, **hints)
+            routed.append(alias)
+            return alias
+
+        client = self.client_for(self.auditor)
+        with mock.patch.object(replicas.ReplicaRouter, 'db_for_read', spy):
+            self.assertEqual(client.get('/api/sheets/transactions/').status_code, 200)
+            self.assertIn('default', routed)
+            self.assertFalse(replicas.is_sticky(self.auditor))
+
+            response = client.post('/api/sheets/transactions/', {
+                'transaction_date': str(date.today()), 'group': self.group.pk, 'payment_account': self.account.pk,
+                'transfer_id_last_6_digits': '700001', 'amount': '100.00', 'transaction_type': 'income',
+            }, format='json')
+            self.assertEqual(response.status_code, 201, response.content)
+            self.assertTrue(replicas.is_sticky(self.auditor))
+
+            routed.clear()
+            self.assertEqual(client.get('/api/sheets/transactions/').json()['count'], 1)
+            self.assertEqual([alias for alias in routed if alias], [])
+            # အခြား user ၏ read များ replica မှ ဆက်ဖတ်
+            self.assertFalse(replicas.is_sticky(self.owner))
+
+
+class TransactionEventTests(SheetsTestCase):
+    """Server-Sent Events — broker, event အမျိုးအစား နှင့် /api/sheets/events/ stream"""
+
+    def setUp(self):
+        self.broker = events.InProcessBroker()
+        patcher = mock.patch.object(events, '_broker', self.broker)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_event_type_for_status_changes(self):
+        self.assertEqual(events.event_type_for(None, 'pending', True), 'created')
+        self.assertEqual(events.event_type_for('rejected', 'pending', False), 'resubmitted')
+        self.assertEqual(events.event_type_for('pending', 'approved', False), 'approved')
+        self.assertEqual(events.event_type_for('pending', 'rejected', False), 'rejected')
+        self.assertIsNone(events.event_type_for('pending', 'pending', False))
+        self.assertIsNone(events.event_type_for('approved', 'pending', False))
+
+    def test_format_sse(self):
+        text = events.format_sse({'id': 3, 'type': 'created', 'transaction': 7})
+        self.assertTrue(text.endswith('\n\n'))
+        lines = text.strip().split('\n')
+        self.assertEqual(lines[:2], ['id: 3', 'event: created'])
+        self.assertEqual(json.loads(lines[2][len('data: '):])['transaction'], 7)
+
+    def test_status_changes_publish_after_commit(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            tx = self.make_transaction('800001')
+        with self.captureOnCommitCallbacks(execute=True):
+            tx.status = 'approved'
+            tx.save()
+        with self.captureOnCommitCallbacks(execute=True):
+            tx.owner_notes = 'ok'
+            tx.save()
+        history = list(self.broker._history[self.owner.pk])
+        self.assertEqual([event['type'] for event in history], ['created', 'approved'])
+        self.assertEqual(history[0]['transaction'], tx.pk)
+        self.assertEqual([event['id'] for event in history], [1, 2])
+
+    def test_subscribe_replays_missed_events(self):
+        async def scenario():
+            for n in range(3):
+                self.broker.publish(self.owner.pk, {'type': 'created', 'transaction': n})
+            sub = self.broker.subscribe(self.owner.pk, last_event_id=1)
+            replayed = [await sub.get(timeout=1), await sub.get(timeout=1)]
+            self.broker.publish(self.owner.pk, {'type': 'approved', 'transaction': 2})
+            live = await sub.get(timeout=1)
+            idle = await sub.get(timeout=0.01)
+            sub.close()
+            return replayed, live, idle
+
+        replayed, live, idle = asyncio.run(scenario())
+        self.assertEqual([event['id'] for event in replayed], [2, 3])
+        self.assertEqual((live['id'], live['type']), (4, 'approved'))
+        self.assertIsNone(idle)
+        self.assertEqual(self.broker.subscriber_count(), 0)
+
+    def test_resync_when_history_or_queue_is_exceeded(self):
+        async def scenario():
+            broker = events.InProcessBroker()
+            broker.history_size = 2
+            for n in range(5):
+                broker.publish(self.owner.pk, {'type': 'created', 'transaction': n})
+            stale = broker.subscribe(self.owner.pk, last_event_id=1)
+            first = await stale.get(timeout=1)
+            stale.close()
+
+            slow = broker.subscribe(self.owner.pk)
+            slow.queue = asyncio.Queue(maxsize=1)
+            for n in range(3):
+                broker.publish(self.owner.pk, {'type': 'created', 'transaction': n})
+            await asyncio.sleep(0)
+            queued = await slow.get(timeout=1)
+            resync = await slow.get(timeout=1)
+            slow.close()
+            return first, queued, resync
+
+        first, queued, resync = asyncio.run(scenario())
+        self.assertEqual(first, {'type': 'resync'})
+        self.assertEqual(queued['type'], 'created')
+        self.assertEqual(resync, {'type': 'resync'})
+
+    async def test_event_stream_requires_authentication(self):
+        response = await AsyncClient().get('/api/sheets/events/')
+        self.assertEqual(response.status_code, 401)
+
+    def test_cache_broker_delivers_across_processes(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+
+        async def scenario():
+            # broker instance နှစ်ခု — process နှစ်ခု (publisher / ASGI) ကို ကိုယ်စားပြု
+            publisher, streamer = events.CacheBroker(), events.CacheBroker()
+            for n in range(3):
+                await sync_to_async(publisher.publish)(self.owner.pk, {'type': 'created', 'transaction': n})
+            sub = streamer.subscribe(self.owner.pk, last_event_id=1)
+            replayed = [await sub.get(timeout=1), await sub.get(timeout=1)]
+            await sync_to_async(publisher.publish)(self.owner.pk, {'type': 'approved', 'transaction': 2})
+            live = await sub.get(timeout=1)
+            idle = await sub.get(timeout=0.05)
+            fresh = streamer.subscribe(self.owner.pk)
+            fresh_idle = await fresh.get(timeout=0.05)
+            return replayed, live, idle, fresh_idle
+
+        with override_settings(SHEETS_EVENT_POLL_SECONDS=0.01):
+            replayed, live, idle, fresh_idle = asyncio.run(scenario())
+        self.assertEqual([event['id'] for event in replayed], [2, 3])
+        self.assertEqual((live['id'], live['type']), (4, 'approved'))
+        self.assertIsNone(idle)
+        self.assertIsNone(fresh_idle)
+
+    def test_cache_broker_resyncs_on_lost_events(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+
+        async def scenario():
+            broker = events.CacheBroker()
+            broker.history_size = 2
+            for n in range(5):
+                await sync_to_async(broker.publish)(self.owner.pk, {'type': 'created', 'transaction': n})
+            stale = await broker.subscribe(self.owner.pk, last_event_id=1).get(timeout=1)
+
+            sub = broker.subscribe(self.owner.pk, last_event_id=5)
+            await sync_to_async(broker.publish)(self.owner.pk, {'type': 'created', 'transaction': 6})
+            await cache.adelete(broker.event_key(self.owner.pk, 6))  # expire / evict
+            await sync_to_async(broker.publish)(self.owner.pk, {'type': 'created', 'transaction': 7})
+            lost = await sub.get(timeout=1)
+            after = await sub.get(timeout=0.05)
+            return stale, lost, after
+
+        with override_settings(SHEETS_EVENT_POLL_SECONDS=0.01):
+            stale, lost, after = asyncio.run(scenario())
+        self.assertEqual(stale, {'type': 'resync'})
+        self.assertEqual(lost, {'type': 'resync'})
+        self.assertIsNone(after)
+
+    def test_event_stream_is_refused_outside_asgi(self):
+        response = self.client.get('/api/sheets/events/')
+        self.assertEqual(response.status_code, 503)
+
+    def test_event_ticket(self):
+        self.assertEqual(APIClient().post('/api/sheets/events/ticket/').status_code, 401)
+        response = self.client_for(self.auditor).post('/api/sheets/events/ticket/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(events.read_ticket(response.data['ticket']), self.auditor.pk)
+        self.assertIsNone(events.read_ticket(response.data['ticket'] + 'x'))
+        with override_settings(SHEETS_EVENT_TICKET_SECONDS=-1):
+            self.assertIsNone(events.read_ticket(response.data['ticket']))
+
+    async def test_event_stream_rejects_token_in_url_and_bad_tickets(self):
+        token = await Token.objects.acreate(user=self.owner)
+        response = await AsyncClient().get('/api/sheets/events/', {'token': token.key})
+        self.assertEqual(response.status_code, 401)
+        response = await AsyncClient().get('/api/sheets/events/', {'ticket': 'forged'})
+        self.assertEqual(response.status_code, 401)
+        with override_settings(SHEETS_EVENT_TICKET_SECONDS=-1):
+            response = await AsyncClient().get('/api/sheets/events/', {'ticket': events.make_ticket(self.owner)})
+        self.assertEqual(response.status_code, 401)
+
+    async def test_event_stream_filters_auditor_events(self):
+        response = await AsyncClient().get('/api/sheets/events/', {'ticket': events.make_ticket(self.auditor)})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'text/event-stream')
+        stream = aiter(response.streaming_content)
+        self.assertEqual(await anext(stream), b'retry: 5000\n\n')
+
+        other = await User.objects.acreate(username='auditor2', user_type='auditor', owner=self.owner)
+        self.broker.publish(self.owner.pk, {'type': 'created', 'transaction': 1, 'submitted_by': other.pk})
+        self.broker.publish(self.owner.pk, {'type': 'created', 'transaction': 2, 'submitted_by': self.auditor.pk})
+        chunk = await asyncio.wait_for(anext(stream), 1)
+        self.assertIn(b'"transaction":2', chunk)
+
+        # ပုံတူ id များ (အခြား auditor ၏ transaction ပါနိုင်) ကို auditor သို့ မပို့
+        self.broker.publish(self.owner.pk, {'type': 'duplicate', 'transaction': 2, 'submitted_by': self.auditor.pk,
+                                            'duplicates': [1]})
+        chunk = await asyncio.wait_for(anext(stream), 1)
+        self.assertIn(b'event: duplicate', chunk)
+        self.assertNotIn(b'duplicates', chunk)
+        await stream.aclose()
+
+
+class IdempotentBatchTests(SheetsTestCase):
+    """POST /transactions/batch/ — DB transaction တစ်ခုတည်း၊ key အလိုက် replay"""
+
+    url = '/api/sheets/transactions/batch/'
+
+    def create_op(self, key, digits, amount='100.00'):
+        return {'key': key, 'op': 'create', 'data': {
+            'transaction_date': str(date.today()), 'group': self.group.pk, 'payment_account': self.account.pk,
+            'transfer_id_last_6_digits': digits, 'amount': amount, 'transaction_type': 'income',
+        }}
+
+    def test_retry_replays_saved_responses(self):
+        client = self.client_for(self.auditor)
+        operations = [self.create_op('k1', '900001'), self.create_op('k2', '900002')]
+        first = client.post(self.url, {'operations': operations}, format='json')
+        self.assertEqual(first.status_code, 200, first.content)
+        self.assertEqual([row['replayed'] for row in first.json()['results']], [False, False])
+        self.assertEqual(Transaction.objects.count(), 2)
+
+        # ပထမ response ပျောက်၍ client က batch တစ်ခုလုံး ပြန်ပို့ + operation အသစ်တစ်ခု
+        retry = client.post(self.url, {'operations': operations + [self.create_op('k3', '900003')]}, format='json')
+        self.assertEqual(retry.status_code, 200, retry.content)
+        results = retry.json()['results']
+        self.assertEqual([row['replayed'] for row in results], [True, True, False])
+        self.assertEqual(results[0]['data'], first.json()['results'][0]['data'])
+        self.assertEqual(Transaction.objects.count(), 3)
+
+    def test_reused_key_with_different_body_conflicts(self):
+        client = self.client_for(self.auditor)
+        client.post(self.url, {'operations': [self.create_op('k1', '900001')]}, format='json')
+        response = client.post(self.url, {'operations': [self.create_op('k1', '900001', amount='999.00')]}, format='json')
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual((response.json()['index'], response.json()['key']), (0, 'k1'))
+        self.assertEqual(IdempotencyKey.objects.filter(key='k1').count(), 1)
+        self.assertEqual(Transaction.objects.count(), 1)
+
+    def test_failed_operation_rolls_back_whole_batch(self):
+        response = self.client_for(self.auditor).post(self.url, {'operations': [
+            self.create_op('k1', '900001'),
+            {'key': 'k2', 'op': 'update', 'id': 999999, 'data': {'amount': '1.00'}},
+        ]}, format='json')
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(response.json()['index'], 1)
+        self.assertFalse(Transaction.objects.exists())
+        self.assertFalse(IdempotencyKey.objects.exists())
+
+    def test_malformed_operations_rejected(self):
+        client = self.client_for(self.auditor)
+        for operations, index in [
+            ([], None),
+            ([self.create_op('k1', '900001'), self.create_op('k1', '900002')], 1),
+            ([{'key': 'k1', 'op': 'delete'}], 0),
+            ([{'key': 'k1', 'op': 'update'}], 0),
+        ]:
+            response = client.post(self.url, {'operations': operations}, format='json')
+            self.assertEqual(response.status_code, 400, operations)
+            self.assertEqual(response.json().get('index'), index)
+
+
+class BatchReadTests(SheetsTestCase):
+    """POST /api/sheets/batch/ — whitelisted GET route များကို round trip တစ်ခုတည်းဖြင့်"""
+
+    url = '/api/sheets/batch/'
+
+    def results(self, body):
+        return body['results'] if isinstance(body, dict) else body
+
+    def test_sequential_reads(self):
+        self.make_transaction('370001')
+        self.make_transaction('370002', status='approved')
+        response = self.client_for(self.owner).post(self.url, {'requests': {
+            'groups': '/api/sheets/groups/',
+            'pending': '/api/sheets/transactions/pending/',
+            'missing': f'/api/sheets/groups/{self.group.pk + 100}/',
+        }}, format='json')
+        self.assertEqual(response.status_code, 200)
+        responses = response.json()['responses']
+        self.assertEqual(responses['groups']['status'], 200)
+        self.assertEqual([g['id'] for g in self.results(responses['groups']['body'])], [self.group.pk])
+        self.assertEqual(responses['pending']['status'], 200)
+        self.assertEqual([t['transfer_id_last_6_digits'] for t in self.results(responses['pending']['body'])],
+                         ['370001'])
+        self.assertEqual(responses['missing']['status'], 404)
+
+    def test_rejects_routes_outside_the_whitelist(self):
+        response = self.client_for(self.owner).post(self.url, {'requests': {
+            'batch': '/api/sheets/transactions/batch/',
+            'outside': '/api/auth/users/me/',
+            'absolute': 'http://example.com/api/sheets/groups/',
+            'csv': '/api/sheets/reports/pivot/?format=csv',
+            'unknown': '/api/sheets/nothing/',
+        }}, format='json')
+        responses = response.json()['responses']
+        self.assertEqual({key: item['status'] for key, item in responses.items()},
+                         {'batch': 400, 'outside': 400, 'absolute': 400, 'csv': 400, 'unknown': 404})
+
+    def test_each_item_checks_its_own_permission(self):
+        response = self.client_for(self.auditor).post(self.url, {'requests': {
+            'groups': '/api/sheets/groups/',
+            'pending': '/api/sheets/transactions/pending/',
+        }}, format='json')
+        self.assertEqual(response.status_code, 200)
+        responses = response.json()['responses']
+        self.assertEqual(responses['groups']['status'], 200)
+        self.assertEqual(responses['pending']['status'], 403)
+
+    @override_settings(SHEETS_BATCH_READ_MAX_REQUESTS=2)
+    def test_max_requests(self):
+        client = self.client_for(self.owner)
+        requests = {f'g{n}': '/api/sheets/groups/' for n in range(3)}
+        self.assertEqual(client.post(self.url, {'requests': requests}, format='json').status_code, 400)
+        self.assertEqual(client.post(self.url, {'requests': {}}, format='json').status_code, 400)
+        self.assertEqual(APIClient().post(self.url, {'requests': requests}, format='json').status_code, 401)
+
+
+class BatchReadParallelTests(TransactionTestCase):
+    """"parallel": true — worker thread တစ်ခုလျှင် connection တစ်ခု (commit ပြီးသော data ကို မြင်ရန် TransactionTestCase)"""
+
+    def test_parallel_matches_sequential(self):
+        owner = User.objects.create_user('owner', 'owner@example.com', 'x', user_type='owner')
+        group = Group.objects.create(group_title='Shop', group_type='income', name='Main', owner=owner)
+        PaymentAccount.objects.create(payment_account_name='KBZ', payment_account_type='bank', owner=owner)
+        client = APIClient(HTTP_HOST='localhost')
+        client.force_authenticate(owner)
+        requests = {
+            'groups': '/api/sheets/groups/',
+            'group': f'/api/sheets/groups/{group.pk}/',
+            'accounts': '/api/sheets/payment-accounts/',
+        }
+        sequential = client.post('/api/sheets/batch/', {'requests': requests}, format='json').json()
+        parallel = client.post('/api/sheets/batch/', {'requests': requests, 'parallel': True}, format='json').json()
+        self.assertEqual(parallel, sequential)
+        self.assertEqual({item['status'] for item in parallel['responses'].values()}, {200})
+
+
+class SparseFieldsetsTests(SheetsTestCase):
+    """?fields= / ?omit= — response ပုံစံ နှင့် SELECT column / join များ"""
+
+    url = '/api/sheets/transactions/'
+
+    def rows(self, response):
+        body = response.json()
+        return body['results'] if isinstance(body, dict) else body
+
+    def transaction_sql(self, params):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client_for(self.owner).get(self.url, params)
+        self.assertEqual(response.status_code, 200)
+        return [q['sql'] for q in ctx.captured_queries if 'FROM "sheets_transaction"' in q['sql']
+                and 'COUNT(' not in q['sql']][-1]
+
+    def test_fields_and_omit_shape_the_payload(self):
+        self.make_transaction('380001')
+        client = self.client_for(self.owner)
+        rows = self.rows(client.get(self.url, {'fields': 'id,amount,status'}))
+        self.assertEqual(set(rows[0]), {'id', 'amount', 'status'})
+        rows = self.rows(client.get(self.url, {'omit': 'image,owner_notes'}))
+        self.assertNotIn('image', rows[0])
+        self.assertNotIn('owner_notes', rows[0])
+        self.assertIn('group_name', rows[0])
+        rows = self.rows(client.get(self.url, {'fields': 'id,group_name', 'omit': 'group_name'}))
+        self.assertEqual(set(rows[0]), {'id'})
+
+    def test_requested_fields_prune_columns_and_joins(self):
+        self.make_transaction('380002')
+        sql = self.transaction_sql({'fields': 'id,amount,status'})
+        self.assertIn('"amount"', sql)
+        self.assertNotIn('"owner_notes"', sql)
+        self.assertNotIn('JOIN', sql)
+
+        sql = self.transaction_sql({'fields': 'id,group_name'})
+        self.assertIn('JOIN "sheets_group"', sql)
+        self.assertNotIn('"sheets_paymentaccount"', sql)
+        self.assertNotIn('"amount"', sql)
+
+    def test_full_list_has_no_n_plus_one(self):
+        client = self.client_for(self.owner)
+        self.make_transaction('380003')
+        with CaptureQueriesContext(connection) as one:
+            client.get(self.url)
+        for n in range(4, 7):
+            self.make_transaction(f'38000{n}')
+        with self.assertNumQueries(len(one.captured_queries)):
+            response = client.get(self.url)
+        self.assertEqual(len(self.rows(response)), 4)
+
+    def test_writes_ignore_sparse_parameters(self):
+        tx = self.make_transaction('380007', status='rejected')
+        response = self.client_for(self.auditor).patch(
+            f'{self.url}{tx.pk}/?fields=id&omit=amount', {'amount': '1500.00'}, format='json',
+        )
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertEqual(Decimal(str(response.json()['amount'])), Decimal('1500.00'))
+        self.assertIn('group_name', response.json())
+        tx.refresh_from_db()
+        self.assertEqual(tx.amount, Decimal('1500.00'))
+
+
+class PeriodCloseTests(SheetsTestCase):
+    """လချုပ် — snapshot (cumulative) နှင့် ပိတ်ပြီးသော ရက်စွဲ lock"""
+
+    JAN, FEB, MAR = date(2024, 1, 15), date(2024, 2, 10), date(2024, 3, 5)
+
+    def close(self, month, user=None):
+        return self.client_for(user or self.owner).post('/api/sheets/periods/', {'month': month}, format='json')
+
+    def test_close_requires_owner_and_no_pending(self):
+        tx = self.make_transaction('100001', transaction_date=self.JAN)
+        self.assertEqual(self.close('2024-01', user=self.auditor).status_code, 403)
+        self.assertEqual(self.close('2024-13').status_code, 400)
+        self.assertEqual(self.close('2024-01').status_code, 400)  # pending ကျန်
+        self.assertFalse(ClosedPeriod.objects.exists())
+
+        tx.status = 'approved'
+        tx.save()
+        response = self.close('2024-01')
+        self.assertEqual(response.status_code, 201, response.content)
+        self.assertEqual(response.json()['snapshots'][0]['income'], 1000.0)
+        # ပိတ်ပြီးသောလ / ယခုလ ကို ထပ်ပိတ်၍ မရ
+        self.assertEqual(self.close('2024-01').status_code, 400)
+        self.assertEqual(self.close(f'{date.today():%Y-%m}').status_code, 400)
+
+    def test_snapshots_are_cumulative(self):
+        self.make_transaction('100001', '1000.00', status='approved', transaction_date=self.JAN)
+        self.make_transaction('100002', '300.00', 'expense', status='approved', transaction_date=self.JAN)
+        self.make_transaction('100003', '50.00', status='rejected', transaction_date=self.JAN)
+        periods.close_period(self.owner, self.JAN, today=self.MAR)
+        self.make_transaction('100004', '200.00', status='approved', transaction_date=self.FEB)
+        feb = periods.close_period(self.owner, self.FEB, today=self.MAR)
+
+        snapshot = BalanceSnapshot.objects.get(period=feb)
+        self.assertEqual(
+            (snapshot.income, snapshot.expense, snapshot.rejected_income, snapshot.rejected_expense),
+            (Decimal('1200.00'), Decimal('300.00'), Decimal('50.00'), Decimal('0.00')),
+        )
+        self.assertEqual(ClosedPeriod.objects.filter(owner=self.owner).count(), 2)
+
+    def test_totals_match_direct_sums(self):
+        self.make_transaction('100001', '1000.00', status='approved', transaction_date=self.JAN)
+        self.make_transaction('100002', '300.00', 'expense', status='approved', transaction_date=self.JAN)
+        periods.close_period(self.owner, self.JAN, today=self.MAR)
+        self.make_transaction('100003', '200.00', status='approved', transaction_date=self.FEB)
+        self.make_transaction('100004', '70.00', 'expense', status='pending', transaction_date=self.MAR)
+
+        sums = periods.totals(self.owner.pk)
+        self.assertEqual(sums[('approved', 'income')], Decimal('1200.00'))
+        self.assertEqual(sums[('approved', 'expense')], Decimal('300.00'))
+        self.assertEqual(sums[('pending', 'expense')], Decimal('70.00'))
+        self.assertEqual(periods.totals(self.owner.pk, end=self.JAN)[('approved', 'income')], Decimal('1000.00'))
+
+        summary = self.client_for(self.owner).get('/api/sheets/audit-summary/').json()
+        self.assertEqual(Decimal(str(summary['audited_balance'])), Decimal('900.00'))
+        self.assertEqual(Decimal(str(summary['total_expense'])), Decimal('370.00'))
+        ranged = self.client_for(self.owner).get('/api/sheets/audit-summary/', {'start': '2024-01-01'}).json()
+        self.assertEqual(ranged['audited_balance'], summary['audited_balance'])
+
+    def test_closed_dates_are_locked(self):
+        approved = self.make_transaction('100001', status='approved', transaction_date=self.JAN)
+        rejected = self.make_transaction('100002', status='rejected', transaction_date=self.JAN)
+        periods.close_period(self.owner, self.JAN)
+        auditor, owner = self.client_for(self.auditor), self.client_for(self.owner)
+
+        response = auditor.post('/api/sheets/transactions/', {
+            'transaction_date': '2024-01-20', 'group': self.group.pk, 'payment_account': self.account.pk,
+            'transfer_id_last_6_digits': '100003', 'amount': '10.00', 'transaction_type': 'income',
+        }, format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('transaction_date', response.json())
+        self.assertEqual(auditor.post(f'/api/sheets/transactions/{rejected.pk}/re_submit/').status_code, 400)
+        self.assertEqual(owner.delete(f'/api/sheets/transactions/{approved.pk}/').status_code, 400)
+        self.assertTrue(Transaction.objects.filter(pk=approved.pk).exists())
+
+        # ပိတ်ရက်နောက်ပိုင်း — ပုံမှန်
+        response = auditor.post('/api/sheets/transactions/', {
+            'transaction_date': str(date.today()), 'group': self.group.pk, 'payment_account': self.account.pk,
+            'transfer_id_last_6_digits': '100004', 'amount': '10.00', 'transaction_type': 'income',
+        }, format='json')
+        self.assertEqual(response.status_code, 201, response.content)
+
+
+@override_settings(SHEETS_ARCHIVE_AFTER_DAYS=30)
+class StatementTests(SheetsTestCase):
+    """Payment account statement — window function, keyset cursor နှင့် archive merge"""
+
+    JAN, FEB = date(2024, 1, 15), date(2024, 2, 10)
+
+    def setUp(self):
+        rows = [
+            ('400001', '1000.00', 'income', self.JAN), ('400002', '300.00', 'expense', self.JAN),
+            ('400003', '200.00', 'income', self.JAN), ('400004', '50.00', 'expense', self.FEB),
+            ('400005', '500.00', 'income', self.FEB),
+        ]
+        self.txs = [self.make_transaction(digits, amount, kind, status='approved', transaction_date=day)
+                    for digits, amount, kind, day in rows]
+        self.make_transaction('400006', '70.00', status='pending', transaction_date=self.FEB)
+        self.make_transaction('400007', '90.00', status='rejected', transaction_date=self.FEB)
+        self.url = f'/api/sheets/payment-accounts/{self.account.pk}/statement/'
+
+    def walk(self, params):
+        client, pages = self.client_for(self.owner), []
+        response = client.get(self.url, params)
+        while True:
+            self.assertEqual(response.status_code, 200, response.content)
+            pages.append(response.json())
+            if not pages[-1]['next']:
+                return pages
+            response = client.get(pages[-1]['next'])
+
+    def balances(self, pages):
+        return [Decimal(str(row['balance'])) for page in pages for row in page['results']]
+
+    def test_running_balance_over_approved_rows(self):
+        (page,) = self.walk({'start': '2024-01-01'})
+        self.assertEqual([row['id'] for row in page['results']], [tx.pk for tx in self.txs])
+        self.assertEqual(self.balances([page]), [Decimal(v) for v in ('1000', '700', '900', '850', '1350')])
+        self.assertEqual(Decimal(str(page['opening_balance'])), Decimal('0'))
+        self.assertEqual(Decimal(str(page['page_end_balance'])), Decimal('1350'))
+
+    def test_keyset_pages_continue_the_balance(self):
+        pages = self.walk({'start': '2024-01-01', 'page_size': 2})
+        self.assertEqual([len(page['results']) for page in pages], [2, 2, 1])
+        self.assertEqual(self.balances(pages), [Decimal(v) for v in ('1000', '700', '900', '850', '1350')])
+        for previous, page in zip(pages, pages[1:]):
+            self.assertEqual(page['opening_balance'], previous['page_end_balance'])
+
+        # start ကြားရက် — start မတိုင်မီ ပမာဏကို opening ထဲ ပေါင်း
+        (page,) = self.walk({'start': '2024-02-01'})
+        self.assertEqual(Decimal(str(page['opening_balance'])), Decimal('900'))
+
+    def test_cursor_is_bound_to_the_account(self):
+        first = self.client_for(self.owner).get(self.url, {'start': '2024-01-01', 'page_size': 2}).json()
+        cursor = first['next'].split('cursor=')[1]
+        other = PaymentAccount.objects.create(payment_account_name='AYA', payment_account_type='bank', owner=self.owner)
+        client = self.client_for(self.owner)
+        response = client.get(f'/api/sheets/payment-accounts/{other.pk}/statement/?cursor={cursor}')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(client.get(self.url, {'cursor': 'garbage'}).status_code, 400)
+        self.assertEqual(client.get(f'{self.url}?cursor={cursor}').status_code, 200)
+
+    def test_opening_balance_from_snapshot_and_archive_merge(self):
+        periods.close_period(self.owner, self.JAN)
+        (page,) = self.walk({})
+        self.assertEqual(Decimal(str(page['opening_balance'])), Decimal('900'))
+        self.assertEqual([row['id'] for row in page['results']], [tx.pk for tx in self.txs[3:]])
+
+        before = self.walk({'start': '2024-01-01', 'page_size': 2})
+        self.assertEqual(archive.archive_owner(self.owner.pk), 3)
+        after = self.walk({'start': '2024-01-01', 'page_size': 2})
+        self.assertEqual(self.balances(after), self.balances(before))
+        self.assertEqual([row['id'] for page in after for row in page['results']], [tx.pk for tx in self.txs])
+
+
+class RiskScoreTests(SheetsTestCase):
+    """Owner review queue — vectorized risk score / flag များ နှင့် /transactions/pending/ အစဉ်"""
+
+    def history(self, count=6, base='100.00', day=None):
+        day = day or date.today() - timedelta(days=40)
+        return [self.make_transaction(f'41{n:04d}', str(Decimal(base) + n), status='approved',
+                                      transaction_date=day + timedelta(days=n * 3))
+                for n in range(count)]
+
+    def age_submissions(self, days=90):
+        Transaction.objects.update(submitted_at=timezone.now() - timedelta(days=days))
+
+    def flags(self, tx):
+        tx.refresh_from_db()
+        return tx.risk_flags
+
+    def test_amount_outlier_is_flagged(self):
+        self.history()
+        outlier = self.make_transaction('419001', '25000.00')
+        normal = self.make_transaction('419002', '103.00', transaction_date=date.today() - timedelta(days=10))
+        risk.score_owner(self.owner.pk)
+        self.assertTrue(self.flags(outlier) & risk.FLAG_AMOUNT)
+        self.assertFalse(self.flags(normal) & risk.FLAG_AMOUNT)
+        self.assertGreater(outlier.risk_score, normal.risk_score)
+
+    def test_same_amount_within_window_is_a_duplicate(self):
+        day = date.today() - timedelta(days=5)
+        first = self.make_transaction('419101', '555.00', transaction_date=day)
+        second = self.make_transaction('419102', '555.00', transaction_date=day + timedelta(days=2))
+        far = self.make_transaction('419103', '777.00', transaction_date=day - timedelta(days=20))
+        later = self.make_transaction('419104', '777.00', transaction_date=day)
+        risk.score_owner(self.owner.pk)
+        self.assertTrue(self.flags(first) & risk.FLAG_DUPLICATE)
+        self.assertTrue(self.flags(second) & risk.FLAG_DUPLICATE)
+        self.assertFalse(self.flags(far) & risk.FLAG_DUPLICATE)
+        self.assertFalse(self.flags(later) & risk.FLAG_DUPLICATE)
+
+    def test_new_auditor_is_flagged_incrementally(self):
+        self.history()
+        self.age_submissions()
+        newcomer = User.objects.create_user('auditor2', 'auditor2@example.com', 'x', user_type='auditor',
+                                            owner=self.owner)
+        with self.captureOnCommitCallbacks(execute=True):
+            known = self.make_transaction('419201', '104.00', transaction_date=date.today() - timedelta(days=3))
+        with self.captureOnCommitCallbacks(execute=True):
+            new = self.make_transaction('419202', '105.00', transaction_date=date.today() - timedelta(days=3),
+                                        submitted_by=newcomer)
+        self.assertTrue(self.flags(new) & risk.FLAG_NEW_AUDITOR)
+        self.assertFalse(self.flags(known) & risk.FLAG_NEW_AUDITOR)
+        self.assertEqual(risk.flag_names(risk.FLAG_NEW_AUDITOR | risk.FLAG_AMOUNT), ['amount', 'new_auditor'])
+
+    def test_pending_queue_is_ordered_by_score_and_hidden_from_auditors(self):
+        self.history()
+        self.age_submissions()
+        low = self.make_transaction('419301', '102.00', transaction_date=date.today() - timedelta(days=3))
+        high = self.make_transaction('419302', '50000.00', transaction_date=date.today() - timedelta(days=3))
+        unscored = self.make_transaction('419303', '101.00', transaction_date=date.today() - timedelta(days=2))
+        risk.score_owner(self.owner.pk)
+        Transaction.objects.filter(pk=unscored.pk).update(risk_score=None)
+
+        body = self.client_for(self.owner).get('/api/sheets/transactions/pending/').json()
+        rows = body['results'] if isinstance(body, dict) else body
+        self.assertEqual([row['id'] for row in rows], [high.pk, low.pk, unscored.pk])
+        self.assertIn('amount', rows[0]['risk_reasons'])
+
+        row = self.client_for(self.auditor).get(f'/api/sheets/transactions/{high.pk}/').json()
+        self.assertNotIn('risk_score', row)
+        self.assertNotIn('risk_reasons', row)
+        body = self.client_for(self.auditor).get('/api/sheets/transactions/').json()
+        self.assertNotIn('risk_score', (body['results'] if isinstance(body, dict) else body)[0])
+
+
+class PivotReportTests(SheetsTestCase):
+    """Crosstab — build() matrix/total များ၊ dense ကာလ axis၊ avg နှင့် CSV"""
+
+    url = '/api/sheets/reports/pivot/'
+    JAN, MAR = date(2024, 1, 15), date(2024, 3, 5)
+
+    def setUp(self):
+        self.other_group = Group.objects.create(group_title='Shop', group_type='income', name='Second', owner=self.owner)
+        self.make_transaction('420001', '1000.00', status='approved', transaction_date=self.JAN)
+        self.make_transaction('420002', '300.00', 'expense', status='approved', transaction_date=self.JAN)
+        self.make_transaction('420003', '500.00', status='approved', transaction_date=self.MAR)
+        self.make_transaction('420004', '250.00', status='approved', transaction_date=self.MAR, group=self.other_group)
+        self.make_transaction('420005', '9999.00', status='pending', transaction_date=self.MAR)
+
+    def build(self, **params):
+        return pivots.build(archive.querysets_for_user(self.owner), pivots.parse(params))
+
+    def test_build_matrix_and_totals(self):
+        report = self.build(rows='group', columns='transaction_type', measure='sum')
+        self.assertEqual(report['rows']['labels'], ['Main', 'Second'])
+        self.assertEqual(report['columns']['keys'], ['expense', 'income'])
+        self.assertEqual(report['values'], [[300.0, 1500.0], [0.0, 250.0]])
+        self.assertEqual(report['row_totals'], [1800.0, 250.0])
+        self.assertEqual(report['column_totals'], [300.0, 1750.0])
+        self.assertEqual(report['grand_total'], 2050.0)
+        self.assertEqual(report['filters'], {'status': 'approved'})
+
+        net = self.build(rows='group', measure='net')
+        self.assertEqual(net['columns']['labels'], ['Total'])
+        self.assertEqual(net['values'], [[1200.0], [250.0]])
+        self.assertEqual(self.build(rows='status', measure='count')['row_totals'], [4, 1])
+        with self.assertRaises(pivots.PivotError):
+            self.build(rows='group', columns='group')
+
+    def test_period_axis_is_dense(self):
+        report = self.build(rows='group', columns='month', start='2024-01-01', end='2024-04-30')
+        self.assertEqual(report['columns']['labels'], ['2024-01', '2024-02', '2024-03', '2024-04'])
+        self.assertEqual(report['values'][0], [1300.0, 0.0, 500.0, 0.0])
+        weekly = self.build(rows='group', columns='week')
+        # 2024-01-15 (တနင်္လာ) မှ 2024-03-04 ပါသော အပတ်အထိ — မှတ်တမ်းမရှိသော အပတ်များလည်း ပါ
+        self.assertEqual(len(weekly['columns']['keys']), 8)
+        self.assertEqual(weekly['columns']['keys'][::7], ['2024-01-15', '2024-03-04'])
+        self.assertEqual(weekly['column_totals'].count(0.0), 6)
+
+    def test_avg_leaves_empty_cells_blank(self):
+        report = self.build(rows='group', columns='month', measure='avg')
+        self.assertEqual(report['values'], [[650.0, None, 500.0], [None, None, 250.0]])
+        self.assertEqual(report['row_totals'], [600.0, 250.0])
+        self.assertEqual(report['column_totals'], [650.0, None, 375.0])
+
+    def test_csv_output(self):
+        client = self.client_for(self.owner)
+        response = client.get(self.url, {'rows': 'group', 'columns': 'month', 'format': 'csv'})
+        self.assertEqual(response.status_code, 200)
+        lines = b''.join(response.streaming_content).decode('utf-8-sig').splitlines()
+        self.assertEqual(lines, [
+            'group,2024-01,2024-02,2024-03,Total',
+            'Main,1300.0,0.0,500.0,1800.0',
+            'Second,0.0,0.0,250.0,250.0',
+            'Total,1300.0,0.0,750.0,2050.0',
+        ])
+        response = client.get(self.url, {'rows': 'group', 'format': 'csv'})
+        lines = b''.join(response.streaming_content).decode('utf-8-sig').splitlines()
+        self.assertEqual(lines, ['group,Total', 'Main,1800.0', 'Second,250.0', 'Total,2050.0'])
+
+        self.assertEqual(client.get(self.url, {'rows': 'nope', 'format': 'csv'}).status_code, 400)
+        self.assertEqual(self.client_for(self.auditor).get(self.url).status_code, 403)
+
+
+class ForecastTests(SheetsTestCase):
+    """Group forecast — weekly Holt-Winters (fit/project) နှင့် version key cache"""
+
+    url = '/api/sheets/groups/forecast/'
+
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+
+    def test_fit_and_project_follow_level_and_weekly_season(self):
+        days = 28 * 6
+        flat = np.full(days, 100.0)
+        # တနင်္လာနေ့ (weekday 0) တိုင်း 700၊ ကျန်နေ့ 0 — start_weekday=0
+        weekly = np.where(np.arange(days) % 7 == 0, 700.0, 0.0)
+        level, season, sigma, alpha = forecasting.fit(np.vstack([flat, weekly]), start_weekday=0)
+        self.assertAlmostEqual(level[0], 100.0, delta=1.0)
+        self.assertLess(sigma[0], sigma[1])  # ညီညာသော series ၏ interval က ပိုကျဉ်း
+
+        forecast, low, high = forecasting.project(level, season, sigma, first_weekday=0, days=28)
+        self.assertAlmostEqual(forecast[0], 2800.0, delta=30.0)
+        self.assertAlmostEqual(forecast[1], 2800.0, delta=280.0)
+        self.assertTrue(np.all(low <= forecast) and np.all(forecast <= high))
+        # ရာသီ pattern — တနင်္လာ ပါ/မပါ ရက်နှစ်ရက် ကွာ
+        monday, = forecasting.project(level[1:], season[1:], sigma[1:], first_weekday=0, days=1)[0]
+        tuesday, = forecasting.project(level[1:], season[1:], sigma[1:], first_weekday=1, days=1)[0]
+        self.assertGreater(monday, tuesday + 300)
+
+    def test_compute_marks_series_without_history(self):
+        today = date.today()
+        for n in range(1, 29):
+            self.make_transaction(f'43{n:04d}', '100.00', status='approved', transaction_date=today - timedelta(days=n))
+        empty = Group.objects.create(group_title='Shop', group_type='income', name='Empty', owner=self.owner)
+        results = forecasting.compute([self.group.pk, empty.pk], today)
+        main = results[self.group.pk]
+        self.assertTrue(main['income']['has_history'])
+        self.assertFalse(main['expense']['has_history'])
+        self.assertGreater(main['income']['forecast'], 0)
+        self.assertEqual(main['net'], round(main['income']['forecast'] - main['expense']['forecast'], 2))
+        self.assertEqual(results[empty.pk]['income'], {'forecast': 0.0, 'low': 0.0, 'high': 0.0,
+                                                        'alpha': results[empty.pk]['income']['alpha'],
+                                                        'has_history': False})
+
+    def test_cache_hit_and_invalidation_on_approve(self):
+        tx = self.make_transaction('439001', '100.00', transaction_date=date.today() - timedelta(days=2))
+        client = self.client_for(self.owner)
+        first = client.get(self.url).json()
+        self.assertEqual(first['computed'], 1)
+        self.assertFalse(first['results'][0]['income']['has_history'])
+        self.assertEqual(client.get(self.url).json()['computed'], 0)
+
+        # pending မှတ်တမ်း ပြောင်းလဲမှုက cache ကို မဖျက်
+        with self.captureOnCommitCallbacks(execute=True):
+            self.make_transaction('439002', '50.00', transaction_date=date.today() - timedelta(days=1))
+        self.assertEqual(client.get(self.url).json()['computed'], 0)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = client.post(f'/api/sheets/transactions/{tx.pk}/approve/')
+        self.assertEqual(response.status_code, 200, response.content)
+        after = client.get(self.url).json()
+        self.assertEqual(after['computed'], 1)
+        self.assertTrue(after['results'][0]['income']['has_history'])
+        self.assertEqual(client.get(self.url, {'group': 'x'}).status_code, 400)
+
+
+@override_settings(SHEETS_ARCHIVE_AFTER_DAYS=30)
+class ReconciliationTests(SheetsTestCase):
+    """AuditEntry (group အလိုက် နောက်ဆုံး) နှင့် approved ledger ကွာခြားချက်"""
+
+    url = '/api/sheets/audit-entries/reconciliation/'
+    JAN = date(2024, 1, 15)
+
+    def setUp(self):
+        self.make_transaction('440001', '1000.00', status='approved', transaction_date=self.JAN)
+        self.make_transaction('440002', '300.00', 'expense', status='approved', transaction_date=self.JAN)
+        self.make_transaction('440003', '999.00', status='rejected', transaction_date=self.JAN)
+        self.other_group = Group.objects.create(group_title='Shop', group_type='income', name='Second', owner=self.owner)
+        self.make_transaction('440004', '80.00', status='approved', transaction_date=self.JAN, group=self.other_group)
+
+    def entry(self, receivable, payable, day, group=None):
+        entry = AuditEntry.objects.create(group=group or self.group, auditor=self.auditor,
+                                          receivable_amount=Decimal(receivable), payable_amount=Decimal(payable))
+        at = timezone.make_aware(datetime.combine(day, time(12)))
+        AuditEntry.objects.filter(pk=entry.pk).update(created_at=at)
+        return entry
+
+    def report(self, **params):
+        response = self.client_for(self.owner).get(self.url, {'start': '2024-01-01', 'end': '2024-01-31', **params})
+        self.assertEqual(response.status_code, 200, response.content)
+        return response.json()
+
+    def test_variance_over_threshold_is_flagged(self):
+        self.entry('1200.00', '300.00', date(2024, 1, 31))
+        report = self.report(threshold='100')
+        self.assertEqual(report['flagged'], 1)
+        (row,) = report['results']
+        self.assertEqual((row['group'], row['flagged']), (self.group.pk, True))
+        self.assertEqual(Decimal(str(row['receivable_variance'])), Decimal('200.00'))
+        self.assertEqual(Decimal(str(row['ledger_payable'])), Decimal('300.00'))
+
+        self.assertEqual(self.report(threshold='500')['results'], [])
+        (row,) = self.report(threshold='500', all='1')['results']
+        self.assertFalse(row['flagged'])
+        client = self.client_for(self.owner)
+        self.assertEqual(client.get(self.url, {'threshold': '-1'}).status_code, 400)
+        self.assertEqual(client.get(self.url, {'start': '2024-02-01', 'end': '2024-01-01'}).status_code, 400)
+        self.assertEqual(self.client_for(self.auditor).get(self.url).status_code, 403)
+
+    def test_latest_entry_per_group_inside_the_window(self):
+        self.entry('5000.00', '0.00', date(2024, 1, 20))
+        self.entry('1000.00', '300.00', date(2024, 1, 30))
+        self.entry('1.00', '1.00', date(2024, 2, 5))  # window ပြင်ပ
+        report = self.report()
+        self.assertEqual(report['audited_groups'], 1)
+        self.assertEqual(report['results'], [])
+
+        (row,) = self.report(end='2024-01-25')['results']
+        self.assertEqual(Decimal(str(row['audit_receivable'])), Decimal('5000.00'))
+
+    def test_groups_without_entries_are_listed_as_unaudited(self):
+        self.entry('1000.00', '300.00', date(2024, 1, 31))
+        report = self.report()
+        self.assertEqual(report['unaudited_groups'], [self.other_group.pk])
+        self.entry('0.00', '0.00', date(2024, 1, 31), group=self.other_group)
+        report = self.report()
+        self.assertEqual(report['unaudited_groups'], [])
+        self.assertEqual([row['group'] for row in report['results']], [self.other_group.pk])
+
+    def test_archived_range_reconciles_the_same(self):
+        self.entry('1100.00', '300.00', date(2024, 1, 31))
+        before = reconciliation.reconcile(self.owner.pk, start=date(2024, 1, 1), end=date(2024, 1, 31))
+        periods.close_period(self.owner, self.JAN)
+        self.assertEqual(archive.archive_owner(self.owner.pk), 3)
+        after = reconciliation.reconcile(self.owner.pk, start=date(2024, 1, 1), end=date(2024, 1, 31))
+        self.assertEqual(after, before)
+        self.assertEqual(after['results'][0]['ledger_receivable'], Decimal('1000.00'))
+
+
+class AuditEntrySummaryTests(SheetsTestCase):
+    """GET /audit-entries/summary/ — Flutter fetchAuditEntrySummary (period=daily ...) နှင့် ကိုက်ညီရမည့် ပုံစံ"""
+
+    url = '/api/sheets/audit-entries/summary/'
+    BUCKET_KEYS = {'period_start', 'total_count', 'total_receive', 'total_pay', 'net', 'total_amount', 'groups'}
+
+    def setUp(self):
+        self.other_group = Group.objects.create(group_title='Shop', group_type='income', name='Second', owner=self.owner)
+        self.other_auditor = User.objects.create_user('auditor2', 'auditor2@example.com', 'x', user_type='auditor',
+                                                      owner=self.owner)
+        self.entries = [
+            self.entry('100.00', '40.00', date(2024, 3, 4)),
+            self.entry('50.00', '0.00', date(2024, 3, 4), group=self.other_group),
+            self.entry('200.00', '20.00', date(2024, 3, 6)),
+            self.entry('10.00', '5.00', date(2024, 4, 2), auditor=self.other_auditor),
+        ]
+
+    def entry(self, receivable, payable, day, group=None, auditor=None):
+        entry = AuditEntry.objects.create(group=group or self.group, auditor=auditor or self.auditor,
+                                          receivable_amount=Decimal(receivable), payable_amount=Decimal(payable))
+        AuditEntry.objects.filter(pk=entry.pk).update(created_at=timezone.make_aware(datetime.combine(day, time(9))))
+        return entry
+
+    def summary(self, user=None, **params):
+        response = self.client_for(user or self.owner).get(self.url, {'start': '2024-03-01', 'end': '2024-04-30', **params})
+        self.assertEqual(response.status_code, 200, response.content)
+        return response.json()
+
+    def test_every_period_alias(self):
+        expected = {
+            'day': ['2024-04-02', '2024-03-06', '2024-03-04'],
+            'week': ['2024-04-01', '2024-03-04'],
+            'month': ['2024-04-01', '2024-03-01'],
+            'year': ['2024-01-01'],
+        }
+        for alias, period in audit_summaries.PERIODS.items():
+            report = self.summary(period=alias)
+            self.assertEqual(report['period'], period, alias)
+            self.assertEqual([bucket['period_start'] for bucket in report['results']], expected[period], alias)
+            for bucket in report['results']:
+                self.assertEqual(set(bucket), self.BUCKET_KEYS)
+            self.assertEqual(sum(bucket['total_count'] for bucket in report['results']), 4)
+        self.assertEqual(self.client_for(self.owner).get(self.url, {'period': 'hourly'}).status_code, 400)
+
+    def test_daily_buckets_and_latest(self):
+        report = self.summary(period='daily')
+        first_day = report['results'][-1]
+        self.assertEqual(first_day['total_count'], 2)
+        self.assertEqual(Decimal(str(first_day['total_receive'])), Decimal('150.00'))
+        self.assertEqual(Decimal(str(first_day['total_amount'])), Decimal('110.00'))
+        self.assertEqual([row['group'] for row in first_day['groups']], [self.group.pk, self.other_group.pk])
+
+        latest = {row['group']: row for row in report['latest']}
+        self.assertEqual(latest[self.group.pk]['audit_entry'], self.entries[3].pk)
+        self.assertEqual(latest[self.other_group.pk]['audit_entry'], self.entries[1].pk)
+        self.assertEqual(Decimal(str(latest[self.group.pk]['net'])), Decimal('5.00'))
+
+    def test_auditor_sees_own_entries_and_group_filter(self):
+        report = self.summary(user=self.auditor, period='monthly')
+        self.assertEqual([bucket['total_count'] for bucket in report['results']], [3])
+        self.assertEqual(report['latest'][0]['audit_entry'], self.entries[2].pk)
+
+        report = self.summary(period='monthly', group=str(self.other_group.pk))
+        self.assertEqual([bucket['total_count'] for bucket in report['results']], [1])
+
+
+@override_settings(SHEETS_ARCHIVE_AFTER_DAYS=30)
+class ArchiveTests(SheetsTestCase):
+    """ပိတ်ပြီး ကြာပြီးသော approved transaction များကို ArchivedTransaction သို့ — id မပြောင်း၊ report ရလဒ် မပြောင်း"""
+
+    JAN, FEB = date(2024, 1, 15), date(2024, 2, 10)
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.other_auditor = User.objects.create_user(
+            'auditor2', 'auditor2@example.com', 'x', user_type='auditor', owner=cls.owner,
+        )
+
+    def setUp(self):
+        self.approved = [
+            self.make_transaction('200001', '1000.00', status='approved', transaction_date=self.JAN,
+                                  image=png_bytes(1), owner_notes='archived note'),
+            self.make_transaction('200002', '400.00', 'expense', status='approved', transaction_date=self.JAN),
+            self.make_transaction('200003', '250.00', status='approved', transaction_date=self.JAN,
+                                  submitted_by=self.other_auditor),
+        ]
+        self.rejected = self.make_transaction('200004', '50.00', status='rejected', transaction_date=self.JAN)
+        self.recent = self.make_transaction('200005', '80.00', status='approved', transaction_date=self.FEB)
+        fingerprints.compute_fingerprint(self.approved[0].pk)
+        periods.close_period(self.owner, self.JAN)
+
+    def reports(self):
+        owner = self.client_for(self.owner)
+        return (
+            owner.get('/api/sheets/audit-summary/').json(),
+            owner.get('/api/sheets/audit-summary/', {'start': '2024-01-01'}).json(),
+            owner.get('/api/sheets/transactions/summary/', {'period': 'monthly'}).json(),
+        )
+
+    def test_moves_closed_approved_rows_in_batches(self):
+        image_name = self.approved[0].image.name
+        ref_count = MediaBlob.objects.get(name=image_name).ref_count
+        self.assertTrue(ReceiptFingerprint.objects.filter(transaction=self.approved[0]).exists())
+        self.assertEqual(archive.archive_owner(self.owner.pk, size=2), 3)
+
+        ids = [tx.pk for tx in self.approved]
+        self.assertFalse(Transaction.objects.filter(pk__in=ids).exists())
+        self.assertEqual(sorted(ArchivedTransaction.objects.values_list('pk', flat=True)), ids)
+        self.assertEqual(Transaction.objects.filter(pk__in=[self.rejected.pk, self.recent.pk]).count(), 2)
+        self.assertEqual(ArchivedTransaction.objects.get(pk=ids[0]).image.name, image_name)
+        self.assertEqual(MediaBlob.objects.get(name=image_name).ref_count, ref_count)
+        self.assertFalse(ReceiptFingerprint.objects.filter(transaction_id__in=ids).exists())
+        self.assertEqual(
+            [row['id'] for row in self.client_for(self.owner).get('/api/sheets/search/', {'q': 'archived'}).json()['results']],
+            [],
+        )
+        self.assertIsNotNone(ClosedPeriod.objects.get(owner=self.owner).archived_at)
+        # ထပ် run — ရွှေ့စရာ မကျန်
+        self.assertEqual(archive.archive_owner(self.owner.pk), 0)
+
+    def test_recent_periods_are_not_archived(self):
+        with override_settings(SHEETS_ARCHIVE_AFTER_DAYS=(date.today() - self.JAN).days + 60):
+            self.assertEqual(archive.archive_all(), {'owners': 0, 'moved': 0})
+        self.assertFalse(ArchivedTransaction.objects.exists())
+        self.assertIsNone(archive.archived_through(self.owner.pk))
+
+    def test_reports_are_unchanged_by_archiving(self):
+        before = self.reports()
+        self.assertEqual(archive.archive_all(), {'owners': 1, 'moved': 3})
+        after = self.reports()
+        for old, new in zip(before, after):
+            if isinstance(old, dict):
+                old.pop('last_updated', None)
+                new.pop('last_updated', None)
+        self.assertEqual(before, after)
+
+    def test_archived_rows_are_retrievable(self):
+        archive.archive_owner(self.owner.pk)
+        tx_id = self.approved[0].pk
+        owner, auditor = self.client_for(self.owner), self.client_for(self.auditor)
+
+        response = owner.get(f'/api/sheets/transactions/{tx_id}/')
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.json()['archived'])
+        self.assertEqual(auditor.get(f'/api/sheets/transactions/{tx_id}/').status_code, 200)
+        self.assertEqual(auditor.get(f'/api/sheets/transactions/{self.approved[2].pk}/').status_code, 404)
+        self.assertEqual(owner.get('/api/sheets/transactions/999999/').status_code, 404)
+
+        listed = owner.get('/api/sheets/transactions/archived/').json()
+        self.assertEqual(listed['count'], 3)
+        self.assertEqual(auditor.get('/api/sheets/transactions/archived/').json()['count'], 2)
+
+    def test_totals_after_the_snapshot_include_archived_rows(self):
+        periods.close_period(self.owner, self.FEB)
+        before = self.client_for(self.owner).get('/api/sheets/audit-summary/', {'end': '2024-02-15'}).json()
+        self.assertEqual(archive.archive_owner(self.owner.pk), 4)
+        # end (02-15) မတိုင်မီ snapshot က ဇန်နဝါရီ — ဖေဖော်ဝါရီ row များ archive ထဲ ရောက်သွားပြီ
+        self.assertEqual(periods.totals(self.owner.pk, end=date(2024, 2, 15))[('approved', 'income')], Decimal('1330.00'))
+        after = self.client_for(self.owner).get('/api/sheets/audit-summary/', {'end': '2024-02-15'}).json()
+        before.pop('last_updated', None)
+        after.pop('last_updated', None)
+        self.assertEqual(after, before)
+        self.assertEqual(Decimal(str(after['total_income'])), Decimal('1380.00'))  # rejected 50 ပါဝင်
+
+    def walk(self, client, params=None):
+        response, ids = client.get('/api/sheets/transactions/', params or {}), []
+        while True:
+            self.assertEqual(response.status_code, 200, response.content)
+            body = response.json()
+            ids += [row['id'] for row in body['results']]
+            if not body['next']:
+                return body['count'], ids
+            response = client.get(body['next'])
+
+    def test_list_and_search_merge_the_archive(self):
+        archive.archive_owner(self.owner.pk)
+        owner, auditor = self.client_for(self.owner), self.client_for(self.auditor)
+        everything = [tx.pk for tx in (*self.approved, self.rejected, self.recent)]
+
+        with mock.patch.object(PageNumberPagination, 'page_size', 2):
+            count, ids = self.walk(owner)
+            self.assertEqual(count, 5)
+            self.assertEqual(ids, sorted(everything, reverse=True))  # submitted_at တူ — id ဖြင့် ဆက်စီ
+            count, ids = self.walk(owner, {'ordering': 'amount'})
+            self.assertEqual(ids, [self.rejected.pk, self.recent.pk, self.approved[2].pk, self.approved[1].pk,
+                                   self.approved[0].pk])
+            self.assertEqual(self.walk(auditor)[0], 4)
+            page = owner.get('/api/sheets/transactions/', {'page': 3}).json()
+            self.assertEqual([row['id'] for row in page['results']], [self.approved[0].pk])
+
+        rows = owner.get('/api/sheets/transactions/', {'fields': 'id,amount'}).json()['results']
+        self.assertEqual({frozenset(row) for row in rows}, {frozenset({'id', 'amount'})})
+        archived_row = owner.get('/api/sheets/transactions/', {'search': '200001'}).json()
+        self.assertEqual([row['id'] for row in archived_row['results']], [self.approved[0].pk])
+        self.assertTrue(archived_row['results'][0]['archived'])
+        self.assertEqual(self.walk(owner, {'search': 'archived note'})[1], [self.approved[0].pk])
+
+        # lower bound က archive နောက်ပိုင်း — hot row များသာ (page number pagination)
+        self.assertEqual(self.walk(owner, {'transaction_date_after': '2024-02-01'})[1], [self.recent.pk])
+        self.assertEqual(owner.get('/api/sheets/transactions/', {'cursor': 'forged'}).status_code, 400)
+
+
+class ReceiptPackTests(SheetsTestCase):
+    """Receipt cold storage — pack ဖိုင်ထဲသို့ ရွှေ့ပြီး URL မပြောင်းဘဲ ReceiptFileView မှ serve"""
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.other_auditor = User.objects.create_user(
+            'auditor2', 'auditor2@example.com', 'x', user_type='auditor', owner=cls.owner,
+        )
+
+    def pack(self):
+        return packs.pack_blobs(older_than_days=0, workers=1)
+
+    def fetch(self, user, name):
+        client = self.client_for(user) if user is not None else APIClient(HTTP_HOST='localhost')
+        return client.get(f'/media/{name}', HTTP_ACCEPT='image/*')
+
+    def test_packed_blobs_read_back_unchanged(self):
+        png_tx = self.make_transaction('300001', image=png_bytes(1))
+        jpeg_tx = self.make_transaction('300002', image=jpeg_bytes(2))
+        loose = receipt_storage().path(png_tx.image.name)
+
+        result = self.pack()
+        self.assertEqual((result['packed'], result['missing']), (2, 0))
+        self.assertFalse(os.path.exists(loose))
+        blob = MediaBlob.objects.get(name=png_tx.image.name)
+        self.assertTrue(blob.pack.startswith('pack-'))
+        with receipt_storage().open(png_tx.image.name) as fh:
+            self.assertEqual(fh.read(), png_bytes(1))
+        with receipt_storage().open(jpeg_tx.image.name) as fh:
+            self.assertEqual(fh.read(), jpeg_bytes(2))
+        # pack လုပ်ပြီးသား — ထပ် run လျှင် မရွေး
+        self.assertEqual(self.pack()['packed'], 0)
+
+    def test_packed_png_keeps_its_content_address(self):
+        # compress_level=0 — ပြန် encode လျှင် ပိုသေးမည့် PNG။ Byte မပြောင်းဘဲ zlib ဖြင့်သာ ချုံ့ရမည်
+        out = io.BytesIO()
+        receipt_image(3).save(out, format='PNG', compress_level=0)
+        tx = self.make_transaction('300003', image=out.getvalue())
+
+        self.pack()
+        blob = MediaBlob.objects.get(name=tx.image.name)
+        self.assertEqual(blob.pack_codec, packs.CODEC_ZLIB)
+        self.assertEqual(blob.size, len(out.getvalue()))
+        with receipt_storage().open(tx.image.name) as fh:
+            data = fh.read()
+        self.assertEqual(data, out.getvalue())
+        self.assertEqual(hashlib.sha256(data).hexdigest(), os.path.splitext(os.path.basename(tx.image.name))[0])
+
+    def test_file_view_serves_packed_image_to_permitted_users(self):
+        tx = self.make_transaction('300001', image=png_bytes(1))
+        self.pack()
+
+        response = self.fetch(self.owner, tx.image.name)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(b''.join(response.streaming_content), png_bytes(1))
+        self.assertEqual(response['Content-Type'], 'image/png')
+        self.assertTrue(response['Cache-Control'].startswith('private'))
+        self.assertEqual(self.fetch(self.auditor, tx.image.name).status_code, 200)
+
+        self.assertEqual(self.fetch(None, tx.image.name).status_code, 401)
+        self.assertEqual(self.fetch(self.other_auditor, tx.image.name).status_code, 404)
+        self.assertEqual(self.fetch(self.owner, 'transaction_images/00/00/missing.png').status_code, 404)
+
+    @override_settings(RECEIPT_FILE_VIEW=False)
+    def test_packing_requires_file_view(self):
+        self.make_transaction('300001', image=png_bytes(1))
+        with self.assertRaises(RuntimeError):
+            self.pack()
+        self.assertFalse(MediaBlob.objects.exclude(pack='').exists())
+
+
+# collectstatic မလုပ်ထားသော test တွင် admin template ၏ {% static %} အတွက် manifest မလို
+@override_settings(STORAGES={**settings.STORAGES, 'staticfiles': {'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage'}})
+class TransactionAdminTests(SheetsTestCase):
+    """TransactionAdmin changelist — ခန့်မှန်း count၊ FTS + related-name search၊ thumbnail"""
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.staff = User.objects.create_superuser('staff', 'staff@example.com', 'x', user_type='owner')
+        cls.other_group = Group.objects.create(group_title='Stall', group_type='income', name='Night', owner=cls.owner)
+
+    def setUp(self):
+        self.client.force_login(self.staff)
+
+    def changelist(self, **params):
+        response = self.client.get('/admin/sheets/transaction/', params)
+        self.assertEqual(response.status_code, 200)
+        return response
+
+    def found(self, term):
+        return sorted(tx.pk for tx in self.changelist(q=term).context['cl'].result_list)
+
+    def test_search_matches_digits_notes_and_related_names(self):
+        first = self.make_transaction('123456', owner_notes='rent deposit')
+        second = self.make_transaction('654321', group=self.other_group)
+
+        self.assertEqual(self.found('3456'), [first.pk])  # transfer ID ၏ အလယ် / နောက်ဆုံး ဂဏန်း
+        self.assertEqual(self.found('6543'), [second.pk])
+        self.assertEqual(self.found('deposit'), [first.pk])
+        self.assertEqual(self.found('Night'), [second.pk])
+        self.assertEqual(self.found('auditor'), [first.pk, second.pk])
+        self.assertEqual(self.found('KBZ'), [first.pk, second.pk])
+        self.assertEqual(self.found('nothing'), [])
+
+    def test_changelist_query_count_does_not_grow_with_rows(self):
+        self.make_transaction('100001', image=png_bytes(1))
+        with CaptureQueriesContext(connection) as few:
+            self.changelist()
+        for i in range(2, 8):
+            self.make_transaction(f'10000{i}', image=png_bytes(i), group=self.other_group)
+        with CaptureQueriesContext(connection) as many:
+            response = self.changelist()
+        self.assertEqual(len(many), len(few))
+        self.assertContains(response, '/admin/sheets/transaction/thumbnail/')
+
+    @override_settings(SHEETS_ADMIN_COUNT_LIMIT=3)
+    def test_paginator_estimates_or_caps_the_count(self):
+        for i in range(5):
+            self.make_transaction(f'20000{i}', status='approved' if i else 'pending')
+        with mock.patch('sheets.admin.estimated_rows', return_value=5000) as estimated:
+            self.assertEqual(self.changelist().context['cl'].paginator.count, 5000)
+            # filter ပါလျှင် ခန့်မှန်းချက် မသုံး — limit + 1 အထိသာ ရေတွက်
+            self.assertEqual(self.changelist(status__exact='approved').context['cl'].paginator.count, 4)
+            self.assertEqual(self.changelist(status__exact='pending').context['cl'].paginator.count, 1)
+        self.assertEqual(estimated.call_count, 1)
+        with mock.patch('sheets.admin.estimated_rows', return_value=2):
+            self.assertEqual(self.changelist().context['cl'].paginator.count, 4)
+        self.assertGreaterEqual(admin_estimated_rows(Transaction, 'default'), 5)
+
+    def test_thumbnail_view_requires_view_permission(self):
+        tx = self.make_transaction('300001', image=png_bytes(1))
+        url = f'/admin/sheets/transaction/thumbnail/{tx.image.name}'
+
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'image/jpeg')
+        self.assertTrue(response['Cache-Control'].startswith('private'))
+        self.assertEqual(self.client.get('/admin/sheets/transaction/thumbnail/transaction_images/00/00/missing.png').status_code, 404)
+
+        clerk = User.objects.create_user('clerk', 'clerk@example.com', 'x', user_type='owner', is_staff=True)
+        self.client.force_login(clerk)
+        self.assertEqual(self.client.get(url).status_code, 403)
+        self.client.logout()
+        self.assertEqual(self.client.get(url).status_code, 302)  # admin login သို့
+
+
+class RequestProfilingTests(SheetsTestCase):
+    """Opt-in request profiler — staff ၏ ?_profile= / X-Sheets-Profile သာ"""
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.staff = User.objects.create_user('staff', 'staff@example.com', 'x', user_type='owner', is_staff=True)
+
+    def get(self, user, path='/api/sheets/transactions/', **extra):
+        client = APIClient(HTTP_HOST='localhost')
+        if user is not None:
+            client.credentials(HTTP_AUTHORIZATION=f'Token {Token.objects.get_or_create(user=user)[0].key}')
+        return client.get(path, **extra)
+
+    def test_staff_request_is_profiled(self):
+        response = self.get(self.staff, '/api/sheets/transactions/?_profile=1', HTTP_X_REQUEST_ID='req-12345678')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['X-Request-ID'], 'req-12345678')
+        profile = RequestProfile.objects.get(pk=response['X-Sheets-Profile-ID'])
+        self.assertEqual((profile.request_id, profile.mode, profile.user), ('req-12345678', 'sample', self.staff))
+        self.assertEqual(profile.path, '/api/sheets/transactions/?_profile=1')
+        self.assertGreater(profile.sql_count, 0)
+        self.assertEqual(len(profile.data['sql']), profile.sql_count)
+        self.assertIsNone(profile.pstats)
+
+    def test_cprofile_mode_stores_stats(self):
+        response = self.get(self.staff, HTTP_X_SHEETS_PROFILE='cprofile')
+        profile = RequestProfile.objects.get(pk=response['X-Sheets-Profile-ID'])
+        self.assertEqual(profile.mode, 'cprofile')
+        self.assertTrue(profile.data['functions'])
+        self.assertIsNotNone(profile.pstats)
+
+    def test_non_staff_and_anonymous_are_not_profiled(self):
+        for user in (self.owner, self.auditor, None):
+            response = self.get(user, '/api/sheets/transactions/?_profile=1')
+            self.assertNotIn('X-Sheets-Profile-ID', response)
+        self.assertFalse(RequestProfile.objects.exists())
+        # ?_profile=0 — ပိတ်
+        self.assertNotIn('X-Sheets-Profile-ID', self.get(self.staff, '/api/sheets/transactions/?_profile=0'))
+
+    def test_stack_helpers(self):
+        stacks = {'main;view;query': 3, 'main;view': 1, 'main;render': 2}
+        functions = {row['function']: row for row in profiling.top_functions(stacks)}
+        self.assertEqual((functions['query']['self_samples'], functions['query']['total_samples']), (3, 3))
+        self.assertEqual((functions['view']['self_samples'], functions['view']['total_samples']), (1, 4))
+        self.assertEqual(functions['main']['total_samples'], 6)
+
+        tree = profiling.call_tree(stacks)
+        self.assertEqual(tree['samples'], 6)
+        main = tree['children'][0]
+        self.assertEqual([(child['name'], child['samples']) for child in main['children']], [('view', 4), ('render', 2)])
+        self.assertEqual(profiling.collapsed(stacks), 'main;render 2\nmain;view 1\nmain;view;query 3\n')
+
+
+# settings_production ကို သီးခြား process ထဲတွင် load (test DB — in-memory, migrate + createcachetable)
+PRODUCTION_SMOKE = """
+import json, os, sys
+import django
+django.setup()
+from django.test.utils import setup_databases, setup_test_environment
+setup_test_environment()
+setup_databases(verbosity=0, interactive=False)
+from django.core.management import call_command
+from django.urls import get_resolver
+call_command('check', fail_level='ERROR')
+get_resolver().url_patterns
+loaded = sorted(name for name in ('numpy', 'django_extensions', 'jazzmin') if name in sys.modules)
+from django.test import Client
+from rest_framework.authtoken.models import Token
+from accounts.models import User
+owner = User.objects.create_user('owner', 'owner@example.com', 'x', user_type='owner')
+response = Client(HTTP_HOST='localhost').get(
+    '/api/sheets/transactions/', HTTP_AUTHORIZATION='Token ' + Token.objects.create(user=owner).key,
+)
+anonymous = Client(HTTP_HOST='localhost').get('/api/sheets/transactions/')
+print(json.dumps({'loaded': loaded, 'status': response.status_code, 'type': response['Content-Type'],
+                  'body': response.json(), 'anonymous': anonymous.status_code}))
+"""
+
+
+class ProductionSettingsTests(TestCase):
+    """settings_production — load, check, token request (API worker ၏ startup တွင် numpy မပါ)"""
+
+    def run_smoke(self, **env):
+        result = subprocess.run(
+            [sys.executable, '-c', PRODUCTION_SMOKE],
+            cwd=settings.BASE_DIR, capture_output=True, text=True, timeout=300,
+            env=dict(os.environ, DJANGO_SETTINGS_MODULE='thoonsheet.settings_production',
+                     DJANGO_SECRET_KEY='production-smoke-test', DJANGO_SQLITE_WAL='0', **env),
+        )
+        self.assertEqual(result.returncode, 0, result.stderr)
+        return json.loads(result.stdout.strip().splitlines()[-1])
+
+    def test_api_worker_serves_token_request(self):
+        result = self.run_smoke()
+        self.assertEqual(result['loaded'], [])
+        self.assertEqual((result['status'], result['type']), (200, 'application/json'))
+        self.assertEqual(result['body']['count'], 0)
+        self.assertEqual(result['anonymous'], 401)
+
+    def test_admin_worker_passes_check(self):
+        self.assertEqual(self.run_smoke(DJANGO_ADMIN='1')['status'], 200)
+
+    def test_missing_secret_key_is_rejected(self):
+        result = subprocess.run(
+            [sys.executable, 'manage.py', 'check'], cwd=settings.BASE_DIR, capture_output=True, text=True, timeout=300,
+            env={k: v for k, v in dict(os.environ, DJANGO_SETTINGS_MODULE='thoonsheet.settings_production').items()
+                 if k != 'DJANGO_SECRET_KEY'},
+        )
+        self.assertNotEqual(result.returncode, 0)
+        self.assertIn('DJANGO_SECRET_KEY', result.stderr)
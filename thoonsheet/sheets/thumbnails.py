@@ -0,0 +1,66 @@
+# sheets/thumbnails.py
+"""
+Receipt ပုံ thumbnail — admin changelist ကဲ့သို့ row များစွာ ပြသော နေရာများတွင် မူရင်းပုံအစား
+
+- `RECEIPT_THUMBNAIL_DIR/<RECEIPT_THUMBNAIL_SIZE>/<receipt name>.jpg` — ပထမဆုံး တောင်းသောအခါ Pillow ဖြင့် ဖန်တီးပြီး disk ပေါ် cache
+  (ရင်းမြစ်ကို receipt_storage() မှ ဖတ်သောကြောင့် pack ထဲရှိ ပုံများလည်း ရ)
+- Receipt အမည်ထဲတွင် sha256 ပါသောကြောင့် thumbnail သည် immutable — blob ဖျက်သောအခါ
+  (ContentAddressedStorage.delete) remove() ဖြင့် ရှင်းသည်
+"""
+
+import os
+import tempfile
+
+from django.conf import settings
+from django.core.exceptions import SuspiciousFileOperation
+from django.utils._os import safe_join
+
+
+def thumbnail_dir():
+    return getattr(settings, 'RECEIPT_THUMBNAIL_DIR', None) or os.path.join(settings.MEDIA_ROOT, 'thumbnails')
+
+
+def thumbnail_size():
+    return getattr(settings, 'RECEIPT_THUMBNAIL_SIZE', 96)
+
+
+def path_for(name):
+    """Receipt အမည် -> thumbnail ဖိုင် path (directory ပြင်ပ ထွက်သော အမည်ဆိုလျှင် SuspiciousFileOperation)"""
+    return safe_join(thumbnail_dir(), str(thumbnail_size()), os.path.splitext(name)[0] + '.jpg')
+
+
+def get_or_create(name):
+    """Thumbnail ဖိုင် path — မရှိသေးလျှင် ဖန်တီး (ရင်းမြစ် မရှိလျှင် FileNotFoundError)"""
+    from PIL import Image
+
+    from .storage import receipt_storage
+
+    size = thumbnail_size()
+    path = path_for(name)
+    if os.path.exists(path):
+        return path
+
+    with receipt_storage().open(name) as fh, Image.open(fh) as img:
+        img.draft('RGB', (size * 2, size * 2))  # JPEG ဆိုလျှင် decode ကတည်းက လျှော့
+        img.thumbnail((size, size))
+        if img.mode not in ('RGB', 'L'):
+            img = img.convert('RGB')
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # request နှစ်ခု တစ်ပြိုင်နက် ဖန်တီးလျှင်လည်း ဖိုင်တစ်ဝက် မမြင်ရစေရန် temp ဖိုင်မှ rename
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as out:
+                img.save(out, format='JPEG', quality=80, optimize=True)
+            os.replace(tmp, path)
+        except BaseException:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+            raise
+    return path
+
+
+def remove(name):
+    try:
+        os.remove(path_for(name))
+    except (FileNotFoundError, SuspiciousFileOperation):
+        pass
@@ -0,0 +1,174 @@
+# sheets/uploads.py
+"""
+Resumable (chunked) receipt upload
+
+1. POST   /api/sheets/uploads/                      {filename, size}  -> session (id)
+2. PUT    /api/sheets/uploads/{id}/chunk/?offset=N  raw bytes (Content-Range: bytes a-b/total လည်းရ)
+   ချိတ်ဆက်မှုပြတ်ရင် GET /uploads/{id}/ ဖြင့် received ကိုကြည့်ပြီး ထို offset မှ ဆက်ပို့
+3. POST   /api/sheets/uploads/{id}/finalize/        -> receipt storage ထဲ ရွှေ့ပြီး image name ရ
+4. Transaction create/update တွင် image အစား upload_id ပို့
+
+Chunk များကို request body stream မှ disk ပေါ် တိုက်ရိုက်ရေးသည် (memory ထဲ body တစ်ခုလုံး မထားပါ)။
+Partial file ကို MEDIA_ROOT အောက်မှာ ထားသောကြောင့် finalize သည် copy မဟုတ်ဘဲ rename သာဖြစ်သည်။
+"""
+
+import os
+import re
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.core.files import File
+from django.db import router
+from django.utils import timezone
+
+try:
+    import fcntl
+except ImportError:  # Windows — received ၏ conditional UPDATE သာ (chunk များကို တစ်ပြိုင်နက် မပို့ပါနှင့်)
+    fcntl = None
+
+from .storage import receipt_storage
+
+CHUNK_READ_SIZE = 64 * 1024
+ALLOWED_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.webp', '.gif', '.bmp')
+re_content_range = re.compile(r'^bytes (\d+)-(\d+)/(\d+|\*)$')
+
+
+class UploadError(Exception):
+    def __init__(self, detail, status_code=400, **extra):
+        super().__init__(detail)
+        self.detail = detail
+        self.status_code = status_code
+        self.extra = extra
+
+
+class PartialUploadFile(File):
+    """disk ပေါ်ရှိပြီးသား ဖိုင် — storage က copy မလုပ်ဘဲ move လုပ်နိုင်ရန် temporary_file_path() ပေးထားသည်"""
+
+    def temporary_file_path(self):
+        return self.file.name
+
+
+def max_upload_size():
+    return getattr(settings, 'RECEIPT_UPLOAD_MAX_SIZE', 25 * 1024 * 1024)
+
+
+def partial_dir():
+    path = getattr(settings, 'RECEIPT_UPLOAD_PARTIAL_DIR', None) or os.path.join(settings.MEDIA_ROOT, '.partial_uploads')
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def partial_path(session):
+    return os.path.join(partial_dir(), f'{session.pk}.part')
+
+
+def parse_offset(request):
+    """?offset=N သို့မဟုတ် Content-Range header မှ chunk ၏ စတင်ရာ byte"""
+    content_range = request.META.get('HTTP_CONTENT_RANGE')
+    if content_range:
+        m = re_content_range.match(content_range.strip())
+        if not m:
+            raise UploadError('Content-Range header မမှန်ပါ။')
+        return int(m.group(1))
+    raw = request.query_params.get('offset')
+    if raw is None:
+        raise UploadError('offset (သို့) Content-Range လိုအပ်ပါသည်။')
+    try:
+        offset = int(raw)
+    except ValueError:
+        raise UploadError('offset သည် ကိန်းဂဏန်း ဖြစ်ရမည်။')
+    if offset < 0:
+        raise UploadError('offset သည် အနုတ်ကိန်း မဖြစ်ရပါ။')
+    return offset
+
+
+@contextmanager
+def _open_partial(path):
+    """Partial file ကို (မရှိလျှင် ဖန်တီး၊ truncate မလုပ်) exclusive lock ဖြင့် ဖွင့်"""
+    fh = os.fdopen(os.open(path, os.O_RDWR | os.O_CREAT, 0o644), 'r+b')
+    try:
+        if fcntl is not None:
+            # process / thread များကြား session တစ်ခု၏ chunk များကို တစ်ခုချင်း ရေးစေရန် (SQLite တွင် row lock မရှိ)
+            fcntl.flock(fh, fcntl.LOCK_EX)
+        yield fh
+    finally:
+        fh.close()
+
+
+def write_chunk(session, stream, offset):
+    """
+    stream မှ bytes များကို partial file ၏ offset နေရာမှ စရေးသည်။
+    offset > received ဆိုလျှင် ကြားမှာ ပျောက်နေသော bytes ရှိလို့ 409 ပြန်သည်။
+    offset < received (chunk ကို ပြန်ပို့) ဆိုလျှင် ထပ်ရေးခွင့်ပြုသည်။
+    တစ်ပြိုင်နက် PUT များ — partial file lock အတွင်းမှ status / received ကို DB မှ ပြန်ဖတ်ပြီးမှ ရေး၊
+    received ကို conditional UPDATE (ပိုကြီးမှသာ) ဖြင့် တိုးသောကြောင့် နောက်ပြန် မဆုတ်
+    """
+    from .models import UploadSession
+
+    sessions = UploadSession.objects.using(router.db_for_write(UploadSession)).filter(pk=session.pk)
+    with _open_partial(partial_path(session)) as fh:
+        status, received = sessions.values_list('status', 'received').get()
+        if status != 'open':
+            raise UploadError('ဤ upload ကို ပိတ်ပြီးပါပြီ။', status_code=409)
+        if offset > received:
+            raise UploadError('offset သည် လက်ခံပြီးသား byte အရေအတွက်နှင့် မကိုက်ညီပါ။', status_code=409, received=received)
+
+        end = offset
+        fh.seek(offset)
+        while True:
+            chunk = stream.read(CHUNK_READ_SIZE)
+            if not chunk:
+                break
+            end += len(chunk)
+            if end > session.size:
+                fh.truncate(received)
+                raise UploadError('ကြေညာထားသော size ထက် ပိုနေပါသည်။')
+            fh.write(chunk)
+        fh.flush()
+        sessions.filter(received__lt=end).update(received=end, updated_at=timezone.now())
+
+    session.refresh_from_db(fields=['status', 'received', 'updated_at'])
+    return session
+
+
+def finalize(session):
+    """ဖိုင်အပြည့်ရောက်ပြီးဆိုလျှင် ပုံဟုတ်မဟုတ်စစ်ပြီး receipt storage ထဲ ရွှေ့သည်"""
+    if session.status != 'open':
+        if session.blob_name:
+            return session
+        raise UploadError('ဤ upload ကို ပိတ်ပြီးပါပြီ။', status_code=409)
+    if session.received != session.size:
+        raise UploadError('ဖိုင် မပြည့်စုံသေးပါ။', status_code=409, received=session.received)
+
+    from PIL import Image, UnidentifiedImageError
+
+    path = partial_path(session)
+    try:
+        with Image.open(path) as img:
+            img.verify()
+    except (UnidentifiedImageError, OSError, SyntaxError):
+        raise UploadError('ပုံဖိုင် မဟုတ်ပါ (သို့) ပျက်နေပါသည်။')
+
+    storage = receipt_storage()
+    upload_to = receipt_upload_to()
+    with open(path, 'rb') as fh:
+        name = storage.save(os.path.join(upload_to, session.filename), PartialUploadFile(fh, name=path))
+    if os.path.exists(path):
+        # blob ရှိပြီးသားဖြစ်လို့ move မလုပ်ခဲ့ရင် partial ကို ဖျက်
+        os.unlink(path)
+
+    session.blob_name = name
+    session.status = 'complete'
+    session.save(update_fields=['blob_name', 'status', 'updated_at'])
+    return session
+
+
+def discard(session):
+    path = partial_path(session)
+    if os.path.exists(path):
+        os.unlink(path)
+
+
+def receipt_upload_to():
+    from .models import Transaction
+    return Transaction._meta.get_field('image').upload_to
@@ -20,10 +20,20 @@ router.register(r'payment-accounts', PaymentAccountViewSet)
 router.register(r'groups', GroupViewSet)
 router.register(r'audit-entries', AuditEntryViewSet) # For Auditor's manual AuditEntry management
 router.register(r'transactions', TransactionViewSet)
+router.register(r'uploads', views.ReceiptUploadViewSet, basename='upload')
+router.register(r'jobs', views.JobViewSet, basename='job')
+router.register(r'periods', views.ClosedPeriodViewSet, basename='period')
 
 urlpatterns = [
     path('', include(router.urls)),
-    # path('audit-entries/summary/', views.AuditSummaryView.as_view(), name='audit_summary',),
+    # audit-entries/summary/ သည် AuditEntryViewSet.summary (group + ကာလ အလိုက်) ဖြစ်သောကြောင့် သီးခြား path
+    path('audit-summary/', views.AuditSummaryView.as_view(), name='audit_summary'),
     path('api/change-password/', views.ChangePasswordView.as_view(), name='change_password'),
     path('api/users/<int:pk>/password/', views.SetUserPasswordView.as_view(), name='change_password'),
+    path('search/', views.SearchView.as_view(), name='search'),
+    path('events/', views.transaction_events, name='transaction_events'),
+    path('events/ticket/', views.EventTicketView.as_view(), name='event_ticket'),
+    path('batch/', views.BatchReadView.as_view(), name='batch_read'),
+    path('reports/pivot/', views.PivotReportView.as_view(), name='pivot_report'),
+    path('stats/compression/', views.CompressionStatsView.as_view(), name='compression_stats'),
 ]
\ No newline at end of file
@@ -1,6 +1,10 @@
 # sheets/views.py
 
+import logging
+import operator
+import os
 from decimal import Decimal
+from functools import reduce
 from django.forms import DecimalField
 from django.shortcuts import get_object_or_404
 import django_filters
@@ -9,8 +13,8 @@ from rest_framework.response import Response
 from rest_framework.decorators import action
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.parsers import MultiPartParser, FormParser, JSONParser
-from django.db.models import Sum, Case, When, F, DecimalField
-from django.db.models.functions import Coalesce
+from django.db.models import Count, Sum, Case, When, F, DecimalField, Q
+from django.db.models.functions import Coalesce, TruncDay, TruncMonth, TruncWeek, TruncYear
 from django.utils import timezone
 from datetime import datetime, timedelta
 from rest_framework.decorators import api_view, permission_classes
@@ -18,15 +22,44 @@ from rest_framework import generics
 # from django.contrib.auth import get_user_model # If you use custom user model, import it directly
 from accounts.models import User # <-- သင့် User model လမ်းကြောင်းကို မှန်ကန်စွာ ပြင်ပါ။
 
-from .models import Group, PaymentAccount, Transaction, AuditEntry
+from .models import Group, PaymentAccount, Transaction, AuditEntry, ArchivedTransaction
 from .serializers import (
     AuditSummarySerializer, ChangePasswordSerializer, GroupSerializer, OwnerApproveRejectSerializer, PaymentAccountSerializer, SetUserPasswordSerializer, TransactionSerializer,
-    AuditEntrySerializer, UserSerializer # <-- UserSerializer ကို import လုပ်ထားကြောင်း သေချာပါစေ။
+    AuditEntrySerializer, UserSerializer, # <-- UserSerializer ကို import လုပ်ထားကြောင်း သေချာပါစေ။
+    UploadSessionSerializer, JobSerializer, ClosedPeriodSerializer, ClosePeriodSerializer, ArchivedTransactionSerializer,
 )
 from .permissions import IsAuditorUser, IsOwnerUser, DenyAll
+from .middleware import compression_stats
+from .fingerprints import find_similar, max_distance
+from .models import ReceiptFingerprint, UploadSession, Job, ClosedPeriod
+from . import archive, audit_summaries, forecasting, periods, pivots, reconciliation, statements
+from . import uploads
+from .jobs import enqueue
+from .tasks import export_storage
+from django.conf import settings
+from concurrent.futures import TimeoutError as FutureTimeoutError
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework.filters import OrderingFilter, SearchFilter
+from rest_framework.pagination import PageNumberPagination
 from rest_framework.views import APIView
+from rest_framework.settings import api_settings
+from django.db import router
+from django.db.models.expressions import RawSQL
+from django.db.models.query import EmptyQuerySet
+from . import search
+from .sharding import ShardScopedViewMixin
+from .replicas import ReplicaReadViewMixin
+from .fieldsets import SparseFieldsetsViewMixin
+from .events import format_sse, get_broker, make_ticket, read_ticket, ticket_max_age
+from django.core.handlers.asgi import ASGIRequest
+from . import idempotency, multiplex
+from .models import IdempotencyKey
+from django.db import IntegrityError, transaction as db_transaction
+from rest_framework.exceptions import APIException, NotFound, PermissionDenied
+from django.core.exceptions import SuspiciousFileOperation
+from django.http import FileResponse, Http404, HttpResponseNotAllowed, JsonResponse, StreamingHttpResponse
+import mimetypes
+from .storage import receipt_storage
 
 # Djoser views and related imports
 from djoser.views import TokenCreateView
@@ -37,6 +70,7 @@ from django.db.models.functions import Coalesce
 from django.utils import timezone
 from django.utils.dateparse import parse_date
 
+logger = logging.getLogger(__name__)
 
 
 class IsOwnerOrAuditor(permissions.BasePermission):
@@ -89,7 +123,8 @@ class UserViewSet(viewsets.ModelViewSet):
         if user.is_superuser:
             return queryset
         elif user.user_type == 'owner':
-            return queryset.filter(user_type='auditor')
+            # ကိုယ်ဖန်တီးထားသော auditor များသာ
+            return queryset.filter(user_type='auditor', owner=user)
         else:
             return User.objects.none()
 
@@ -109,6 +144,7 @@ class UserViewSet(viewsets.ModelViewSet):
                 first_name=self.request.data.get('first_name', ''),
                 last_name=self.request.data.get('last_name', ''),
                 phone_number=self.request.data.get('phone_number', ''),
+                owner=self.request.user,
             )
             serializer.instance = user
         else:
@@ -137,7 +173,7 @@ class UserViewSet(viewsets.ModelViewSet):
 
 
 # Group ViewSet (Owner CRUD, Auditor List/Retrieve)
-class GroupViewSet(viewsets.ModelViewSet):
+class GroupViewSet(ShardScopedViewMixin, ReplicaReadViewMixin, SparseFieldsetsViewMixin, viewsets.ModelViewSet):
     queryset = Group.objects.all().order_by('id')
     serializer_class = GroupSerializer
     http_method_names = ['get', 'post', 'put', 'patch', 'delete', 'head', 'options']
@@ -154,13 +190,38 @@ class GroupViewSet(viewsets.ModelViewSet):
             self.permission_classes = [permissions.IsAuthenticatedOrReadOnly]
         else:
             self.permission_classes = [permissions.IsAuthenticated]
+        if self.action == 'forecast':
+            self.permission_classes = [IsOwnerUser]
         return [permission() for permission in self.permission_classes]
 
+    def get_queryset(self):
+        return super().get_queryset().for_user(self.request.user)
+
     def perform_create(self, serializer):
         serializer.save(owner=self.request.user)
 
+    @action(detail=False, methods=['get'])
+    def forecast(self, request):
+        """
+        GET /groups/forecast/?group=1,2
+        Group အလိုက် နောက်လ ဝင်ငွေ / ထွက်ငွေ ခန့်မှန်းချက် (အသေးစိတ် — sheets/forecasting.py)
+        """
+        groups = Group.objects.for_user(request.user).order_by('id')
+        if request.query_params.get('group'):
+            try:
+                ids = [int(part) for part in request.query_params['group'].split(',') if part.strip()]
+            except ValueError:
+                return Response({'detail': 'group သည် id (ကိန်းဂဏန်း) များ ဖြစ်ရမည်။'}, status=status.HTTP_400_BAD_REQUEST)
+            groups = groups.filter(pk__in=ids)
+        names = dict(groups.values_list('id', 'name'))
+        results, computed = forecasting.forecast(names)
+        return Response({
+            'computed': computed,
+            'results': [{'group': group_id, 'group_name': name, **results[group_id]} for group_id, name in names.items()],
+        })
+
 # PaymentAccount ViewSet (Owner CRUD, Auditor List/Retrieve)
-class PaymentAccountViewSet(viewsets.ModelViewSet):
+class PaymentAccountViewSet(ShardScopedViewMixin, ReplicaReadViewMixin, SparseFieldsetsViewMixin, viewsets.ModelViewSet):
     queryset = PaymentAccount.objects.all().order_by('id')
     serializer_class = PaymentAccountSerializer
     http_method_names = ['get', 'post', 'put', 'patch', 'delete', 'head', 'options']
@@ -177,11 +238,52 @@ class PaymentAccountViewSet(viewsets.ModelViewSet):
             self.permission_classes = [permissions.IsAuthenticatedOrReadOnly]
         else:
             self.permission_classes = [permissions.IsAuthenticated]
+
+        # owner-only custom actions
+        if self.action == 'statement':
+            self.permission_classes = [IsOwnerUser]
         return [permission() for permission in self.permission_classes]
+
+    def get_queryset(self):
+        return super().get_queryset().for_user(self.request.user)
     
     def perform_create(self, serializer):
         serializer.save(owner=self.request.user)
 
+    # -------- Statement with running balance (owner; sheets/statements.py) --------
+    @action(detail=True, methods=['get'])
+    def statement(self, request, pk=None):
+        """
+        GET /payment-accounts/{id}/statement/?start=YYYY-MM-DD&page_size=50
+        နောက် page — response ထဲရှိ next (?cursor=...) ကို ခေါ်ပါ (cursor သည် ဤ account အတွက်သာ)
+        page_end_balance — ဤ page ၏ နောက်ဆုံး row ပြီးနောက် balance
+        """
+        account = self.get_object()
+        try:
+            size = max(1, min(int(request.query_params.get('page_size', 50)), 500))
+        except ValueError:
+            return Response({'detail': 'page_size သည် ကိန်းဂဏန်း ဖြစ်ရမည်။'}, status=status.HTTP_400_BAD_REQUEST)
+
+        cursor = start = None
+        if request.query_params.get('cursor'):
+            cursor = statements.decode_cursor(request.query_params['cursor'], account)
+            if cursor is None:
+                return Response({'detail': 'cursor မမှန်ကန်ပါ။'}, status=status.HTTP_400_BAD_REQUEST)
+        elif request.query_params.get('start'):
+            start = parse_date(request.query_params['start'])
+            if start is None:
+                return Response({'detail': 'start သည် YYYY-MM-DD ဖြစ်ရမည်။'}, status=status.HTTP_400_BAD_REQUEST)
+
+        data = statements.page(account, start=start, cursor=cursor, size=size)
+        next_cursor = data.pop('next_cursor')
+        data['next'] = None
+        if next_cursor:
+            query = request.query_params.copy()
+            query.pop('start', None)
+            query['cursor'] = next_cursor
+            data['next'] = request.build_absolute_uri(f'{request.path}?{query.urlencode()}')
+        return Response({'payment_account': account.pk, **data})
+
 # Transaction ViewSet (Owner: List, Edit, Delete / Auditor: Create, List, Edit (rejected only))
 
 class TransactionFilter(django_filters.FilterSet):
@@ -199,20 +301,54 @@ class TransactionFilter(django_filters.FilterSet):
         ]
 
 
+class ArchivedTransactionFilter(TransactionFilter):
+    # /transactions/archived/ — TransactionFilter နှင့် parameter တူ
+    class Meta(TransactionFilter.Meta):
+        model = ArchivedTransaction
 
 
-class TransactionViewSet(viewsets.ModelViewSet):
+class FullTextSearchFilter(SearchFilter):
+    """
+    ?search= ကို LIKE '%...%' scan အစား full-text index (sheets.search) ဖြင့် ရှာ
+    view.search_kind = index ထဲမှ kind ('transaction', 'audit_entry', ...)
+    view.search_digit_fields = ဂဏန်းသက်သက် query ဆိုလျှင် contains ဖြင့်လည်း ရှာမည့် field များ
+    (index သည် prefix သာ ရှာနိုင်သောကြောင့် transfer ID ၏ အလယ်မှ ဂဏန်းများ — "345" -> "123456")
+    FTS မရှိသော database နှင့် index မှ ဖယ်ထားသော archive (ArchivedTransaction) ဆိုလျှင်
+    SearchFilter (search_fields) သို့ ပြန်လှည့်သည်။
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        query = request.query_params.get(self.search_param, '').strip()
+        if not query:
+            return queryset
+        if queryset.model is ArchivedTransaction or not search.is_supported(queryset.db):
+            return super().filter_queryset(request, queryset, view)
+        sql, params, match = search.matching_ids(query, view.search_kind, using=queryset.db)
+        conditions = [Q(pk__in=RawSQL(sql, params))] if match else []
+        if query.isdigit():
+            conditions += [Q(**{f'{field}__contains': query}) for field in getattr(view, 'search_digit_fields', ())]
+        if not conditions:
+            # သင်္ကေတသက်သက် query — ဘာမှ မကိုက်
+            return queryset.none()
+        return queryset.filter(reduce(operator.or_, conditions))
+
+
+class TransactionViewSet(ShardScopedViewMixin, ReplicaReadViewMixin, SparseFieldsetsViewMixin, viewsets.ModelViewSet):
     queryset = Transaction.objects.all().order_by('-submitted_at')
     serializer_class = TransactionSerializer
     parser_classes = [MultiPartParser, FormParser, JSONParser]
     http_method_names = ['get', 'post', 'put', 'patch', 'delete', 'head', 'options']
 
     # ---- Filters for frontend duplicate & convenience ----
-    filter_backends = [DjangoFilterBackend, OrderingFilter, SearchFilter]
+    filter_backends = [DjangoFilterBackend, OrderingFilter, FullTextSearchFilter]
     filterset_fields = ['transfer_id_last_6_digits', 'status', 'transaction_type',
                         'submitted_by', 'payment_account', 'group', 'transaction_date']
-    ordering_fields = ['submitted_at', 'transaction_date', 'amount']
+    ordering_fields = ['submitted_at', 'transaction_date', 'amount', 'risk_score']
     search_fields = ['transfer_id_last_6_digits', 'owner_notes']
+    # list / ?search= — archive ထဲ ရောက်လျှင် archive ကိုပါ ပေါင်း (list() ကိုကြည့်ပါ)၊ archive ကို index မှ
+    # ဖယ်ထားသောကြောင့် archive ဘက်တွင် search_fields (LIKE) ဖြင့် ရှာ
+    search_kind = 'transaction'
+    search_digit_fields = ['transfer_id_last_6_digits']
     filterset_class = TransactionFilter
 
     def get_permissions(self):
@@ -224,7 +360,7 @@ class TransactionViewSet(viewsets.ModelViewSet):
                 self.permission_classes = [IsOwnerUser]
             elif user.user_type == 'auditor': # type: ignore
                 # auditor can: create/list/retrieve/update(re-submit rejected), but not destroy
-                if self.action in ['create', 'list', 'retrieve', 'update', 'partial_update', 're_submit']:
+                if self.action in ['create', 'list', 'retrieve', 'archived', 'update', 'partial_update', 're_submit', 'batch']:
                     self.permission_classes = [IsAuditorUser]
                 elif self.action in ['destroy']:
                     self.permission_classes = [DenyAll]
@@ -234,14 +370,16 @@ class TransactionViewSet(viewsets.ModelViewSet):
                 self.permission_classes = [DenyAll]
 
             # owner-only custom actions
-            if self.action in ['approve', 'reject', 'summary', 'pending', 'rejected']:
+            if self.action in ['approve', 'reject', 'summary', 'pending', 'rejected', 'duplicates']:
                 self.permission_classes = [IsOwnerUser]
 
         return [pc() for pc in self.permission_classes]
 
     def get_queryset(self):
-        qs = super().get_queryset()
         user = self.request.user
+        # owner (tenant) ၏ data သာ — (owner, submitted_at) index range
+        # join / column များကို SparseFieldsetsViewMixin က serializer field (?fields=) အလိုက် ရွေး
+        qs = super().get_queryset().for_user(user)
         if not user.is_authenticated:
             return Transaction.objects.none()
         if user.is_superuser or user.user_type == 'owner':
@@ -250,9 +388,111 @@ class TransactionViewSet(viewsets.ModelViewSet):
             return qs.filter(submitted_by=user)
         return Transaction.objects.none()
 
+    def get_archived_queryset(self, start=None):
+        # get_queryset() နှင့် scope တူ — start မှ စသော range က archive လုပ်ပြီးသောလ ထဲ မရောက်လျှင် query မလုပ်
+        user = self.request.user
+        sources = archive.querysets_for_user(user, start=start)
+        if len(sources) < 2 or not (user.is_superuser or user.user_type in ('owner', 'auditor')):
+            return ArchivedTransaction.objects.none()
+        qs = sources[1].select_related('group', 'payment_account', 'submitted_by')
+        if not user.is_superuser and user.user_type == 'auditor':
+            qs = qs.filter(submitted_by=user)
+        return qs
+
+    def list(self, request, *args, **kwargs):
+        """
+        ရက်စွဲ lower bound (transaction_date_after) မပါ / archive လုပ်ပြီးသောလ ထဲ ရောက်လျှင် hot + archive ကို
+        (ordering, id) keyset ဖြင့် merge (sheets/archive.py)။ နောက် page — next (?cursor=...) ကို ခေါ်ပါ
+        """
+        ordering = OrderingFilter().get_ordering(request, self.get_queryset(), self)
+        key = archive.list_ordering(ordering)
+        hot = self.filter_queryset(self.get_queryset())
+        start = parse_date(request.query_params.get('transaction_date_after') or '')
+        archived = self.get_archived_queryset(start) if key is not None else ArchivedTransaction.objects.none()
+        if isinstance(archived, EmptyQuerySet):
+            return super().list(request, *args, **kwargs)
+        archived = FullTextSearchFilter().filter_queryset(
+            request, ArchivedTransactionFilter(request.query_params, queryset=archived, request=request).qs, self,
+        )
+
+        field, descending = key
+        size = self.paginator.get_page_size(request)
+        cursor, offset = None, 0
+        if request.query_params.get('cursor'):
+            cursor = archive.decode_cursor(request.query_params['cursor'], field, descending)
+            if cursor is None:
+                return Response({'detail': 'cursor မမှန်ကန်ပါ။'}, status=status.HTTP_400_BAD_REQUEST)
+        else:
+            try:
+                offset = (max(int(request.query_params.get('page', 1)), 1) - 1) * size
+            except ValueError:
+                raise NotFound('Invalid page.')
+        objects, more = archive.merged_page([hot, archived], field, descending, size, cursor=cursor, offset=offset)
+
+        context = self.get_serializer_context()
+        hot_rows = [obj for obj in objects if not isinstance(obj, ArchivedTransaction)]
+        cold_rows = [obj for obj in objects if isinstance(obj, ArchivedTransaction)]
+        data = dict(zip((obj.pk for obj in hot_rows), self.get_serializer(hot_rows, many=True).data))
+        data.update(zip((obj.pk for obj in cold_rows),
+                        ArchivedTransactionSerializer(cold_rows, many=True, context=context).data))
+        next_url = None
+        if more and objects:
+            query = request.query_params.copy()
+            query.pop('page', None)
+            query['cursor'] = archive.encode_cursor(objects[-1], field, descending)
+            next_url = request.build_absolute_uri(f'{request.path}?{query.urlencode()}')
+        return Response({
+            'count': hot.count() + archived.count(),
+            'next': next_url,
+            'previous': None,
+            'results': [data[obj.pk] for obj in objects],
+        })
+
+    def retrieve(self, request, *args, **kwargs):
+        # hot မှာ မရှိလျှင် archive (id မူလအတိုင်း) — ဖတ်ရန်သာ
+        try:
+            return super().retrieve(request, *args, **kwargs)
+        except Http404:
+            instance = generics.get_object_or_404(self.get_archived_queryset(), pk=kwargs[self.lookup_field])
+            return Response(ArchivedTransactionSerializer(instance, context=self.get_serializer_context()).data)
+
+    @action(detail=False, methods=['get'])
+    def archived(self, request):
+        """
+        GET /transactions/archived/?transaction_date_after=YYYY-MM-DD&group=1
+        Archive (sheets/archive.py) ထဲရှိ transaction များ — filter parameter များ list နှင့် တူ၊ ?search= မပါ
+        """
+        filterset = ArchivedTransactionFilter(request.query_params, queryset=self.get_archived_queryset(), request=request)
+        if not filterset.is_valid():
+            return Response(filterset.errors, status=status.HTTP_400_BAD_REQUEST)
+        qs = filterset.qs.order_by('-transaction_date', '-id')
+        context = self.get_serializer_context()
+        page = self.paginate_queryset(qs)
+        if page is not None:
+            return self.get_paginated_response(ArchivedTransactionSerializer(page, many=True, context=context).data)
+        return Response(ArchivedTransactionSerializer(qs, many=True, context=context).data)
+
     def perform_create(self, serializer):
         # submitted_by ကို serializer.create() ထဲမှာလည်း handle လုပ်ထားလို့ပါ—but double set OK
-        serializer.save(submitted_by=self.request.user)
+        tx = serializer.save(submitted_by=self.request.user)
+        self._wait_for_fingerprint(tx)
+
+    def _wait_for_fingerprint(self, tx):
+        """
+        ပုံ hash ကို background pool ထဲမှာ တွက်နေသည် — default မစောင့်ဘဲ ချက်ချင်း ပြန်ပေးပြီး ပုံတူများကို
+        /transactions/duplicates/ နှင့် SSE 'duplicate' event ဖြင့် ပြသည်။ ?wait_for_duplicates=1 ပေးမှသာ
+        RECEIPT_DUPLICATE_WAIT_SECONDS အထိ စောင့်ပြီး အချိန်မီလျှင် submit response ထဲ possible_duplicates ထည့်
+        """
+        future = getattr(tx, '_fingerprint_future', None)
+        if future is None or self.request.query_params.get('wait_for_duplicates') not in ('1', 'true', 'yes'):
+            return
+        try:
+            future.result(timeout=getattr(settings, 'RECEIPT_DUPLICATE_WAIT_SECONDS', 0.5))
+        except FutureTimeoutError:
+            return
+        except Exception:
+            return  # fingerprints module က log ထုတ်ပြီးသား
+        tx.receipt_fingerprint = ReceiptFingerprint.objects.filter(transaction_id=tx.pk).first()
 
     def perform_update(self, serializer):
         user = self.request.user
@@ -264,19 +504,28 @@ class TransactionViewSet(viewsets.ModelViewSet):
 
         if user.user_type == 'auditor': # type: ignore
             if instance.submitted_by != user:
-                raise permissions.PermissionDenied("You can only update your own transactions.") # type: ignore
+                raise PermissionDenied("You can only update your own transactions.")
             if instance.status != 'rejected':
-                raise permissions.PermissionDenied("You can only re-submit rejected transactions.") # type: ignore
+                raise PermissionDenied("You can only re-submit rejected transactions.")
             # Re-submit as pending; owner review info clear
-            serializer.save(status='pending', approved_by_owner_at=None, owner_notes=None)
+            tx = serializer.save(status='pending', approved_by_owner_at=None, owner_notes=None)
+            self._wait_for_fingerprint(tx)
             return
 
-        raise permissions.PermissionDenied("You do not have permission to update this transaction.") # type: ignore
+        raise PermissionDenied("You do not have permission to update this transaction.")
 
     # -------- Owner-only listing shortcuts --------
-    @action(detail=True, methods=['get'])
+    @action(detail=False, methods=['get'])
     def pending(self, request):
-        pending_transactions = self.get_queryset().filter(status='pending')
+        # review queue — risk score (sheets/risk.py) မြင့်ရာမှ၊ (owner, status, -risk_score) index
+        # ?ordering=-submitted_at ဖြင့် ယခင်အတိုင်း စီနိုင်
+        pending_transactions = self.get_queryset().filter(status='pending').order_by(
+            F('risk_score').desc(nulls_last=True), '-submitted_at',
+        )
+        pending_transactions = self.filter_queryset(pending_transactions)
+        page = self.paginate_queryset(pending_transactions)
+        if page is not None:
+            return self.get_paginated_response(self.get_serializer(page, many=True).data)
         ser = self.get_serializer(pending_transactions, many=True)
         return Response(ser.data)
 
@@ -286,12 +535,43 @@ class TransactionViewSet(viewsets.ModelViewSet):
         ser = self.get_serializer(rejected_transactions, many=True)
         return Response(ser.data)
 
+    # -------- Duplicate receipt lookup (owner) --------
+    @action(detail=True, methods=['get'])
+    def duplicates(self, request, pk=None):
+        """
+        GET /transactions/{id}/duplicates/?distance=N
+        ပုံ perceptual hash အရ Hamming distance <= N ရှိသော အခြား transaction များ
+        """
+        tx = self.get_object()
+        fp = ReceiptFingerprint.objects.filter(transaction_id=tx.pk).first()
+        if fp is None:
+            return Response({'detail': 'ဤမှတ်တမ်းအတွက် ပုံ fingerprint မရှိသေးပါ။', 'results': []})
+        try:
+            distance = min(int(request.query_params.get('distance', max_distance())), 16)
+        except ValueError:
+            return Response({'detail': 'distance သည် ကိန်းဂဏန်း ဖြစ်ရမည်။'}, status=status.HTTP_400_BAD_REQUEST)
+
+        matches = find_similar(
+            fp.dhash, distance=distance, exclude_transaction_id=tx.pk,
+            queryset=ReceiptFingerprint.objects.filter(transaction__owner_id=tx.owner_id),
+        )
+        distances = {m.transaction_id: d for m, d in matches}
+        others = self.get_queryset().filter(pk__in=distances).select_related('group', 'payment_account', 'submitted_by')
+        results = sorted(
+            ({**self.get_serializer(o).data, 'distance': distances[o.pk]} for o in others),
+            key=lambda row: (row['distance'], row['id']),
+        )
+        return Response({'distance': distance, 'results': results})
+
     # -------- Approve / Reject (owner) --------
     @action(detail=True, methods=['patch', 'post'], permission_classes=[IsOwnerUser])
     def approve(self, request, pk=None):
         tx = self.get_queryset().filter(pk=pk).first()
         if not tx:
             return Response({'detail': 'မှတ်တမ်းကို ရှာမတွေ့ပါ။'}, status=status.HTTP_404_NOT_FOUND)
+        locked = self._period_locked(tx)
+        if locked:
+            return locked
         if tx.status != 'pending':
             return Response({'detail': 'ဤမှတ်တမ်းသည် စောင့်ဆိုင်းဆဲ အခြေအနေတွင် မရှိပါ။'}, status=status.HTTP_400_BAD_REQUEST)
         owner_notes = request.data.get('owner_notes')
@@ -307,6 +587,9 @@ class TransactionViewSet(viewsets.ModelViewSet):
         tx = self.get_queryset().filter(pk=pk).first()
         if not tx:
             return Response({'detail': 'မှတ်တမ်းကို ရှာမတွေ့ပါ။'}, status=status.HTTP_404_NOT_FOUND)
+        locked = self._period_locked(tx)
+        if locked:
+            return locked
         if tx.status != 'pending':
             return Response({'detail': 'ဤမှတ်တမ်းသည် စောင့်ဆိုင်းဆဲ အခြေအနေတွင် မရှိပါ။'}, status=status.HTTP_400_BAD_REQUEST)
         owner_notes = request.data.get('owner_notes')
@@ -321,22 +604,126 @@ class TransactionViewSet(viewsets.ModelViewSet):
     @action(detail=True, methods=['post'])
     def re_submit(self, request, pk=None):
         tx = self.get_object()  # get_queryset() + permissions already applied
-        if request.user.user_type != 'auditor':
-            return Response({"detail": "Only auditor can re-submit."}, status=status.HTTP_403_FORBIDDEN)
-        if tx.submitted_by != request.user:
-            return Response({"detail": "You can only re-submit your own transactions."}, status=status.HTTP_403_FORBIDDEN)
+        denied = self._re_submit_denied(tx, request.user)
+        if denied:
+            return Response({"detail": denied[1]}, status=denied[0])
+        self._mark_resubmitted(tx)
+        return Response(self.get_serializer(tx).data, status=status.HTTP_200_OK)
+
+    def _re_submit_denied(self, tx, user):
+        if user.user_type != 'auditor':
+            return status.HTTP_403_FORBIDDEN, "Only auditor can re-submit."
+        if tx.submitted_by != user:
+            return status.HTTP_403_FORBIDDEN, "You can only re-submit your own transactions."
         if tx.status != 'rejected':
-            return Response({"detail": "Transaction is not in 'rejected' status."}, status=status.HTTP_400_BAD_REQUEST)
+            return status.HTTP_400_BAD_REQUEST, "Transaction is not in 'rejected' status."
+        locked = self._period_locked(tx)
+        if locked:
+            return locked.status_code, locked.data['transaction_date'][0]
+        return None
+
+    def _period_locked(self, tx):
+        # လချုပ်ပိတ်ပြီးသော ရက်စွဲ (sheets/periods.py) — 400 response, မပိတ်ရသေးလျှင် None
+        try:
+            periods.check_open(tx.owner_id, tx.transaction_date)
+        except serializers.ValidationError as exc:
+            return Response(exc.detail, status=status.HTTP_400_BAD_REQUEST)
+        return None
 
+    def perform_destroy(self, instance):
+        periods.check_open(instance.owner_id, instance.transaction_date)
+        instance.delete()
+
+    def _mark_resubmitted(self, tx):
         tx.status = 'pending'
         tx.approved_by_owner_at = None
         tx.owner_notes = None
         tx.save()
-        return Response(self.get_serializer(tx).data, status=status.HTTP_200_OK)
+
+    # -------- Batched, idempotent mutations (offline-first clients; sheets/idempotency.py) --------
+    @action(detail=False, methods=['post'])
+    def batch(self, request):
+        """
+        POST /transactions/batch/ {"operations": [{key, op: create|update|re_submit, id?, data?, files?}, ...]}
+        -> {"results": [{key, op, status, replayed, data}, ...]}
+        """
+        try:
+            operations = idempotency.parse_operations(request)
+        except idempotency.BatchError as exc:
+            return Response(exc.as_dict(), status=exc.status_code)
+
+        hashes = [idempotency.request_hash(request, op) for op in operations]
+        saved = idempotency.saved_keys(request.user, (op['key'] for op in operations))
+        if len(saved) == len(operations):
+            # retry အပြည့် — DB write transaction မဖွင့်ဘဲ သိမ်းထားသော response များ
+            try:
+                results = [self._replay(index, op, digest, saved) for index, (op, digest) in enumerate(zip(operations, hashes))]
+            except idempotency.BatchError as exc:
+                return Response(exc.as_dict(), status=exc.status_code)
+            return Response({'results': results})
+
+        using = router.db_for_write(Transaction)
+        try:
+            with db_transaction.atomic(using=using):
+                results = []
+                for index, (op, digest) in enumerate(zip(operations, hashes)):
+                    if op['key'] in saved:
+                        results.append(self._replay(index, op, digest, saved))
+                        continue
+                    code, data = self._apply_batch_operation(index, op)
+                    row = IdempotencyKey.objects.create(
+                        user=request.user, key=op['key'], operation=op['op'],
+                        request_hash=digest, status_code=code, response=idempotency.stored_response(data),
+                    )
+                    results.append(idempotency.result_for(row, replayed=False))
+        except idempotency.BatchError as exc:
+            return Response(exc.as_dict(), status=exc.status_code)
+        except IntegrityError:
+            # key တူ batch နှစ်ခု ပြိုင်တူရောက် — တစ်ခုသာ commit ဖြစ်၊ ကျန်တစ်ခုက retry လုပ်လျှင် replay ရမည်
+            return Response(
+                {'detail': 'ဤ key များဖြင့် batch တစ်ခု လုပ်ဆောင်နေဆဲ ဖြစ်သည်။ ခဏနေ၍ ပြန်ပို့ပါ။'},
+                status=status.HTTP_409_CONFLICT,
+            )
+        return Response({'results': results})
+
+    def _replay(self, index, op, digest, saved):
+        row = saved[op['key']]
+        if row.request_hash != digest:
+            raise idempotency.BatchError(
+                'ဤ key ကို အခြား request အတွက် သုံးပြီး ဖြစ်ပါသည်။', status.HTTP_409_CONFLICT, index, op['key'],
+            )
+        return idempotency.result_for(row, replayed=True)
+
+    def _apply_batch_operation(self, index, op):
+        try:
+            data = idempotency.operation_data(self.request, index, op)
+            if op['op'] == 'create':
+                ser = self.get_serializer(data=data)
+                ser.is_valid(raise_exception=True)
+                self.perform_create(ser)
+                return status.HTTP_201_CREATED, ser.data
+
+            tx = self.get_queryset().filter(pk=op['id']).first()
+            if tx is None:
+                raise NotFound('မှတ်တမ်းကို ရှာမတွေ့ပါ။')
+            self.check_object_permissions(self.request, tx)
+            if op['op'] == 'update':
+                ser = self.get_serializer(tx, data=data, partial=True)
+                ser.is_valid(raise_exception=True)
+                self.perform_update(ser)
+                return status.HTTP_200_OK, ser.data
+
+            denied = self._re_submit_denied(tx, self.request.user)
+            if denied:
+                raise idempotency.BatchError(denied[1], denied[0], index, op['key'])
+            self._mark_resubmitted(tx)
+            return status.HTTP_200_OK, self.get_serializer(tx).data
+        except APIException as exc:
+            raise idempotency.BatchError(exc.detail, exc.status_code, index, op['key'])
 
     # -------- Summary (owner) --------
     @action(
-        detail=True,
+        detail=False,
         methods=['get'],
         url_path='summary',
         permission_classes=[IsOwnerOrAuditor],          # Owner/Auditor နှစ်ဦးစလုံးရှုနိုင်
@@ -346,19 +733,10 @@ class TransactionViewSet(viewsets.ModelViewSet):
         period = (request.query_params.get('period') or 'daily').lower()
         start = request.query_params.get('start')
         end = request.query_params.get('end')
+        start_d = parse_date(start) if start else None
+        end_d = parse_date(end) if end else None
 
-        # သင့် model ရဲ့ ရက်စွဲ field အမည်ကို အတိအကျ ထည့်ပါ
-        date_field = 'entry_date'  # <-- အကယ်၍ 'created_at' ဆိုရင် ဒီလိုပြောင်း
-
-        qs = self.get_queryset()
-        if start:
-            d = parse_date(start)
-            if d:
-                qs = qs.filter(**{f'{date_field}__gte': d})
-        if end:
-            d = parse_date(end)
-            if d:
-                qs = qs.filter(**{f'{date_field}__lte': d})
+        date_field = 'transaction_date'
 
         # Grouping period
         if period == 'weekly':
@@ -370,44 +748,167 @@ class TransactionViewSet(viewsets.ModelViewSet):
         else:
             trunc = TruncDay(date_field)
 
-        data = (qs
-            .annotate(bucket=trunc)
-            .values('bucket')
-            .annotate(
-                total_amount=Coalesce(Sum('amount'), Decimal('0.00')),
-                total_count=Coalesce(Sum(Case(When(id__isnull=False, then=1),
-                default=0, output_field=DecimalField())), Decimal('0.00')),
-                total_receive=Coalesce(Sum(Case(
-                    When(entry_type='receive', then=F('amount')),
-                    default=Decimal('0.00'), output_field=DecimalField()
-                )), Decimal('0.00')),
-                total_pay=Coalesce(Sum(Case(
-                    When(entry_type='pay', then=F('amount')),
-                    default=Decimal('0.00'), output_field=DecimalField()
-                )), Decimal('0.00')),
+        # hot + (start က archive လုပ်ပြီးသောလ ထဲ ရောက်လျှင်) archive — bucket တူ row များကို ပေါင်း
+        buckets = {}
+        for qs in archive.querysets_for_user(request.user, start=start_d):
+            if start_d:
+                qs = qs.filter(**{f'{date_field}__gte': start_d})
+            if end_d:
+                qs = qs.filter(**{f'{date_field}__lte': end_d})
+            data = (qs
+                .annotate(bucket=trunc)
+                .values('bucket')
+                .annotate(
+                    total_amount=Coalesce(Sum('amount'), Decimal('0.00')),
+                    total_count=Count('id'),
+                    total_receive=Coalesce(Sum(Case(
+                        When(transaction_type='income', then=F('amount')),
+                        default=Decimal('0.00'), output_field=DecimalField()
+                    )), Decimal('0.00')),
+                    total_pay=Coalesce(Sum(Case(
+                        When(transaction_type='expense', then=F('amount')),
+                        default=Decimal('0.00'), output_field=DecimalField()
+                    )), Decimal('0.00')),
+                )
+                .order_by('bucket')
             )
-            .order_by('bucket')
-        )
+            for row in data:
+                totals = buckets.setdefault(row['bucket'], dict.fromkeys(
+                    ('total_amount', 'total_count', 'total_receive', 'total_pay'), 0,
+                ))
+                for key in totals:
+                    totals[key] += row[key]
 
         # DRF JSON response
         return Response({
             'period': period,
             'results': [
-                {
-                    'period_start': row['bucket'],
-                    'total_amount': row['total_amount'],
-                    'total_count': int(row['total_count']),  # Decimal → int
-                    'total_receive': row['total_receive'],
-                    'total_pay': row['total_pay'],
-                } for row in data
+                {'period_start': bucket, **buckets[bucket]} for bucket in sorted(buckets)
             ]
         })
 
 
-class AuditEntryViewSet(viewsets.ModelViewSet):
+class ReceiptUploadViewSet(viewsets.GenericViewSet):
+    """
+    Resumable chunked receipt upload (အသေးစိတ် — sheets/uploads.py)
+    POST /uploads/ -> PUT /uploads/{id}/chunk/?offset=N -> POST /uploads/{id}/finalize/
+    """
+    queryset = UploadSession.objects.all()
+    serializer_class = UploadSessionSerializer
+    permission_classes = [IsOwnerOrAuditor]
+
+    def get_queryset(self):
+        return super().get_queryset().filter(user=self.request.user)
+
+    def create(self, request):
+        ser = self.get_serializer(data=request.data)
+        ser.is_valid(raise_exception=True)
+        ser.save(user=request.user)
+        return Response(ser.data, status=status.HTTP_201_CREATED)
+
+    def retrieve(self, request, pk=None):
+        return Response(self.get_serializer(self.get_object()).data)
+
+    def destroy(self, request, pk=None):
+        session = self.get_object()
+        if session.status == 'open':
+            uploads.discard(session)
+        session.delete()
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+    def _upload_error(self, exc):
+        return Response({'detail': exc.detail, **exc.extra}, status=exc.status_code)
+
+    @action(detail=True, methods=['put'])
+    def chunk(self, request, pk=None):
+        # request.data ကို မဖတ်ပါ — body ကို parse/buffer မလုပ်ဘဲ stream အတိုင်း disk ပေါ် ရေးသည်
+        session = self.get_object()
+        try:
+            offset = uploads.parse_offset(request)
+            session = uploads.write_chunk(session, request.stream, offset)
+        except uploads.UploadError as exc:
+            return self._upload_error(exc)
+        return Response(self.get_serializer(session).data)
+
+    @action(detail=True, methods=['post'])
+    def finalize(self, request, pk=None):
+        session = self.get_object()
+        try:
+            uploads.finalize(session)
+        except uploads.UploadError as exc:
+            return self._upload_error(exc)
+        return Response(self.get_serializer(session).data)
+
+
+class JobViewSet(viewsets.GenericViewSet):
+    """
+    Background job တန်းစီ/စောင့်ကြည့်ရန်
+    POST /jobs/ {kind, payload} -> 202, GET /jobs/{id}/ ဖြင့် status/progress/result ကို poll
+    export_transactions ၏ ဖိုင် — GET /jobs/{id}/download/ (result.url)
+    """
+    queryset = Job.objects.all()
+    serializer_class = JobSerializer
+    permission_classes = [IsOwnerOrAuditor]
+
+    def get_queryset(self):
+        qs = super().get_queryset().select_related('created_by')
+        if self.request.user.is_superuser:
+            return qs
+        return qs.filter(created_by=self.request.user)
+
+    def list(self, request):
+        qs = self.filter_queryset(self.get_queryset())
+        kind = request.query_params.get('kind')
+        if kind:
+            qs = qs.filter(kind=kind)
+        page = self.paginate_queryset(qs)
+        return self.get_paginated_response(self.get_serializer(page, many=True).data)
+
+    def retrieve(self, request, pk=None):
+        return Response(self.get_serializer(self.get_object()).data)
+
+    def create(self, request):
+        ser = self.get_serializer(data=request.data)
+        ser.is_valid(raise_exception=True)
+        job_obj = enqueue(ser.validated_data['kind'], ser.validated_data.get('payload'), user=request.user)
+        return Response(self.get_serializer(job_obj).data, status=status.HTTP_202_ACCEPTED)
+
+    def perform_content_negotiation(self, request, force=False):
+        # download — Accept: text/csv ဖြင့် ခေါ်လျှင်လည်း 406 မဖြစ်စေရန် (error များကိုသာ JSON ဖြင့် render)
+        return super().perform_content_negotiation(request, force=force or self.action == 'download')
+
+    @action(detail=True, methods=['get'])
+    def download(self, request, pk=None):
+        """GET /jobs/{id}/download/ — အောင်မြင်ပြီးသော export job ၏ CSV (job တင်သူ / superuser သာ)"""
+        job_obj = self.get_object()
+        name = (job_obj.result or {}).get('file') if job_obj.status == 'succeeded' else None
+        if job_obj.kind != 'export_transactions' or not name:
+            raise NotFound('ဤ job တွင် download လုပ်ရန် ဖိုင် မရှိပါ။')
+        try:
+            fh = export_storage().open(name)
+        except (FileNotFoundError, SuspiciousFileOperation):
+            raise NotFound('ဖိုင်ကို ရှာမတွေ့ပါ။')
+        response = FileResponse(fh, as_attachment=True, filename=os.path.basename(name), content_type='text/csv')
+        response['Cache-Control'] = 'private, no-store'
+        return response
+
+    @action(detail=True, methods=['post'])
+    def cancel(self, request, pk=None):
+        job_obj = self.get_object()
+        if not Job.objects.filter(pk=job_obj.pk, status='queued').update(status='cancelled', finished_at=timezone.now()):
+            return Response({'detail': 'တန်းစီဆဲ job ကိုသာ ပယ်ဖျက်နိုင်ပါသည်။'}, status=status.HTTP_400_BAD_REQUEST)
+        job_obj.refresh_from_db()
+        return Response(self.get_serializer(job_obj).data)
+
+
+class AuditEntryViewSet(ShardScopedViewMixin, ReplicaReadViewMixin, SparseFieldsetsViewMixin, viewsets.ModelViewSet):
     queryset = AuditEntry.objects.all().order_by('-created_at')
     serializer_class = AuditEntrySerializer
     http_method_names = ['get', 'post', 'put', 'patch', 'delete', 'head', 'options']
+    # ?search= (remarks) — full-text index
+    filter_backends = [FullTextSearchFilter]
+    search_fields = ['remarks']
+    search_kind = 'audit_entry'
 
     def get_permissions(self):
         user = self.request.user
@@ -420,7 +921,7 @@ class AuditEntryViewSet(viewsets.ModelViewSet):
         elif user.user_type == 'auditor': # type: ignore
             if self.action == 'create':
                 self.permission_classes = [IsAuditorUser]
-            elif self.action in ['list', 'retrieve', 'update', 'partial_update']:
+            elif self.action in ['list', 'retrieve', 'update', 'partial_update', 'summary']:
                 self.permission_classes = [IsAuditorUser]
             elif self.action == 'destroy':
                 self.permission_classes = [DenyAll]
@@ -429,11 +930,15 @@ class AuditEntryViewSet(viewsets.ModelViewSet):
         else:
             self.permission_classes = [DenyAll]
 
+        # owner-only
+        if self.action == 'reconciliation':
+            self.permission_classes = [IsOwnerUser]
+
         return [permission() for permission in self.permission_classes]
 
     def get_queryset(self):
-        queryset = super().get_queryset()
         user = self.request.user
+        queryset = super().get_queryset().for_user(user)
         if user.is_superuser or user.user_type == 'owner':
             return queryset
         elif user.user_type == 'auditor':
@@ -443,6 +948,62 @@ class AuditEntryViewSet(viewsets.ModelViewSet):
     def perform_create(self, serializer):
         serializer.save(auditor=self.request.user)
 
+    @action(detail=False, methods=['get'])
+    def reconciliation(self, request):
+        """
+        GET /audit-entries/reconciliation/?start=YYYY-MM-DD&end=YYYY-MM-DD&threshold=1000&all=1
+        Group တစ်ခုချင်း၏ နောက်ဆုံး AuditEntry ရရန်/ပေးရန် နှင့် approved ledger စုစုပေါင်း ကွာခြားချက် (sheets/reconciliation.py)
+        """
+        try:
+            params = reconciliation.parse_params(request.query_params)
+        except reconciliation.ReconciliationError as exc:
+            return Response({'detail': exc.detail}, status=status.HTTP_400_BAD_REQUEST)
+        owner_id = None if request.user.is_superuser else request.user.tenant_id
+        return Response(reconciliation.reconcile(owner_id=owner_id, **params))
+
+    @action(detail=False, methods=['get'])
+    def summary(self, request):
+        """
+        GET /audit-entries/summary/?period=day|week|month|year&start=YYYY-MM-DD&end=YYYY-MM-DD&group=1,2
+        ရရန်/ပေးရန်/net ကို group + ကာလ အလိုက် DB ထဲတွင် ပေါင်း (sheets/audit_summaries.py)
+        Auditor — မိမိ entry များသာ
+        """
+        try:
+            params = audit_summaries.parse_params(request.query_params)
+        except audit_summaries.SummaryError as exc:
+            return Response({'detail': exc.detail}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(audit_summaries.summarize(self.get_queryset(), **params))
+
+
+class ClosedPeriodViewSet(ShardScopedViewMixin, ReplicaReadViewMixin, viewsets.ReadOnlyModelViewSet):
+    """
+    လချုပ် — GET /periods/ (snapshot များနှင့်), POST /periods/ {"month": "YYYY-MM"} (owner)
+    ပိတ်ပြီးသောလကို ပြန်ဖွင့်၍ မရ (snapshot များသည် immutable)
+    """
+    queryset = ClosedPeriod.objects.all()
+    serializer_class = ClosedPeriodSerializer
+
+    def get_permissions(self):
+        if self.action == 'create':
+            self.permission_classes = [IsOwnerUser]
+        else:
+            self.permission_classes = [IsOwnerOrAuditor]
+        return [permission() for permission in self.permission_classes]
+
+    def get_queryset(self):
+        return (super().get_queryset().for_user(self.request.user)
+                .select_related('closed_by')
+                .prefetch_related('snapshots__group', 'snapshots__payment_account'))
+
+    def create(self, request):
+        ser = ClosePeriodSerializer(data=request.data)
+        ser.is_valid(raise_exception=True)
+        try:
+            closed = periods.close_period(request.user, ser.validated_data['month'], user=request.user)
+        except periods.CloseError as exc:
+            return Response({'detail': exc.detail}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(self.get_serializer(self.get_queryset().get(pk=closed.pk)).data, status=status.HTTP_201_CREATED)
+
 
 class PasswordChangeView(APIView):
     permission_classes = [IsAuthenticated]
@@ -473,7 +1034,7 @@ class PasswordChangeView(APIView):
         target_user.save()
         return Response({'detail': 'Password updated successfully.'})
 
-class AuditSummaryView(APIView):
+class AuditSummaryView(ShardScopedViewMixin, ReplicaReadViewMixin, APIView):
     permission_classes = [IsOwnerOrAuditor]  # type: ignore # ← Auditor & Owner လိုသလိုခေါ်နိုင်
 
     def get(self, request, *args, **kwargs):
@@ -484,25 +1045,38 @@ class AuditSummaryView(APIView):
             start_d = parse_date(start) if start else None
             end_d = parse_date(end) if end else None
 
-            qs = Transaction.objects.all()
-            if start_d:
-                qs = qs.filter(transaction_date__gte=start_d)
-            if end_d:
-                qs = qs.filter(transaction_date__lte=end_d)
-
-            def agg(q):
-                return q.aggregate(total=Coalesce(Sum('amount'), Decimal('0.00')))['total']
+            tenant_id = getattr(request.user, 'tenant_id', None)
+            if start_d is None and tenant_id is not None and not request.user.is_superuser:
+                # နောက်ဆုံး လချုပ် snapshot + ဖွင့်ထားသော period delta (sheets/periods.py)
+                sums = periods.totals(tenant_id, end=end_d)
+                audited_income, audited_expense = sums[('approved', 'income')], sums[('approved', 'expense')]
+                unapproved_income, unapproved_expense = sums[('pending', 'income')], sums[('pending', 'expense')]
+                total_income_transactions = audited_income + unapproved_income + sums[('rejected', 'income')]
+                total_expense_transactions = audited_expense + unapproved_expense + sums[('rejected', 'expense')]
+            else:
+                # hot + (start က archive လုပ်ပြီးသောလ ထဲ ရောက်လျှင်) archive
+                sources = archive.querysets_for_user(request.user, start=start_d)
+                if start_d:
+                    sources = [qs.filter(transaction_date__gte=start_d) for qs in sources]
+                if end_d:
+                    sources = [qs.filter(transaction_date__lte=end_d) for qs in sources]
+
+                def agg(**filters):
+                    return sum(
+                        (qs.filter(**filters).aggregate(total=Coalesce(Sum('amount'), Decimal('0.00')))['total']
+                         for qs in sources),
+                        Decimal('0.00'),
+                    )
+
+                total_income_transactions = agg(transaction_type='income')
+                total_expense_transactions = agg(transaction_type='expense')
+                audited_income = agg(transaction_type='income', status='approved')
+                audited_expense = agg(transaction_type='expense', status='approved')
+                unapproved_income = agg(transaction_type='income', status='pending')
+                unapproved_expense = agg(transaction_type='expense', status='pending')
 
-            total_income_transactions = agg(qs.filter(transaction_type='income'))
-            total_expense_transactions = agg(qs.filter(transaction_type='expense'))
             total_balance = total_income_transactions - total_expense_transactions
-
-            audited_income = agg(qs.filter(transaction_type='income', status='approved'))
-            audited_expense = agg(qs.filter(transaction_type='expense', status='approved'))
             audited_balance = audited_income - audited_expense
-
-            unapproved_income = agg(qs.filter(transaction_type='income', status='pending'))
-            unapproved_expense = agg(qs.filter(transaction_type='expense', status='pending'))
             unapproved_balance = unapproved_income - unapproved_expense
 
             payload = {
@@ -519,8 +1093,8 @@ class AuditSummaryView(APIView):
             }
             return Response(AuditSummarySerializer(payload).data, status=status.HTTP_200_OK)
 
-        except Exception as e:
-            print(f"Error calculating audit summary: {e}")
+        except Exception:
+            logger.exception("Error calculating audit summary")
             return Response(
                 {"detail": "Failed to calculate audit summary."},
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
@@ -577,4 +1151,209 @@ class SetUserPasswordView(APIView):
         return Response(
             {'detail': 'စကားဝှက် အသစ် သတ်မှတ်ပြီးပါပြီ (အသုံးပြုသူမှ ပြန်လော့ဂ်အင် လုပ်ပါ)'},
             status=status.HTTP_200_OK
-        )
\ No newline at end of file
+        )
+
+
+class SearchPagination(PageNumberPagination):
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+
+
+class SearchView(ShardScopedViewMixin, ReplicaReadViewMixin, APIView):
+    """
+    GET /api/sheets/search/?q=ငွေလွှဲ&kind=transaction,audit_entry&page=1
+    Transaction (transfer ID, owner notes), audit remarks, group / payment account အမည်များကို
+    rank အလိုက် ရှာ (နောက်ဆုံးစကားလုံးကို prefix အဖြစ် ရှာ)။ Auditor သည် ကိုယ့်မှတ်တမ်းများကိုသာ မြင်ရ။
+    Archive လုပ်ပြီးသော transaction များကို index မှ ဖယ်ထားသောကြောင့် မပါ (GET /transactions/archived/ ကို သုံးပါ)။
+    """
+    permission_classes = [IsOwnerOrAuditor]
+    pagination_class = SearchPagination
+
+    def get(self, request):
+        query = request.query_params.get('q', '').strip()
+        if not query:
+            return Response({'detail': 'ရှာဖွေရန် စကားလုံး (q) ထည့်ပါ။'}, status=status.HTTP_400_BAD_REQUEST)
+        using = router.db_for_read(Transaction)
+        if not search.is_supported(using):
+            return Response({'detail': 'ဤ database တွင် full-text search မရနိုင်ပါ။'}, status=status.HTTP_501_NOT_IMPLEMENTED)
+        kinds = [k for k in request.query_params.get('kind', '').split(',') if k]
+        unknown = set(kinds) - set(search.KIND_CODES)
+        if unknown:
+            return Response(
+                {'detail': f"မသိသော kind: {', '.join(sorted(unknown))}", 'kinds': list(search.KIND_CODES)},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        results = search.SearchResults(query, kinds=kinds, user=request.user, using=using)
+        paginator = self.pagination_class()
+        page = paginator.paginate_queryset(results, request, view=self)
+        return paginator.get_paginated_response(page)
+
+
+class PivotReportView(ShardScopedViewMixin, ReplicaReadViewMixin, APIView):
+    """
+    GET /api/sheets/reports/pivot/?rows=group&columns=month&measure=net&start=2025-01-01
+    Group × ကာလ စသည့် crosstab (subtotal / grand total ပါ) — ?format=csv ဖြင့် CSV (အသေးစိတ် — sheets/pivots.py)
+    """
+    permission_classes = [IsOwnerUser]
+    renderer_classes = [*api_settings.DEFAULT_RENDERER_CLASSES, pivots.CSVRenderer]
+
+    def get(self, request):
+        try:
+            spec = pivots.parse(request.query_params)
+            sources = archive.querysets_for_user(request.user, start=spec['filters'].get('transaction_date__gte'))
+            report = pivots.build(sources, spec)
+        except pivots.PivotError as exc:
+            return Response({'detail': exc.detail}, status=status.HTTP_400_BAD_REQUEST)
+        if request.accepted_renderer.format != 'csv':
+            return Response(report)
+        # report ကို memory ထဲ တွက်ပြီးမှ stream (shard context ပိတ်ပြီးနောက် query မလုပ်)
+        response = StreamingHttpResponse(pivots.csv_rows(report), content_type='text/csv; charset=utf-8')
+        response['Content-Disposition'] = f'attachment; filename="pivot-{spec["rows"]}-{spec["columns"] or "total"}.csv"'
+        return response
+
+
+class BatchReadView(APIView):
+    """
+    POST /api/sheets/batch/ {"requests": {key: "/api/sheets/..."}, "parallel": false}
+    Dashboard ဖွင့်ချိန် GET များကို round trip တစ်ခုတည်းဖြင့် (အသေးစိတ် — sheets/multiplex.py)
+    """
+    permission_classes = [IsOwnerOrAuditor]
+
+    def post(self, request):
+        ser = multiplex.BatchReadSerializer(data=request.data)
+        ser.is_valid(raise_exception=True)
+        responses = multiplex.run(request, ser.validated_data['requests'], ser.validated_data['parallel'])
+        return Response({'responses': responses})
+
+
+class CompressionStatsView(APIView):
+    """
+    GET /api/sheets/stats/compression/
+    Endpoint အလိုက် response compression ဖြင့် ချွေတာခဲ့သော bytes (ဤ process အတွက်သာ)
+    ?reset=1 ဖြင့် counter များကို ပြန်စနိုင်သည်။ admin (is_staff) သာ။
+    """
+    permission_classes = [permissions.IsAdminUser]
+
+    def get(self, request):
+        data = compression_stats.snapshot()
+        if request.query_params.get('reset') in ('1', 'true', 'yes'):
+            compression_stats.reset()
+        return Response({
+            'endpoints': data,
+            'total_saved_bytes': sum(row['saved_bytes'] for row in data.values()),
+        })
+
+
+# -------- Real-time transaction events (Server-Sent Events) --------
+
+EVENT_HEARTBEAT_SECONDS = 15
+
+
+class EventTicketView(APIView):
+    """
+    POST /api/sheets/events/ticket/ — /api/sheets/events/?ticket=... အတွက် သက်တမ်းတို signed ticket
+    EventSource သည် Authorization header မထည့်နိုင်၍ token ကို URL (access log / browser history) တွင် မထည့်စေရန်။
+    Ticket သက်တမ်း (SHEETS_EVENT_TICKET_SECONDS) ကုန်လျှင် reconnect မလုပ်မီ အသစ်ယူပါ။
+    """
+    permission_classes = [IsOwnerOrAuditor]
+
+    def post(self, request):
+        return Response({'ticket': make_ticket(request.user), 'expires_in': ticket_max_age()})
+
+
+async def _event_stream_user(request):
+    auth = request.headers.get('Authorization', '')
+    if auth.startswith('Token '):
+        token = await Token.objects.select_related('user').filter(key=auth[len('Token '):].strip()).afirst()
+        return token.user if token is not None and token.user.is_active else None
+    if 'ticket' in request.GET:
+        user_id = read_ticket(request.GET['ticket'])
+        if user_id is None:
+            return None
+        return await User.objects.filter(pk=user_id, is_active=True).afirst()
+    user = await request.auser()
+    return user if user.is_authenticated else None
+
+
+async def transaction_events(request):
+    """
+    GET /api/sheets/events/  (text/event-stream; Authorization: Token <key> သို့မဟုတ် ?ticket=<EventTicketView>)
+    Owner: ကိုယ့် tenant ၏ transaction event အားလုံး၊ Auditor: ကိုယ်တင်ထားသော transaction များ၏ event သာ
+    Reconnect လုပ်လျှင် Last-Event-ID ဖြင့် လွတ်သွားသော event များကို ပြန်ပို့သည် ('resync' ရလျှင် list ပြန်ယူပါ)။
+    ASGI (uvicorn/daphne) process မှသာ serve — WSGI worker တွင် stream တစ်ခုလျှင် thread တစ်ခု ယူထားမည်ဖြစ်၍
+    DEBUG (runserver) မဟုတ်လျှင် 503 ပြန်သည် (thoonsheet/asgi.py ကိုကြည့်ပါ)။
+    """
+    if request.method != 'GET':
+        return HttpResponseNotAllowed(['GET'])
+    if not isinstance(request, ASGIRequest) and not settings.DEBUG:
+        return JsonResponse({'detail': 'Event stream ကို ASGI process (thoonsheet.asgi) မှသာ ရနိုင်ပါသည်။'}, status=503)
+    user = await _event_stream_user(request)
+    if user is None:
+        return JsonResponse({'detail': 'Authentication credentials were not provided.'}, status=401)
+    if user.user_type not in ('owner', 'auditor') or user.tenant_id is None:
+        return JsonResponse({'detail': 'ဤ event stream ကို ကြည့်ရှုခွင့် မရှိပါ။'}, status=403)
+
+    try:
+        last_event_id = int(request.headers.get('Last-Event-ID') or request.GET.get('last_event_id'))
+    except (TypeError, ValueError):
+        last_event_id = None
+    only_submitter = None if user.user_type == 'owner' else user.pk
+
+    async def stream():
+        subscription = get_broker().subscribe(user.tenant_id, last_event_id=last_event_id)
+        try:
+            yield 'retry: 5000\n\n'
+            while True:
+                event = await subscription.get(timeout=EVENT_HEARTBEAT_SECONDS)
+                if event is None:
+                    yield ': ping\n\n'  # proxy idle timeout မဖြစ်စေရန်
+                    continue
+                if only_submitter is not None:
+                    if event.get('submitted_by', only_submitter) != only_submitter:
+                        continue
+                    if 'duplicates' in event:
+                        # ပုံတူ id များထဲတွင် အခြား auditor ၏ transaction ပါနိုင် — /transactions/{id}/ ၏
+                        # possible_duplicates (ကိုယ့် transaction များသာ) ကို ပြန်ယူပါ
+                        event = {key: value for key, value in event.items() if key != 'duplicates'}
+                yield format_sse(event)
+        finally:
+            subscription.close()
+
+    response = StreamingHttpResponse(stream(), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'  # nginx buffering ပိတ်
+    return response
+
+
+# -------- Receipt files (loose ဖိုင် / cold storage pack — sheets/packs.py) --------
+
+class ReceiptFileView(ShardScopedViewMixin, APIView):
+    """
+    GET <MEDIA_URL>transaction_images/... — Transaction.image.url မပြောင်းဘဲ pack ထဲရှိ ပုံများကိုပါ serve
+    Production တွင် web server က disk ပေါ်ရှိ loose ဖိုင်များကို တိုက်ရိုက် serve ပြီး မရှိမှ ဤ view သို့ fallback ပါ
+    Login ဝင်ထားပြီး ထိုပုံကို သုံးသော transaction (archive ပါ) ကို မြင်ခွင့်ရှိသူသာ — auditor ဆိုလျှင် ကိုယ်တင်ထားသော
+    transaction များ၏ ပုံသာ။ RECEIPT_FILE_VIEW ဖွင့်ထားမှသာ mount (thoonsheet/urls.py)
+    """
+    permission_classes = [permissions.IsAuthenticated]
+
+    def perform_content_negotiation(self, request, force=False):
+        # <img> / Image.network ၏ Accept: image/* ကြောင့် 406 မဖြစ်စေရန် — 401/404 ကိုသာ JSON ဖြင့် render
+        return super().perform_content_negotiation(request, force=True)
+
+    def get(self, request, name):
+        if not self._can_view(request.user, name):
+            raise NotFound()
+        try:
+            fh = receipt_storage().open(name)
+        except (FileNotFoundError, SuspiciousFileOperation):
+            raise NotFound()
+        response = FileResponse(fh, content_type=mimetypes.guess_type(name)[0] or 'application/octet-stream')
+        # Content-addressed (အမည်ထဲတွင် sha256) ဖြစ်၍ immutable၊ user ခွင့်ပြုချက်ဖြင့်သာ ရသောကြောင့် shared cache တွင် မသိမ်း
+        response['Cache-Control'] = 'private, max-age=31536000, immutable'
+        return response
+
+    def _can_view(self, user, name):
+        sources = archive.querysets_for_user(user)
+        if not user.is_superuser and user.user_type != 'owner':
+            sources = [qs.filter(submitted_by=user) for qs in sources]
+        return any(qs.filter(image=name).exists() for qs in sources)
@@ -3,6 +3,19 @@ ASGI config for thoonsheet project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
 
+Real-time transaction events (``/api/sheets/events/``, Server-Sent Events) are
+async views and are only served through ASGI (outside DEBUG a WSGI worker
+answers 503), so that idle event streams do not hold a worker thread each.
+Route ``/api/sheets/events/`` to a separate ASGI process next to the gunicorn
+(WSGI) workers, e.g.::
+
+    uvicorn thoonsheet.asgi:application --workers 2
+
+Events are published by the WSGI workers and ``run_jobs``, so production uses
+``sheets.events.CacheBroker`` over the shared ``DatabaseCache`` (run
+``manage.py createcachetable``). The default ``InProcessBroker`` only delivers
+events published by the same process and is meant for ``runserver``.
+
 For more information on this file, see
 https://docs.djangoproject.com/en/5.2/howto/deployment/asgi/
 """
@@ -64,14 +64,17 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    # WhiteNoise ကို SecurityMiddleware နောက်တွင် ချက်ချင်းထားရမည် (docs အတိုင်း)
+    'whitenoise.middleware.WhiteNoiseMiddleware',
+    'sheets.middleware.ResponseCompressionMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'sheets.middleware.RequestProfilingMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
     'corsheaders.middleware.CorsMiddleware',
-    "whitenoise.middleware.WhiteNoiseMiddleware",
 ]
 
 ROOT_URLCONF = 'thoonsheet.urls'
@@ -101,9 +104,38 @@ DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': os.path.join(BASE_DIR, 'db.sqlite3'),
+        'OPTIONS': {
+            # request worker များနှင့် job worker (manage.py run_jobs) တစ်ပြိုင်နက် ရေးနိုင်ရန်:
+            # IMMEDIATE = read->write lock upgrade deadlock မဖြစ်
+            'transaction_mode': 'IMMEDIATE',
+            'timeout': 20,
+        },
     }
 }
 
+# WAL = reader များက writer ကို မပိတ် — journal_mode သည် database ဖိုင်ထဲ သိမ်းသွားသောကြောင့် repo ထဲရှိ db.sqlite3 ကို
+# manage.py run တိုင်း မပြောင်းစေရန် DJANGO_SQLITE_WAL=1 ဖြင့်သာ (settings_production တွင် default ဖွင့်)
+SQLITE_WAL = os.environ.get('DJANGO_SQLITE_WAL', '').lower() in ('1', 'true', 'yes', 'on')
+if SQLITE_WAL:
+    DATABASES['default']['OPTIONS']['init_command'] = 'PRAGMA journal_mode=WAL;'
+
+# Database-per-owner sharding (sheets.sharding) — ဖွင့်ပြီးလျှင် `manage.py split_into_shards` ဖြင့် data ခွဲပါ
+SHEETS_SHARDING = False
+SHEETS_SHARD_DIR = os.path.join(BASE_DIR, 'shards')
+
+# Read replica (sheets.replicas) — list/retrieve/summary/export read များကို replica မှ ဖတ်
+# SQLite ဥပမာ (`manage.py refresh_replica --interval 30` ဖြင့် primary မှ ကူး):
+# DATABASES['replica'] = {
+#     'ENGINE': 'django.db.backends.sqlite3',
+#     'NAME': os.path.join(BASE_DIR, 'db.replica.sqlite3'),
+#     'OPTIONS': {'init_command': 'PRAGMA query_only=1;'},
+# }
+# SHEETS_READ_REPLICA = 'replica'
+SHEETS_READ_REPLICA = None
+SHEETS_REPLICA_STICKY_SECONDS = 10  # write ပြီးနောက် ဤစက္ကန့်အတွင်း user ၏ read များကို primary မှ ဖတ်
+
+DATABASE_ROUTERS = ['sheets.sharding.ShardRouter', 'sheets.replicas.ReplicaRouter']
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -145,7 +177,103 @@ STATIC_URL = '/static/'
 # ]
 STATIC_ROOT = os.path.join(BASE_DIR, 'staticfiles')
 
-STATICFILES_STROAGE = 'whitenoise.storage.CompressedManifestStaticFilesStorage'
+# Django 5 တွင် STATICFILES_STORAGE မရှိတော့ပါ။ STORAGES ဖြင့်သာ သတ်မှတ်ရသည်။
+STORAGES = {
+    'default': {
+        'BACKEND': 'django.core.files.storage.FileSystemStorage',
+    },
+    # Transaction.image — content-addressed (sha256) ဖြင့် ဖိုင်တစ်ခုကို တစ်ကြိမ်သာ သိမ်း
+    'receipts': {
+        'BACKEND': 'sheets.storage.ContentAddressedStorage',
+    },
+    'staticfiles': {
+        # collectstatic အချိန်တွင် hashed filename + .gz (brotli ထည့်ထားလျှင် .br) များကို ကြိုထုတ်ထားသည်
+        # staticfiles.json (manifest) ကို collectstatic ကသာ ထုတ်သည် — deploy တိုင်း `manage.py collectstatic --noinput`
+        # လုပ်ရမည် (မလုပ်လျှင် DEBUG=False တွင် {% static %} ပါသော page (admin) များ ValueError ဖြင့် ပျက်)
+        'BACKEND': 'whitenoise.storage.CompressedManifestStaticFilesStorage',
+    },
+}
+
+# Hashed (manifest) ဖိုင်များကို WhiteNoise က immutable/1 year ဖြင့် အလိုအလျောက် serve လုပ်သည်။
+# hash မပါသော ဖိုင်များအတွက် max-age
+WHITENOISE_MAX_AGE = 0 if DEBUG else 60 * 60 * 24
+
+# Duplicate receipt detection (sheets.fingerprints)
+RECEIPT_DUPLICATE_MAX_DISTANCE = 6   # dHash Hamming distance (64 bits ထဲမှ)
+RECEIPT_DUPLICATE_WAIT_SECONDS = 0.5  # ?wait_for_duplicates=1 ဖြင့် submit လျှင် response ထဲ flag ထည့်ရန် စောင့်မည့်အချိန်
+RECEIPT_FINGERPRINT_WORKERS = 2
+
+# Chunked receipt upload (sheets.uploads)
+RECEIPT_UPLOAD_MAX_SIZE = 25 * 1024 * 1024
+RECEIPT_UPLOAD_PARTIAL_DIR = None  # None => MEDIA_ROOT/.partial_uploads (finalize ကို rename ဖြစ်စေရန် filesystem တူရမည်)
+
+# Receipt cold storage (sheets.packs, manage.py pack_receipts)
+RECEIPT_PACK_AFTER_DAYS = 90
+RECEIPT_PACK_DIR = None  # None => MEDIA_ROOT/packs
+RECEIPT_PACK_MAX_BYTES = 256 * 1024 * 1024  # ပြည့်လျှင် pack ဖိုင်အသစ်
+RECEIPT_PACK_WORKERS = 2  # recompress process pool
+# <MEDIA_URL>transaction_images/ ကို Django (ReceiptFileView — login + ownership စစ်) မှ serve; pack ထဲရှိ ပုံများအတွက် မဖြစ်မနေ
+RECEIPT_FILE_VIEW = True
+
+# Receipt thumbnail (sheets.thumbnails — admin changelist)
+RECEIPT_THUMBNAIL_SIZE = 96  # px (အရှည်ဘက်)
+RECEIPT_THUMBNAIL_DIR = None  # None => MEDIA_ROOT/thumbnails
+
+# Admin changelist — filter ပါသော COUNT ကို ဤအရေအတွက်အထိသာ ရေတွက် (sheets.admin.EstimatedCountPaginator)
+SHEETS_ADMIN_COUNT_LIMIT = 10000
+
+# Background jobs (sheets.jobs, manage.py run_jobs)
+SHEETS_JOB_RETRY_BASE_SECONDS = 30
+SHEETS_JOB_STALE_SECONDS = 60 * 60
+SHEETS_JOB_HEARTBEAT_SECONDS = 30  # run နေဆဲ job ၏ locked_at ကို worker က ပြန်မှတ်သည့် interval
+# export_transactions CSV — MEDIA_ROOT ပြင်ပ (web server မှ serve မလုပ်)၊ GET /jobs/{id}/download/ (login) မှသာ
+SHEETS_EXPORT_DIR = os.path.join(BASE_DIR, 'exports')
+
+# Real-time transaction events (sheets.events, /api/sheets/events/)
+# process အများအပြားဖြင့် run လျှင် 'sheets.events.CacheBroker' (shared cache လို) — settings_production ကိုကြည့်ပါ
+SHEETS_EVENT_BACKEND = 'sheets.events.InProcessBroker'
+SHEETS_EVENT_CACHE = 'default'
+SHEETS_EVENT_POLL_SECONDS = 1
+SHEETS_EVENT_TTL_SECONDS = 600
+# ?ticket= (POST /api/sheets/events/ticket/) သက်တမ်း
+SHEETS_EVENT_TICKET_SECONDS = 60
+
+# Batched idempotent mutations (sheets.idempotency, /api/sheets/transactions/batch/)
+SHEETS_BATCH_MAX_OPERATIONS = 50
+SHEETS_IDEMPOTENCY_KEY_DAYS = 7  # manage.py purge_idempotency_keys — client retry window ထက် ရှည်ရမည်
+
+# Multiplexed dashboard reads (sheets.multiplex, /api/sheets/batch/)
+SHEETS_BATCH_READ_MAX_REQUESTS = 10
+SHEETS_BATCH_READ_WORKERS = 4  # "parallel": true အတွက် thread (thread တစ်ခုလျှင် DB connection တစ်ခု)
+
+# Owner review queue risk score (sheets.risk, manage.py score_transactions)
+SHEETS_RISK_NEAR_DUPLICATE_DAYS = 3  # ပမာဏတူ မှတ်တမ်း ဤရက်အတွင်း နီးလျှင် duplicate အဖြစ် flag
+SHEETS_RISK_NEW_AUDITOR_DAYS = 30  # ပထမဆုံးတင်ပြမှုမှ ဤရက် မပြည့်သေးသော auditor
+
+# Pivot report (sheets.pivots, /api/sheets/reports/pivot/)
+SHEETS_PIVOT_MAX_CELLS = 100_000
+
+# Group cash-flow forecast (sheets.forecasting, /api/sheets/groups/forecast/)
+SHEETS_FORECAST_HISTORY_DAYS = 365
+SHEETS_FORECAST_CACHE_SECONDS = 24 * 60 * 60  # approved မှတ်တမ်း ပြောင်းလျှင် ချက်ချင်း invalidate
+
+# AuditEntry vs ledger reconciliation (sheets.reconciliation, manage.py reconcile_audit_entries)
+SHEETS_RECONCILIATION_THRESHOLD = '1.00'  # |audit − ledger| ဤထက် ကျော်မှ flag
+
+# Hot / cold partitioning (sheets.archive, manage.py archive_transactions)
+SHEETS_ARCHIVE_AFTER_DAYS = 365  # ဤထက် ကြာပြီး ပိတ်ပြီးသောလများ၏ approved မှတ်တမ်းများကို archive သို့
+SHEETS_ARCHIVE_BATCH_SIZE = 500  # transaction (lock) တစ်ခုလျှင် ရွှေ့မည့် row
+
+# Request profiling (sheets.profiling, sheets.middleware.RequestProfilingMiddleware)
+# staff user များက X-Sheets-Profile: 1|cprofile header သို့ ?_profile= ဖြင့် အမြဲ profile လုပ်နိုင်သည်
+SHEETS_PROFILE_SAMPLE_RATE = 0.0  # request အားလုံးထဲမှ ကျပန်း profile လုပ်မည့် အချိုး (0 = ပိတ်)
+SHEETS_PROFILE_INTERVAL_MS = 5  # sampling profiler ၏ stack ယူသည့် interval
+SHEETS_PROFILE_MAX_SQL = 1000  # profile တစ်ခုတွင် သိမ်းမည့် SQL statement
+SHEETS_PROFILE_RETENTION_DAYS = 7
+
+# API response compression (sheets.middleware.ResponseCompressionMiddleware)
+RESPONSE_COMPRESSION_MIN_SIZE = 1024  # bytes
+RESPONSE_COMPRESSION_PATHS = ('/api/',)
 
 MEDIA_URL = '/media/'
 MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
@@ -0,0 +1,147 @@
+"""
+Production settings — DJANGO_SETTINGS_MODULE=thoonsheet.settings_production
+
+settings.py (development) ကို အခြေခံပြီး API worker တစ်ခု မလိုသော app / middleware / renderer / authentication
+များကို ဖယ်ထားသည် (worker boot နှင့် request တစ်ခုချင်း middleware ကုန်ကျစရိတ် လျော့)။
+
+- jazzmin, django_extensions, browsable API, SessionAuthentication မပါ
+- DJANGO_ADMIN=1 — Django admin (review / RequestProfile) ကို ဤ process တွင် ဖွင့် (session / CSRF / messages
+  middleware ပါ ပြန်ထည့်)။ API worker pool နှင့် admin pool ကို ခွဲ run ရန် API pool တွင် မထည့်ပါနှင့်
+- DJANGO_RECEIPT_FILE_VIEW=1 — pack_receipts (cold storage) သုံးလျှင် receipt ပုံကို Django မှ serve (login လို)
+- Template များကို cached loader ဖြင့်၊ DB connection ကို request များအကြား ပြန်သုံး (DJANGO_CONN_MAX_AGE —
+  asgi.py (events) process တွင် Django docs အတိုင်း 0 ထားပါ)
+- Deploy တိုင်း worker မစမီ `manage.py collectstatic --noinput --settings thoonsheet.settings_production` —
+  CompressedManifestStaticFilesStorage ၏ staticfiles.json (manifest) နှင့် .gz / .br ဖိုင်များကို ထုတ်သည် (repo ထဲ မပါ)
+- WSGI worker များကို `gunicorn thoonsheet.wsgi --preload` ဖြင့် run လျှင် import များကို master တွင် တစ်ကြိမ်သာ လုပ်
+- /api/sheets/events/ (SSE) ကို ASGI process (`uvicorn thoonsheet.asgi:application`) မှသာ serve — WSGI worker
+  များ၊ run_jobs မှ publish သော event များကို DatabaseCache (CacheBroker) မှတစ်ဆင့် ရသည်။ Deploy တိုင်း
+  `manage.py createcachetable` (cache table) လုပ်ပါ
+- Startup အချိန် (app အလိုက် import) ကို `manage.py startup_report --settings thoonsheet.settings_production` ဖြင့် ကြည့်ပါ
+"""
+
+import os
+
+from django.core.exceptions import ImproperlyConfigured
+
+from .settings import *  # noqa: F401,F403
+from .settings import DATABASES, INSTALLED_APPS, REST_FRAMEWORK, TEMPLATES
+
+
+def env_bool(name, default=False):
+    value = os.environ.get(name)
+    if value is None:
+        return default
+    return value.strip().lower() in ('1', 'true', 'yes', 'on')
+
+
+def env_list(name, default=()):
+    value = os.environ.get(name)
+    if not value:
+        return list(default)
+    return [item.strip() for item in value.split(',') if item.strip()]
+
+
+DEBUG = env_bool('DJANGO_DEBUG', False)
+
+SECRET_KEY = os.environ.get('DJANGO_SECRET_KEY')
+if not SECRET_KEY:
+    raise ImproperlyConfigured("DJANGO_SECRET_KEY environment variable ထည့်ပါ။")
+
+ALLOWED_HOSTS = env_list('DJANGO_ALLOWED_HOSTS', ['localhost'])
+
+ADMIN_ENABLED = env_bool('DJANGO_ADMIN', False)
+
+# Receipt ပုံ view — pack_receipts သုံးမှသာ DJANGO_RECEIPT_FILE_VIEW=1 (မဟုတ်လျှင် web server က media ကို serve)
+RECEIPT_FILE_VIEW = env_bool('DJANGO_RECEIPT_FILE_VIEW', False)
+
+# ---- Apps ----
+
+INSTALLED_APPS = [app for app in INSTALLED_APPS if app not in ('jazzmin', 'django_extensions')]
+if not ADMIN_ENABLED:
+    INSTALLED_APPS = [
+        app for app in INSTALLED_APPS
+        if app not in ('django.contrib.admin', 'django.contrib.sessions', 'django.contrib.messages')
+    ]
+
+# ---- Middleware ----
+
+# CorsMiddleware ကို response ထုတ်နိုင်သော middleware များ (CommonMiddleware) ရှေ့တွင် (django-cors-headers docs)
+if ADMIN_ENABLED:
+    MIDDLEWARE = [
+        'django.middleware.security.SecurityMiddleware',
+        'whitenoise.middleware.WhiteNoiseMiddleware',
+        'corsheaders.middleware.CorsMiddleware',
+        'sheets.middleware.ResponseCompressionMiddleware',
+        'django.contrib.sessions.middleware.SessionMiddleware',
+        'django.middleware.common.CommonMiddleware',
+        'django.middleware.csrf.CsrfViewMiddleware',
+        'django.contrib.auth.middleware.AuthenticationMiddleware',
+        'sheets.middleware.RequestProfilingMiddleware',
+        'django.contrib.messages.middleware.MessageMiddleware',
+        'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    ]
+else:
+    # API view များသည် token ဖြင့်သာ authenticate လုပ်ပြီး CSRF exempt — session / CSRF / messages / X-Frame-Options မလို
+    MIDDLEWARE = [
+        'django.middleware.security.SecurityMiddleware',
+        'whitenoise.middleware.WhiteNoiseMiddleware',
+        'corsheaders.middleware.CorsMiddleware',
+        'sheets.middleware.ResponseCompressionMiddleware',
+        'django.middleware.common.CommonMiddleware',
+        'sheets.middleware.RequestProfilingMiddleware',
+    ]
+
+# ---- Templates ----
+
+TEMPLATES = [dict(TEMPLATES[0], APP_DIRS=False)]
+TEMPLATES[0]['OPTIONS'] = dict(TEMPLATES[0]['OPTIONS'], loaders=[
+    ('django.template.loaders.cached.Loader', [
+        'django.template.loaders.filesystem.Loader',
+        'django.template.loaders.app_directories.Loader',
+    ]),
+])
+if not ADMIN_ENABLED:
+    TEMPLATES[0]['OPTIONS']['context_processors'] = [
+        'django.template.context_processors.request',
+        'django.contrib.auth.context_processors.auth',
+    ]
+
+# ---- Database ----
+
+# Request တိုင်း connect (SQLite — PRAGMA init_command ပါ) မလုပ်ရန်; shard connection များသည် default ကို ကူးသည်
+DATABASES = {
+    alias: dict(
+        config,
+        CONN_MAX_AGE=int(os.environ.get('DJANGO_CONN_MAX_AGE', 300)),
+        CONN_HEALTH_CHECKS=True,
+    )
+    for alias, config in DATABASES.items()
+}
+
+# Production database သည် repo ထဲရှိ ဖိုင် မဟုတ်သောကြောင့် WAL ကို default ဖွင့် (settings.SQLITE_WAL ကိုကြည့်ပါ)
+SQLITE_WAL = env_bool('DJANGO_SQLITE_WAL', True)
+if SQLITE_WAL:
+    DATABASES['default']['OPTIONS'] = dict(DATABASES['default']['OPTIONS'], init_command='PRAGMA journal_mode=WAL;')
+
+# ---- REST framework ----
+
+REST_FRAMEWORK = dict(
+    REST_FRAMEWORK,
+    DEFAULT_AUTHENTICATION_CLASSES=('rest_framework.authentication.TokenAuthentication',),
+    DEFAULT_RENDERER_CLASSES=('rest_framework.renderers.JSONRenderer',),
+)
+
+# ---- Cache / real-time events ----
+
+# Process အားလုံး (gunicorn worker, ASGI events process, run_jobs) မျှဝေရန် — `manage.py createcachetable`
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.db.DatabaseCache',
+        'LOCATION': os.environ.get('DJANGO_CACHE_TABLE', 'sheets_cache'),
+    },
+}
+SHEETS_EVENT_BACKEND = 'sheets.events.CacheBroker'
+
+# ---- Misc ----
+
+WHITENOISE_MAX_AGE = 60 * 60 * 24
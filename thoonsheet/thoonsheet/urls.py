@@ -14,15 +14,16 @@ Including another URLconf
     1. Import the include() function: from django.urls import include, path
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
-from django.contrib import admin
-from django.urls import path, include
+import re
+
+from django.apps import apps
+from django.urls import path, include, re_path
 from django.conf import settings
 from django.conf.urls.static import static
-from sheets.views import CustomTokenCreateView
+from sheets.views import CustomTokenCreateView, ReceiptFileView
 
 
 urlpatterns = [
-    path('admin/', admin.site.urls),
     path('api/sheets/', include('sheets.urls')),
     # path('api/auth/', include('accounts.urls')),
 
@@ -31,6 +32,20 @@ urlpatterns = [
     # path('api/auth/', include('djoser.urls.authtoken')),
 ]
 
+# Receipt ပုံ — loose ဖိုင် သို့မဟုတ် cold storage pack (sheets/packs.py); image.url မပြောင်း
+# pack_receipts မသုံးဘဲ web server က media ကို serve လျှင် RECEIPT_FILE_VIEW = False
+if getattr(settings, 'RECEIPT_FILE_VIEW', True):
+    urlpatterns.append(re_path(
+        rf'^{re.escape(settings.MEDIA_URL.lstrip("/"))}(?P<name>transaction_images/.+)$',
+        ReceiptFileView.as_view(), name='receipt_file',
+    ))
+
+# Admin — settings_production တွင် DJANGO_ADMIN=1 ဖြင့်သာ (API worker များ admin ကို import မလုပ်ရ)
+if apps.is_installed('django.contrib.admin'):
+    from django.contrib import admin
+
+    urlpatterns.insert(0, path('admin/', admin.site.urls))
+
 # urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
 # urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
 